@@ -174,6 +174,33 @@ async def readiness_check():
     return {"ready": True, "status": "ready"}
 
 
+@app.get("/metrics/classifier")
+async def classifier_metrics():
+    """Local classifier dispatcher metrics (queue depth, batch sizes, latencies)."""
+    from src.central_engine import _classification_dispatcher_singleton
+    if _classification_dispatcher_singleton is None:
+        return {"enabled": False}
+    return {"enabled": True, **_classification_dispatcher_singleton.get_stats()}
+
+
+@app.get("/metrics/routing-cache")
+async def routing_cache_metrics():
+    """Routing cache metrics (hit rates, LLM calls and routing time saved)."""
+    from src.config import get_config
+    if not get_config().routing_cache_enabled:
+        return {"enabled": False}
+    from src.classifiers.routing_cache import get_routing_cache
+    return {"enabled": True, **get_routing_cache().get_stats()}
+
+
+@app.get("/metrics/speculation")
+async def speculation_metrics():
+    """Speculative retrieval metrics (hit rate, time saved, wasted work)."""
+    from src.config import get_config
+    from src.rag.speculative_retrieval import get_speculation_stats
+    return {"enabled": get_config().speculative_retrieval_enabled, **get_speculation_stats().to_dict()}
+
+
 @app.post("/warmup")
 async def trigger_warmup():
     """Explicit warmup trigger endpoint.
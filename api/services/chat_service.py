@@ -16,6 +16,7 @@ from src.llm.central_prompt_manager import CentralPromptManager
 from src.rag.context_assembler import ContextAssembler
 from src.rag.rulebook.rulebook_storage import RulebookStorage
 from src.rag.session_notes.session_notes_storage import SessionNotesStorage
+from src.rag.session_notes.session_snapshot_cache import SessionSnapshotCache
 from src.rag.character.character_types import Character
 from src.config import get_config
 from api.database.firestore_client import get_firestore_client
@@ -78,8 +79,11 @@ class ChatService:
         # Initialize session notes storage with Firestore client if not already done
         if self._session_notes_storage_instance is None:
             db = get_firestore_client()
-            self._session_notes_storage_instance = SessionNotesStorage(db)
-            print(f"[ChatService] Session notes storage initialized with Firestore")
+            snapshot_dir = get_config().session_snapshot_dir
+            snapshot_cache = SessionSnapshotCache(snapshot_dir) if snapshot_dir else None
+            self._session_notes_storage_instance = SessionNotesStorage(db, snapshot_cache=snapshot_cache)
+            print(f"[ChatService] Session notes storage initialized with Firestore"
+                  f"{f' (snapshots: {snapshot_dir})' if snapshot_dir else ''}")
 
         campaign_notes = await self._session_notes_storage_instance.get_campaign(campaign_id)
         if campaign_notes:
@@ -12,6 +12,8 @@ interface PerformanceMetricsProps {
 
 export function PerformanceMetrics({ performance }: PerformanceMetricsProps) {
   const timing = performance.timing || {};
+  const ragTools = Object.entries(performance.rag_tools || {});
+  const context = performance.context;
   
   const metrics = [
     { label: 'Routing & Entities', value: timing.routing_and_entities, color: 'bg-blue-500' },
@@ -44,6 +46,28 @@ export function PerformanceMetrics({ performance }: PerformanceMetricsProps) {
             ))}
           </div>
 
+          {ragTools.length > 0 && (
+            <div className="space-y-1 text-xs">
+              {ragTools.map(([tool, { time_ms, status, speculative }]) => (
+                <div key={tool} className="flex items-center justify-between pl-2">
+                  <span className="text-muted-foreground">{tool}{speculative ? ' (speculative)' : ''}</span>
+                  <span className={status === 'ok' ? 'font-medium' : 'font-medium text-destructive'}>
+                    {status === 'ok' ? `${time_ms.toFixed(0)}ms` : `${status} (${time_ms.toFixed(0)}ms)`}
+                  </span>
+                </div>
+              ))}
+            </div>
+          )}
+
+          {context && (
+            <div className="flex items-center justify-between text-xs">
+              <span className="text-muted-foreground">Prompt Context</span>
+              <span className="font-medium">
+                {context.total_tokens} / {context.candidate_tokens} tokens
+              </span>
+            </div>
+          )}
+
           {total > 0 && (
             <div className="pt-3 border-t border-border">
               <div className="flex items-center justify-between">
@@ -59,6 +59,27 @@ export interface PerformanceMetrics {
     response_generation?: number;
     total?: number;
   };
+  // Per-tool RAG query timings (tools run concurrently, so rag_queries tracks the slowest)
+  rag_tools?: Record<string, { time_ms: number; status: 'ok' | 'timeout' | 'error'; speculative?: boolean }>;
+  // Retrieval started while the LLM router was deciding (haiku/comparison routing)
+  speculation?: {
+    entity_resolution_ms: number;
+    kept: string[];
+    discarded: string[];
+    saved_ms: number;
+  };
+  // Final prompt context after deduplication and token-budget packing (estimated tokens)
+  context?: {
+    total_tokens: number;
+    token_budget: number;
+    candidate_tokens: number;
+    prompt_tokens: number;
+    deduplicated_blocks: number;
+    deduplicated_lines: number;
+    truncated_blocks: number;
+    dropped_blocks: number;
+    sources: Record<string, { tokens: number; budget: number; candidate_tokens: number; blocks: number; candidate_blocks: number }>;
+  };
 }
 
 export interface QueryMetadata {
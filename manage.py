@@ -1193,13 +1193,14 @@ async def main():
         records = await repo.get_recent(limit=1000)
         print(f"\\nProcessing {len(records)} feedback records...\\n")
         
+        # Re-extract entities for all queries in this process: forking workers
+        # while the database client is live is unsafe (results stay in order)
+        batch_results = extractor.extract_simple_batch([r.user_query for r in records], workers=1)
+        
         updated = 0
-        for r in records:
+        for r, raw_entities in zip(records, batch_results):
             original_query = r.user_query
             
-            # Re-extract entities from the query
-            raw_entities = extractor.extract_simple(original_query)
-            
             # Convert to storage format
             new_entities = [
                 {
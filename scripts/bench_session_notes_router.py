@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+"""
+Benchmark SessionNotesQueryRouter on synthetic campaigns.
+
+Runs every UserIntention handler against campaigns of increasing size with
+0..N query entities and reports:
+- latency percentiles (p50/p95/p99/max) per intention
+- mean SessionNotesQueryPerformanceMetrics stage breakdown
+- memory held by the campaign and peak memory during queries
+- growth of median latency relative to campaign size (flags superlinear scaling)
+
+Usage:
+    uv run python -m scripts.bench_session_notes_router
+    uv run python -m scripts.bench_session_notes_router --sizes 10 100 1000 --repeats 20
+    uv run python -m scripts.bench_session_notes_router --output bench_session_notes.json
+"""
+import argparse
+import gc
+import json
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Standard project root setup
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.rag.session_notes.session_notes_query_router import SessionNotesQueryRouter
+from src.rag.session_notes.session_types import UserIntention
+from scripts.synthetic_campaign import generate_campaign, ITEMS, LOCATIONS, PLAYER_CHARACTERS
+
+
+CONTEXT_HINTS = [[], ["recent"], ["combat"], ["between 2 and 8"]]
+STAGES = ["session_filtering_ms", "context_building_ms", "scoring_sorting_ms", "result_limiting_ms"]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def sample_entities(rng: random.Random, npc_names: List[str], count: int) -> List[Dict[str, str]]:
+    """Pick a mix of PC, NPC, location and item entities."""
+    pool = ([(n, "PC") for n in PLAYER_CHARACTERS] + [(n, "NPC") for n in npc_names] +
+            [(n, "LOCATION") for n in LOCATIONS] + [(n, "ITEM") for n in ITEMS])
+    return [{"name": name, "type": entity_type} for name, entity_type in rng.sample(pool, count)]
+
+
+def bench_size(size: int, entity_counts: List[int], repeats: int, seed: int) -> Dict[str, Any]:
+    """Benchmark all intentions on a campaign of the given size."""
+    gc.collect()
+    tracemalloc.start()
+    storage = generate_campaign(size, seed=seed)
+    campaign_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    router = SessionNotesQueryRouter(storage)
+    npc_names = sorted({n["name"] for s in storage.get_all_sessions() for n in s.npcs})
+    rng = random.Random(seed)
+
+    # Timed pass (tracemalloc off, it would inflate latencies)
+    per_intention: Dict[str, Dict[str, Any]] = {}
+    all_latencies: List[float] = []
+
+    for intention in UserIntention:
+        latencies: List[float] = []
+        stage_totals = {stage: 0.0 for stage in STAGES}
+        results_returned = 0
+
+        for entity_count in entity_counts:
+            for i in range(repeats):
+                entities = sample_entities(rng, npc_names, entity_count)
+                hints = CONTEXT_HINTS[i % len(CONTEXT_HINTS)]
+
+                start = time.perf_counter()
+                result = router.query("Duskryn Nightwarden", "benchmark query", intention.value, entities, hints)
+                latencies.append((time.perf_counter() - start) * 1000)
+
+                metrics = result.performance_metrics
+                for stage in STAGES:
+                    stage_totals[stage] += getattr(metrics, stage)
+                results_returned += metrics.results_returned
+
+        runs = len(latencies)
+        all_latencies.extend(latencies)
+        per_intention[intention.value] = {
+            "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95),
+            "p99_ms": percentile(latencies, 99),
+            "max_ms": max(latencies),
+            "stages_mean_ms": {stage: total / runs for stage, total in stage_totals.items()},
+            "mean_results": results_returned / runs,
+        }
+
+    # Memory pass: peak allocation of one query per intention at the largest entity count
+    tracemalloc.start()
+    baseline_bytes = tracemalloc.get_traced_memory()[0]
+    entities = sample_entities(rng, npc_names, max(entity_counts))
+    for intention in UserIntention:
+        router.query("Duskryn Nightwarden", "benchmark query", intention.value, entities, [])
+    query_peak_bytes = tracemalloc.get_traced_memory()[1] - baseline_bytes
+    tracemalloc.stop()
+
+    return {
+        "sessions": size,
+        "queries": len(all_latencies),
+        "campaign_memory_mb": campaign_bytes / 1024 / 1024,
+        "query_peak_memory_mb": max(0, query_peak_bytes) / 1024 / 1024,
+        "overall": {
+            "p50_ms": percentile(all_latencies, 50),
+            "p95_ms": percentile(all_latencies, 95),
+            "p99_ms": percentile(all_latencies, 99),
+            "mean_ms": statistics.fmean(all_latencies),
+        },
+        "intentions": per_intention,
+    }
+
+
+def print_report(results: List[Dict[str, Any]]) -> None:
+    for result in results:
+        print("\n" + "=" * 90)
+        print(f"{result['sessions']} sessions | {result['queries']} queries | "
+              f"campaign {result['campaign_memory_mb']:.1f} MB | query peak +{result['query_peak_memory_mb']:.1f} MB")
+        print("=" * 90)
+        print(f"{'intention':24s} {'p50':>8s} {'p95':>8s} {'p99':>8s} {'max':>8s}   "
+              f"{'filter':>8s} {'build':>8s} {'score':>8s}  {'results':>7s}")
+        for name, stats in result["intentions"].items():
+            stages = stats["stages_mean_ms"]
+            print(f"{name:24s} {stats['p50_ms']:8.2f} {stats['p95_ms']:8.2f} {stats['p99_ms']:8.2f} "
+                  f"{stats['max_ms']:8.2f}   {stages['session_filtering_ms']:8.2f} "
+                  f"{stages['context_building_ms']:8.2f} {stages['scoring_sorting_ms']:8.2f}  "
+                  f"{stats['mean_results']:7.1f}")
+        overall = result["overall"]
+        print(f"{'ALL':24s} {overall['p50_ms']:8.2f} {overall['p95_ms']:8.2f} {overall['p99_ms']:8.2f}")
+
+    # Scaling: how much faster than the campaign does p50 latency grow?
+    if len(results) > 1:
+        print("\nScaling (p50 growth vs. session growth, >1.5 suggests superlinear behavior):")
+        base = results[0]
+        for result in results[1:]:
+            size_ratio = result["sessions"] / base["sessions"]
+            for name, stats in result["intentions"].items():
+                base_p50 = base["intentions"][name]["p50_ms"] or 1e-6
+                growth = (stats["p50_ms"] / base_p50) / size_ratio
+                flag = "  <-- check" if growth > 1.5 else ""
+                print(f"  {base['sessions']}->{result['sessions']} {name:24s} x{growth:5.2f}{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the session notes query router")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000],
+                        help="Campaign sizes in sessions (default: 10 100 1000)")
+    parser.add_argument("--entities", type=int, nargs="+", default=[0, 1, 3, 5],
+                        help="Entity counts per query (default: 0 1 3 5)")
+    parser.add_argument("--repeats", "-r", type=int, default=8,
+                        help="Queries per intention and entity count (default: 8)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (default: 42)")
+    parser.add_argument("--output", "-o", type=str, help="Optional JSON output path")
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        print(f"Benchmarking {size} sessions...")
+        results.append(bench_size(size, args.entities, args.repeats, args.seed))
+
+    print_report(results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"config": vars(args), "results": results}, f, indent=2)
+        print(f"\nDetailed results saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+"""
+Compile the SRD cache into the prebuilt gazetteer artifact.
+
+The artifact holds the SRD name table, entity types and the serialized exact
+(Aho-Corasick) and fuzzy (character-count) match indexes, so extractors load
+it with a single unpickle instead of parsing every SRD JSON file and
+rebuilding the indexes. It is also rebuilt automatically at runtime whenever
+the source JSON changes; this script just does it ahead of time (e.g. during
+the Docker build) and reports timings.
+
+Usage:
+    uv run python -m scripts.build_gazetteer_artifact
+    uv run python -m scripts.build_gazetteer_artifact --force
+    uv run python -m scripts.build_gazetteer_artifact --cache-path src/classifiers/data/srd_cache --output /tmp/srd.gazetteer.pkl
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Standard project root setup
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config import get_config
+from src.classifiers.srd_gazetteer import (
+    GazetteerIndex,
+    build_srd_gazetteer,
+    default_artifact_path,
+    load_artifact,
+    load_srd_entries,
+    source_fingerprint,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile the SRD gazetteer artifact")
+    parser.add_argument("--cache-path", type=str, help="SRD cache directory (default: from config)")
+    parser.add_argument("--output", "-o", type=str, help="Artifact path (default: next to the SRD cache)")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if the artifact is current")
+    args = parser.parse_args()
+
+    cache_path = Path(args.cache_path) if args.cache_path else project_root / get_config().local_classifier_srd_cache
+    artifact_path = Path(args.output) if args.output else default_artifact_path(cache_path)
+
+    if not cache_path.exists():
+        print(f"SRD cache not found at {cache_path}")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    gazetteer = build_srd_gazetteer(cache_path, artifact_path, force=args.force)
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"Artifact: {artifact_path} ({artifact_path.stat().st_size / 1024:.0f} KB, {len(gazetteer)} entities)")
+    print(f"Build/validate: {build_ms:.1f} ms")
+
+    # Compare cold-start cost of both paths
+    start = time.perf_counter()
+    load_artifact(artifact_path, source_fingerprint(cache_path))
+    load_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    GazetteerIndex(load_srd_entries(cache_path))
+    parse_ms = (time.perf_counter() - start) * 1000
+    print(f"Load from artifact: {load_ms:.1f} ms | parse JSON + build indexes: {parse_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,7 @@ Usage:
     uv run python -m scripts.eval_full_pipeline_recall
     uv run python -m scripts.eval_full_pipeline_recall --verbose
     uv run python -m scripts.eval_full_pipeline_recall --top-k 10
+    uv run python -m scripts.eval_full_pipeline_recall --workers 4
 """
 import argparse
 import asyncio
@@ -134,9 +135,14 @@ class PipelineEvaluator:
     async def evaluate_question(
         self,
         question: dict,
-        top_k: int = 10
+        top_k: int = 10,
+        extracted_entities: Optional[List[str]] = None
     ) -> EvalResult:
-        """Evaluate a single question through the full pipeline."""
+        """Evaluate a single question through the full pipeline.
+        
+        extracted_entities can be precomputed (see extract_all_entities); otherwise
+        the engine's gazetteer extraction runs for this question.
+        """
         query = question["question"]
         expected = set(question["relevant_sections"])
         
@@ -157,8 +163,9 @@ class PipelineEvaluator:
         detected_intent = rulebook_tool.get("intention") if rulebook_tool else None
         
         # Step 2: Extract entities using Gazetteer
-        entity_output = self.engine._extract_entities_gazetteer(query)
-        extracted_entities = [e.get("name", e.get("text", "")) for e in entity_output.entities]
+        if extracted_entities is None:
+            entity_output = self.engine._extract_entities_gazetteer(query)
+            extracted_entities = [e.get("name", e.get("text", "")) for e in entity_output.entities]
         
         # Step 3: Execute retrieval if rulebook was selected
         retrieved_ids = []
@@ -210,16 +217,33 @@ class PipelineEvaluator:
             tool_selected=tool_selected
         )
     
-    async def run_evaluation(self, top_k: int = 10) -> dict:
+    def extract_all_entities(self, questions: List[dict], workers: int = 1) -> Dict[str, List[str]]:
+        """Extract entities for every question up front with the batch extractor."""
+        extractor = self.engine.entity_extractor
+        if not extractor:
+            return {}
+        
+        start = time.time()
+        results = extractor.extract_simple_batch([q["question"] for q in questions], workers=workers)
+        entities_by_id = {
+            q["id"]: [e["canonical"] for e in entities]
+            for q, entities in zip(questions, results)
+        }
+        print(f"Extracted entities for {len(questions)} questions in {(time.time() - start) * 1000:.0f}ms "
+              f"({workers} workers)")
+        return entities_by_id
+    
+    async def run_evaluation(self, top_k: int = 10, workers: int = 1) -> dict:
         """Run full evaluation on test set."""
         questions = load_test_questions()
         print(f"\nEvaluating {len(questions)} questions with top_k={top_k}...")
+        entities_by_id = self.extract_all_entities(questions, workers=workers)
         print("(This involves LLM calls for each question)\n")
         
         results: List[EvalResult] = []
         
         for i, q in enumerate(questions, 1):
-            result = await self.evaluate_question(q, top_k=top_k)
+            result = await self.evaluate_question(q, top_k=top_k, extracted_entities=entities_by_id.get(q["id"]))
             results.append(result)
             
             # Progress indicator
@@ -355,11 +379,17 @@ async def main():
         action="store_true",
         help="Print detailed per-question results"
     )
+    parser.add_argument(
+        "--workers", "-w",
+        type=int,
+        default=1,
+        help="Worker processes for batch entity extraction (default: 1)"
+    )
     
     args = parser.parse_args()
     
     evaluator = PipelineEvaluator(verbose=args.verbose)
-    await evaluator.run_evaluation(top_k=args.top_k)
+    await evaluator.run_evaluation(top_k=args.top_k, workers=args.workers)
 
 
 if __name__ == "__main__":
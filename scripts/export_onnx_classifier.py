@@ -0,0 +1,217 @@
+#!/usr/bin/env python
+"""
+Export the JointClassifier routing model to int8 ONNX and verify parity.
+
+Exports the encoder, tool head, the three intent heads and the calibrated
+temperature (as a temperature-scaled softmax) to a single ONNX graph with
+dynamic batch and sequence axes, applies dynamic int8 quantization to its
+weights, and writes it with the tokenizer to <model_path>/onnx/ for
+OnnxLocalClassifier (RAG_LOCAL_CLASSIFIER_BACKEND=onnx).
+
+Parity is then checked against the PyTorch model on a held-out query set
+(the ground-truth rulebook questions by default, which the classifier never
+trained on): the predicted tool and intent must agree and probabilities must
+stay within tolerance, otherwise the script exits non-zero.
+
+Requires torch, transformers, onnx and onnxruntime.
+
+Usage:
+    uv run python -m scripts.export_onnx_classifier
+    uv run python -m scripts.export_onnx_classifier --queries my_queries.txt
+    uv run python -m scripts.export_onnx_classifier --model-path models/routing_classifier --max-prob-diff 0.1
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+
+# Standard project root setup
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.classifiers.local_classifier import JointClassifier, LocalClassifier
+from src.classifiers.local_classifier_base import LocalClassifierBase
+from src.classifiers.onnx_classifier import (
+    ONNX_EXPORT_FORMAT,
+    ONNX_INPUT_NAMES,
+    ONNX_MODEL_FILENAME,
+    ONNX_OUTPUT_NAMES,
+    ONNX_SUBDIR,
+    ONNX_TOKENIZER_FILENAME,
+    OnnxLocalClassifier,
+)
+
+
+class ExportableJointClassifier(nn.Module):
+    """JointClassifier returning temperature-scaled probabilities as a flat tuple."""
+
+    def __init__(self, model: JointClassifier):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids, attention_mask):
+        tool_logits, intent_logits = self.model(input_ids, attention_mask)
+        temperature = self.model.temperature
+        return (
+            F.softmax(tool_logits / temperature, dim=-1),
+            F.softmax(intent_logits['character'] / temperature, dim=-1),
+            F.softmax(intent_logits['session_notes'] / temperature, dim=-1),
+            F.softmax(intent_logits['rulebook'] / temperature, dim=-1),
+        )
+
+
+def export_onnx(classifier: LocalClassifier, output_dir: Path, opset: int = 17, quantize: bool = True) -> Path:
+    """Export, quantize and annotate the model; write the tokenizer. Returns the model path."""
+    import onnx
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    model_file = output_dir / ONNX_MODEL_FILENAME
+    # Eval mode on the wrapper too: export restores its train/eval mode afterwards
+    module = ExportableJointClassifier(classifier.model.cpu()).eval()
+
+    sample = classifier.tokenizer(["What is my AC?", "How does grappling work?"], padding=True, return_tensors='pt')
+    dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in ONNX_INPUT_NAMES}
+    dynamic_axes.update({name: {0: 'batch'} for name in ONNX_OUTPUT_NAMES})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fp32_file = Path(tmp) / 'joint_classifier.fp32.onnx'
+        with torch.no_grad():
+            torch.onnx.export(
+                module,
+                (sample['input_ids'], sample['attention_mask']),
+                str(fp32_file),
+                input_names=ONNX_INPUT_NAMES,
+                output_names=ONNX_OUTPUT_NAMES,
+                dynamic_axes=dynamic_axes,
+                opset_version=opset,
+                dynamo=False,
+            )
+        print(f"FP32 export: {fp32_file.stat().st_size / 1e6:.1f} MB")
+
+        if quantize:
+            quantize_dynamic(str(fp32_file), str(model_file), weight_type=QuantType.QInt8)
+        else:
+            onnx.save(onnx.load(str(fp32_file)), str(model_file))
+
+    # Runtime settings the ONNX backend needs without the checkpoint
+    exported = onnx.load(str(model_file))
+    metadata = {
+        'export_format': ONNX_EXPORT_FORMAT,
+        'max_length': str(classifier.max_length),
+        'pad_token_id': str(classifier.tokenizer.pad_token_id),
+        'quantization': 'int8-dynamic' if quantize else 'none',
+    }
+    del exported.metadata_props[:]
+    for key, value in metadata.items():
+        exported.metadata_props.add(key=key, value=value)
+    onnx.save(exported, str(model_file))
+    print(f"{'Int8' if quantize else 'FP32'} model: {model_file} ({model_file.stat().st_size / 1e6:.1f} MB)")
+
+    # Standalone tokenizer (no truncation/padding state; the backend sets its own)
+    from tokenizers import Tokenizer
+    tokenizer = Tokenizer.from_str(classifier.tokenizer.backend_tokenizer.to_str())
+    tokenizer.no_truncation()
+    tokenizer.no_padding()
+    tokenizer.save(str(output_dir / ONNX_TOKENIZER_FILENAME))
+
+    return model_file
+
+
+def load_heldout_queries(path: Optional[Path] = None) -> List[str]:
+    """Queries from a text file (one per line) or the ground-truth question set."""
+    if path:
+        return [line.strip() for line in path.read_text().splitlines() if line.strip()]
+    test_file = project_root / "tests" / "ground_truth" / "test_questions.json"
+    with open(test_file) as f:
+        return [q['question'] for q in json.load(f)['questions']]
+
+
+def check_parity(
+    reference: LocalClassifierBase,
+    candidate: LocalClassifierBase,
+    queries: List[str],
+    batch_size: int = 32
+) -> Dict[str, float]:
+    """Compare two backends' probabilities on the same queries."""
+    expected = reference._forward_batch(queries, batch_size)
+    actual = candidate._forward_batch(queries, batch_size)
+
+    tool_agree = intent_agree = 0
+    max_tool_diff = max_intent_diff = 0.0
+    for (ref_tools, ref_intents), (tools, intents) in zip(expected, actual):
+        max_tool_diff = max(max_tool_diff, float(np.abs(ref_tools - tools).max()))
+        best_tool = reference.idx_to_tool[int(np.argmax(ref_tools))]
+        tool_agree += int(np.argmax(ref_tools) == np.argmax(tools))
+        intent_agree += int(np.argmax(ref_intents[best_tool]) == np.argmax(intents[best_tool]))
+        for tool in reference.tools:
+            max_intent_diff = max(max_intent_diff, float(np.abs(ref_intents[tool] - intents[tool]).max()))
+
+    return {
+        'queries': len(queries),
+        'tool_agreement': tool_agree / len(queries),
+        'intent_agreement': intent_agree / len(queries),
+        'max_tool_prob_diff': max_tool_diff,
+        'max_intent_prob_diff': max_intent_diff,
+    }
+
+
+def time_backend(classifier: LocalClassifierBase, queries: List[str]) -> float:
+    """Mean single-query latency in ms."""
+    classifier._forward_batch(queries[:1])
+    start = time.perf_counter()
+    for query in queries:
+        classifier._forward_batch([query])
+    return (time.perf_counter() - start) * 1000 / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the routing classifier to int8 ONNX")
+    parser.add_argument("--model-path", type=str, help="Model directory with joint_classifier.pt (default: from config)")
+    parser.add_argument("--output-dir", "-o", type=str, help=f"Output directory (default: <model-path>/{ONNX_SUBDIR})")
+    parser.add_argument("--queries", type=str, help="Held-out queries, one per line (default: ground-truth questions)")
+    parser.add_argument("--opset", type=int, default=17, help="ONNX opset version")
+    parser.add_argument("--no-quantize", action="store_true", help="Export FP32 without int8 quantization")
+    parser.add_argument("--min-agreement", type=float, default=0.98, help="Minimum tool and intent top-1 agreement")
+    parser.add_argument("--max-prob-diff", type=float, default=0.05, help="Maximum absolute tool probability difference")
+    args = parser.parse_args()
+
+    classifier = LocalClassifier(model_path=args.model_path, device='cpu', use_gazetteer=False)
+    output_dir = Path(args.output_dir) if args.output_dir else classifier.model_path / ONNX_SUBDIR
+
+    export_onnx(classifier, output_dir, opset=args.opset, quantize=not args.no_quantize)
+
+    onnx_classifier = OnnxLocalClassifier(
+        model_path=str(classifier.model_path), onnx_path=str(output_dir), use_gazetteer=False
+    )
+    queries = load_heldout_queries(Path(args.queries) if args.queries else None)
+    parity = check_parity(classifier, onnx_classifier, queries)
+
+    print(f"\nParity on {parity['queries']} held-out queries:")
+    print(f"  Tool agreement:        {parity['tool_agreement']:.1%}")
+    print(f"  Intent agreement:      {parity['intent_agreement']:.1%}")
+    print(f"  Max tool prob diff:    {parity['max_tool_prob_diff']:.4f}")
+    print(f"  Max intent prob diff:  {parity['max_intent_prob_diff']:.4f}")
+
+    sample = queries[:50]
+    print(f"\nLatency (single query): torch {time_backend(classifier, sample):.1f} ms | "
+          f"onnx {time_backend(onnx_classifier, sample):.1f} ms")
+
+    if (parity['tool_agreement'] < args.min_agreement
+            or parity['intent_agreement'] < args.min_agreement
+            or parity['max_tool_prob_diff'] > args.max_prob_diff):
+        print("\n❌ Parity check FAILED")
+        sys.exit(1)
+    print("\n✅ Parity check passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+"""
+Batch gazetteer entity extraction over NDJSON files.
+
+Reads one JSON value per line (an object with the query in --field, or a
+bare string), extracts entities with GazetteerEntityExtractor.extract_batch
+across worker processes, and writes each input object back out with an
+"entities" list (extract_simple format), in input order.
+
+Character/campaign names can be added with --entities, a JSON object of
+entity type -> list of names, e.g. {"CHARACTER": ["Duskryn Nightwarden"],
+"NPC": ["Ghul'Vor"]}.
+
+Usage:
+    uv run python -m scripts.extract_entities queries.ndjson -o entities.ndjson
+    uv run python -m scripts.extract_entities queries.ndjson -o entities.ndjson --workers 8
+    uv run python -m scripts.extract_entities logs.ndjson --field user_query --entities campaign_entities.json
+    cat queries.ndjson | uv run python -m scripts.extract_entities - > entities.ndjson
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Iterator, List
+
+# Standard project root setup
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config import get_config
+from src.classifiers.gazetteer_ner import GazetteerEntityExtractor
+
+
+def read_records(stream) -> Iterator[Any]:
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def record_text(record: Any, field: str) -> str:
+    if isinstance(record, str):
+        return record
+    return str(record.get(field) or "")
+
+
+def build_extractor(args) -> GazetteerEntityExtractor:
+    """Extractor over the SRD cache, plus optional dynamic entities."""
+    config = get_config()
+    extractor = GazetteerEntityExtractor(
+        project_root / config.local_classifier_srd_cache,
+        min_similarity=config.gazetteer_min_similarity
+    )
+
+    if args.entities:
+        with open(args.entities) as f:
+            for entity_type, names in json.load(f).items():
+                extractor.add_entities(names, entity_type)
+
+    return extractor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract gazetteer entities from an NDJSON file")
+    parser.add_argument("input", type=str, help="Input NDJSON file ('-' for stdin)")
+    parser.add_argument("--output", "-o", type=str, help="Output NDJSON file (default: stdout)")
+    parser.add_argument("--field", "-f", type=str, default="query",
+                        help="Field holding the text in object records (default: query)")
+    parser.add_argument("--workers", "-w", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunksize", type=int, default=256, help="Texts per worker task (default: 256)")
+    parser.add_argument("--entities", "-e", type=str,
+                        help="JSON file of entity type -> names to add (character, party, NPCs, ...)")
+    args = parser.parse_args()
+
+    # Keep stdout clean for NDJSON output; loader logging goes to stderr
+    with contextlib.redirect_stdout(sys.stderr):
+        extractor = build_extractor(args)
+
+    in_stream = sys.stdin if args.input == "-" else open(args.input)
+    out_stream = open(args.output, "w") if args.output else sys.stdout
+    records: List[Any] = list(read_records(in_stream))
+    if in_stream is not sys.stdin:
+        in_stream.close()
+
+    start = time.perf_counter()
+    texts = (record_text(record, args.field) for record in records)
+    results = extractor.extract_simple_batch(texts, workers=args.workers, chunksize=args.chunksize)
+    for record, entities in zip(records, results):
+        out = dict(record) if isinstance(record, dict) else {args.field: record}
+        out["entities"] = entities
+        out_stream.write(json.dumps(out) + "\n")
+    elapsed = time.perf_counter() - start
+
+    if out_stream is not sys.stdout:
+        out_stream.close()
+    print(f"[extract_entities] {len(records)} records in {elapsed:.2f}s with {args.workers} workers",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
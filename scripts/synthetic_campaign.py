@@ -0,0 +1,227 @@
+#!/usr/bin/env python
+"""
+Synthetic campaign generator for session notes benchmarks.
+
+Fabricates realistic SessionDocuments (NPCs, events, encounters, spells,
+quotes, raw sections, ...) so the session notes router can be exercised at
+campaign sizes far beyond the sample notes in knowledge_base/.
+
+Generation is deterministic for a given seed.
+
+Usage:
+    uv run python -m scripts.synthetic_campaign --sessions 100
+    uv run python -m scripts.synthetic_campaign --sessions 1000 --seed 7
+"""
+import argparse
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Standard project root setup
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from api.database.firestore_models import SessionDocument
+from src.rag.session_notes.campaign_session_notes_storage import CampaignSessionNotesStorage
+
+
+PLAYER_CHARACTERS = ["Duskryn Nightwarden", "Ilyana Brightwater", "Thorgar Ironfist", "Wren Ashdown", "Kael Morrow"]
+
+NPC_FIRST = ["Aldric", "Brenna", "Corvin", "Dalia", "Eamon", "Fenna", "Garrick", "Hesper", "Isolde", "Jorah",
+             "Kestrel", "Lysandra", "Marek", "Nerys", "Orin", "Perrin", "Quilla", "Rhogar", "Sabine", "Tamsin"]
+NPC_LAST = ["Blackthorn", "Vale", "Stormcrow", "Ashgrove", "Dunmere", "Holloway", "Kettleburn", "Marsh",
+            "Oakenshield", "Thistlewood"]
+NPC_ROLES = ["innkeeper", "high priest", "smuggler", "city guard captain", "sage", "cultist", "merchant",
+             "noble", "bounty hunter", "hermit"]
+
+LOCATIONS = ["Greywater Docks", "The Sunken Chapel", "Emberfall Keep", "Whispering Woods", "Saltmarsh",
+             "The Gilded Tankard", "Hollowspire", "Frostholm Pass", "Temple of Lathander", "The Underdark Gate",
+             "Ravencrest Manor", "Old Mill", "Shadowfen", "Crystal Caverns", "Market Square"]
+
+ITEMS = ["Eldaryth of Regret", "Staff of Frost", "Bag of Holding", "Cloak of Elvenkind", "Potion of Healing",
+         "Amulet of the Drowned", "Sending Stones", "Moonblade", "Ring of Protection", "Wand of Web",
+         "Ancient Map Fragment", "Silver Key", "Obsidian Idol"]
+
+ENEMIES = ["Goblin", "Ghoul", "Bandit Captain", "Owlbear", "Young Black Dragon", "Cultist", "Wight",
+           "Giant Spider", "Hobgoblin Warlord", "Mind Flayer", "Troll", "Wraith"]
+
+SPELLS = ["Fireball", "Healing Word", "Bless", "Shield", "Counterspell", "Misty Step", "Eldritch Blast",
+          "Guiding Bolt", "Hold Person", "Spirit Guardians", "Thunderwave", "Divine Smite"]
+
+DEITIES = ["Lathander", "Shar", "Tyr", "Selune", "Kelemvor", "Mystra"]
+
+FILLER = ("The party pressed on through the rain while rumors of the cult spread across the region. "
+          "Old debts resurfaced and alliances were tested as the night wore on. ")
+
+
+def _npc_pool(rng: random.Random, count: int = 60) -> List[Dict[str, Any]]:
+    npcs = []
+    seen = set()
+    while len(npcs) < count:
+        name = f"{rng.choice(NPC_FIRST)} {rng.choice(NPC_LAST)}"
+        if name in seen:
+            continue
+        seen.add(name)
+        npcs.append({
+            "name": name,
+            "entity_type": "npc",
+            "aliases": [name.split()[0], f"the {rng.choice(NPC_ROLES)}"],
+            "description": f"A {rng.choice(NPC_ROLES)} met near {rng.choice(LOCATIONS)}.",
+        })
+    return npcs
+
+
+def _sentence(rng: random.Random, names: List[str]) -> str:
+    return (f"{rng.choice(names)} {rng.choice(['confronted', 'helped', 'bargained with', 'followed', 'argued with'])} "
+            f"{rng.choice(names)} at {rng.choice(LOCATIONS)}.")
+
+
+def generate_session(rng: random.Random, campaign_id: str, number: int, npc_pool: List[Dict[str, Any]],
+                     start_date: datetime) -> SessionDocument:
+    """Fabricate one session document."""
+    npcs = rng.sample(npc_pool, rng.randint(3, 8))
+    npc_names = [n["name"] for n in npcs]
+    pcs = [{"name": name, "entity_type": "pc", "aliases": [name.split()[0]]} for name in PLAYER_CHARACTERS]
+    everyone = PLAYER_CHARACTERS + npc_names
+    locations = [{"name": loc, "entity_type": "location", "aliases": []}
+                 for loc in rng.sample(LOCATIONS, rng.randint(2, 4))]
+    items = [{"name": item, "entity_type": "item", "aliases": []} for item in rng.sample(ITEMS, rng.randint(1, 3))]
+
+    key_events = []
+    for i in range(rng.randint(4, 10)):
+        participants = rng.sample(everyone, rng.randint(1, 4))
+        key_events.append({
+            "description": _sentence(rng, participants),
+            "participants": [{"name": p} for p in participants],
+            "location": rng.choice(locations)["name"],
+            "session_number": number,
+            "order": i,
+        })
+
+    spells_used = []
+    for _ in range(rng.randint(2, 8)):
+        spells_used.append({
+            "name": rng.choice(SPELLS),
+            "caster": rng.choice(PLAYER_CHARACTERS),
+            "targets": rng.sample(everyone, rng.randint(1, 2)),
+            "effect": "Turned the tide of the fight.",
+        })
+
+    combat_encounters = []
+    for _ in range(rng.randint(0, 3)):
+        enemies = [{"name": e, "count": rng.randint(1, 4)} for e in rng.sample(ENEMIES, rng.randint(1, 3))]
+        combat_encounters.append({
+            "enemies": enemies,
+            "location": rng.choice(locations)["name"],
+            "damage_dealt": {pc.lower(): rng.randint(5, 60) for pc in rng.sample(PLAYER_CHARACTERS, 3)},
+            "damage_taken": {pc.lower(): rng.randint(0, 40) for pc in rng.sample(PLAYER_CHARACTERS, 3)},
+            "spells_used": [s["name"] for s in rng.sample(spells_used, min(2, len(spells_used)))],
+            "outcome": rng.choice(["victory", "retreat", "narrow victory"]),
+        })
+
+    quotes = [{
+        "speaker": rng.choice(everyone),
+        "quote": rng.choice(["We should not be here.", "I told you it was a trap!", "That joke was hilarious.",
+                             "For the dawn!", "Someone is following us."]),
+        "context": _sentence(rng, everyone),
+    } for _ in range(rng.randint(2, 6))]
+
+    statuses = {
+        pc: {
+            "hp": rng.randint(10, 90),
+            "is_alive": rng.random() > 0.02,
+            "conditions": rng.sample(["poisoned", "exhausted", "blessed", "cursed"], rng.randint(0, 2)),
+            "equipment_changes": [f"Gained {rng.choice(ITEMS)}"] if rng.random() < 0.3 else [],
+        }
+        for pc in PLAYER_CHARACTERS
+    }
+
+    raw_sections = {
+        "Summary": FILLER * rng.randint(3, 8) + " ".join(_sentence(rng, everyone) for _ in range(5)),
+        "NPCs": " ".join(f"{n['name']}: {n['description']}" for n in npcs),
+        "Combat": " ".join(_sentence(rng, everyone) for _ in range(rng.randint(3, 10))),
+        "Loot": ", ".join(i["name"] for i in items),
+    }
+
+    date = start_date + timedelta(days=7 * (number - 1))
+    return SessionDocument(
+        id=f"{campaign_id}-session-{number}",
+        campaign_id=campaign_id,
+        user_id="benchmark",
+        session_number=number,
+        session_name=f"Session {number}",
+        title=f"Session {number}: {rng.choice(['The', 'A'])} {rng.choice(['Return', 'Descent', 'Bargain', 'Siege'])}",
+        summary=FILLER + " ".join(_sentence(rng, everyone) for _ in range(4)),
+        player_characters=pcs,
+        npcs=npcs,
+        locations=locations,
+        items=items,
+        key_events=key_events,
+        combat_encounters=combat_encounters,
+        spells_abilities_used=spells_used,
+        character_decisions=[{
+            "character": rng.choice(PLAYER_CHARACTERS),
+            "decision": _sentence(rng, everyone),
+            "consequences": rng.choice(["The party lost trust.", "Opened a new path.", ""]),
+            "party_reaction": rng.choice(["approved", "", "divided"]),
+        } for _ in range(rng.randint(1, 4))],
+        character_statuses=statuses,
+        memories_visions=[{"character": rng.choice(PLAYER_CHARACTERS), "description": _sentence(rng, everyone)}
+                          for _ in range(rng.randint(0, 2))],
+        quest_updates=[{"quest": f"Find the {rng.choice(ITEMS)}", "status": rng.choice(["started", "progressed"])}],
+        loot_obtained={rng.choice(PLAYER_CHARACTERS): [i["name"] for i in items]},
+        deaths=[{"character": rng.choice(npc_names), "cause": "Fell in battle"}] if rng.random() < 0.1 else [],
+        revivals=[],
+        party_conflicts=[_sentence(rng, PLAYER_CHARACTERS)] if rng.random() < 0.5 else [],
+        party_bonds=[_sentence(rng, PLAYER_CHARACTERS)] if rng.random() < 0.5 else [],
+        quotes=quotes,
+        funny_moments=[f"{rng.choice(PLAYER_CHARACTERS)} tried to seduce a door."] if rng.random() < 0.3 else [],
+        puzzles_encountered={f"Riddle of {rng.choice(LOCATIONS)}": "Solved with a mirror"} if rng.random() < 0.2 else {},
+        mysteries_revealed=[f"Who stole the {rng.choice(ITEMS)}?"] if rng.random() < 0.2 else [],
+        unresolved_questions=[f"Who stole the {rng.choice(ITEMS)}?", f"Why is {rng.choice(npc_names)} lying?"],
+        divine_interventions=[f"{rng.choice(DEITIES)} answered a prayer."] if rng.random() < 0.1 else [],
+        religious_elements=[f"Shrine to {rng.choice(DEITIES)}"] if rng.random() < 0.2 else [],
+        rules_clarifications=["Ruled that readied spells hold concentration."] if rng.random() < 0.2 else [],
+        dice_rolls=[{"character": rng.choice(PLAYER_CHARACTERS), "roll": rng.randint(1, 20), "type": "attack"}
+                    for _ in range(rng.randint(0, 5))],
+        cliffhanger=_sentence(rng, everyone),
+        next_session_hook=f"Travel to {rng.choice(LOCATIONS)}.",
+        dm_notes=[f"Foreshadow {rng.choice(npc_names)}."],
+        raw_sections=raw_sections,
+        date=date,
+        created_at=date,
+        updated_at=date,
+    )
+
+
+def generate_campaign(num_sessions: int, seed: int = 42, campaign_id: str = "synthetic") -> CampaignSessionNotesStorage:
+    """Generate a campaign storage with `num_sessions` fabricated sessions."""
+    rng = random.Random(seed)
+    npc_pool = _npc_pool(rng)
+    start_date = datetime(2024, 1, 6)
+
+    storage = CampaignSessionNotesStorage(campaign_id=campaign_id)
+    for number in range(1, num_sessions + 1):
+        storage.add_session(generate_session(rng, campaign_id, number, npc_pool, start_date))
+    return storage
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic campaign and print its shape")
+    parser.add_argument("--sessions", "-n", type=int, default=100, help="Number of sessions (default: 100)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (default: 42)")
+    args = parser.parse_args()
+
+    storage = generate_campaign(args.sessions, seed=args.seed)
+    sessions = storage.get_sessions_sorted()
+    npcs = {n["name"] for s in sessions for n in s.npcs}
+    events = sum(len(s.key_events) for s in sessions)
+    raw_chars = sum(len(t) for s in sessions for t in s.raw_sections.values())
+    print(f"Generated {len(sessions)} sessions: {len(npcs)} distinct NPCs, {events} key events, "
+          f"{raw_chars:,} raw section characters")
+
+
+if __name__ == "__main__":
+    main()
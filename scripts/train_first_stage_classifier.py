@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+"""
+Train the first-stage cascade classifier from exported query logs.
+
+Pulls labeled query logs with QueryLogRepository.get_for_training_export
+(corrections plus confirmed-correct predictions), trains the hashed n-gram
+model over the routing classifier's label mappings, calibrates its
+temperatures on a held-out split, and reports how many held-out queries the
+cascade would answer at the confidence threshold and how accurate those
+answers are. The model is written to <model_path>/first_stage.npz, where
+LocalClassifier picks it up.
+
+Records are not marked as exported; that flag belongs to the transformer
+fine-tuning export.
+
+Usage:
+    uv run python -m scripts.train_first_stage_classifier
+    uv run python -m scripts.train_first_stage_classifier --corrections-only
+    uv run python -m scripts.train_first_stage_classifier --from-json export.json --threshold 0.85
+"""
+import argparse
+import asyncio
+import json
+import sys
+import zlib
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# Standard project root setup
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config import get_config
+from src.classifiers.first_stage import FIRST_STAGE_FILENAME, ClassifierCascade, HashedNgramClassifier
+
+Example = Tuple[str, str, str]  # (query, tool, intent)
+
+
+async def fetch_examples(corrections_only: bool = False) -> List[Example]:
+    """Training examples from the query logs in Firestore."""
+    from api.database.firestore_client import get_firestore_client
+    from api.database.repositories.feedback_repo import QueryLogRepository
+
+    repo = QueryLogRepository(get_firestore_client())
+    records = await repo.get_for_training_export(
+        include_corrections_only=corrections_only,
+        include_confirmed_correct=True,
+        unexported_only=False
+    )
+    print(f"Fetched {len(records)} labeled query logs")
+    return [
+        (example['query'], example['tool'], example['intent'])
+        for record in records
+        for example in record.to_training_example()
+    ]
+
+
+def load_examples_json(path: Path) -> List[Example]:
+    """Examples from a saved /api/feedback/export response (or its examples list)."""
+    with open(path) as f:
+        data = json.load(f)
+    examples = data['examples'] if isinstance(data, dict) else data
+    return [(e['query'], e['tool'], e['intent']) for e in examples]
+
+
+def load_label_mappings(model_path: Path) -> Tuple[List[str], Dict[str, List[str]]]:
+    """Tools and intents in the routing classifier's index order."""
+    with open(model_path / 'label_mappings.json') as f:
+        mappings = json.load(f)
+    idx_to_tool = {int(k): v for k, v in mappings['idx_to_tool'].items()}
+    tools = [idx_to_tool[i] for i in range(len(idx_to_tool))]
+    intents_per_tool = {}
+    for tool in tools:
+        idx_to_intent = {int(k): v for k, v in mappings['idx_to_intent_per_tool'][tool].items()}
+        intents_per_tool[tool] = [idx_to_intent[i] for i in range(len(idx_to_intent))]
+    return tools, intents_per_tool
+
+
+def split_examples(examples: List[Example], val_fraction: float) -> Tuple[List[Example], List[Example]]:
+    """Deterministic split by query, so every tool label of a query lands on the same side."""
+    train, val = [], []
+    for example in examples:
+        bucket = zlib.crc32(example[0].lower().encode('utf-8')) % 1000
+        (val if bucket < val_fraction * 1000 else train).append(example)
+    return train, val
+
+
+def evaluate(model: HashedNgramClassifier, examples: List[Example], threshold: float) -> Dict[str, float]:
+    """Top-1 accuracy overall, and coverage/accuracy of the answers the cascade would give."""
+    by_query: Dict[str, set] = {}
+    for query, tool, intent in examples:
+        by_query.setdefault(query, set()).add((tool, intent))
+    queries = list(by_query)
+    cascade = ClassifierCascade(model, threshold)
+
+    correct = answered = answered_correct = 0
+    for query, output in zip(queries, model.predict(queries)):
+        tool_probs, intent_probs = output
+        tool = model.tools[int(np.argmax(tool_probs))]
+        intent_index = int(np.argmax(intent_probs[tool]))
+        hit = (tool, model.intents_per_tool[tool][intent_index]) in by_query[query]
+        correct += hit
+        if cascade.accepts(query, output):
+            answered += 1
+            answered_correct += hit
+
+    return {
+        'queries': len(queries),
+        'accuracy': correct / len(queries) if queries else 0.0,
+        'coverage': answered / len(queries) if queries else 0.0,
+        'answered_accuracy': answered_correct / answered if answered else 0.0,
+    }
+
+
+def train_first_stage(
+    examples: List[Example],
+    tools: List[str],
+    intents_per_tool: Dict[str, List[str]],
+    val_fraction: float = 0.2,
+    epochs: int = 200,
+    n_features: int = 2 ** 15,
+) -> Tuple[HashedNgramClassifier, List[Example]]:
+    """Train on the train split and calibrate on the held-out split. Returns (model, held-out examples)."""
+    valid = [e for e in examples if e[1] in intents_per_tool and e[2] in intents_per_tool[e[1]]]
+    if len(valid) < len(examples):
+        print(f"Skipped {len(examples) - len(valid)} examples with labels not in the label mappings")
+
+    train, val = split_examples(valid, val_fraction)
+    if not train or not val:
+        raise ValueError(f"Not enough examples to train and calibrate ({len(train)} train, {len(val)} held out)")
+    print(f"Training on {len(train)} examples, calibrating on {len(val)}")
+
+    model = HashedNgramClassifier(tools, intents_per_tool, n_features=n_features)
+    model.fit(*zip(*train), epochs=epochs)
+    model.calibrate(*zip(*val))
+    return model, val
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the first-stage cascade classifier")
+    parser.add_argument("--model-path", type=str, help="Routing model directory (default: from config)")
+    parser.add_argument("--from-json", type=str, help="Use a saved training export instead of Firestore")
+    parser.add_argument("--corrections-only", action="store_true", help="Only use corrected query logs")
+    parser.add_argument("--val-fraction", type=float, default=0.2, help="Held-out fraction for calibration")
+    parser.add_argument("--epochs", type=int, default=200, help="Training epochs per head")
+    parser.add_argument("--threshold", type=float, help="Confidence threshold to report (default: from config)")
+    parser.add_argument("--output", "-o", type=str, help=f"Output file (default: <model-path>/{FIRST_STAGE_FILENAME})")
+    args = parser.parse_args()
+
+    config = get_config()
+    model_path = Path(args.model_path) if args.model_path else project_root / config.local_classifier_model_path
+    threshold = args.threshold if args.threshold is not None else config.local_classifier_cascade_threshold
+
+    if args.from_json:
+        examples = load_examples_json(Path(args.from_json))
+    else:
+        examples = asyncio.run(fetch_examples(args.corrections_only))
+    print(f"Loaded {len(examples)} training examples")
+
+    tools, intents_per_tool = load_label_mappings(model_path)
+    model, val = train_first_stage(examples, tools, intents_per_tool, args.val_fraction, args.epochs)
+
+    metrics = evaluate(model, val, threshold)
+    print(f"\nHeld-out ({metrics['queries']} queries):")
+    print(f"  Top-1 accuracy:              {metrics['accuracy']:.1%}")
+    print(f"  Answered at {threshold:.2f}:         {metrics['coverage']:.1%}")
+    print(f"  Accuracy of answered:        {metrics['answered_accuracy']:.1%}")
+    print(f"  Temperatures: " + ", ".join(f"{h}={t:.2f}" for h, t in model.temperatures.items()))
+
+    output = Path(args.output) if args.output else model_path / FIRST_STAGE_FILENAME
+    model.save(output)
+    print(f"\nSaved first-stage model to {output} ({output.stat().st_size / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
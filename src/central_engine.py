@@ -7,8 +7,11 @@ Optionally runs local classifier in parallel for comparison logging.
 """
 
 import asyncio
+import functools
+import hashlib
 import time
-from typing import Dict, List, Optional, Any, Union
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Any, Tuple, Union
 from dataclasses import dataclass, field
 from pathlib import Path
 
@@ -16,6 +19,7 @@ from pathlib import Path
 from .llm.llm_client import LLMClient, LLMClientFactory
 from .config import get_config
 from .llm.json_repair import JSONRepair
+from .llm.conversation_memory import ConversationMemory
 
 # Import query router types
 from .rag.character.character_query_router import CharacterQueryRouter, CharacterQueryResult
@@ -32,12 +36,19 @@ from .utils.entity_search_engine import EntitySearchEngine
 # Import query normalization for placeholder substitution
 from .utils.query_normalization import apply_entity_placeholders
 
+# Speculative retrieval while the LLM router is in flight
+from .rag.speculative_retrieval import SpeculativeRetrieval, predict_tools, submit_tracked
+
 # Import tool intentions from single source of truth
 from .rag.tool_intentions import get_fallback_intention
 
 # Import Gazetteer-based entity extraction
 from .classifiers.gazetteer_ner import GazetteerEntityExtractor, Entity
 
+# Routing decisions shared by the Haiku tool selector and the local classifier
+from .classifiers.base import ClassificationResult
+from .classifiers.routing_cache import get_routing_cache
+
 # ===== SINGLETON LOCAL CLASSIFIER =====
 # Shared across all CentralEngine instances to avoid repeated model loading
 _local_classifier_singleton: Optional[Any] = None
@@ -55,17 +66,24 @@ def get_local_classifier():
         return _local_classifier_singleton
     
     try:
-        from .classifiers.local_classifier import LocalClassifier
         config = get_config()
         
-        print("[LocalClassifier] Loading singleton instance...")
+        print(f"[LocalClassifier] Loading singleton instance ({config.local_classifier_backend} backend)...")
         start = time.time()
         
-        # LocalClassifier reads paths from config by default
-        _local_classifier_singleton = LocalClassifier(
-            device=config.local_classifier_device,
-            gazetteer_min_similarity=config.gazetteer_min_similarity
-        )
+        # Both backends read paths from config by default
+        if config.local_classifier_backend == "onnx":
+            # Int8 ONNX export (scripts/export_onnx_classifier.py); does not import torch
+            from .classifiers.onnx_classifier import OnnxLocalClassifier
+            _local_classifier_singleton = OnnxLocalClassifier(
+                gazetteer_min_similarity=config.gazetteer_min_similarity
+            )
+        else:
+            from .classifiers.local_classifier import LocalClassifier
+            _local_classifier_singleton = LocalClassifier(
+                device=config.local_classifier_device,
+                gazetteer_min_similarity=config.gazetteer_min_similarity
+            )
         
         elapsed = time.time() - start
         print(f"[LocalClassifier] Singleton loaded in {elapsed:.2f}s")
@@ -77,6 +95,74 @@ def get_local_classifier():
     return _local_classifier_singleton
 
 
+_classification_dispatcher_singleton: Optional[Any] = None
+
+
+def get_classification_dispatcher():
+    """Get or create the micro-batching dispatcher around the local classifier singleton.
+    
+    Returns None when the local classifier is unavailable.
+    """
+    global _classification_dispatcher_singleton
+    
+    if _classification_dispatcher_singleton is not None:
+        return _classification_dispatcher_singleton
+    
+    classifier = get_local_classifier()
+    if classifier is None:
+        return None
+    
+    from .classifiers.classification_dispatcher import ClassificationDispatcher
+    config = get_config()
+    _classification_dispatcher_singleton = ClassificationDispatcher(
+        classifier,
+        max_wait_ms=config.local_classifier_batch_wait_ms,
+        max_batch_size=config.local_classifier_max_batch_size
+    )
+    return _classification_dispatcher_singleton
+
+
+_rag_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_rag_executor() -> ThreadPoolExecutor:
+    """Get or create the bounded thread pool that runs RAG tool queries off the event loop."""
+    global _rag_executor
+    if _rag_executor is None:
+        _rag_executor = ThreadPoolExecutor(
+            max_workers=get_config().rag_max_workers,
+            thread_name_prefix="rag-query"
+        )
+    return _rag_executor
+
+
+_speculative_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_speculative_executor() -> ThreadPoolExecutor:
+    """Get or create the thread pool for speculative tool queries, kept apart from the routed queries' pool."""
+    global _speculative_executor
+    if _speculative_executor is None:
+        _speculative_executor = ThreadPoolExecutor(
+            max_workers=get_config().speculative_max_workers,
+            thread_name_prefix="rag-speculative"
+        )
+    return _speculative_executor
+
+
+async def await_tracked(job: Tuple[Future, Future], timeout: float) -> Any:
+    """
+    Wait for a job from submit_tracked(), timing out `timeout` seconds after a worker started it.
+    
+    Time spent queued behind other queries doesn't count against the timeout.
+    """
+    future, started = (asyncio.wrap_future(f) for f in job)
+    await asyncio.wait({future, started}, return_when=asyncio.FIRST_COMPLETED)
+    if started.done():
+        timeout -= time.time() - started.result()
+    return await asyncio.wait_for(future, max(timeout, 0))
+
+
 # ===== ROUTER OUTPUT DATACLASSES =====
 
 @dataclass
@@ -84,6 +170,7 @@ class ToolSelectorOutput:
     """Output from Tool & Intention Selector LLM call."""
     tools_needed: List[Dict[str, Any]] = field(default_factory=list)
     # Each tool dict: {"tool": "character_data", "intention": "combat_info", "confidence": 0.95}
+    cached: bool = False  # Served from the routing cache instead of an LLM call
 
 
 @dataclass
@@ -131,11 +218,25 @@ class CentralEngine:
         self.rulebook_router = RulebookQueryRouter(rulebook_storage) if rulebook_storage else None
         self.session_notes_router = SessionNotesQueryRouter(campaign_session_notes) if campaign_session_notes else None
 
-        # Conversation history tracking
-        self.conversation_history: List[Dict[str, str]] = []
+        # Conversation history tracking: recent turns plus a summary of older ones,
+        # within a token budget
+        self.conversation_memory = ConversationMemory(
+            token_budget=self.config.conversation_token_budget,
+            summary_tokens=self.config.conversation_summary_tokens,
+            max_turn_tokens=self.config.conversation_max_turn_tokens,
+            summarizer=self._summarize_conversation if self.config.conversation_summary_enabled else None
+        )
+
+        # Process-wide routing decisions, keyed on the normalized query. Off in "haiku"
+        # mode, which exists to collect fresh routing labels for training
+        self.routing_cache = (
+            get_routing_cache()
+            if self.config.routing_cache_enabled and self.config.routing_mode != "haiku" else None
+        )
 
         # Initialize local classifier if needed (for "local" or "comparison" routing modes)
         self.local_classifier = None
+        self.classification_dispatcher = None
         if self.config.routing_mode in ("local", "comparison"):
             self._init_local_classifier()
     
@@ -149,6 +250,8 @@ class CentralEngine:
                 print(f"[CentralEngine] SRD cache not found at {srd_cache_path}")
                 return None
             
+            # SRD entities are shared process-wide; only this engine's
+            # character/session entities live in the extractor's overlay
             extractor = GazetteerEntityExtractor(
                 cache_path=srd_cache_path,
                 min_similarity=self.config.gazetteer_min_similarity
@@ -179,6 +282,7 @@ class CentralEngine:
         """Initialize the local classifier using singleton pattern."""
         self.local_classifier = get_local_classifier()
         if self.local_classifier:
+            self.classification_dispatcher = get_classification_dispatcher()
             print("[CentralEngine] Using shared local classifier instance")
     
     @classmethod
@@ -195,25 +299,49 @@ class CentralEngine:
         llm_clients = LLMClientFactory.create_default_clients()
         return cls(llm_clients, prompt_manager, character, rulebook_storage, campaign_session_notes)
     
+    @property
+    def conversation_history(self) -> List[Dict[str, str]]:
+        """Budgeted conversation history: a summary exchange (if any) and the recent turns."""
+        return self.conversation_memory.get_history()
+    
     def add_conversation_turn(self, role: str, content: str):
         """Add a turn to the conversation history.
         
+        Older turns are folded into the running summary once the recent turns
+        outgrow the conversation token budget.
+        
         Args:
             role: Either "user" or "assistant"
             content: The message content
         """
-        self.conversation_history.append({
-            "role": role,
-            "content": content
-        })
+        self.conversation_memory.add_turn(role, content)
     
     def clear_conversation_history(self):
         """Clear all conversation history."""
-        self.conversation_history = []
+        self.conversation_memory.clear()
     
     def get_conversation_history(self) -> List[Dict[str, str]]:
         """Get the current conversation history."""
-        return self.conversation_history.copy()
+        return self.conversation_history
+    
+    async def _summarize_conversation(self, previous_summary: str, turns: List[Dict[str, str]]) -> str:
+        """Fold older conversation turns into the running summary with the router LLM."""
+        prompt = self.prompt_manager.get_conversation_summary_prompt(
+            previous_summary, turns, self.config.conversation_summary_tokens
+        )
+        provider = self.config.router_llm_provider
+        client = self.llm_clients.get(provider) or self.llm_clients.get("openai") or self.llm_clients.get("anthropic")
+        if not client:
+            raise RuntimeError("No suitable LLM client available for conversation summary")
+        
+        model = self.config.openai_router_model if provider == "openai" else self.config.anthropic_router_model if provider == "anthropic" else None
+        llm_params = self.config.get_router_llm_params(model)
+        start_time = time.time()
+        response = await client.generate_response(prompt, model=model, **llm_params)
+        if not response.success:
+            raise RuntimeError(response.error)
+        print(f"[ConversationMemory] Summarized {len(turns)} turns (⏱️ {(time.time() - start_time) * 1000:.0f}ms)")
+        return response.content
     
     async def process_query(self, user_query: str, character_name: str) -> str:
         """
@@ -250,20 +378,7 @@ class CentralEngine:
         # Step 3: Resolve entities across ALL tools (not just selected)
         # This ensures we find every bit of context that matches, regardless of classifier routing
         print(f"🔧 DEBUG: Step 3 - Resolving entities across ALL tools...")
-        all_tools = ['character_data', 'session_notes', 'rulebook']
-        entity_results = {}
-        if entity_extractor_output.entities:
-            entity_results = self.entity_search_engine.resolve_entities(
-                entities=entity_extractor_output.entities,
-                selected_tools=all_tools,  # Always search ALL tools
-                character=self.character,
-                session_notes_storage=self.campaign_session_notes,
-                rulebook_storage=self.rulebook_storage
-            )
-            print(f"🔧 DEBUG: Entity resolution found {len(entity_results)} entities")
-            print(f"🔧 DEBUG: Entity results detail: {entity_results}")
-        else:
-            print("🔧 DEBUG: No entities to resolve")
+        entity_results = self._resolve_entities(entity_extractor_output.entities)
         
         # Step 4: Distribute entities to RAG tools based on where they were found
         print(f"🔧 DEBUG: Step 4 - Distributing entities to RAG tools...")
@@ -354,15 +469,21 @@ class CentralEngine:
 
         local_classifier_result = None
         tool_selector_output = None
+        speculation = None
 
         if routing_mode == "local":
             # Local classifier only - fast, no API calls
             print("🧠 LOCAL CLASSIFIER ROUTING:")
             if self.local_classifier:
-                local_classifier_result = await self._run_local_classifier(normalized_query)
+                local_classifier_result = await self._run_local_classifier(
+                    normalized_query, entity_extractor_output.entities
+                )
                 if local_classifier_result:
                     tool_selector_output = ToolSelectorOutput(tools_needed=local_classifier_result.tools_needed)
-                    print(f"   ⏱️ {local_classifier_result.inference_time_ms:.1f}ms")
+                    stage = " [cache]" if local_classifier_result.cached else (
+                        f" [{local_classifier_result.cascade_stage}]" if local_classifier_result.cascade_stage else ""
+                    )
+                    print(f"   ⏱️ {local_classifier_result.inference_time_ms:.1f}ms{stage}")
                     for tool in local_classifier_result.tools_needed:
                         conf = tool.get('confidence', 0)
                         print(f"   - {tool['tool']}: {tool['intention']} ({conf:.1%})")
@@ -377,14 +498,21 @@ class CentralEngine:
             # Run BOTH classifiers in parallel - Haiku is primary, local for UI comparison
             print("🔧 DEBUG: Running Haiku + Local classifier in parallel")
             tasks = [self._call_tool_selector(normalized_query, character_name)]
+            local_task = None
             if self.local_classifier:
-                tasks.append(self._run_local_classifier(normalized_query))
+                local_task = asyncio.create_task(
+                    self._run_local_classifier(normalized_query, entity_extractor_output.entities)
+                )
+                tasks.append(local_task)
+            speculation = self._start_speculation(
+                user_query, normalized_query, entity_extractor_output.entities, local_task
+            )
 
             results = await asyncio.gather(*tasks)
             tool_selector_output = results[0]
             local_classifier_result = results[1] if len(results) > 1 else None
 
-            print(f"🤖 HAIKU ROUTING (PRIMARY):")
+            print(f"🤖 HAIKU ROUTING (PRIMARY){' [cache]' if tool_selector_output.cached else ''}:")
             for tool in tool_selector_output.tools_needed:
                 conf = tool.get('confidence', 0)
                 print(f"   - {tool['tool']}: {tool['intention']} ({conf:.1%})")
@@ -397,13 +525,19 @@ class CentralEngine:
 
         else:  # "haiku" (default)
             # Haiku only - for collecting training data
-            print("🤖 HAIKU ROUTING:")
+            speculation = self._start_speculation(user_query, normalized_query, entity_extractor_output.entities)
             tool_selector_output = await self._call_tool_selector(normalized_query, character_name)
+            print(f"🤖 HAIKU ROUTING{' [cache]' if tool_selector_output.cached else ''}:")
             for tool in tool_selector_output.tools_needed:
                 conf = tool.get('confidence', 0)
                 print(f"   - {tool['tool']}: {tool['intention']} ({conf:.1%})")
 
         timing['routing_and_entities'] = (time.time() - step1_start) * 1000  # Convert to ms
+        
+        # Stop speculating and wait for the entity resolution started during routing
+        if speculation:
+            speculation.mark_routed()
+            await speculation.task
 
         # Emit routing metadata
         if metadata_callback:
@@ -413,6 +547,10 @@ class CentralEngine:
             routing_metadata = {
                 'tools_needed': [dict(t) for t in tool_selector_output.tools_needed],
                 'classifier_backend': classifier_backend,
+                'routing_cache_hit': (
+                    local_classifier_result.cached if routing_mode == 'local' and local_classifier_result
+                    else tool_selector_output.cached
+                ),
                 'normalized_query': normalized_query,  # The placeholder-ized query
                 'extracted_entities': [
                     {
@@ -429,6 +567,9 @@ class CentralEngine:
             if local_classifier_result and routing_mode == "comparison":
                 routing_metadata['local_tools_needed'] = [dict(t) for t in local_classifier_result.tools_needed]
                 routing_metadata['local_inference_time_ms'] = local_classifier_result.inference_time_ms
+                if local_classifier_result.cascade_stage:
+                    routing_metadata['local_cascade_stage'] = local_classifier_result.cascade_stage
+                    routing_metadata['local_cascade_stats'] = local_classifier_result.cascade_stats
 
             await metadata_callback('routing_metadata', routing_metadata)
         
@@ -440,20 +581,11 @@ class CentralEngine:
         # This ensures we find every bit of context that matches, regardless of classifier routing
         print(f"🔧 DEBUG: Step 3 - Resolving entities across ALL tools...")
         step3_start = time.time()
-        all_tools = ['character_data', 'session_notes', 'rulebook']
-        entity_results = {}
-        if entity_extractor_output.entities:
-            entity_results = self.entity_search_engine.resolve_entities(
-                entities=entity_extractor_output.entities,
-                selected_tools=all_tools,  # Always search ALL tools
-                character=self.character,
-                session_notes_storage=self.campaign_session_notes,
-                rulebook_storage=self.rulebook_storage
-            )
-            print(f"🔧 DEBUG: Entity resolution found {len(entity_results)} entities")
-            print(f"🔧 DEBUG: Entity results detail: {entity_results}")
+        if speculation and speculation.entity_results is not None:
+            entity_results = speculation.entity_results
+            print(f"🔧 DEBUG: Entities resolved during routing ({speculation.entity_resolution_ms:.0f}ms)")
         else:
-            print("🔧 DEBUG: No entities to resolve")
+            entity_results = self._resolve_entities(entity_extractor_output.entities)
         
         # Step 4: Distribute entities to RAG tools based on where they were found
         print(f"🔧 DEBUG: Step 4 - Distributing entities to RAG tools...")
@@ -499,11 +631,14 @@ class CentralEngine:
         # Step 5: Execute RAG queries for selected tools
         print(f"🔧 DEBUG: Step 5 - Executing RAG queries...")
         step5_start = time.time()
+        tool_timings = {}
         raw_results = await self._execute_rag_queries(
             tool_selector_output.tools_needed,
             entity_distribution,
             entity_results,
-            user_query
+            user_query,
+            tool_timings=tool_timings,
+            speculation=speculation
         )
         timing['rag_queries'] = (time.time() - step5_start) * 1000
         
@@ -527,7 +662,8 @@ class CentralEngine:
         
         # Capture the full response as we stream it
         full_response = ""
-        async for chunk in self.generate_final_response_stream(raw_results, user_query):
+        context_stats = {}
+        async for chunk in self.generate_final_response_stream(raw_results, user_query, context_stats=context_stats):
             full_response += chunk
             yield chunk
         
@@ -536,7 +672,12 @@ class CentralEngine:
         
         # Emit performance metrics
         if metadata_callback:
-            await metadata_callback('performance_metrics', {'timing': timing})
+            performance = {'timing': timing, 'rag_tools': tool_timings}
+            if context_stats:
+                performance['context'] = context_stats
+            if speculation:
+                performance['speculation'] = speculation.summary()
+            await metadata_callback('performance_metrics', performance)
         
         # Emit response metadata for query logging
         if metadata_callback:
@@ -594,16 +735,29 @@ class CentralEngine:
         except Exception as e:
             return f"Error generating final response: {str(e)}"
     
-    async def generate_final_response_stream(self, raw_results: Dict[str, Any], user_query: str):
+    async def generate_final_response_stream(
+        self,
+        raw_results: Dict[str, Any],
+        user_query: str,
+        context_stats: Optional[Dict[str, Any]] = None
+    ):
         """
         Get final response prompt from Prompt Manager and stream the LLM response.
         Yields response chunks as they arrive.
         
+        Args:
+            context_stats: If given, filled with the prompt context's token counts
+        
         Yields:
             str: Chunks of the response as they are generated
         """
         # Get final response prompt from Prompt Manager/Context Assembler
-        final_prompt = self.prompt_manager.get_final_response_prompt(raw_results, user_query)
+        final_prompt, prompt_stats = self.prompt_manager.build_final_response_prompt(raw_results, user_query)
+        print(f"📦 DEBUG: Final prompt context: {prompt_stats['total_tokens']} of "
+              f"{prompt_stats['candidate_tokens']} candidate tokens, "
+              f"{prompt_stats['deduplicated_blocks']} duplicate blocks dropped")
+        if context_stats is not None:
+            context_stats.update(prompt_stats)
         
         try:
             # Use configured final response provider
@@ -651,6 +805,9 @@ class CentralEngine:
         """
         start_time = time.time()
         try:
+            provider = self.config.router_llm_provider
+            model = self.config.openai_router_model if provider == "openai" else self.config.anthropic_router_model if provider == "anthropic" else None
+            
             history = self.conversation_history[:-1] if len(self.conversation_history) > 0 else []
             
             prompt = self.prompt_manager.get_tool_and_intention_selector_prompt(
@@ -660,13 +817,23 @@ class CentralEngine:
                 conversation_history=history
             )
             
-            provider = self.config.router_llm_provider
+            # Repeated normalized queries reuse the decision instead of another API call.
+            # Follow-ups depend on the conversation, so only first turns are cached, and
+            # the key covers the whole prompt (character name and inventory included).
+            use_cache = self.routing_cache is not None and not history
+            if use_cache:
+                prompt_digest = hashlib.sha1(prompt.encode('utf-8')).hexdigest()[:16]
+                model_version = f"{provider}:{model}:{prompt_digest}"
+                cached = self.routing_cache.get('llm', user_query, model_version)
+                if cached:
+                    print(f"🔍 TOOL SELECTOR CACHE HIT (⏱️ {(time.time() - start_time) * 1000:.1f}ms)")
+                    return ToolSelectorOutput(tools_needed=cached['tools_needed'], cached=True)
+            
             client = self.llm_clients.get(provider) or self.llm_clients.get("openai") or self.llm_clients.get("anthropic")
             
             if not client:
                 raise RuntimeError("No suitable LLM client available for tool selector")
             
-            model = self.config.openai_router_model if provider == "openai" else self.config.anthropic_router_model if provider == "anthropic" else None
             llm_params = self.config.get_router_llm_params(model)
             
             response = await client.generate_json_response(prompt, model=model, **llm_params)
@@ -690,7 +857,11 @@ class CentralEngine:
                 for detail in repair_result.repair_details:
                     print(f"   • {detail}")
             
-            return ToolSelectorOutput(tools_needed=repair_result.data.get("tools_needed", []))
+            tools_needed = repair_result.data.get("tools_needed", [])
+            if use_cache and tools_needed:
+                self.routing_cache.put('llm', user_query, model_version, {'tools_needed': tools_needed}, elapsed_ms)
+            
+            return ToolSelectorOutput(tools_needed=tools_needed)
             
         except Exception as e:
             raise RuntimeError(f"Tool selector LLM call failed: {str(e)}") from e
@@ -734,13 +905,22 @@ class CentralEngine:
         
         return EntityExtractorOutput(entities=entities)
     
-    async def _run_local_classifier(self, user_query: str) -> Optional[Any]:
+    async def _run_local_classifier(
+        self,
+        user_query: str,
+        entities: Optional[List[Dict[str, Any]]] = None
+    ) -> Optional[Any]:
         """
         Run local classifier for comparison logging.
         Returns ClassificationResult or None if local classifier not available.
         
         Passes character name and known names for placeholder normalization.
         The model was trained on {CHARACTER}, {PARTY_MEMBER}, {NPC} placeholders.
+        
+        Args:
+            user_query: Normalized query to classify
+            entities: Gazetteer entities the pipeline already extracted from the
+                original query. When given, the classifier skips its own extraction.
         """
         if not self.local_classifier:
             return None
@@ -765,20 +945,44 @@ class CentralEngine:
             # Extract known NPCs from session notes entities
             known_npcs = self._extract_known_npcs()
             
-            # Get classification result
-            result = await self.local_classifier.classify(
+            # Key on the text the model would see, so a repeated normalized query
+            # skips inference entirely
+            start_time = time.time()
+            model_version = f"{self.local_classifier.model_version}:{self.config.local_classifier_tool_threshold}"
+            if self.routing_cache is not None:
+                classifier_query = self.local_classifier.normalize_query(
+                    user_query, character_name, character_aliases, party_members, known_npcs
+                )
+                cached = self.routing_cache.get('local', classifier_query, model_version)
+                if cached:
+                    return ClassificationResult(
+                        tools_needed=cached['tools_needed'],
+                        tool_confidences=cached['tool_confidences'],
+                        entities=list(entities or []),
+                        backend='local',
+                        inference_time_ms=(time.time() - start_time) * 1000,
+                        cached=True
+                    )
+            
+            # Get classification result (batched with other connections' queries
+            # off the event loop)
+            classifier = self.classification_dispatcher or self.local_classifier
+            result = await classifier.classify(
                 user_query,
                 character_name=character_name,
                 character_aliases=character_aliases,
                 conversation_history=self.conversation_history,
                 party_members=party_members,
-                known_npcs=known_npcs
+                known_npcs=known_npcs,
+                entities=entities
             )
             
-            # Use gazetteer entities for comparison (same as main pipeline)
-            if result and self.entity_extractor:
-                gazetteer_output = self._extract_entities_gazetteer(user_query)
-                result.entities = gazetteer_output.entities
+            if self.routing_cache is not None:
+                self.routing_cache.put(
+                    'local', classifier_query, model_version,
+                    {'tools_needed': result.tools_needed, 'tool_confidences': result.tool_confidences},
+                    result.inference_time_ms
+                )
             
             return result
         except Exception as e:
@@ -1075,18 +1279,22 @@ class CentralEngine:
         print(f"🔍 DEBUG: Final context_sources = {context_sources}")
         return context_sources
     
-    async def _execute_rag_queries(
+    def _build_rag_queries(
         self,
         tools_needed: List[Dict[str, Any]],
         entity_distribution: Dict[str, List[str]],
         entity_results: Dict[str, List[Any]],
         user_query: str
-    ) -> Dict[str, Any]:
+    ) -> Dict[str, Tuple[tuple, Any, float]]:
         """
-        Execute RAG queries for selected tools with distributed entities.
-        Includes auto-include sections derived from entity resolution results.
+        Prepare the tool queries for the selected tools.
+        
+        Returns:
+            Dict of result key -> (signature, call, timeout). Two queries with the
+            same signature return the same results, which is what lets speculative
+            queries stand in for routed ones.
         """
-        results = {}
+        queries = {}
         
         for tool_info in tools_needed:
             tool = tool_info["tool"]
@@ -1097,50 +1305,191 @@ class CentralEngine:
             auto_include_sections = self._extract_auto_include_sections(
                 entities, entity_results, tool
             )
+            signature = (tool, intention, tuple(entities), tuple(auto_include_sections))
             
             print(f"🔧 DEBUG: Executing {tool} with intention='{intention}', entities={entities}")
             if auto_include_sections:
                 print(f"🔧 DEBUG: Auto-include sections: {auto_include_sections}")
             
             if tool == "character_data" and self.character_router:
-                results["character"] = self.character_router.query_character(
+                queries["character"] = (signature, functools.partial(
+                    self.character_router.query_character,
                     user_intentions=[intention],
                     entities=[{"name": e, "confidence": 1.0} for e in entities],
                     auto_include_sections=auto_include_sections
-                )
+                ), self.config.rag_character_timeout_seconds)
                 
             elif tool == "session_notes" and self.session_notes_router:
-                results["session_notes"] = self.session_notes_router.query(
+                queries["session_notes"] = (signature, functools.partial(
+                    self.session_notes_router.query,
                     character_name=self.character.character_base.name if self.character else "",
                     original_query=user_query,
                     intention=intention,
                     entities=[{"name": e} for e in entities],
                     context_hints=[],
                     top_k=self.config.max_results
-                )
+                ), self.config.rag_session_notes_timeout_seconds)
                 
             elif tool == "rulebook" and self.rulebook_router:
                 try:
                     intention_enum = RulebookQueryIntent(intention.lower())
-                    results["rulebook"] = self.rulebook_router.query(
-                        intention=intention_enum,
-                        user_query=user_query,
-                        entities=entities,
-                        context_hints=[],
-                        k=self.config.max_results
-                    )
                 except ValueError:
                     print(f"🔧 WARNING: Invalid rulebook intention '{intention}', skipping")
+                    continue
+                queries["rulebook"] = (signature, functools.partial(
+                    self.rulebook_router.query,
+                    intention=intention_enum,
+                    user_query=user_query,
+                    entities=entities,
+                    context_hints=[],
+                    k=self.config.max_results
+                ), self.config.rag_rulebook_timeout_seconds)
+        
+        return queries
+    
+    async def _execute_rag_queries(
+        self,
+        tools_needed: List[Dict[str, Any]],
+        entity_distribution: Dict[str, List[str]],
+        entity_results: Dict[str, List[Any]],
+        user_query: str,
+        tool_timings: Optional[Dict[str, Dict[str, Any]]] = None,
+        speculation: Optional[SpeculativeRetrieval] = None
+    ) -> Dict[str, Any]:
+        """
+        Execute RAG queries for selected tools with distributed entities.
+        Includes auto-include sections derived from entity resolution results.
+        
+        Tool queries run concurrently on the shared RAG executor, each with its own
+        timeout counted from when a worker starts it. A tool that fails or times
+        out is left out of the results and the rest are still returned.
+        
+        Args:
+            tool_timings: Optional dict filled with {result_key: {"time_ms", "status"}}
+                          per tool query ("ok", "timeout" or "error")
+            speculation: Speculative queries started during routing; matching ones
+                         are awaited instead of re-run, the rest are discarded
+        """
+        queries = self._build_rag_queries(tools_needed, entity_distribution, entity_results, user_query)
+        
+        executor = get_rag_executor()
+        
+        # Claim matching speculative queries before dropping the rest
+        speculative = {}
+        if speculation:
+            for key, (signature, _, _) in queries.items():
+                speculative[key] = speculation.take(key, signature)
+            speculation.discard()
+        
+        async def run_query(key: str, call, timeout: float):
+            query_start = time.time()
+            result, status = None, "ok"
+            try:
+                result = await await_tracked(speculative.get(key) or submit_tracked(executor, call), timeout)
+            except asyncio.TimeoutError:
+                # The worker thread finishes in the background; its result is dropped
+                status = "timeout"
+                print(f"⚠️ RAG {key} query timed out after {timeout:.1f}s, continuing without it")
+            except Exception as e:
+                status = "error"
+                print(f"⚠️ RAG {key} query failed, continuing without it: {e}")
+            return key, result, status, (time.time() - query_start) * 1000, speculative.get(key) is not None
+        
+        pending = asyncio.gather(*(run_query(key, call, timeout) for key, (_, call, timeout) in queries.items()))
         
         # Step 2: Add entity-based context (independent of intentions)
-        # This retrieves raw context for ALL entities found, regardless of intention routing
+        # This retrieves raw context for ALL entities found, regardless of intention routing.
+        # Plain lookups, so it runs on the loop while the tool queries are in flight
         entity_context = self._retrieve_entity_context(entity_results)
+        
+        results = {}
+        for key, result, status, elapsed_ms, was_speculative in await pending:
+            print(f"🔧 DEBUG: RAG {key} query {status} (⏱️ {elapsed_ms:.0f}ms{', speculative' if was_speculative else ''})")
+            if tool_timings is not None:
+                tool_timings[key] = {"time_ms": elapsed_ms, "status": status, "speculative": was_speculative}
+            if result is not None:
+                results[key] = result
+        
         if entity_context:
             results["entity_context"] = entity_context
             print(f"🔧 DEBUG: Added entity context for {len(entity_context)} entities")
         
         return results
     
+    def _start_speculation(
+        self,
+        user_query: str,
+        normalized_query: str,
+        entities: List[Dict[str, Any]],
+        local_task: Optional[asyncio.Task] = None
+    ) -> Optional[SpeculativeRetrieval]:
+        """
+        Start entity resolution and the likely tool queries while the LLM router runs.
+        
+        Args:
+            local_task: The local classifier running alongside the router, whose
+                        decision is used as the prediction when available
+        """
+        if not self.config.speculative_retrieval_enabled:
+            return None
+        speculation = SpeculativeRetrieval()
+        speculation.task = asyncio.create_task(
+            self._run_speculation(speculation, user_query, normalized_query, entities, local_task)
+        )
+        return speculation
+    
+    async def _run_speculation(
+        self,
+        speculation: SpeculativeRetrieval,
+        user_query: str,
+        normalized_query: str,
+        entities: List[Dict[str, Any]],
+        local_task: Optional[asyncio.Task]
+    ) -> None:
+        """Resolve entities off the loop, then launch predicted queries unless routing already finished."""
+        loop = asyncio.get_running_loop()
+        executor = get_rag_executor()
+        try:
+            resolve_start = time.time()
+            speculation.entity_results = await loop.run_in_executor(
+                executor, self._resolve_entities, entities
+            )
+            speculation.entity_resolution_ms = (time.time() - resolve_start) * 1000
+            
+            classifier_tools = None
+            if local_task is not None:
+                local_result = await local_task
+                classifier_tools = local_result.tools_needed if local_result else None
+            if speculation.routed:
+                return
+            
+            entity_distribution = self._distribute_entities_to_rag_queries(speculation.entity_results, [])
+            predicted = predict_tools(
+                normalized_query, entities, entity_distribution, classifier_tools,
+                max_queries=self.config.speculative_max_queries
+            )
+            queries = self._build_rag_queries(predicted, entity_distribution, speculation.entity_results, user_query)
+            for key, (signature, call, _) in queries.items():
+                speculation.launch(key, signature, call, get_speculative_executor())
+        except Exception as e:
+            print(f"⚠️ Speculative retrieval failed: {e}")
+    
+    def _resolve_entities(self, entities: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
+        """Resolve entities across ALL tools (not just selected)."""
+        if not entities:
+            print("🔧 DEBUG: No entities to resolve")
+            return {}
+        entity_results = self.entity_search_engine.resolve_entities(
+            entities=entities,
+            selected_tools=['character_data', 'session_notes', 'rulebook'],  # Always search ALL tools
+            character=self.character,
+            session_notes_storage=self.campaign_session_notes,
+            rulebook_storage=self.rulebook_storage
+        )
+        print(f"🔧 DEBUG: Entity resolution found {len(entity_results)} entities")
+        print(f"🔧 DEBUG: Entity results detail: {entity_results}")
+        return entity_results
+    
     def _retrieve_entity_context(
         self,
         entity_results: Dict[str, List[Any]]
@@ -1201,12 +1550,11 @@ class CentralEngine:
         return entity_context
     
     def _get_session_notes_entity_context(self, entity_name: str, section: str) -> Optional[str]:
-        """Get raw session notes context for an entity by searching all sessions."""
+        """Get raw session notes context for an entity from every session that mentions it."""
         if not self.campaign_session_notes:
             return None
 
         entity_lower = entity_name.lower()
-        context_parts = []
 
         # Map section types to raw_sections keys
         section_key = section.split('.')[-1] if '.' in section else section.replace('session_notes_', '')
@@ -1222,52 +1570,8 @@ class CentralEngine:
         }
         raw_section_key = section_key_map.get(section_key, 'Summary')
 
-        # Search through all sessions for entity mentions
-        for session in self.campaign_session_notes.get_sessions_sorted():
-            session_num = session.session_number
-
-            # Check if entity appears in this session's entity lists
-            entity_found = self._session_has_entity(session, entity_lower)
-
-            # Also check raw_sections for entity mention
-            raw_sections = session.raw_sections or {}
-            section_content = raw_sections.get(raw_section_key, '')
-
-            if entity_found or (section_content and entity_lower in section_content.lower()):
-                if section_content and entity_lower in section_content.lower():
-                    context_parts.append(f"Session {session_num} - {raw_section_key}:\n{section_content}")
-                elif entity_found and session.summary and entity_lower in session.summary.lower():
-                    # Fallback to summary if entity found but not in specific section
-                    context_parts.append(f"Session {session_num} - Summary:\n{session.summary}")
-
-        return "\n\n".join(context_parts) if context_parts else None
-
-    def _session_has_entity(self, session, entity_lower: str) -> bool:
-        """Check if a session contains references to an entity in its entity lists."""
-        all_entities = (
-            (session.player_characters or []) +
-            (session.npcs or []) +
-            (session.locations or []) +
-            (session.items or [])
-        )
-
-        for entity in all_entities:
-            if not isinstance(entity, dict):
-                continue
-
-            # Check name
-            name = entity.get('name', '').lower()
-            if entity_lower in name or name in entity_lower:
-                return True
-
-            # Check aliases
-            aliases = entity.get('aliases', [])
-            for alias in aliases:
-                alias_lower = alias.lower() if isinstance(alias, str) else ''
-                if entity_lower in alias_lower or alias_lower in entity_lower:
-                    return True
-
-        return False
+        # Sessions mentioning the entity, from the campaign entity index
+        return self.campaign_session_notes.get_entity_index().entity_context(entity_lower, raw_section_key)
     
     def _get_character_entity_context(self, entity_name: str, section: str) -> Optional[str]:
         """Get raw character data context for an entity."""
@@ -6,6 +6,7 @@ that can be used interchangeably via the ClassifierBackend protocol.
 
 LocalClassifier requires torch and is imported lazily to avoid import
 errors in environments where torch is not installed (e.g., Docker API container).
+OnnxLocalClassifier serves the int8 ONNX export with onnxruntime instead.
 """
 
 from .base import ClassifierBackend, ClassificationResult
@@ -16,8 +17,14 @@ def get_local_classifier():
     from .local_classifier import LocalClassifier
     return LocalClassifier
 
+def get_onnx_classifier():
+    """Get OnnxLocalClassifier class (requires onnxruntime, not torch)."""
+    from .onnx_classifier import OnnxLocalClassifier
+    return OnnxLocalClassifier
+
 __all__ = [
     'ClassifierBackend',
     'ClassificationResult', 
     'get_local_classifier',
+    'get_onnx_classifier',
 ]
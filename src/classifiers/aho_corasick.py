@@ -0,0 +1,94 @@
+"""
+Aho-Corasick multi-pattern string matcher.
+
+Finds every occurrence of every pattern in a text in a single pass, so the
+cost of exact gazetteer matching depends on the length of the query and the
+number of hits, not on the number of known entity names.
+"""
+
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+
+class AhoCorasick:
+    """
+    Immutable Aho-Corasick automaton over a fixed set of patterns.
+
+    Patterns are matched case-sensitively; callers lowercase both the
+    patterns and the text for case-insensitive matching.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]   # Pattern ids ending exactly at a node
+        self._dict_link: List[int] = [-1]   # Nearest suffix node that has outputs
+
+        seen = set()
+        for pattern in patterns:
+            if not pattern or pattern in seen:
+                continue
+            seen.add(pattern)
+            self._insert(pattern, len(self.patterns))
+            self.patterns.append(pattern)
+
+        self._build_links()
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def _insert(self, pattern: str, pattern_id: int) -> None:
+        node = 0
+        for char in pattern:
+            nxt = self._goto[node].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._dict_link.append(-1)
+            node = nxt
+        self._out[node].append(pattern_id)
+
+    def _build_links(self) -> None:
+        """Breadth-first construction of failure and output (dictionary) links."""
+        queue: List[int] = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                fail_node = self._fail[child]
+                self._dict_link[child] = fail_node if self._out[fail_node] else self._dict_link[fail_node]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """
+        Yield (start, end, pattern) for every occurrence, including overlapping ones.
+
+        Matches are produced in order of their end position.
+        """
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        dict_link = self._dict_link
+        patterns = self.patterns
+
+        node = 0
+        for i, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+
+            hit = node if out[node] else dict_link[node]
+            while hit > 0:
+                for pattern_id in out[hit]:
+                    pattern = patterns[pattern_id]
+                    yield i + 1 - len(pattern), i + 1, pattern
+                hit = dict_link[hit]
@@ -26,6 +26,13 @@ class ClassificationResult:
     # Metadata
     backend: str = "unknown"  # "llm" or "local"
     inference_time_ms: float = 0.0
+    
+    cached: bool = False  # Served from the routing cache (no inference ran)
+    
+    # Classifier cascade (local backend with a trained first stage)
+    cascade_stage: Optional[str] = None  # "first_stage" or "transformer"
+    cascade_stats: Dict[str, Any] = field(default_factory=dict)
+    # Format: {"first_stage_hit_rate": 0.62, "sampled_agreement": 0.97, ...} (process totals)
 
 
 class ClassifierBackend(Protocol):
@@ -0,0 +1,232 @@
+"""
+Classification Dispatcher
+
+Async front end for the shared LocalClassifier. Requests from every
+connection in the process are queued; a dedicated worker thread waits a few
+milliseconds for more requests to arrive, classifies the whole batch with one
+batched forward pass, and resolves each caller's future on its own event loop.
+
+The event loop never runs model inference, and N concurrent chats cost about
+one forward pass instead of N queued ones. Each query is normalized with its
+own character/party/NPC names, so requests from different campaigns batch
+together.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional
+
+from .base import ClassificationResult
+
+
+@dataclass
+class _PendingRequest:
+    """A queued classification request."""
+    query: str
+    normalized_query: str
+    entities: Optional[List[Dict[str, Any]]]
+    future: asyncio.Future
+    loop: asyncio.AbstractEventLoop
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+@dataclass
+class DispatcherStats:
+    """Queue and batching metrics for a ClassificationDispatcher."""
+    requests: int = 0
+    batches: int = 0
+    errors: int = 0
+    queue_depth: int = 0                  # Requests waiting right now
+    max_queue_depth: int = 0
+    max_batch_size: int = 0
+    batch_sizes: Dict[int, int] = field(default_factory=dict)  # Batch size -> number of batches
+    total_wait_ms: float = 0.0            # Enqueue -> batch start, summed over requests
+    total_inference_ms: float = 0.0       # Summed over batches
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'requests': self.requests,
+            'batches': self.batches,
+            'errors': self.errors,
+            'queue_depth': self.queue_depth,
+            'max_queue_depth': self.max_queue_depth,
+            'max_batch_size': self.max_batch_size,
+            'avg_batch_size': self.requests / self.batches if self.batches else 0.0,
+            'batch_sizes': dict(sorted(self.batch_sizes.items())),
+            'avg_wait_ms': self.total_wait_ms / self.requests if self.requests else 0.0,
+            'avg_inference_ms': self.total_inference_ms / self.batches if self.batches else 0.0,
+        }
+
+
+class ClassificationDispatcher:
+    """
+    Micro-batching async wrapper around a LocalClassifier.
+
+    classify() has the ClassifierBackend signature, so it can stand in for
+    LocalClassifier.classify(). The worker thread starts on first use.
+    """
+
+    def __init__(self, classifier, max_wait_ms: float = 5.0, max_batch_size: int = 32):
+        """
+        Args:
+            classifier: LocalClassifier (anything with normalize_query and predict_normalized)
+            max_wait_ms: How long the worker waits for more requests after the first one
+            max_batch_size: Maximum requests per forward pass
+        """
+        self.classifier = classifier
+        self.max_wait_ms = max_wait_ms
+        self.max_batch_size = max(1, max_batch_size)
+        self.stats = DispatcherStats()
+
+        self._queue: Deque[_PendingRequest] = deque()
+        self._condition = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+        self._closed = False
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Current queue and batching metrics."""
+        with self._condition:
+            self.stats.queue_depth = len(self._queue)
+            return self.stats.to_dict()
+
+    async def classify(
+        self,
+        query: str,
+        character_name: Optional[str] = None,
+        character_aliases: Optional[List[str]] = None,
+        conversation_history: Optional[List[Dict[str, str]]] = None,
+        party_members: Optional[List[str]] = None,
+        known_npcs: Optional[List[str]] = None,
+        entities: Optional[List[Dict[str, Any]]] = None
+    ) -> ClassificationResult:
+        """
+        Classify a query in the next batch.
+
+        Args:
+            query: The user's query text
+            character_name: Optional character name for normalization
+            character_aliases: Optional list of character aliases/nicknames
+            conversation_history: Optional prior conversation (not used by local model)
+            party_members: Optional list of party member names
+            known_npcs: Optional list of known NPC names
+            entities: Optional entities already extracted for this query
+
+        Returns:
+            ClassificationResult with tools, intents, and entities
+        """
+        loop = asyncio.get_running_loop()
+        normalized_query = self.classifier.normalize_query(
+            query, character_name, character_aliases, party_members, known_npcs
+        )
+        request = _PendingRequest(
+            query=query,
+            normalized_query=normalized_query,
+            entities=entities,
+            future=loop.create_future(),
+            loop=loop
+        )
+
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("ClassificationDispatcher is closed")
+            self._ensure_worker()
+            self._queue.append(request)
+            self.stats.max_queue_depth = max(self.stats.max_queue_depth, len(self._queue))
+            self._condition.notify()
+
+        return await request.future
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Stop the worker after it drains the queue."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            worker = self._worker
+        if worker is not None:
+            worker.join(timeout)
+
+    # ===== WORKER =====
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(
+                target=self._run, name="classification-dispatcher", daemon=True
+            )
+            self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            self._process(batch)
+
+    def _next_batch(self) -> Optional[List[_PendingRequest]]:
+        """Wait for a request, then up to max_wait_ms for the batch to fill."""
+        with self._condition:
+            while not self._queue:
+                if self._closed:
+                    return None
+                self._condition.wait()
+
+            deadline = time.perf_counter() + self.max_wait_ms / 1000
+            while len(self._queue) < self.max_batch_size and not self._closed:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+
+            size = min(len(self._queue), self.max_batch_size)
+            return [self._queue.popleft() for _ in range(size)]
+
+    def _process(self, batch: List[_PendingRequest]) -> None:
+        start = time.perf_counter()
+        try:
+            results = self.classifier.predict_normalized(
+                [r.query for r in batch],
+                [r.normalized_query for r in batch],
+                entities=[r.entities for r in batch],
+                batch_size=self.max_batch_size
+            )
+        except Exception as e:
+            print(f"[ClassificationDispatcher] Batch of {len(batch)} failed: {e}")
+            with self._condition:
+                self.stats.errors += 1
+            for request in batch:
+                self._resolve(request, exception=e)
+            return
+
+        inference_ms = (time.perf_counter() - start) * 1000
+        with self._condition:
+            stats = self.stats
+            stats.requests += len(batch)
+            stats.batches += 1
+            stats.max_batch_size = max(stats.max_batch_size, len(batch))
+            stats.batch_sizes[len(batch)] = stats.batch_sizes.get(len(batch), 0) + 1
+            stats.total_wait_ms += sum((start - r.enqueued_at) * 1000 for r in batch)
+            stats.total_inference_ms += inference_ms
+
+        for request, result in zip(batch, results):
+            self._resolve(request, result=result)
+
+    @staticmethod
+    def _resolve(request: _PendingRequest, result=None, exception: Optional[BaseException] = None) -> None:
+        def resolve() -> None:
+            if request.future.done():  # Caller was cancelled
+                return
+            if exception is not None:
+                request.future.set_exception(exception)
+            else:
+                request.future.set_result(result)
+
+        try:
+            request.loop.call_soon_threadsafe(resolve)
+        except RuntimeError:
+            pass  # Caller's event loop already closed
@@ -0,0 +1,377 @@
+"""
+First-Stage Classifier Cascade
+
+A tiny hashed n-gram linear model that answers routine routing queries
+("what's my AC", "how many spell slots do I have") without a transformer
+forward pass, and defers everything else to the JointClassifier.
+
+The model mirrors the JointClassifier's outputs: a softmax tool head plus one
+softmax intent head per tool, over the same label mappings, on word uni/bigrams
+and character n-grams hashed into a fixed feature space. Each head's
+temperature is calibrated on held-out data, and the cascade only answers when
+the calibrated confidence of the top tool and of its top intent both clear
+the threshold, and most of the query's words were seen in training (a linear
+model can be confidently wrong on out-of-vocabulary queries). Every query the
+first stage answers is a single-tool decision.
+
+Trained by scripts/train_first_stage_classifier.py from exported query logs;
+stored as <model_path>/first_stage.npz.
+"""
+
+import re
+import threading
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .local_classifier_base import ProbabilityOutput
+
+FIRST_STAGE_FILENAME = 'first_stage.npz'
+FIRST_STAGE_FORMAT = 1
+
+# Minimum share of a query's words seen in training for the first stage to answer
+MIN_KNOWN_WORD_FRACTION = 0.8
+
+# Words keep the {CHARACTER}/{PARTY_MEMBER}/{NPC} placeholders as single tokens
+_TOKEN_PATTERN = re.compile(r"\{[a-z_]+\}|[a-z0-9']+")
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    shifted = logits - logits.max(axis=-1, keepdims=True)
+    exp = np.exp(shifted)
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+class HashedNgramClassifier:
+    """Hashed n-gram softmax regression with a tool head and per-tool intent heads."""
+
+    def __init__(
+        self,
+        tools: List[str],
+        intents_per_tool: Dict[str, List[str]],
+        n_features: int = 2 ** 15,
+        char_ngrams: Tuple[int, int] = (3, 5),
+    ):
+        """
+        Args:
+            tools: Tool names in label-mapping index order
+            intents_per_tool: Intent names per tool, in label-mapping index order
+            n_features: Size of the hashed feature space
+            char_ngrams: Min and max character n-gram length (within words)
+        """
+        self.tools = list(tools)
+        self.intents_per_tool = {tool: list(intents_per_tool[tool]) for tool in self.tools}
+        self.n_features = n_features
+        self.char_ngrams = char_ngrams
+
+        # One weight matrix per head: (n_features + 1, n_classes); the last row is the bias
+        self.weights: Dict[str, np.ndarray] = {
+            head: np.zeros((n_features + 1, n), dtype=np.float32)
+            for head, n in self._head_sizes().items()
+        }
+        self.temperatures: Dict[str, float] = {head: 1.0 for head in self.weights}
+        self.known_words = np.zeros(n_features, dtype=bool)  # Hashed words seen in training
+
+    def _head_sizes(self) -> Dict[str, int]:
+        sizes = {'tool': len(self.tools)}
+        sizes.update({tool: len(intents) for tool, intents in self.intents_per_tool.items()})
+        return sizes
+
+    # ===== FEATURES =====
+
+    def _hash(self, feature: str) -> int:
+        return zlib.crc32(feature.encode('utf-8')) % self.n_features
+
+    def known_word_fraction(self, query: str) -> float:
+        """Share of the query's words that appeared in the training data."""
+        words = _TOKEN_PATTERN.findall(query.lower())
+        if not words:
+            return 0.0
+        return sum(bool(self.known_words[self._hash(f"w:{w}")]) for w in words) / len(words)
+
+    def featurize(self, query: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Hashed feature indices and L2-normalized values (bias feature included)."""
+        words = _TOKEN_PATTERN.findall(query.lower())
+        features = [f"w:{w}" for w in words]
+        features.extend(f"b:{a} {b}" for a, b in zip(words, words[1:]))
+        low, high = self.char_ngrams
+        for word in words:
+            padded = f"<{word}>"
+            for n in range(low, high + 1):
+                features.extend(f"c:{padded[i:i + n]}" for i in range(len(padded) - n + 1))
+
+        counts: Dict[int, float] = {}
+        for feature in features:
+            index = self._hash(feature)
+            counts[index] = counts.get(index, 0.0) + 1.0
+
+        indices = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        values = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+        if len(values):
+            values /= np.linalg.norm(values)
+        return np.append(indices, self.n_features), np.append(values, np.float32(1.0))
+
+    def _featurize_batch(self, queries: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Padded (N, L) index and value matrices; padding points at the bias row with value 0."""
+        rows = [self.featurize(q) for q in queries]
+        width = max((len(indices) for indices, _ in rows), default=1)
+        indices = np.full((len(rows), width), self.n_features, dtype=np.int64)
+        values = np.zeros((len(rows), width), dtype=np.float32)
+        for i, (row_indices, row_values) in enumerate(rows):
+            indices[i, :len(row_indices)] = row_indices
+            values[i, :len(row_values)] = row_values
+        return indices, values
+
+    def _logits(self, head: str, indices: np.ndarray, values: np.ndarray) -> np.ndarray:
+        return np.einsum('nlc,nl->nc', self.weights[head][indices], values)
+
+    # ===== INFERENCE =====
+
+    def predict(self, queries: Sequence[str]) -> List[ProbabilityOutput]:
+        """Calibrated (tool_probs, {tool: intent_probs}) per query, like the JointClassifier."""
+        if not queries:
+            return []
+        indices, values = self._featurize_batch(queries)
+        probs = {
+            head: _softmax(self._logits(head, indices, values) / self.temperatures[head])
+            for head in self.weights
+        }
+        return [
+            (probs['tool'][i], {tool: probs[tool][i] for tool in self.tools})
+            for i in range(len(queries))
+        ]
+
+    # ===== TRAINING =====
+
+    def fit(
+        self,
+        queries: Sequence[str],
+        tools: Sequence[str],
+        intents: Sequence[str],
+        epochs: int = 200,
+        learning_rate: float = 0.5,
+        l2: float = 1e-5,
+    ) -> 'HashedNgramClassifier':
+        """
+        Train all heads with full-batch Adagrad on softmax cross-entropy.
+
+        Each (query, tool, intent) example trains the tool head, and the intent
+        head of its tool. Multi-tool queries appear once per tool.
+        """
+        indices, values = self._featurize_batch(queries)
+        for query in queries:
+            for word in _TOKEN_PATTERN.findall(query.lower()):
+                self.known_words[self._hash(f"w:{word}")] = True
+        tool_labels = np.array([self.tools.index(t) for t in tools])
+        self._fit_head('tool', indices, values, tool_labels, epochs, learning_rate, l2)
+
+        for tool in self.tools:
+            rows = np.array([i for i, t in enumerate(tools) if t == tool], dtype=np.int64)
+            if not len(rows):
+                continue
+            labels = np.array([self.intents_per_tool[tool].index(intents[i]) for i in rows])
+            self._fit_head(tool, indices[rows], values[rows], labels, epochs, learning_rate, l2)
+        return self
+
+    def _fit_head(self, head, indices, values, labels, epochs, learning_rate, l2) -> None:
+        # Only rows of features present in the data get gradients; train those compactly
+        rows, compact = np.unique(indices, return_inverse=True)
+        compact = compact.reshape(indices.shape)
+        flat_indices = compact.ravel()
+        weights = self.weights[head][rows]
+        accumulator = np.full_like(weights, 1e-8)
+        targets = np.eye(weights.shape[1], dtype=np.float32)[labels]
+
+        for _ in range(epochs):
+            probs = _softmax(np.einsum('nlc,nl->nc', weights[compact], values))
+            delta = (probs - targets) / len(labels)
+            gradient = np.stack([
+                np.bincount(flat_indices, weights=(values * delta[:, c, None]).ravel(), minlength=len(weights))
+                for c in range(weights.shape[1])
+            ], axis=1).astype(np.float32)
+            gradient += l2 * weights
+            accumulator += gradient ** 2
+            weights -= learning_rate * gradient / np.sqrt(accumulator)
+
+        self.weights[head][rows] = weights
+
+    def calibrate(self, queries: Sequence[str], tools: Sequence[str], intents: Sequence[str]) -> Dict[str, float]:
+        """Fit each head's temperature on held-out examples (minimum NLL over a grid)."""
+        indices, values = self._featurize_batch(queries)
+        # Sharpening is capped: on near-separable held-out data NLL keeps falling as T -> 0
+        grid = np.exp(np.linspace(np.log(0.5), np.log(10.0), 60))
+
+        def fit_temperature(head: str, rows: np.ndarray, labels: np.ndarray) -> None:
+            if not len(rows):
+                return
+            logits = self._logits(head, indices[rows], values[rows])
+            nll = [
+                -np.log(_softmax(logits / t)[np.arange(len(labels)), labels] + 1e-12).mean()
+                for t in grid
+            ]
+            self.temperatures[head] = float(grid[int(np.argmin(nll))])
+
+        all_rows = np.arange(len(queries))
+        fit_temperature('tool', all_rows, np.array([self.tools.index(t) for t in tools]))
+        for tool in self.tools:
+            rows = np.array([i for i, t in enumerate(tools) if t == tool], dtype=np.int64)
+            labels = np.array([self.intents_per_tool[tool].index(intents[i]) for i in rows])
+            fit_temperature(tool, rows, labels)
+        return dict(self.temperatures)
+
+    # ===== PERSISTENCE =====
+
+    def save(self, path: Path) -> None:
+        """Write weights (float16) and metadata to an .npz file."""
+        arrays = {f"weights_{head}": w.astype(np.float16) for head, w in self.weights.items()}
+        np.savez_compressed(
+            path,
+            format=np.array(FIRST_STAGE_FORMAT),
+            tools=np.array(self.tools),
+            intents=np.array([f"{tool}\t{intent}" for tool in self.tools for intent in self.intents_per_tool[tool]]),
+            n_features=np.array(self.n_features),
+            char_ngrams=np.array(self.char_ngrams),
+            temperatures=np.array([self.temperatures[head] for head in self.weights]),
+            heads=np.array(list(self.weights)),
+            known_words=np.packbits(self.known_words),
+            **arrays,
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> 'HashedNgramClassifier':
+        with np.load(path) as data:
+            if int(data['format']) != FIRST_STAGE_FORMAT:
+                raise ValueError(f"Unsupported first-stage format {int(data['format'])} in {path}")
+            tools = [str(t) for t in data['tools']]
+            intents_per_tool: Dict[str, List[str]] = {tool: [] for tool in tools}
+            for entry in data['intents']:
+                tool, intent = str(entry).split('\t', 1)
+                intents_per_tool[tool].append(intent)
+            model = cls(tools, intents_per_tool, int(data['n_features']), tuple(int(n) for n in data['char_ngrams']))
+            for head, temperature in zip(data['heads'], data['temperatures']):
+                model.weights[str(head)] = data[f"weights_{head}"].astype(np.float32)
+                model.temperatures[str(head)] = float(temperature)
+            model.known_words = np.unpackbits(data['known_words'])[:model.n_features].astype(bool)
+        return model
+
+
+@dataclass
+class CascadeStats:
+    """Per-stage hit rates and first-stage/transformer agreement."""
+    first_stage: int = 0           # Queries answered by the first stage
+    transformer: int = 0           # Queries deferred to the transformer
+    sampled: int = 0               # First-stage answers re-checked by the transformer
+    sampled_agreed: int = 0
+    deferred_agreed: int = 0       # Deferred queries where the first stage's guess matched anyway
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        total = self.first_stage + self.transformer
+        return {
+            'queries': total,
+            'first_stage_hits': self.first_stage,
+            'transformer_hits': self.transformer,
+            'first_stage_hit_rate': self.first_stage / total if total else 0.0,
+            'sampled_agreement': self.sampled_agreed / self.sampled if self.sampled else None,
+            'deferred_agreement': self.deferred_agreed / self.transformer if self.transformer else None,
+        }
+
+
+def _top_decision(output: ProbabilityOutput, tools: List[str]) -> Tuple[str, int, float, float]:
+    """(tool, intent index, tool confidence, intent confidence) of the top tool."""
+    tool_probs, intent_probs = output
+    tool = tools[int(np.argmax(tool_probs))]
+    intent = int(np.argmax(intent_probs[tool]))
+    return tool, intent, float(np.max(tool_probs)), float(intent_probs[tool][intent])
+
+
+class ClassifierCascade:
+    """
+    Confidence-gated first stage in front of a transformer forward function.
+
+    Every sample_every-th first-stage answer is also run through the
+    transformer (its answer is still the first stage's) to measure agreement
+    on the queries the cascade skips.
+    """
+
+    def __init__(
+        self,
+        first_stage: HashedNgramClassifier,
+        threshold: float = 0.9,
+        sample_every: int = 20,
+        min_known_fraction: float = MIN_KNOWN_WORD_FRACTION,
+    ):
+        self.first_stage = first_stage
+        self.threshold = threshold
+        self.sample_every = sample_every
+        self.min_known_fraction = min_known_fraction
+        self.stats = CascadeStats()
+
+    def accepts(self, query: str, output: ProbabilityOutput) -> bool:
+        """Whether the first stage's answer for a query is confident enough to use."""
+        _, _, tool_confidence, intent_confidence = _top_decision(output, self.first_stage.tools)
+        return (min(tool_confidence, intent_confidence) >= self.threshold
+                and self.first_stage.known_word_fraction(query) >= self.min_known_fraction)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.stats._lock:
+            return self.stats.to_dict()
+
+    def run(
+        self,
+        normalized_queries: List[str],
+        transformer_forward: Callable[[List[str]], List[ProbabilityOutput]],
+    ) -> Tuple[List[ProbabilityOutput], List[str]]:
+        """
+        Route each query through the cascade.
+
+        Returns:
+            (per-query outputs, per-query stage: 'first_stage' or 'transformer')
+        """
+        tools = self.first_stage.tools
+        first_outputs = self.first_stage.predict(normalized_queries)
+        accepted = [self.accepts(query, output) for query, output in zip(normalized_queries, first_outputs)]
+
+        with self.stats._lock:
+            sampled = []
+            for i, ok in enumerate(accepted):
+                if ok:
+                    self.stats.first_stage += 1
+                    if self.sample_every and self.stats.first_stage % self.sample_every == 0:
+                        sampled.append(i)
+                else:
+                    self.stats.transformer += 1
+
+        to_run = [i for i, ok in enumerate(accepted) if not ok] + sampled
+        transformer_outputs = dict(zip(to_run, transformer_forward([normalized_queries[i] for i in to_run]))) \
+            if to_run else {}
+
+        outputs: List[ProbabilityOutput] = []
+        stages: List[str] = []
+        agreed = {i: _top_decision(first_outputs[i], tools)[:2] == _top_decision(transformer_outputs[i], tools)[:2]
+                  for i in to_run}
+        for i, ok in enumerate(accepted):
+            outputs.append(first_outputs[i] if ok else transformer_outputs[i])
+            stages.append('first_stage' if ok else 'transformer')
+
+        with self.stats._lock:
+            for i in to_run:
+                if accepted[i]:
+                    self.stats.sampled += 1
+                    self.stats.sampled_agreed += int(agreed[i])
+                else:
+                    self.stats.deferred_agreed += int(agreed[i])
+
+        return outputs, stages
+
+
+def load_cascade(model_path: Path, threshold: float, sample_every: int) -> Optional[ClassifierCascade]:
+    """Load the first stage next to the transformer checkpoint, if one was trained."""
+    path = model_path / FIRST_STAGE_FILENAME
+    if not path.exists():
+        return None
+    print(f"[LocalClassifier] Loading first-stage cascade from {path} (threshold {threshold})")
+    return ClassifierCascade(HashedNgramClassifier.load(path), threshold, sample_every)
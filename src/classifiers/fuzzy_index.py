@@ -0,0 +1,111 @@
+"""
+Candidate index for gazetteer fuzzy matching.
+
+Shortlists gazetteer names that can possibly reach a similarity threshold
+for a phrase, so SequenceMatcher only runs on a handful of names instead of
+the whole gazetteer.
+
+The shortlist is exact, not heuristic: SequenceMatcher.ratio() is bounded
+above by 2 * |shared characters| / (len(a) + len(b)) (its quick_ratio), so
+any name whose bound is below the threshold cannot match. Bounds for every
+name are computed at once from a character-count matrix.
+"""
+
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+
+# Characters with their own count column; everything else shares the last
+# column, which can only over-count shared characters (keeping the bound valid)
+_ALPHABET = "abcdefghijklmnopqrstuvwxyz0123456789 '-."
+_CHAR_COLUMN: Dict[str, int] = {c: i for i, c in enumerate(_ALPHABET)}
+_OTHER_COLUMN = len(_ALPHABET)
+_NUM_COLUMNS = len(_ALPHABET) + 1
+
+# Slack for float rounding when comparing bounds with thresholds
+_EPSILON = 1e-9
+
+# First-word similarity needed before the first-word bonus applies
+FIRST_WORD_MIN_SIMILARITY = 0.85
+FIRST_WORD_WEIGHT = 0.9
+
+
+def _char_counts(text: str) -> np.ndarray:
+    counts = np.zeros(_NUM_COLUMNS, dtype=np.int32)
+    for char in text:
+        counts[_CHAR_COLUMN.get(char, _OTHER_COLUMN)] += 1
+    return counts
+
+
+def _count_matrix(texts: Sequence[str]) -> np.ndarray:
+    matrix = np.zeros((len(texts), _NUM_COLUMNS), dtype=np.int32)
+    for row, text in enumerate(texts):
+        for char in text:
+            matrix[row, _CHAR_COLUMN.get(char, _OTHER_COLUMN)] += 1
+    return matrix
+
+
+def _ratio_bounds(counts: np.ndarray, lengths: np.ndarray, text: str) -> np.ndarray:
+    """Upper bound of SequenceMatcher(None, text, x).ratio() for every row of a count matrix."""
+    shared = np.minimum(counts, _char_counts(text)).sum(axis=1)
+    return 2.0 * shared / (lengths + len(text))
+
+
+def ratio_upper_bounds(names: Sequence[str], text: str) -> np.ndarray:
+    """Upper bound of SequenceMatcher(None, text, name).ratio() for every name."""
+    lengths = np.fromiter((len(n) for n in names), dtype=np.int64, count=len(names))
+    return _ratio_bounds(_count_matrix(names), lengths, text)
+
+
+class FuzzyCandidateIndex:
+    """
+    Immutable candidate index over lowercase gazetteer names.
+
+    candidates() returns indexes into `names` (ascending, i.e. gazetteer
+    order) for every name that could score >= min_similarity under the
+    extractor's fuzzy scoring: full-string similarity, or the first-word
+    bonus (first-word similarity >= 0.85, weighted by 0.9).
+    """
+
+    def __init__(self, names: Sequence[str]):
+        self.names: List[str] = list(names)
+        self._lengths = np.array([len(n) for n in self.names], dtype=np.int32)
+        self._counts = _count_matrix(self.names)
+
+        # Distinct first words and the names that start with each
+        first_word_ids: Dict[str, int] = {}
+        members: List[List[int]] = []
+        for index, name in enumerate(self.names):
+            words = name.split()
+            if not words:
+                continue
+            word_id = first_word_ids.setdefault(words[0], len(members))
+            if word_id == len(members):
+                members.append([])
+            members[word_id].append(index)
+
+        self.first_words: List[str] = list(first_word_ids)
+        self._first_word_lengths = np.array([len(w) for w in self.first_words], dtype=np.int32)
+        self._first_word_counts = _count_matrix(self.first_words)
+        self._first_word_members = [np.array(m, dtype=np.int64) for m in members]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def candidates(self, phrase: str, min_similarity: float) -> np.ndarray:
+        """Indexes of names that may reach min_similarity for this phrase."""
+        if not self.names:
+            return np.zeros(0, dtype=np.int64)
+
+        phrase_lower = phrase.lower()
+        mask = _ratio_bounds(self._counts, self._lengths, phrase_lower) >= min_similarity - _EPSILON
+
+        phrase_words = phrase_lower.split()
+        first_word_threshold = max(FIRST_WORD_MIN_SIMILARITY, min_similarity / FIRST_WORD_WEIGHT)
+        if phrase_words and len(self.first_words) and first_word_threshold <= 1.0 + _EPSILON:
+            bounds = _ratio_bounds(self._first_word_counts, self._first_word_lengths, phrase_words[0])
+            for word_id in np.flatnonzero(bounds >= first_word_threshold - _EPSILON):
+                mask[self._first_word_members[word_id]] = True
+
+        return np.flatnonzero(mask)
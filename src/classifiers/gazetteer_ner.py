@@ -9,15 +9,26 @@ Supports dynamic entity sources:
 - Character name and aliases
 - Party member names
 - Session notes NPCs, locations, items
+
+extract() results are kept in a process-wide LRU keyed on the query text and
+the versions of the SRD base and the extractor's overlay, so repeated
+phrasings and repeated extraction of the same message cost a dictionary
+lookup.
 """
 
-import json
+import hashlib
+import multiprocessing
 import re
+import threading
+from collections import ChainMap, OrderedDict
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional, Set, Any, TYPE_CHECKING
-from dataclasses import dataclass
+from types import MappingProxyType
+from typing import List, Dict, Tuple, Optional, Set, Any, Iterable, Iterator, Mapping, TYPE_CHECKING
+from dataclasses import dataclass, replace
 from difflib import SequenceMatcher
 
+from .srd_gazetteer import GAZETTEER_MAPPING, GazetteerIndex, get_srd_gazetteer
+
 if TYPE_CHECKING:
     from src.rag.character.character_types import Character
     from src.rag.session_notes.campaign_session_notes_storage import CampaignSessionNotesStorage
@@ -56,36 +67,75 @@ class Entity:
     end: int           # End position in query
 
 
+class ExtractionCache:
+    """Thread-safe LRU of extraction results, shared by every extractor in the process"""
+    
+    def __init__(self, max_size: int = 4096):
+        self.cache: 'OrderedDict[tuple, Tuple[Entity, ...]]' = OrderedDict()
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self.cache)
+    
+    def get(self, key: tuple) -> Optional[List[Entity]]:
+        """Get a copy of the cached entities (None on a miss)"""
+        with self._lock:
+            entities = self.cache.get(key)
+            if entities is None:
+                self.misses += 1
+                return None
+            self.cache.move_to_end(key)
+            self.hits += 1
+        return [replace(e) for e in entities]
+    
+    def put(self, key: tuple, entities: List[Entity]) -> None:
+        """Store entities, evicting the least recently used results"""
+        with self._lock:
+            self.cache[key] = tuple(replace(e) for e in entities)
+            self.cache.move_to_end(key)
+            while len(self.cache) > self.max_size:
+                self.cache.popitem(last=False)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self.cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_extraction_cache: Optional[ExtractionCache] = None
+
+
+def get_extraction_cache() -> ExtractionCache:
+    """Get or create the process-wide extraction cache (size from config)."""
+    global _extraction_cache
+    if _extraction_cache is None:
+        from src.config import get_config
+        _extraction_cache = ExtractionCache(get_config().entity_extraction_cache_size)
+    return _extraction_cache
+
+
 class GazetteerEntityExtractor:
     """
     Extract D&D entities from text using fuzzy matching against known gazetteers.
     
     Uses a two-phase approach:
-    1. Exact substring matching (fast, high precision)
-    2. Fuzzy matching for misspellings (slower, catches typos)
+    1. Exact substring matching (fast, high precision) via Aho-Corasick
+       automata over all gazetteer names
+    2. Fuzzy matching for misspellings (slower, catches typos), scoring only
+       the names a character-count index shortlists for each phrase
     
     Supports dynamic entity sources:
-    - SRD entities loaded at init
-    - Character/party/NPC entities added via add_character_context()
+    - SRD entities from the process-wide shared gazetteer (loaded once)
+    - Character/party/NPC entities added via add_character_context(), kept
+      in a per-extractor overlay with its own small match indexes
     """
     
     # Mapping from SRD cache file to entity type
-    GAZETTEER_MAPPING = {
-        'spells': 'SPELL',
-        'classes': 'CLASS',
-        'subclasses': 'CLASS',
-        'races': 'RACE',
-        'monsters': 'CREATURE',
-        'equipment': 'ITEM',
-        'magic-items': 'ITEM',
-        'conditions': 'CONDITION',
-        'damage-types': 'DAMAGE_TYPE',
-        'skills': 'SKILL',
-        'features': 'FEAT',
-        'traits': 'FEAT',
-        'backgrounds': 'BACKGROUND',
-        'ability-scores': 'ABILITY',
-    }
+    GAZETTEER_MAPPING = GAZETTEER_MAPPING
     
     # Dynamic entity types (not from SRD files)
     DYNAMIC_ENTITY_TYPES = {
@@ -142,81 +192,33 @@ class GazetteerEntityExtractor:
         """
         self.cache_path = Path(cache_path)
         self.min_similarity = min_similarity
-        self.gazetteers: Dict[str, Tuple[str, str]] = {}  # {lowercase_name: (canonical_name, type)}
         self.skip_words: Set[str] = set(ENGLISH_STOP_WORDS) | self.DND_SKIP_WORDS
-        self._load_gazetteers()
-    
-    def _load_gazetteers(self) -> None:
-        """Load all entity gazetteers from SRD cache."""
-        self.gazetteers = {}
-        
-        for filename, entity_type in self.GAZETTEER_MAPPING.items():
-            filepath = self.cache_path / f"{filename}.json"
-            if not filepath.exists():
-                continue
-            
-            try:
-                with open(filepath) as f:
-                    data = json.load(f)
-            except (json.JSONDecodeError, IOError):
-                continue
-            
-            # Handle different file structures
-            if 'results' in data:
-                entities = data['results']
-            elif isinstance(data, list):
-                entities = data
-            else:
-                continue
-            
-            for entity in entities:
-                if isinstance(entity, dict) and 'name' in entity:
-                    name = entity['name']
-                    self.gazetteers[name.lower()] = (name, entity_type)
-        
-        # Add static D&D domain knowledge not in SRD API
-        self._add_static_dnd_entities()
-        
-        print(f"[GazetteerNER] Loaded {len(self.gazetteers)} entities from gazetteers")
-    
-    def _add_static_dnd_entities(self) -> None:
-        """Add common D&D entities that aren't in the SRD API files."""
-        # Armor categories
-        armor_categories = [
-            "Light Armor", "Medium Armor", "Heavy Armor", 
-            "Shields", "Armor Class", "AC"
-        ]
-        for name in armor_categories:
-            self.gazetteers[name.lower()] = (name, "ITEM_CATEGORY")
-        
-        # Weapon categories
-        weapon_categories = [
-            "Simple Weapons", "Martial Weapons", 
-            "Simple Melee Weapons", "Simple Ranged Weapons",
-            "Martial Melee Weapons", "Martial Ranged Weapons",
-            "Melee Weapons", "Ranged Weapons", "Finesse Weapons"
-        ]
-        for name in weapon_categories:
-            self.gazetteers[name.lower()] = (name, "ITEM_CATEGORY")
-        
-        # Ability scores (full names for better matching)
-        ability_scores = [
-            "Strength", "Dexterity", "Constitution", 
-            "Intelligence", "Wisdom", "Charisma"
-        ]
-        for name in ability_scores:
-            self.gazetteers[name.lower()] = (name, "ABILITY")
-        
-        # Common D&D mechanics terms
-        mechanics = [
-            "Proficiency Bonus", "Spell Save DC", "Spell Attack",
-            "Attack Roll", "Damage Roll", "Saving Throw",
-            "Ability Check", "Skill Check", "Initiative",
-            "Hit Points", "Hit Dice", "Death Saving Throw"
-        ]
-        for name in mechanics:
-            self.gazetteers[name.lower()] = (name, "MECHANIC")
 
+        # SRD entities and their match indexes are shared process-wide; this
+        # extractor only owns the dynamic entities layered on top of them
+        self.base: GazetteerIndex = get_srd_gazetteer(self.cache_path)
+        self._overlay: Dict[str, Tuple[str, str]] = {}  # {lowercase_name: (canonical_name, type)}
+        self._overlay_writes = 0  # Bumped by every overlay write, so the versions below can't miss one
+
+        # Match indexes over the overlay (built lazily, rebuilt after a write)
+        self._overlay_index: Optional[GazetteerIndex] = None
+        self._overlay_index_writes = -1
+        self._overlay_rank: Dict[str, int] = {}
+        self._overlay_version: Optional[Tuple[int, str]] = None  # (overlay writes, content hash)
+
+    @property
+    def overlay(self) -> Mapping[str, Tuple[str, str]]:
+        """Read-only view of the dynamic entities: {lowercase_name: (canonical_name, type)}.
+
+        Use add_entities()/clear_dynamic_entities() to change them.
+        """
+        return MappingProxyType(self._overlay)
+
+    @property
+    def gazetteers(self) -> ChainMap:
+        """Read-only view of all entities, overlay first: {lowercase_name: (canonical_name, type)}."""
+        return ChainMap(self.overlay, MappingProxyType(self.base.entries))
+    
     def add_entities(
         self, 
         names: List[str], 
@@ -242,7 +244,7 @@ class GazetteerEntityExtractor:
             if not name or not name.strip():
                 continue
             canonical = name.strip()
-            self.gazetteers[canonical.lower()] = (canonical, entity_type)
+            self._set_overlay(canonical.lower(), (canonical, entity_type))
             added += 1
             
             # Auto-generate first-name alias for multi-word names
@@ -255,7 +257,7 @@ class GazetteerEntityExtractor:
                 if len(first_word) >= 4 and first_word.lower() not in self.skip_words:
                     # Check it's not already in gazetteer with different meaning
                     if first_word.lower() not in self.gazetteers:
-                        self.gazetteers[first_word.lower()] = (canonical, entity_type)
+                        self._set_overlay(first_word.lower(), (canonical, entity_type))
                         added += 1
             
             # Handle apostrophe/hyphen names (e.g., "Ghul'Vor" -> "Ghul", "Shar-Kai" -> "Shar")
@@ -266,14 +268,14 @@ class GazetteerEntityExtractor:
                     if len(first_part) >= 3 and first_part.lower() not in self.skip_words:
                         # Add first part as alias pointing to canonical
                         if first_part.lower() not in self.gazetteers:
-                            self.gazetteers[first_part.lower()] = (canonical, entity_type)
+                            self._set_overlay(first_part.lower(), (canonical, entity_type))
                             added += 1
             
             # Add any explicit aliases for this entity
             if aliases and canonical in aliases:
                 for alias in aliases[canonical]:
                     if alias and alias.strip():
-                        self.gazetteers[alias.strip().lower()] = (canonical, entity_type)
+                        self._set_overlay(alias.strip().lower(), (canonical, entity_type))
                         added += 1
         
         return added
@@ -387,12 +389,12 @@ class GazetteerEntityExtractor:
         removed = 0
         to_remove = []
         
-        for key, (canonical, entity_type) in self.gazetteers.items():
+        for key, (canonical, entity_type) in self._overlay.items():
             if entity_type in self.DYNAMIC_ENTITY_TYPES:
                 to_remove.append(key)
         
         for key in to_remove:
-            del self.gazetteers[key]
+            self._remove_overlay(key)
             removed += 1
         
         print(f"[GazetteerNER] Cleared {removed} dynamic entities")
@@ -406,7 +408,8 @@ class GazetteerEntityExtractor:
         """
         Clear dynamic entities and reload from character/session data.
         
-        Use this when character or session data has changed.
+        Use this when character or session data has changed. Only the overlay
+        is rebuilt; the shared SRD gazetteer is untouched.
         
         Args:
             character: The Character object (optional)
@@ -422,51 +425,102 @@ class GazetteerEntityExtractor:
         """Calculate similarity between two strings."""
         return SequenceMatcher(None, s1.lower(), s2.lower()).ratio()
     
+    def _set_overlay(self, name_lower: str, entry: Tuple[str, str]) -> None:
+        self._overlay[name_lower] = entry
+        self._overlay_writes += 1
+
+    def _remove_overlay(self, name_lower: str) -> None:
+        del self._overlay[name_lower]
+        self._overlay_writes += 1
+
+    @property
+    def overlay_version(self) -> str:
+        """Hash of the overlay entries in order.
+
+        Extractors with the same overlay over the same base share cached
+        extraction results; any add/clear/reload that changes the overlay
+        changes the version.
+        """
+        if self._overlay_version is None or self._overlay_version[0] != self._overlay_writes:
+            digest = hashlib.sha1(repr(tuple(self._overlay.items())).encode('utf-8')).hexdigest()
+            self._overlay_version = (self._overlay_writes, digest)
+        return self._overlay_version[1]
+
+    def _ensure_index(self) -> None:
+        """Build the overlay match indexes if entities changed since the last build."""
+        if self._overlay_index_writes != self._overlay_writes:
+            self._overlay_index = GazetteerIndex(self._overlay)
+            self._overlay_index_writes = self._overlay_writes
+            # Rank preserves merged gazetteer order for tie-breaking between equal-length
+            # names: SRD order first (overlay entries shadowing an SRD name keep its
+            # place), then overlay-only names in insertion order
+            base_rank = self.base.rank
+            self._overlay_rank = {
+                key: base_rank.get(key, len(base_rank) + rank)
+                for rank, key in enumerate(self._overlay_index.names)
+            }
+
+    def _lookup(self, name_lower: str) -> Tuple[str, str]:
+        """(canonical_name, type) for a name, preferring the overlay."""
+        entry = self._overlay.get(name_lower)
+        return entry if entry is not None else self.base.entries[name_lower]
+
     def _find_exact_matches(self, text: str) -> List[Entity]:
         """Find exact substring matches (case-insensitive)."""
+        self._ensure_index()
         entities = []
         text_lower = text.lower()
         
-        # Sort by length (longest first) to prefer longer matches
-        sorted_names = sorted(self.gazetteers.keys(), key=len, reverse=True)
+        # One pass over the text per automaton finds every occurrence of every
+        # name; resolve them longest name first (then gazetteer order, then position).
+        # SRD names shadowed by the overlay are reported by the overlay automaton.
+        overlay = self._overlay
+        base_rank = self.base.rank
+        overlay_rank = self._overlay_rank
+        hits = [
+            (start, name_lower, base_rank[name_lower])
+            for start, _, name_lower in self.base.automaton.iter_matches(text_lower)
+            if name_lower not in overlay
+        ]
+        hits.extend(
+            (start, name_lower, overlay_rank[name_lower])
+            for start, _, name_lower in self._overlay_index.automaton.iter_matches(text_lower)
+        )
+        candidates = sorted(hits, key=lambda c: (-len(c[1]), c[2], c[0]))
         
         # Track matched spans to avoid overlaps
         matched_spans: List[Tuple[int, int]] = []
+        # Occurrences of a name are scanned left to right without overlapping themselves
+        next_start: Dict[str, int] = {}
         
-        for name_lower in sorted_names:
-            canonical, entity_type = self.gazetteers[name_lower]
+        for idx, name_lower, _ in candidates:
+            if idx < next_start.get(name_lower, 0):
+                continue
             
-            # Find all occurrences
-            start = 0
-            while True:
-                idx = text_lower.find(name_lower, start)
-                if idx == -1:
-                    break
-                
-                end = idx + len(name_lower)
-                
-                # Check word boundaries
-                before_ok = idx == 0 or not text[idx-1].isalnum()
-                after_ok = end == len(text) or not text[end].isalnum()
-                
-                # Check for overlap with existing matches
-                overlaps = any(
-                    not (end <= s or idx >= e) 
-                    for s, e in matched_spans
-                )
-                
-                if before_ok and after_ok and not overlaps:
-                    entities.append(Entity(
-                        text=text[idx:end],
-                        canonical=canonical,
-                        type=entity_type,
-                        confidence=1.0,
-                        start=idx,
-                        end=end
-                    ))
-                    matched_spans.append((idx, end))
-                
-                start = end
+            end = idx + len(name_lower)
+            next_start[name_lower] = end
+            canonical, entity_type = self._lookup(name_lower)
+            
+            # Check word boundaries
+            before_ok = idx == 0 or not text[idx-1].isalnum()
+            after_ok = end == len(text) or not text[end].isalnum()
+            
+            # Check for overlap with existing matches
+            overlaps = any(
+                not (end <= s or idx >= e) 
+                for s, e in matched_spans
+            )
+            
+            if before_ok and after_ok and not overlaps:
+                entities.append(Entity(
+                    text=text[idx:end],
+                    canonical=canonical,
+                    type=entity_type,
+                    confidence=1.0,
+                    start=idx,
+                    end=end
+                ))
+                matched_spans.append((idx, end))
         
         return entities
     
@@ -476,6 +530,7 @@ class GazetteerEntityExtractor:
         Uses aggressive matching to avoid missing entities - prefer over-matching
         to under-matching since the LLM can filter irrelevant context.
         """
+        self._ensure_index()
         entities = []
         
         # Tokenize into words with positions
@@ -527,7 +582,7 @@ class GazetteerEntityExtractor:
             best_match: Optional[Tuple[str, str, float]] = None
             best_score = 0.0
             
-            for name_lower, (canonical, entity_type) in self.gazetteers.items():
+            for name_lower, (canonical, entity_type) in self._fuzzy_candidates(phrase):
                 # More permissive length ratio check
                 len_ratio = len(phrase) / len(name_lower) if len(name_lower) > 0 else 0
                 if len_ratio < 0.4 or len_ratio > 2.5:
@@ -562,6 +617,26 @@ class GazetteerEntityExtractor:
         
         return entities
     
+    def _fuzzy_candidates(self, phrase: str) -> Iterator[Tuple[str, Tuple[str, str]]]:
+        """
+        Yield (name_lower, (canonical, type)) for names that may fuzzy-match the phrase.
+
+        Only names whose similarity upper bound can reach min_similarity are
+        yielded, in merged gazetteer order (SRD first, then overlay-only names).
+        """
+        overlay = self._overlay
+        base = self.base
+        for name_index in base.fuzzy_index.candidates(phrase, self.min_similarity):
+            name_lower = base.names[name_index]
+            entry = overlay.get(name_lower)
+            yield name_lower, entry if entry is not None else base.entries[name_lower]
+
+        overlay_index = self._overlay_index
+        for name_index in overlay_index.fuzzy_index.candidates(phrase, self.min_similarity):
+            name_lower = overlay_index.names[name_index]
+            if name_lower not in base.entries:
+                yield name_lower, overlay[name_lower]
+    
     def _deduplicate_overlapping(self, entities: List[Entity]) -> List[Entity]:
         """Remove overlapping entities, preferring higher confidence and longer spans."""
         if not entities:
@@ -598,6 +673,15 @@ class GazetteerEntityExtractor:
         Returns:
             List of Entity objects, sorted by position
         """
+        cache = get_extraction_cache()
+        key = (text, use_fuzzy, self.min_similarity, self.base.version, self.overlay_version)
+        entities = cache.get(key)
+        if entities is None:
+            entities = self._extract_uncached(text, use_fuzzy)
+            cache.put(key, entities)
+        return entities
+    
+    def _extract_uncached(self, text: str, use_fuzzy: bool) -> List[Entity]:
         entities = self._find_exact_matches(text)
         exact_spans = [(e.start, e.end) for e in entities]
         
@@ -618,7 +702,9 @@ class GazetteerEntityExtractor:
             List of dicts with 'text', 'type', 'canonical', 'confidence', 
             and 'is_dynamic' keys
         """
-        entities = self.extract(text)
+        return self._to_simple(self.extract(text))
+
+    def _to_simple(self, entities: List[Entity]) -> List[Dict[str, Any]]:
         return [
             {
                 'text': e.text,
@@ -629,6 +715,57 @@ class GazetteerEntityExtractor:
             }
             for e in entities
         ]
+
+    def extract_batch(
+        self,
+        texts: Iterable[str],
+        workers: int = 1,
+        use_fuzzy: bool = True,
+        chunksize: int = 256
+    ) -> Iterator[List[Entity]]:
+        """
+        Extract entities from many texts, streaming results in input order.
+
+        With workers > 1 the texts are split into chunks and processed by a
+        pool of worker processes. Workers are forked where the platform
+        supports it, so they share the already-built SRD and overlay indexes
+        copy-on-write instead of rebuilding them; elsewhere the extractor is
+        pickled to each worker once.
+
+        Intended for offline jobs (feedback reprocessing, evaluations, data
+        exports), not for the request path.
+
+        Args:
+            texts: Query texts (any iterable; consumed lazily)
+            workers: Number of worker processes (1 = extract in this process)
+            use_fuzzy: Whether to use fuzzy matching for typos
+            chunksize: Texts per task sent to a worker
+
+        Yields:
+            The extract() result for each text, in input order
+        """
+        self._ensure_index()
+
+        if workers <= 1:
+            for text in texts:
+                yield self.extract(text, use_fuzzy=use_fuzzy)
+            return
+
+        start_method = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else None
+        context = multiprocessing.get_context(start_method)
+        with context.Pool(workers, initializer=_init_batch_worker, initargs=(self, use_fuzzy)) as pool:
+            for chunk_results in pool.imap(_extract_batch_chunk, _chunked(texts, chunksize)):
+                yield from chunk_results
+
+    def extract_simple_batch(
+        self,
+        texts: Iterable[str],
+        workers: int = 1,
+        chunksize: int = 256
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """extract_batch() with extract_simple() output, in input order."""
+        for entities in self.extract_batch(texts, workers=workers, chunksize=chunksize):
+            yield self._to_simple(entities)
     
     def get_entity_count(self) -> Dict[str, int]:
         """Get count of entities by type."""
@@ -636,3 +773,30 @@ class GazetteerEntityExtractor:
         for _, (_, entity_type) in self.gazetteers.items():
             counts[entity_type] = counts.get(entity_type, 0) + 1
         return counts
+
+
+# ===== BATCH EXTRACTION WORKERS =====
+# Each worker process holds the extractor it was started with
+_batch_extractor: Optional[GazetteerEntityExtractor] = None
+_batch_use_fuzzy = True
+
+
+def _init_batch_worker(extractor: GazetteerEntityExtractor, use_fuzzy: bool) -> None:
+    global _batch_extractor, _batch_use_fuzzy
+    _batch_extractor = extractor
+    _batch_use_fuzzy = use_fuzzy
+
+
+def _extract_batch_chunk(texts: List[str]) -> List[List[Entity]]:
+    return [_batch_extractor.extract(text, use_fuzzy=_batch_use_fuzzy) for text in texts]
+
+
+def _chunked(texts: Iterable[str], size: int) -> Iterator[List[str]]:
+    chunk: List[str] = []
+    for text in texts:
+        chunk.append(text)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
@@ -0,0 +1,600 @@
+"""
+Local Classifier Base
+
+Backend-independent parts of the local Joint Tool+Intent classifier: label
+mappings, name normalization, gazetteer NER and turning probabilities into
+ClassificationResults. Backends implement _load_model() and _forward_batch():
+- LocalClassifier (local_classifier.py): the PyTorch checkpoint
+- OnnxLocalClassifier (onnx_classifier.py): the int8 ONNX export, without torch
+
+The model was trained on templates with {CHARACTER}, {PARTY_MEMBER}, {NPC} placeholders.
+At inference, we normalize actual names to these placeholders before classification.
+"""
+
+import hashlib
+import json
+import re
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple
+
+import numpy as np
+
+from .base import ClassificationResult
+from .gazetteer_ner import GazetteerEntityExtractor
+
+# Per-query model output: (tool_probs, {tool: intent_probs})
+ProbabilityOutput = Tuple[np.ndarray, Dict[str, np.ndarray]]
+
+
+@dataclass
+class SingleClassificationResult:
+    """Result from classifying a single query."""
+    tool: str
+    tool_confidence: float
+    intent: str
+    intent_confidence: float
+    normalized_query: str
+    combined_confidence: float
+
+
+class LocalClassifierBase(ABC):
+    """
+    Backend-independent base for the local Joint Tool+Intent classifier.
+    
+    Subclasses load a model in _load_model() and run it in _forward_batch();
+    everything else (label mappings, normalization, thresholds, results) is here.
+    
+    Key features:
+    - Name normalization: replaces character/party/NPC names with placeholders
+    - Temperature-scaled confidence scores for calibration
+    - Gazetteer NER for entity extraction (optional)
+    
+    Training vs Inference Flow:
+        TRAINING: Templates with {CHARACTER} → Train model on placeholder patterns
+        INFERENCE: "What level is Duskryn?" → normalize → "What level is {CHARACTER}?" → Classify
+    """
+    
+    def __init__(
+        self,
+        model_path: Optional[str] = None,
+        srd_cache_path: Optional[str] = None,
+        use_gazetteer: bool = True,
+        gazetteer_min_similarity: float = 0.80,
+    ):
+        """
+        Initialize the local classifier.
+        
+        Args:
+            model_path: Path to the trained model directory. If None, uses config default.
+            srd_cache_path: Path to SRD cache for gazetteer NER. If None, uses config default.
+            use_gazetteer: Whether to use gazetteer NER for entity extraction.
+            gazetteer_min_similarity: Minimum similarity for gazetteer matching.
+        """
+        from src.config import get_config
+        config = get_config()
+        
+        # Use config defaults if not provided
+        project_root = Path(__file__).parent.parent.parent
+        if model_path:
+            self.model_path = Path(model_path)
+        else:
+            self.model_path = project_root / config.local_classifier_model_path
+        
+        if srd_cache_path:
+            self.srd_cache_path = Path(srd_cache_path)
+        else:
+            self.srd_cache_path = project_root / config.local_classifier_srd_cache
+        
+        self.gazetteer_min_similarity = gazetteer_min_similarity
+        
+        print(f"[LocalClassifier] Model path: {self.model_path}")
+        
+        # Load components
+        self._load_mappings()
+        self._load_model()
+        self.cascade = self._load_cascade() if config.local_classifier_cascade_enabled else None
+        self.model_version = self._compute_model_version()
+        
+        # Load gazetteer if enabled and cache exists
+        self.use_gazetteer = use_gazetteer and self.srd_cache_path.exists()
+        if self.use_gazetteer:
+            self._load_gazetteer()
+        else:
+            self.gazetteer_ner = None
+    
+    def _load_mappings(self) -> None:
+        """Load label mappings from training."""
+        mappings_path = self.model_path / 'label_mappings.json'
+        with open(mappings_path) as f:
+            self.mappings = json.load(f)
+        
+        self.tool_to_idx = self.mappings['tool_to_idx']
+        self.idx_to_tool = {int(k): v for k, v in self.mappings['idx_to_tool'].items()}
+        self.tools = list(self.tool_to_idx.keys())
+        
+        self.intent_to_idx_per_tool = self.mappings['intent_to_idx_per_tool']
+        self.idx_to_intent_per_tool = {
+            tool: {int(k): v for k, v in intents.items()}
+            for tool, intents in self.mappings['idx_to_intent_per_tool'].items()
+        }
+        self.num_intents_per_tool = self.mappings['num_intents_per_tool']
+        
+        # Preserved placeholders from training
+        self.preserved_placeholders = self.mappings.get('preserved_placeholders', [
+            '{CHARACTER}', '{PARTY_MEMBER}', '{NPC}'
+        ])
+        
+        print(f"[LocalClassifier] Loaded mappings: {len(self.tools)} tools")
+        for tool, num in self.num_intents_per_tool.items():
+            print(f"  - {tool}: {num} intents")
+    
+    @abstractmethod
+    def _load_model(self) -> None:
+        """Load the model and tokenizer; sets self.tokenizer, self.max_length and self.model_file."""
+        pass
+    
+    @abstractmethod
+    def _forward_batch(
+        self,
+        normalized_queries: List[str],
+        batch_size: int = 32
+    ) -> List[ProbabilityOutput]:
+        """
+        Run the model over normalized queries.
+        
+        Returns:
+            Per-query (tool_probs, {tool: intent_probs}) arrays, temperature-scaled,
+            in input order
+        """
+        pass
+    
+    def _load_cascade(self):
+        """Load the first-stage cascade if one was trained for these label mappings."""
+        from src.config import get_config
+        from .first_stage import load_cascade
+        config = get_config()
+        
+        try:
+            cascade = load_cascade(
+                self.model_path,
+                threshold=config.local_classifier_cascade_threshold,
+                sample_every=config.local_classifier_cascade_sample_every
+            )
+        except Exception as e:
+            print(f"[LocalClassifier] Failed to load first-stage cascade: {e}")
+            return None
+        
+        if cascade and (cascade.first_stage.tools != self.tools or any(
+            cascade.first_stage.intents_per_tool[tool] !=
+            [self.idx_to_intent_per_tool[tool][i] for i in range(len(self.idx_to_intent_per_tool[tool]))]
+            for tool in self.tools
+        )):
+            print("[LocalClassifier] First-stage labels don't match the label mappings, cascade disabled")
+            return None
+        return cascade
+    
+    def _compute_model_version(self) -> str:
+        """Fingerprint of the loaded artifacts (name, size, mtime), used to key cached routing decisions."""
+        from .first_stage import FIRST_STAGE_FILENAME
+        paths = [self.model_path / 'label_mappings.json', self.model_file]
+        if self.cascade:
+            paths.append(self.model_path / FIRST_STAGE_FILENAME)
+        
+        digest = hashlib.sha1()
+        for path in paths:
+            stat = path.stat()
+            digest.update(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns};".encode('utf-8'))
+        return digest.hexdigest()[:12]
+    
+    def _load_gazetteer(self) -> None:
+        """Load gazetteer-based NER for entity extraction."""
+        if self.srd_cache_path and self.srd_cache_path.exists():
+            print(f"[LocalClassifier] Loading gazetteer NER from {self.srd_cache_path}")
+            self.gazetteer_ner = GazetteerEntityExtractor(
+                str(self.srd_cache_path),
+                min_similarity=self.gazetteer_min_similarity
+            )
+        else:
+            print("[LocalClassifier] Gazetteer NER not available (no SRD cache)")
+            self.gazetteer_ner = None
+    
+    def normalize_query(
+        self,
+        query: str,
+        character_name: Optional[str] = None,
+        character_aliases: Optional[List[str]] = None,
+        party_members: Optional[List[str]] = None,
+        known_npcs: Optional[List[str]] = None
+    ) -> str:
+        """
+        The query as the model sees it, with known names replaced by placeholders.
+        
+        For callers that key on or batch by the normalized text (the routing
+        cache, ClassificationDispatcher). Same arguments as classify().
+        """
+        return self._normalize_names(query, character_name, character_aliases, party_members, known_npcs)
+    
+    def _normalize_names(
+        self,
+        query: str,
+        character_name: Optional[str] = None,
+        character_aliases: Optional[List[str]] = None,
+        party_members: Optional[List[str]] = None,
+        known_npcs: Optional[List[str]] = None
+    ) -> str:
+        """
+        Replace known names with placeholder tokens.
+        
+        This aligns runtime queries with the placeholder-based training data.
+        The model was trained on patterns like "What level is {CHARACTER}?"
+        so we need to normalize "What level is Duskryn?" to match.
+        
+        Args:
+            query: The original query text
+            character_name: The player's character name (can be full name like "Duskryn Nightwarden")
+            character_aliases: Optional list of aliases/nicknames (e.g., ["Dusk", "DN"])
+            party_members: List of party member names
+            known_npcs: List of known NPC names
+            
+        Returns:
+            Query with names replaced by placeholders
+        """
+        normalized = query
+        
+        # Helper for case-insensitive whole-word replacement
+        def replace_name(text: str, name: str, placeholder: str) -> str:
+            if not name or len(name) < 2:  # Skip empty or single-char names
+                return text
+            # Match whole word, case-insensitive
+            pattern = re.compile(rf'\b{re.escape(name)}\b', re.IGNORECASE)
+            return pattern.sub(placeholder, text)
+        
+        # Build list of character name variants to match
+        character_variants = []
+        if character_name:
+            # Add full name
+            character_variants.append(character_name)
+            # Add first name (split on space)
+            name_parts = character_name.split()
+            if len(name_parts) > 1:
+                character_variants.append(name_parts[0])  # First name
+                # Optionally add last name too
+                if len(name_parts[-1]) > 2:  # Skip short suffixes like "Jr"
+                    character_variants.append(name_parts[-1])
+        
+        # Add explicit aliases
+        if character_aliases:
+            character_variants.extend(character_aliases)
+        
+        # Replace character name variants (highest priority, longest first)
+        # Sort by length descending to match longer names first (e.g., "Duskryn Nightwarden" before "Duskryn")
+        character_variants = sorted(set(character_variants), key=len, reverse=True)
+        for variant in character_variants:
+            normalized = replace_name(normalized, variant, '{CHARACTER}')
+        
+        # Replace party member names
+        if party_members:
+            for member in party_members:
+                if member:
+                    # Also handle first names for party members
+                    member_parts = member.split()
+                    names_to_check = [member]
+                    if len(member_parts) > 1:
+                        names_to_check.append(member_parts[0])
+                    for name in names_to_check:
+                        # Don't replace if already a placeholder
+                        if '{CHARACTER}' not in name:
+                            normalized = replace_name(normalized, name, '{PARTY_MEMBER}')
+        
+        # Replace NPC names
+        if known_npcs:
+            for npc in known_npcs:
+                if npc:
+                    # Also handle first names for NPCs
+                    npc_parts = npc.split()
+                    names_to_check = [npc]
+                    if len(npc_parts) > 1:
+                        names_to_check.append(npc_parts[0])
+                    for name in names_to_check:
+                        normalized = replace_name(normalized, name, '{NPC}')
+        
+        return normalized
+    
+    def classify_single(
+        self,
+        query: str,
+        character_name: Optional[str] = None,
+        character_aliases: Optional[List[str]] = None,
+        party_members: Optional[List[str]] = None,
+        known_npcs: Optional[List[str]] = None
+    ) -> SingleClassificationResult:
+        """
+        Classify a query and return the single best tool + intent.
+        
+        Args:
+            query: The user's query text
+            character_name: Optional character name for normalization (can be full name)
+            character_aliases: Optional list of character aliases/nicknames
+            party_members: Optional list of party member names
+            known_npcs: Optional list of known NPC names
+            
+        Returns:
+            SingleClassificationResult with tool, intent, and confidence scores
+        """
+        # Normalize names to placeholders
+        normalized_query = self._normalize_names(
+            query, character_name, character_aliases, party_members, known_npcs
+        )
+        
+        tool_probs, intent_probs = self._forward_batch([normalized_query])[0]
+        tool_pred = int(np.argmax(tool_probs))
+        tool_conf = float(tool_probs[tool_pred])
+        tool_name = self.idx_to_tool[tool_pred]
+        
+        # Best intent for the predicted tool
+        intent_pred = int(np.argmax(intent_probs[tool_name]))
+        intent_conf = float(intent_probs[tool_name][intent_pred])
+        intent_name = self.idx_to_intent_per_tool[tool_name][intent_pred]
+        
+        return SingleClassificationResult(
+            tool=tool_name,
+            tool_confidence=tool_conf,
+            intent=intent_name,
+            intent_confidence=intent_conf,
+            normalized_query=normalized_query,
+            combined_confidence=tool_conf * intent_conf
+        )
+    
+    def predict_sync(
+        self,
+        query: str,
+        character_name: Optional[str] = None,
+        character_aliases: Optional[List[str]] = None,
+        party_members: Optional[List[str]] = None,
+        known_npcs: Optional[List[str]] = None,
+        tool_threshold: Optional[float] = None,
+        entities: Optional[List[Dict[str, Any]]] = None
+    ) -> ClassificationResult:
+        """
+        Synchronous prediction returning ClassificationResult for integration.
+        
+        Returns ALL tools with confidence above the threshold, each with their
+        best intent. This allows multi-tool queries like "What spells do I have
+        and how does fireball work?" to route to both character_data AND rulebook.
+        
+        Args:
+            query: The user's query text
+            character_name: Optional character name for normalization
+            character_aliases: Optional list of character aliases/nicknames
+            party_members: Optional list of party member names
+            known_npcs: Optional list of known NPC names
+            tool_threshold: Confidence threshold for tool selection (uses config default if None)
+            entities: Entities already extracted for this query (e.g. by the caller's
+                gazetteer, which knows character/session names); skips extraction here
+            
+        Returns:
+            ClassificationResult with tools_needed, tool_confidences, entities
+        """
+        return self.predict_batch(
+            [query], character_name, character_aliases, party_members, known_npcs,
+            tool_threshold=tool_threshold,
+            entities=[entities] if entities is not None else None
+        )[0]
+    
+    def predict_batch(
+        self,
+        queries: List[str],
+        character_name: Optional[str] = None,
+        character_aliases: Optional[List[str]] = None,
+        party_members: Optional[List[str]] = None,
+        known_npcs: Optional[List[str]] = None,
+        tool_threshold: Optional[float] = None,
+        entities: Optional[List[Optional[List[Dict[str, Any]]]]] = None,
+        batch_size: int = 32
+    ) -> List[ClassificationResult]:
+        """
+        Classify many queries, running the model once per length bucket.
+        
+        Each result matches predict_sync() for that query (up to float rounding
+        from padding within a bucket). inference_time_ms is the batch time
+        divided by the number of queries.
+        
+        Args:
+            queries: The user query texts
+            character_name: Optional character name for normalization (all queries)
+            character_aliases: Optional list of character aliases/nicknames
+            party_members: Optional list of party member names
+            known_npcs: Optional list of known NPC names
+            tool_threshold: Confidence threshold for tool selection (uses config default if None)
+            entities: Optional per-query entities already extracted (None entries are extracted here)
+            batch_size: Maximum queries per forward pass
+            
+        Returns:
+            ClassificationResult per query, in input order
+        """
+        start_time = time.time()
+        
+        # Normalize names to placeholders
+        normalized_queries = [
+            self._normalize_names(query, character_name, character_aliases, party_members, known_npcs)
+            for query in queries
+        ]
+        return self.predict_normalized(queries, normalized_queries, tool_threshold, entities,
+                                       batch_size, start_time)
+    
+    def predict_normalized(
+        self,
+        queries: List[str],
+        normalized_queries: List[str],
+        tool_threshold: Optional[float] = None,
+        entities: Optional[List[Optional[List[Dict[str, Any]]]]] = None,
+        batch_size: int = 32,
+        start_time: Optional[float] = None
+    ) -> List[ClassificationResult]:
+        """
+        Classify queries whose names were already normalized to placeholders.
+        
+        Lets callers batch queries from different characters/campaigns together,
+        each normalized with its own names via _normalize_names().
+        
+        Args:
+            queries: Original query texts (used for entity extraction)
+            normalized_queries: The same queries with names replaced by placeholders
+            tool_threshold: Confidence threshold for tool selection (uses config default if None)
+            entities: Optional per-query entities already extracted
+            batch_size: Maximum queries per forward pass
+            start_time: When the batch started, for inference_time_ms (defaults to now)
+            
+        Returns:
+            ClassificationResult per query, in input order
+        """
+        from src.config import get_config
+        config = get_config()
+        threshold = tool_threshold if tool_threshold is not None else config.local_classifier_tool_threshold
+        
+        if not queries:
+            return []
+        
+        if start_time is None:
+            start_time = time.time()
+        
+        # Confident routine queries are answered by the first stage; the rest
+        # go through the transformer
+        stages = None
+        if self.cascade:
+            outputs, stages = self.cascade.run(
+                normalized_queries, lambda pending: self._forward_batch(pending, batch_size)
+            )
+        else:
+            outputs = self._forward_batch(normalized_queries, batch_size)
+        
+        results = []
+        for index, (query, (tool_probs, intent_probs)) in enumerate(zip(queries, outputs)):
+            query_entities = entities[index] if entities is not None else None
+            results.append(self._build_result(query, tool_probs, intent_probs, threshold, query_entities))
+        
+        per_query_ms = (time.time() - start_time) * 1000 / len(queries)
+        cascade_stats = self.cascade.get_stats() if self.cascade else {}
+        for index, result in enumerate(results):
+            result.inference_time_ms = per_query_ms
+            if stages:
+                result.cascade_stage = stages[index]
+                result.cascade_stats = cascade_stats
+        return results
+    
+    def _build_result(
+        self,
+        query: str,
+        tool_probs: np.ndarray,
+        intent_probs: Dict[str, np.ndarray],
+        threshold: float,
+        entities: Optional[List[Dict[str, Any]]] = None
+    ) -> ClassificationResult:
+        """Turn one query's probabilities into a ClassificationResult."""
+        # Get confidence for all tools
+        tool_confidences = {
+            self.idx_to_tool[i]: float(tool_probs[i])
+            for i in range(len(self.tools))
+        }
+        
+        # Build tools_needed list with ALL tools above threshold
+        tools_needed = []
+        for tool_idx in range(len(self.tools)):
+            tool_name = self.idx_to_tool[tool_idx]
+            tool_conf = float(tool_probs[tool_idx])
+            
+            if tool_conf >= threshold:
+                # Get best intent for this tool
+                intent_pred = int(np.argmax(intent_probs[tool_name]))
+                intent_name = self.idx_to_intent_per_tool[tool_name][intent_pred]
+                
+                tools_needed.append({
+                    'tool': tool_name,
+                    'intention': intent_name,
+                    'confidence': tool_conf
+                })
+        
+        # Sort by confidence descending
+        tools_needed.sort(key=lambda x: x['confidence'], reverse=True)
+        
+        # Fallback: if no tools above threshold, include the best one anyway
+        if not tools_needed:
+            best_tool_idx = int(np.argmax(tool_probs))
+            best_tool_name = self.idx_to_tool[best_tool_idx]
+            best_tool_conf = float(tool_probs[best_tool_idx])
+            
+            intent_pred = int(np.argmax(intent_probs[best_tool_name]))
+            intent_name = self.idx_to_intent_per_tool[best_tool_name][intent_pred]
+            
+            tools_needed.append({
+                'tool': best_tool_name,
+                'intention': intent_name,
+                'confidence': best_tool_conf
+            })
+        
+        # Extract entities using gazetteer NER (if available and not given)
+        if entities is not None:
+            entities = list(entities)
+        elif self.gazetteer_ner:
+            raw_entities = self.gazetteer_ner.extract_simple(query)
+            entities = [
+                {
+                    'name': e['canonical'],
+                    'text': e['text'],
+                    'type': e['type'],
+                    'confidence': e['confidence']
+                }
+                for e in raw_entities
+            ]
+        else:
+            entities = []
+        
+        return ClassificationResult(
+            tools_needed=tools_needed,
+            tool_confidences=tool_confidences,
+            entities=entities,
+            backend='local'
+        )
+    
+    async def classify(
+        self,
+        query: str,
+        character_name: Optional[str] = None,
+        character_aliases: Optional[List[str]] = None,
+        conversation_history: Optional[List[Dict[str, str]]] = None,
+        party_members: Optional[List[str]] = None,
+        known_npcs: Optional[List[str]] = None,
+        entities: Optional[List[Dict[str, Any]]] = None
+    ) -> ClassificationResult:
+        """
+        Async classification method (required by ClassifierBackend protocol).
+        
+        Args:
+            query: The user's query text
+            character_name: Optional character name for normalization
+            character_aliases: Optional list of character aliases/nicknames
+            conversation_history: Optional prior conversation (not used by local model)
+            party_members: Optional list of party member names
+            known_npcs: Optional list of known NPC names
+            entities: Optional entities already extracted for this query
+            
+        Returns:
+            ClassificationResult with tools, intents, and entities
+        """
+        return self.predict_sync(query, character_name, character_aliases, party_members, known_npcs,
+                                 entities=entities)
+    
+    def get_all_tool_confidences(
+        self,
+        query: str,
+        character_name: Optional[str] = None,
+        character_aliases: Optional[List[str]] = None,
+        party_members: Optional[List[str]] = None,
+        known_npcs: Optional[List[str]] = None
+    ) -> Dict[str, float]:
+        """Get confidence scores for all tools."""
+        result = self.predict_sync(query, character_name, character_aliases, party_members, known_npcs)
+        return result.tool_confidences
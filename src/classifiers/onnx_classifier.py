@@ -0,0 +1,144 @@
+"""
+ONNX Runtime backend for the local Joint Tool+Intent classifier.
+
+Serves the int8-quantized ONNX export of JointClassifier produced by
+scripts/export_onnx_classifier.py. The exported graph already includes the
+temperature-scaled softmax, so it outputs calibrated probabilities directly.
+Tokenization uses the standalone `tokenizers` library, so neither torch nor
+transformers is imported.
+
+Artifacts (in <model_path>/onnx/):
+- joint_classifier.int8.onnx: the quantized model, with max_length and
+  pad_token_id in its metadata
+- tokenizer.json: the serialized fast tokenizer
+"""
+
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+from .local_classifier_base import LocalClassifierBase, ProbabilityOutput
+
+# Use try/except for onnxruntime as it may not be installed
+try:
+    import onnxruntime as ort
+    from tokenizers import Tokenizer
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ONNXRUNTIME_AVAILABLE = False
+
+ONNX_SUBDIR = 'onnx'
+ONNX_MODEL_FILENAME = 'joint_classifier.int8.onnx'
+ONNX_TOKENIZER_FILENAME = 'tokenizer.json'
+ONNX_EXPORT_FORMAT = '1'
+
+# Graph outputs, in order: tool probabilities, then intent probabilities per tool
+ONNX_INPUT_NAMES = ['input_ids', 'attention_mask']
+ONNX_OUTPUT_NAMES = ['tool_probs', 'character_data_probs', 'session_notes_probs', 'rulebook_probs']
+
+
+class OnnxLocalClassifier(LocalClassifierBase):
+    """
+    Local classifier served from the int8 ONNX export (no torch).
+
+    Same API and results as LocalClassifier, up to quantization error.
+    """
+
+    def __init__(
+        self,
+        model_path: Optional[str] = None,
+        srd_cache_path: Optional[str] = None,
+        use_gazetteer: bool = True,
+        gazetteer_min_similarity: float = 0.80,
+        onnx_path: Optional[str] = None,
+        num_threads: Optional[int] = None,
+    ):
+        """
+        Initialize the ONNX classifier.
+
+        Args:
+            model_path: Path to the trained model directory (label mappings). If None, uses config default.
+            srd_cache_path: Path to SRD cache for gazetteer NER. If None, uses config default.
+            use_gazetteer: Whether to use gazetteer NER for entity extraction.
+            gazetteer_min_similarity: Minimum similarity for gazetteer matching.
+            onnx_path: Directory with the ONNX artifacts (default: <model_path>/onnx)
+            num_threads: onnxruntime intra-op threads (default: onnxruntime's choice)
+        """
+        if not ONNXRUNTIME_AVAILABLE:
+            raise ImportError("onnxruntime and tokenizers are required for the ONNX classifier backend")
+
+        self.onnx_path = Path(onnx_path) if onnx_path else None
+        self.num_threads = num_threads
+        super().__init__(model_path, srd_cache_path, use_gazetteer, gazetteer_min_similarity)
+
+    def _load_model(self) -> None:
+        """Load the ONNX session, its metadata, and the tokenizer."""
+        onnx_dir = self.onnx_path or self.model_path / ONNX_SUBDIR
+        model_file = onnx_dir / ONNX_MODEL_FILENAME
+        tokenizer_file = onnx_dir / ONNX_TOKENIZER_FILENAME
+        if not model_file.exists() or not tokenizer_file.exists():
+            raise FileNotFoundError(
+                f"No ONNX export found at {onnx_dir} (run scripts/export_onnx_classifier.py)"
+            )
+
+        print(f"[LocalClassifier] Loading ONNX model from {model_file}")
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if self.num_threads:
+            options.intra_op_num_threads = self.num_threads
+        self.session = ort.InferenceSession(
+            str(model_file), sess_options=options, providers=['CPUExecutionProvider']
+        )
+
+        self.model_file = model_file
+
+        metadata = self.session.get_modelmeta().custom_metadata_map
+        if metadata.get('export_format') != ONNX_EXPORT_FORMAT:
+            raise ValueError(
+                f"Unsupported ONNX export format {metadata.get('export_format')!r} in {model_file}"
+            )
+        self.max_length = int(metadata['max_length'])
+        self.pad_token_id = int(metadata['pad_token_id'])
+
+        self.tokenizer = Tokenizer.from_file(str(tokenizer_file))
+        self.tokenizer.no_padding()
+        self.tokenizer.enable_truncation(max_length=self.max_length)
+
+        print(f"[LocalClassifier] ONNX model loaded (max_length={self.max_length})")
+
+    def _forward_batch(
+        self,
+        normalized_queries: List[str],
+        batch_size: int = 32
+    ) -> List[ProbabilityOutput]:
+        """
+        Run the ONNX model over normalized queries with length bucketing.
+
+        Same bucketing as LocalClassifier._forward_batch: each bucket is padded
+        only to its longest query.
+
+        Returns:
+            Per-query (tool_probs, {tool: intent_probs}) numpy arrays, in input order
+        """
+        input_ids = [encoding.ids for encoding in self.tokenizer.encode_batch(normalized_queries)]
+        order = sorted(range(len(input_ids)), key=lambda i: len(input_ids[i]))
+
+        outputs: List[Optional[ProbabilityOutput]] = [None] * len(input_ids)
+        for start in range(0, len(order), batch_size):
+            bucket = order[start:start + batch_size]
+            width = max(len(input_ids[i]) for i in bucket)
+            ids = np.full((len(bucket), width), self.pad_token_id, dtype=np.int64)
+            mask = np.zeros((len(bucket), width), dtype=np.int64)
+            for row, index in enumerate(bucket):
+                ids[row, :len(input_ids[index])] = input_ids[index]
+                mask[row, :len(input_ids[index])] = 1
+
+            tool_probs, *intent_probs = self.session.run(
+                ONNX_OUTPUT_NAMES, {'input_ids': ids, 'attention_mask': mask}
+            )
+            intent_probs = dict(zip(['character_data', 'session_notes', 'rulebook'], intent_probs))
+            for row, index in enumerate(bucket):
+                outputs[index] = (tool_probs[row], {tool: intent_probs[tool][row] for tool in self.tools})
+
+        return outputs
@@ -0,0 +1,242 @@
+"""
+Routing Cache
+
+Process-wide cache of routing decisions (the tools_needed list, plus the local
+classifier's tool confidences), shared by the Haiku tool selector and the
+local classifier.
+
+After entity placeholders are applied, many queries collapse to the same
+normalized text ("What level is {CHARACTER}?"), so a decision is keyed on
+(routing mode, normalized query, model version):
+- mode: "llm" (the Haiku tool selector) or "local", the backend that decided
+- normalized query: whitespace-collapsed and casefolded
+- model version: the router model for Haiku, the checkpoint fingerprint for
+  the local classifier, so retraining or switching models starts cold
+
+Entries expire after a TTL and the in-memory tier is an LRU bounded by size.
+An optional SQLite file keeps decisions across restarts: memory misses fall
+through to it, and puts are written behind in batches by a background thread
+(never on the caller's thread), trimming the file to the same size bound.
+"""
+
+import copy
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+RoutingKey = Tuple[str, str, str]  # (mode, normalized query, model version)
+
+
+def routing_key(mode: str, query: str, model_version: str) -> RoutingKey:
+    """Cache key for a routing decision; queries differing only in case or spacing share it."""
+    return (mode, " ".join(query.split()).casefold(), model_version)
+
+
+@dataclass
+class _Entry:
+    decision: Dict[str, Any]
+    created_at: float
+    cost_ms: float  # What the miss cost, credited back on every hit
+
+
+@dataclass
+class RoutingCacheStats:
+    """Counters for hit rates and the routing time/API calls saved."""
+    hits: Dict[str, int] = field(default_factory=dict)
+    misses: Dict[str, int] = field(default_factory=dict)
+    persistent_hits: int = 0
+    expired: int = 0
+    saved_ms: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        modes = sorted(set(self.hits) | set(self.misses))
+        lookups = sum(self.hits.values()) + sum(self.misses.values())
+        return {
+            'lookups': lookups,
+            'hits': sum(self.hits.values()),
+            'hit_rate': sum(self.hits.values()) / lookups if lookups else 0.0,
+            'hit_rate_by_mode': {
+                mode: self.hits.get(mode, 0) / (self.hits.get(mode, 0) + self.misses.get(mode, 0))
+                for mode in modes
+            },
+            'llm_calls_saved': self.hits.get('llm', 0),
+            'persistent_hits': self.persistent_hits,
+            'expired': self.expired,
+            'saved_ms': round(self.saved_ms, 1),
+        }
+
+
+class RoutingCache:
+    """Thread-safe TTL + LRU cache of routing decisions with an optional SQLite tier."""
+
+    def __init__(self, max_size: int = 4096, ttl_seconds: float = 86400.0, persist_path: Optional[str] = None):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.entries: 'OrderedDict[RoutingKey, _Entry]' = OrderedDict()
+        self.stats = RoutingCacheStats()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()  # The connection is used from the caller's and the writer's threads
+        self._pending: Dict[RoutingKey, _Entry] = {}  # Puts not yet written to the persistent tier
+        self._writer: Optional[ThreadPoolExecutor] = None
+        if persist_path:
+            self._open_db(Path(persist_path))
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _open_db(self, path: Path) -> None:
+        """Open the persistent tier, dropping expired rows and trimming it to max_size."""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(path), check_same_thread=False)
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS routing_cache ("
+                " mode TEXT, query TEXT, model_version TEXT, decision TEXT,"
+                " created_at REAL, cost_ms REAL,"
+                " PRIMARY KEY (mode, query, model_version))"
+            )
+            db.execute("DELETE FROM routing_cache WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+            self._trim(db)
+            db.commit()
+            rows = db.execute("SELECT COUNT(*) FROM routing_cache").fetchone()[0]
+            print(f"[RoutingCache] Persistent tier at {path} ({rows} decisions)")
+            self._db = db
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="routing-cache")
+        except sqlite3.Error as e:
+            print(f"[RoutingCache] Persistent tier disabled, could not open {path}: {e}")
+
+    def _trim(self, db: sqlite3.Connection) -> None:
+        """Keep only the max_size newest rows."""
+        db.execute(
+            "DELETE FROM routing_cache WHERE rowid NOT IN "
+            "(SELECT rowid FROM routing_cache ORDER BY created_at DESC, rowid DESC LIMIT ?)",
+            (self.max_size,)
+        )
+
+    def _load_persisted(self, key: RoutingKey) -> Optional[_Entry]:
+        if self._db is None:
+            return None
+        pending = self._pending.get(key)
+        if pending is not None:
+            return pending
+        try:
+            with self._db_lock:
+                row = self._db.execute(
+                    "SELECT decision, created_at, cost_ms FROM routing_cache"
+                    " WHERE mode = ? AND query = ? AND model_version = ?",
+                    key
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"[RoutingCache] Persistent read failed: {e}")
+            return None
+        if row is None:
+            return None
+        return _Entry(json.loads(row[0]), row[1], row[2])
+
+    def get(self, mode: str, query: str, model_version: str) -> Optional[Dict[str, Any]]:
+        """Get a copy of the cached decision (None on a miss or after the TTL)."""
+        key = routing_key(mode, query, model_version)
+        now = time.time()
+        with self._lock:
+            entry = self.entries.get(key)
+            from_disk = False
+            if entry is None:
+                entry = self._load_persisted(key)
+                from_disk = entry is not None
+            if entry is not None and now - entry.created_at > self.ttl_seconds:
+                self.entries.pop(key, None)
+                self.stats.expired += 1
+                entry = None
+            if entry is None:
+                self.stats.misses[mode] = self.stats.misses.get(mode, 0) + 1
+                return None
+
+            if from_disk:
+                self.stats.persistent_hits += 1
+                self._store(key, entry)
+            else:
+                self.entries.move_to_end(key)
+            self.stats.hits[mode] = self.stats.hits.get(mode, 0) + 1
+            self.stats.saved_ms += entry.cost_ms
+            return copy.deepcopy(entry.decision)
+
+    def put(self, mode: str, query: str, model_version: str, decision: Dict[str, Any], cost_ms: float = 0.0) -> None:
+        """Store a decision in memory and queue it for the persistent tier, if enabled."""
+        key = routing_key(mode, query, model_version)
+        entry = _Entry(copy.deepcopy(decision), time.time(), cost_ms)
+        with self._lock:
+            self._store(key, entry)
+            if self._writer is not None:
+                # One flush per batch: puts arriving before it runs join the same transaction
+                if not self._pending:
+                    self._writer.submit(self.flush)
+                self._pending[key] = entry
+
+    def flush(self) -> None:
+        """Write queued puts to the persistent tier and trim it to max_size."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending or self._db is None:
+            return
+        try:
+            with self._db_lock:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO routing_cache VALUES (?, ?, ?, ?, ?, ?)",
+                    [(*key, json.dumps(e.decision), e.created_at, e.cost_ms) for key, e in pending.items()]
+                )
+                self._trim(self._db)
+                self._db.commit()
+        except sqlite3.Error as e:
+            print(f"[RoutingCache] Persistent write failed: {e}")
+
+    def _store(self, key: RoutingKey, entry: _Entry) -> None:
+        """Insert into the LRU, evicting the least recently used decisions (lock held)."""
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'size': len(self.entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl_seconds,
+                'persistent': self._db is not None,
+                **self.stats.to_dict(),
+            }
+
+    def clear(self) -> None:
+        """Drop every decision from both tiers and reset the stats."""
+        with self._lock:
+            self.entries.clear()
+            self.stats = RoutingCacheStats()
+            self._pending.clear()
+            if self._db is not None:
+                with self._db_lock:
+                    self._db.execute("DELETE FROM routing_cache")
+                    self._db.commit()
+
+
+_routing_cache: Optional[RoutingCache] = None
+
+
+def get_routing_cache() -> RoutingCache:
+    """Get or create the process-wide routing cache (settings from config)."""
+    global _routing_cache
+    if _routing_cache is None:
+        from src.config import get_config
+        config = get_config()
+        _routing_cache = RoutingCache(
+            max_size=config.routing_cache_size,
+            ttl_seconds=config.routing_cache_ttl_seconds,
+            persist_path=config.routing_cache_path or None
+        )
+    return _routing_cache
@@ -0,0 +1,269 @@
+"""
+Shared SRD gazetteer for entity extraction.
+
+The SRD entities (spells, monsters, items, ...) and their exact and fuzzy
+match indexes are identical for every character, so they are loaded once per
+process and shared by every GazetteerEntityExtractor. Extractors keep only
+their dynamic character/party/session entities in a small overlay.
+
+Building the indexes dominates startup, so the compiled gazetteer is also
+written to a versioned artifact next to the SRD cache (see
+scripts/build_gazetteer_artifact.py) and unpickled on later starts. The
+artifact records a fingerprint of the source JSON files and is rebuilt
+automatically whenever they change.
+"""
+
+import hashlib
+import itertools
+import json
+import os
+import pickle
+import threading
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from .aho_corasick import AhoCorasick
+from .fuzzy_index import FuzzyCandidateIndex
+
+
+# Mapping from SRD cache file to entity type
+GAZETTEER_MAPPING = {
+    'spells': 'SPELL',
+    'classes': 'CLASS',
+    'subclasses': 'CLASS',
+    'races': 'RACE',
+    'monsters': 'CREATURE',
+    'equipment': 'ITEM',
+    'magic-items': 'ITEM',
+    'conditions': 'CONDITION',
+    'damage-types': 'DAMAGE_TYPE',
+    'skills': 'SKILL',
+    'features': 'FEAT',
+    'traits': 'FEAT',
+    'backgrounds': 'BACKGROUND',
+    'ability-scores': 'ABILITY',
+}
+
+# Common D&D entities that aren't in the SRD API files
+STATIC_DND_ENTITIES: Dict[str, List[str]] = {
+    'ITEM_CATEGORY': [
+        # Armor categories
+        "Light Armor", "Medium Armor", "Heavy Armor",
+        "Shields", "Armor Class", "AC",
+        # Weapon categories
+        "Simple Weapons", "Martial Weapons",
+        "Simple Melee Weapons", "Simple Ranged Weapons",
+        "Martial Melee Weapons", "Martial Ranged Weapons",
+        "Melee Weapons", "Ranged Weapons", "Finesse Weapons",
+    ],
+    # Ability scores (full names for better matching)
+    'ABILITY': [
+        "Strength", "Dexterity", "Constitution",
+        "Intelligence", "Wisdom", "Charisma",
+    ],
+    # Common D&D mechanics terms
+    'MECHANIC': [
+        "Proficiency Bonus", "Spell Save DC", "Spell Attack",
+        "Attack Roll", "Damage Roll", "Saving Throw",
+        "Ability Check", "Skill Check", "Initiative",
+        "Hit Points", "Hit Dice", "Death Saving Throw",
+    ],
+}
+
+
+# Gazetteer index versions, unique within the process (keys for extraction caches)
+_index_versions = itertools.count(1)
+
+
+class GazetteerIndex:
+    """
+    Immutable gazetteer entries with their exact and fuzzy match indexes.
+
+    `entries` maps lowercase name -> (canonical_name, type) in insertion
+    order; `rank` gives each name's position in that order (used to break
+    ties between equal-length exact matches). `version` is unique per
+    built or loaded index within the process.
+    """
+
+    def __init__(self, entries: Mapping[str, Tuple[str, str]]):
+        self.entries: Mapping[str, Tuple[str, str]] = MappingProxyType(dict(entries))
+        self.names: List[str] = list(self.entries)
+        self.rank: Dict[str, int] = {name: rank for rank, name in enumerate(self.names)}
+        self.automaton = AhoCorasick(self.names)
+        self.fuzzy_index = FuzzyCandidateIndex(self.names)
+        self.version = next(_index_versions)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = dict(self.__dict__)
+        state['entries'] = dict(self.entries)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        state['entries'] = MappingProxyType(state['entries'])
+        state['version'] = next(_index_versions)
+        self.__dict__.update(state)
+
+
+def load_srd_entries(cache_path: Path) -> Dict[str, Tuple[str, str]]:
+    """Read every SRD cache file plus the static D&D entities."""
+    cache_path = Path(cache_path)
+    entries: Dict[str, Tuple[str, str]] = {}
+
+    for filename, entity_type in GAZETTEER_MAPPING.items():
+        filepath = cache_path / f"{filename}.json"
+        if not filepath.exists():
+            continue
+
+        try:
+            with open(filepath) as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            continue
+
+        # Handle different file structures
+        if 'results' in data:
+            entities = data['results']
+        elif isinstance(data, list):
+            entities = data
+        else:
+            continue
+
+        for entity in entities:
+            if isinstance(entity, dict) and 'name' in entity:
+                name = entity['name']
+                entries[name.lower()] = (name, entity_type)
+
+    for entity_type, names in STATIC_DND_ENTITIES.items():
+        for name in names:
+            entries[name.lower()] = (name, entity_type)
+
+    return entries
+
+
+# ===== COMPILED ARTIFACT =====
+# Bump when GazetteerIndex, AhoCorasick or FuzzyCandidateIndex internals change
+ARTIFACT_FORMAT_VERSION = 1
+
+
+def default_artifact_path(cache_path: Path) -> Path:
+    """Artifact location for an SRD cache directory (a sibling file)."""
+    cache_path = Path(cache_path).resolve()
+    return cache_path.parent / f"{cache_path.name}.gazetteer.pkl"
+
+
+def source_fingerprint(cache_path: Path) -> str:
+    """Hash of everything the compiled gazetteer is built from."""
+    cache_path = Path(cache_path)
+    digest = hashlib.sha1()
+    digest.update(json.dumps([ARTIFACT_FORMAT_VERSION, GAZETTEER_MAPPING, STATIC_DND_ENTITIES]).encode('utf-8'))
+    for filename in GAZETTEER_MAPPING:
+        filepath = cache_path / f"{filename}.json"
+        digest.update(filename.encode('utf-8'))
+        try:
+            digest.update(filepath.read_bytes())
+        except OSError:
+            digest.update(b'<missing>')
+    return digest.hexdigest()
+
+
+def load_artifact(artifact_path: Path, fingerprint: str) -> Optional[GazetteerIndex]:
+    """
+    Load a compiled gazetteer.
+
+    Returns:
+        The GazetteerIndex, or None if the artifact is missing, unreadable or
+        was built from different sources
+    """
+    artifact_path = Path(artifact_path)
+    if not artifact_path.exists():
+        return None
+
+    try:
+        with open(artifact_path, 'rb') as f:
+            # The header is a separate pickle so stale artifacts are rejected without loading the index
+            header = pickle.load(f)
+            if header.get('fingerprint') != fingerprint:
+                print(f"[GazetteerNER] Gazetteer artifact {artifact_path} is outdated, rebuilding")
+                return None
+            gazetteer = pickle.load(f)
+    except Exception as e:
+        print(f"[GazetteerNER] Ignoring unreadable gazetteer artifact {artifact_path}: {e}")
+        return None
+
+    return gazetteer if isinstance(gazetteer, GazetteerIndex) else None
+
+
+def save_artifact(artifact_path: Path, gazetteer: GazetteerIndex, fingerprint: str) -> bool:
+    """Write a compiled gazetteer atomically. Returns False if the location is not writable."""
+    artifact_path = Path(artifact_path)
+    tmp_path = artifact_path.with_name(f"{artifact_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({'fingerprint': fingerprint, 'entities': len(gazetteer)}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(gazetteer, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, artifact_path)
+        return True
+    except OSError as e:
+        print(f"[GazetteerNER] Could not write gazetteer artifact {artifact_path}: {e}")
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        return False
+
+
+def build_srd_gazetteer(cache_path: Path, artifact_path: Optional[Path] = None, force: bool = False) -> GazetteerIndex:
+    """
+    Load the compiled SRD gazetteer, rebuilding and saving it if it is stale.
+
+    Args:
+        cache_path: SRD cache directory
+        artifact_path: Compiled artifact location (default: next to the cache directory)
+        force: Rebuild even if the artifact is current
+    """
+    artifact_path = Path(artifact_path) if artifact_path else default_artifact_path(cache_path)
+    fingerprint = source_fingerprint(cache_path)
+
+    if not force:
+        gazetteer = load_artifact(artifact_path, fingerprint)
+        if gazetteer is not None:
+            return gazetteer
+
+    gazetteer = GazetteerIndex(load_srd_entries(cache_path))
+    save_artifact(artifact_path, gazetteer, fingerprint)
+    return gazetteer
+
+
+# ===== PROCESS-WIDE SRD GAZETTEERS =====
+# One immutable index per SRD cache directory, shared by all extractors
+_srd_gazetteers: Dict[Path, GazetteerIndex] = {}
+_srd_gazetteers_lock = threading.Lock()
+
+
+def get_srd_gazetteer(cache_path: Path) -> GazetteerIndex:
+    """Get or build the shared SRD gazetteer for a cache directory."""
+    key = Path(cache_path).resolve()
+    gazetteer = _srd_gazetteers.get(key)
+    if gazetteer is not None:
+        return gazetteer
+
+    with _srd_gazetteers_lock:
+        gazetteer = _srd_gazetteers.get(key)
+        if gazetteer is None:
+            gazetteer = build_srd_gazetteer(key)
+            _srd_gazetteers[key] = gazetteer
+            print(f"[GazetteerNER] Loaded {len(gazetteer)} entities from gazetteers")
+    return gazetteer
+
+
+def clear_srd_gazetteers(cache_path: Optional[Path] = None) -> None:
+    """Drop shared SRD gazetteers (all, or one cache directory) so they reload from disk."""
+    with _srd_gazetteers_lock:
+        if cache_path is None:
+            _srd_gazetteers.clear()
+        else:
+            _srd_gazetteers.pop(Path(cache_path).resolve(), None)
@@ -112,6 +112,30 @@ class RAGConfig:
     
     # Caching Settings
     embedding_cache_size: int = 1000
+    entity_extraction_cache_size: int = 4096  # Gazetteer extraction results (per process)
+    session_snapshot_dir: str = ""  # Local session snapshot directory for faster cold starts (empty = disabled)
+    
+    # Conversation Memory Settings (history sent with every prompt)
+    conversation_token_budget: int = 4000  # Recent turns + summary, in estimated tokens
+    conversation_summary_tokens: int = 600  # Part of the budget reserved for the summary of older turns
+    conversation_max_turn_tokens: int = 800  # Stored turns are clipped to this (drops long rule/stat dumps)
+    conversation_summary_enabled: bool = True  # Summarize folded turns with the router LLM (off = short notes)
+    
+    # Final Prompt Context Settings (retrieved context is deduplicated and packed by relevance)
+    context_token_budget: int = 10000  # All retrieved context in the final response prompt, in estimated tokens
+    context_character_tokens: int = 4000
+    context_rulebook_tokens: int = 3500
+    context_session_notes_tokens: int = 3000
+    context_entity_tokens: int = 1500
+    
+    # RAG Tool Query Settings (tool queries run concurrently on a bounded thread pool)
+    rag_max_workers: int = 4  # Threads shared by all RAG tool queries in the process
+    rag_character_timeout_seconds: float = 5.0
+    rag_session_notes_timeout_seconds: float = 20.0
+    rag_rulebook_timeout_seconds: float = 60.0  # First query may load the reranker
+    speculative_retrieval_enabled: bool = True  # Start likely tool queries while the LLM router runs
+    speculative_max_queries: int = 2  # Predicted tool queries started per message
+    speculative_max_workers: int = 2  # Threads for speculative queries, separate from rag_max_workers
     
     # Local Model Settings (if using local models)
     local_model_device: str = "cpu"  # or "cuda" if GPU available
@@ -120,7 +144,13 @@ class RAGConfig:
     local_classifier_model_path: str = "models/routing_classifier"
     local_classifier_srd_cache: str = "src/classifiers/data/srd_cache"
     local_classifier_device: str = "auto"  # auto, cuda, mps, cpu
+    local_classifier_backend: str = "torch"  # torch (checkpoint) or onnx (int8 export, no torch)
     local_classifier_tool_threshold: float = 0.5  # Confidence threshold for tool selection
+    local_classifier_cascade_enabled: bool = True  # Use the first-stage model when one was trained
+    local_classifier_cascade_threshold: float = 0.9  # First stage answers at this calibrated confidence
+    local_classifier_cascade_sample_every: int = 20  # Re-check every Nth first-stage answer with the transformer
+    local_classifier_batch_wait_ms: float = 5.0  # How long the dispatcher waits to fill a batch
+    local_classifier_max_batch_size: int = 32  # Maximum queries per batched forward pass
     gazetteer_min_similarity: float = 0.70  # Minimum similarity for gazetteer NER matching (lower = more permissive)
 
     # Routing Mode - Controls which classifier is used for tool/intention routing
@@ -129,6 +159,10 @@ class RAGConfig:
     #   "local"      - Use local DeBERTa classifier for routing (fast, no API calls)
     #   "comparison" - Run BOTH classifiers, Haiku is primary, local shown in UI for comparison
     routing_mode: str = "comparison"  # Run both for UI comparison
+    routing_cache_enabled: bool = True  # Reuse routing decisions for repeated normalized queries (not in "haiku" mode)
+    routing_cache_size: int = 4096  # Decisions kept in memory (and in the persistent tier)
+    routing_cache_ttl_seconds: float = 86400.0  # Decisions older than this are re-routed
+    routing_cache_path: str = ""  # SQLite file that keeps decisions across restarts (empty = memory only)
     
     # Rulebook Retrieval Settings
     # Cross-encoder reranking for improved retrieval precision
@@ -213,17 +247,45 @@ class RAGConfig:
             entity_boost_weight=env_or_default('RAG_ENTITY_BOOST_WEIGHT', 'entity_boost_weight', float),
             context_hint_weight=env_or_default('RAG_CONTEXT_HINT_WEIGHT', 'context_hint_weight', float),
             embedding_cache_size=env_or_default('RAG_CACHE_SIZE', 'embedding_cache_size', int),
+            entity_extraction_cache_size=env_or_default('RAG_EXTRACTION_CACHE_SIZE', 'entity_extraction_cache_size', int),
+            session_snapshot_dir=env_or_default('RAG_SESSION_SNAPSHOT_DIR', 'session_snapshot_dir'),
             local_model_device=env_or_default('RAG_LOCAL_DEVICE', 'local_model_device'),
+            conversation_token_budget=env_or_default('RAG_CONVERSATION_TOKEN_BUDGET', 'conversation_token_budget', int),
+            conversation_summary_tokens=env_or_default('RAG_CONVERSATION_SUMMARY_TOKENS', 'conversation_summary_tokens', int),
+            conversation_max_turn_tokens=env_or_default('RAG_CONVERSATION_MAX_TURN_TOKENS', 'conversation_max_turn_tokens', int),
+            conversation_summary_enabled=env_or_default('RAG_CONVERSATION_SUMMARY_ENABLED', 'conversation_summary_enabled', bool),
+            context_token_budget=env_or_default('RAG_CONTEXT_TOKEN_BUDGET', 'context_token_budget', int),
+            context_character_tokens=env_or_default('RAG_CONTEXT_CHARACTER_TOKENS', 'context_character_tokens', int),
+            context_rulebook_tokens=env_or_default('RAG_CONTEXT_RULEBOOK_TOKENS', 'context_rulebook_tokens', int),
+            context_session_notes_tokens=env_or_default('RAG_CONTEXT_SESSION_NOTES_TOKENS', 'context_session_notes_tokens', int),
+            context_entity_tokens=env_or_default('RAG_CONTEXT_ENTITY_TOKENS', 'context_entity_tokens', int),
+            rag_max_workers=env_or_default('RAG_MAX_WORKERS', 'rag_max_workers', int),
+            rag_character_timeout_seconds=env_or_default('RAG_CHARACTER_TIMEOUT_SECONDS', 'rag_character_timeout_seconds', float),
+            rag_session_notes_timeout_seconds=env_or_default('RAG_SESSION_NOTES_TIMEOUT_SECONDS', 'rag_session_notes_timeout_seconds', float),
+            rag_rulebook_timeout_seconds=env_or_default('RAG_RULEBOOK_TIMEOUT_SECONDS', 'rag_rulebook_timeout_seconds', float),
+            speculative_retrieval_enabled=env_or_default('RAG_SPECULATIVE_RETRIEVAL_ENABLED', 'speculative_retrieval_enabled', bool),
+            speculative_max_queries=env_or_default('RAG_SPECULATIVE_MAX_QUERIES', 'speculative_max_queries', int),
+            speculative_max_workers=env_or_default('RAG_SPECULATIVE_MAX_WORKERS', 'speculative_max_workers', int),
             
             # Local Classifier Settings
             local_classifier_model_path=env_or_default('RAG_LOCAL_CLASSIFIER_MODEL_PATH', 'local_classifier_model_path'),
             local_classifier_srd_cache=env_or_default('RAG_LOCAL_CLASSIFIER_SRD_CACHE', 'local_classifier_srd_cache'),
             local_classifier_device=env_or_default('RAG_LOCAL_CLASSIFIER_DEVICE', 'local_classifier_device'),
+            local_classifier_backend=env_or_default('RAG_LOCAL_CLASSIFIER_BACKEND', 'local_classifier_backend'),
             local_classifier_tool_threshold=env_or_default('RAG_LOCAL_CLASSIFIER_TOOL_THRESHOLD', 'local_classifier_tool_threshold', float),
+            local_classifier_cascade_enabled=env_or_default('RAG_LOCAL_CLASSIFIER_CASCADE_ENABLED', 'local_classifier_cascade_enabled', bool),
+            local_classifier_cascade_threshold=env_or_default('RAG_LOCAL_CLASSIFIER_CASCADE_THRESHOLD', 'local_classifier_cascade_threshold', float),
+            local_classifier_cascade_sample_every=env_or_default('RAG_LOCAL_CLASSIFIER_CASCADE_SAMPLE_EVERY', 'local_classifier_cascade_sample_every', int),
+            local_classifier_batch_wait_ms=env_or_default('RAG_LOCAL_CLASSIFIER_BATCH_WAIT_MS', 'local_classifier_batch_wait_ms', float),
+            local_classifier_max_batch_size=env_or_default('RAG_LOCAL_CLASSIFIER_MAX_BATCH_SIZE', 'local_classifier_max_batch_size', int),
             gazetteer_min_similarity=env_or_default('RAG_GAZETTEER_MIN_SIMILARITY', 'gazetteer_min_similarity', float),
 
             # Routing Mode
             routing_mode=env_or_default('RAG_ROUTING_MODE', 'routing_mode'),
+            routing_cache_enabled=env_or_default('RAG_ROUTING_CACHE_ENABLED', 'routing_cache_enabled', bool),
+            routing_cache_size=env_or_default('RAG_ROUTING_CACHE_SIZE', 'routing_cache_size', int),
+            routing_cache_ttl_seconds=env_or_default('RAG_ROUTING_CACHE_TTL_SECONDS', 'routing_cache_ttl_seconds', float),
+            routing_cache_path=env_or_default('RAG_ROUTING_CACHE_PATH', 'routing_cache_path'),
             
             # Rulebook Retrieval Settings
             rulebook_reranker_model=env_or_default('RAG_RULEBOOK_RERANKER_MODEL', 'rulebook_reranker_model'),
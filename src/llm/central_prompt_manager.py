@@ -5,10 +5,11 @@ Builds all prompts and coordinates between components. No LLM calls - just promp
 and component coordination.
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from src.rag.character.character_query_types import CharacterPromptHelper
 from src.rag.rulebook.rulebook_types import RulebookPromptHelper
 from src.rag.session_notes.session_types import SessionNotesPromptHelper
+from src.utils.token_estimation import estimate_tokens
 
 
 class CentralPromptManager:
@@ -240,79 +241,53 @@ Return ONLY valid JSON:
 
 IMPORTANT: Return valid JSON only. No explanations.{inventory_context}'''
 
+    def get_conversation_summary_prompt(self, previous_summary: str, turns: List[Dict[str, str]], max_tokens: int) -> str:
+        """
+        Build prompt for folding older conversation turns into the running summary.
+        
+        Args:
+            previous_summary: The summary so far (may be empty)
+            turns: Turns being folded, oldest first
+            max_tokens: Approximate length limit for the new summary
+        """
+        transcript = "\n".join(f"{t.get('role', 'unknown').upper()}: {t.get('content', '')}" for t in turns)
+        previous = previous_summary or "(none yet)"
+        
+        return f'''You maintain a running summary of a conversation between a D&D player and their assistant.
+
+--- SUMMARY SO FAR ---
+{previous}
+--- END SUMMARY ---
+
+--- NEW TURNS ---
+{transcript}
+--- END TURNS ---
+
+Update the summary to cover the new turns. Keep what later questions may refer back to:
+the topics asked about, decisions and conclusions reached, and names of characters, NPCs,
+items, spells and places. Leave out rule text and stat details that can be looked up again.
+
+Write at most {max_tokens * 3 // 4} words as short bullet points ("- ..."). Return only the summary.'''
+
     def get_final_response_prompt(self, raw_results: Dict[str, Any], user_query: str) -> str:
         """
         Build the final response prompt using assembled context data.
         Creates a professional prompt that makes the AI act as an authoritative knowledge source.
         """
-        import json
-        
-        context_sections = []
-        
-        # Process character data
-        if "character" in raw_results and raw_results["character"]:
-            char_result = raw_results["character"]
-            
-            if hasattr(char_result, 'character_data') and char_result.character_data:
-                try:
-                    def custom_serializer(obj):
-                        """Custom serializer for complex objects"""
-                        if hasattr(obj, '__dict__'):
-                            return obj.__dict__
-                        elif hasattr(obj, '_asdict'):
-                            return obj._asdict()
-                        else:
-                            return str(obj)
-                    
-                    char_data_json = json.dumps(char_result.character_data, indent=2, default=custom_serializer)
-                    context_sections.append(f"CHARACTER INFORMATION:\n{char_data_json}")
-                    
-                except Exception as e:
-                    context_sections.append(f"CHARACTER INFORMATION:\n{str(char_result.character_data)}")
-        
-        # Process rulebook data
-        if "rulebook" in raw_results and raw_results["rulebook"]:
-            rulebook_result = raw_results["rulebook"]
-            
-            if isinstance(rulebook_result, tuple) and len(rulebook_result) >= 2:
-                search_results, performance = rulebook_result
-                if search_results:
-                    rulebook_content = []
-                    for i, result in enumerate(search_results, 1):
-                        if hasattr(result, 'section'):
-                            rulebook_content.append(f"RULE SECTION: {result.section.title}")
-                            rulebook_content.append(f"{result.section.content}")
-                    
-                    if rulebook_content:
-                        context_sections.append("RULES REFERENCE:\n" + "\n\n".join(rulebook_content))
-        
-        # Process session notes data
-        if "session_notes" in raw_results and raw_results["session_notes"]:
-            session_result = raw_results["session_notes"]
-            
-            if hasattr(session_result, 'contexts') and session_result.contexts:
-                session_content = []
-                for i, context in enumerate(session_result.contexts, 1):
-                    session_content.append(f"SESSION CONTEXT {i}: {str(context)}")
-                
-                if session_content:
-                    context_sections.append("CAMPAIGN HISTORY:\n" + "\n\n".join(session_content))
+        return self.build_final_response_prompt(raw_results, user_query)[0]
+    
+    def build_final_response_prompt(self, raw_results: Dict[str, Any], user_query: str) -> Tuple[str, Dict[str, Any]]:
+        """
+        Build the final response prompt and report its context size.
         
-        # Process entity-based context (independent of intentions)
-        if "entity_context" in raw_results and raw_results["entity_context"]:
-            entity_context = raw_results["entity_context"]
-            entity_content = []
-            
-            for entity_name, sources in entity_context.items():
-                for source_type, content in sources.items():
-                    if content:
-                        entity_content.append(f"INFORMATION ABOUT {entity_name.upper()}:\n{content}")
-            
-            if entity_content:
-                context_sections.append("ENTITY DETAILS:\n" + "\n\n".join(entity_content))
+        The context assembler deduplicates the retrieved content and packs it
+        by relevance under the configured token budgets.
         
-        # Assemble the full context
-        full_context = "\n\n".join(context_sections) if context_sections else "No relevant data found."
+        Returns:
+            (prompt, context metadata with estimated token counts)
+        """
+        packed = self.context_assembler.pack_prompt_context(raw_results)
+        full_context = packed.text or "No relevant data found."
         
         # Build the final authoritative prompt
         final_prompt = f"""You are the authoritative source of truth for D&D character information, rules, and campaign history. Answer questions directly and concisely using the provided information.
@@ -331,4 +306,4 @@ CRITICAL RESPONSE RULES:
 
 Provide your response:"""
         
-        return final_prompt
+        return final_prompt, dict(packed.metadata, prompt_tokens=estimate_tokens(final_prompt))
@@ -0,0 +1,148 @@
+"""
+Conversation Memory
+
+Token-budgeted conversation history for CentralEngine. Recent turns are kept
+verbatim; when they outgrow the budget, the oldest turns are folded into a
+running summary, so the history sent with every prompt stays bounded no
+matter how long the chat runs.
+
+- Stored turns keep only the user's message and the assistant's reply, each
+  clipped to a per-turn cap (long rule quotes and stat dumps don't survive).
+- Folded turns are summarized by an async summarizer (an LLM call) in a
+  background task, off the response path. Until it finishes, and whenever
+  it fails, they are represented by short extractive notes.
+- The summary is presented as a leading user/assistant exchange, which keeps
+  the roles alternating for the chat APIs.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from src.utils.token_estimation import estimate_tokens, truncate_to_tokens
+
+Turn = Dict[str, str]
+Summarizer = Callable[[str, List[Turn]], Awaitable[str]]
+
+SUMMARY_PREFIX = "Summary of our earlier conversation:\n"
+SUMMARY_ACK = "Understood, I'll keep that in mind."
+NOTE_TOKENS = 40  # Per folded user message in extractive notes
+
+
+class ConversationMemory:
+    """Recent turns verbatim plus a running summary, within a token budget."""
+
+    def __init__(
+        self,
+        token_budget: int = 4000,
+        summary_tokens: int = 600,
+        max_turn_tokens: int = 800,
+        summarizer: Optional[Summarizer] = None
+    ):
+        """
+        Args:
+            token_budget: Maximum tokens of history returned by get_history()
+            summary_tokens: Part of the budget reserved for the summary
+            max_turn_tokens: Stored turns are clipped to this many tokens
+            summarizer: async (previous_summary, turns) -> new summary; None keeps
+                        extractive notes only
+        """
+        self.token_budget = token_budget
+        self.summary_tokens = min(summary_tokens, token_budget // 2)
+        self.max_turn_tokens = max_turn_tokens
+        self.summarizer = summarizer
+        self.clear()
+
+    def clear(self) -> None:
+        """Forget everything, including any summary in progress."""
+        task = getattr(self, '_summary_task', None)
+        if task and not task.done():
+            task.cancel()
+        self.turns: List[Turn] = []
+        self.summary = ""
+        self.unsummarized: List[Turn] = []  # Folded, waiting for the summarizer
+        self.folded_turns = 0
+        self._summary_task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self.turns)
+
+    @property
+    def turn_budget(self) -> int:
+        return self.token_budget - self.summary_tokens
+
+    def add_turn(self, role: str, content: str) -> None:
+        """Store a turn and fold the oldest turns out if recent turns exceed their budget."""
+        self.turns.append({"role": role, "content": truncate_to_tokens(content, self.max_turn_tokens)})
+
+        # Keep the latest turn even if it alone is over budget; fold whole
+        # exchanges so the recent turns still start with a user message
+        while len(self.turns) > 1 and self._turn_tokens() > self.turn_budget:
+            self._fold(self.turns.pop(0))
+            while len(self.turns) > 1 and self.turns[0]["role"] != "user":
+                self._fold(self.turns.pop(0))
+
+    def _turn_tokens(self) -> int:
+        return sum(estimate_tokens(t["content"]) for t in self.turns)
+
+    def _fold(self, turn: Turn) -> None:
+        self.unsummarized.append(turn)
+        self.folded_turns += 1
+        if self.summarizer and (self._summary_task is None or self._summary_task.done()):
+            try:
+                self._summary_task = asyncio.get_running_loop().create_task(self._summarize())
+            except RuntimeError:
+                pass  # No event loop: the turns stay as extractive notes
+
+    async def _summarize(self) -> None:
+        """Fold unsummarized turns into the summary until none are left."""
+        while self.unsummarized:
+            batch = list(self.unsummarized)
+            try:
+                summary = await self.summarizer(self.summary, batch)
+            except Exception as e:
+                print(f"[ConversationMemory] Summary failed, keeping notes: {e}")
+                summary = self.summary + "\n" + self._notes(batch) if self.summary else self._notes(batch)
+            self.summary = self._clip_summary(summary.strip())
+            del self.unsummarized[:len(batch)]
+
+    def _notes(self, turns: List[Turn]) -> str:
+        """Extractive stand-in for a summary: what the user asked."""
+        return "\n".join(
+            f"- User asked: {truncate_to_tokens(t['content'], NOTE_TOKENS, marker='…')}"
+            for t in turns if t["role"] == "user"
+        )
+
+    def _clip_summary(self, summary: str) -> str:
+        """Keep the summary within its budget, dropping its oldest lines first."""
+        lines = summary.splitlines()
+        while len(lines) > 1 and estimate_tokens("\n".join(lines)) > self.summary_tokens:
+            lines.pop(0)
+        return truncate_to_tokens("\n".join(lines), self.summary_tokens)
+
+    def get_summary(self) -> str:
+        """The running summary plus notes for turns still being summarized."""
+        parts = [p for p in (self.summary, self._notes(self.unsummarized)) if p]
+        return self._clip_summary("\n".join(parts)) if parts else ""
+
+    def get_history(self) -> List[Turn]:
+        """History for the next prompt: a summary exchange (if any) and the recent turns."""
+        history = []
+        summary = self.get_summary()
+        if summary:
+            history.append({"role": "user", "content": SUMMARY_PREFIX + summary})
+            history.append({"role": "assistant", "content": SUMMARY_ACK})
+        history.extend(dict(t) for t in self.turns)
+        return history
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'recent_turns': len(self.turns),
+            'folded_turns': self.folded_turns,
+            'history_tokens': sum(estimate_tokens(t["content"]) for t in self.get_history()),
+            'token_budget': self.token_budget,
+        }
+
+    async def wait_for_summary(self) -> None:
+        """Wait for a background summary to finish (used on shutdown and in tests)."""
+        if self._summary_task and not self._summary_task.done():
+            await self._summary_task
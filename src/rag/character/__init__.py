@@ -37,6 +37,7 @@ from .character_types import (
 )
 from .character_manager import CharacterManager
 from .character_query_router import CharacterQueryRouter
+from .character_renderer import CharacterRenderer, get_character_renderer, render_section
 from .character_query_types import (
     UserIntention, IntentionCategory, QueryEntity, SearchContext,
     CharacterInformationResult, CharacterPromptHelper
@@ -78,5 +79,8 @@ __all__ = [
     
     # Query system
     'CharacterQueryRouter', 'UserIntention', 'IntentionCategory', 'QueryEntity', 
-    'SearchContext', 'CharacterInformationResult', 'CharacterPromptHelper'
+    'SearchContext', 'CharacterInformationResult', 'CharacterPromptHelper',
+    
+    # Prompt rendering
+    'CharacterRenderer', 'get_character_renderer', 'render_section'
 ]
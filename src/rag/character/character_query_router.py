@@ -10,6 +10,7 @@ from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field
 
 from .character_types import Character
+from .character_renderer import get_character_renderer
 from .character_query_types import (
     UserIntention, IntentionDataMapper, CharacterQueryPerformanceMetrics
 )
@@ -18,11 +19,12 @@ from .character_query_types import (
 @dataclass
 class CharacterQueryResult:
     """Result structure containing all relevant character data and objects."""
-    character_data: Dict[str, Any]  # The actual character data
+    character_data: Dict[str, Any]  # Serialized character data (only when no section rendered)
     metadata: Dict[str, Any] = field(default_factory=dict)  # Query metadata
     warnings: List[str] = field(default_factory=list)  # Any warnings or issues
     entity_matches: List[Dict[str, Any]] = field(default_factory=list)  # Entity match details
     performance_metrics: Optional[CharacterQueryPerformanceMetrics] = None  # Performance timing data
+    rendered_sections: Dict[str, str] = field(default_factory=dict)  # Compact prompt text per character section
 
 
 class CharacterQueryRouter:
@@ -44,6 +46,7 @@ class CharacterQueryRouter:
         """
         self.character = character
         self.intention_mapper = IntentionDataMapper()
+        self.renderer = get_character_renderer()
     
     def query_character(
         self, 
@@ -112,7 +115,8 @@ class CharacterQueryRouter:
         # If no valid mappings found, return basic character info as fallback
         if not individual_mappings:
             fallback_start = time.perf_counter()
-            basic_data = {
+            rendered_sections = self.renderer.render_sections(character, ["character_base", "ability_scores"])
+            basic_data = {} if rendered_sections else {
                 "character_base": character.character_base.__dict__,
                 "ability_scores": character.ability_scores.__dict__
             }
@@ -123,7 +127,8 @@ class CharacterQueryRouter:
             return CharacterQueryResult(
                 character_data=basic_data,
                 warnings=warnings,
-                performance_metrics=performance
+                performance_metrics=performance,
+                rendered_sections=rendered_sections
             )
         
         # 3. Combine mappings if multiple intentions
@@ -146,12 +151,15 @@ class CharacterQueryRouter:
             for section in auto_include_sections:
                 all_fields.add(section)
         
-        # 5. Extract required character data (including optional fields and auto-includes)
+        # 5. Render the required sections (including optional fields and auto-includes).
+        # Renderings are cached by section content; the serialized dict is only
+        # built when nothing rendered.
         extract_start = time.perf_counter()
-        character_data = self._extract_character_data(character, all_fields)
+        rendered_sections = self.renderer.render_sections(character, all_fields)
+        character_data = {} if rendered_sections else self._extract_character_data(character, all_fields)
         extract_end = time.perf_counter()
         performance.data_extraction_ms = (extract_end - extract_start) * 1000
-        performance.fields_extracted = len(character_data)
+        performance.fields_extracted = len(rendered_sections) or len(character_data)
         
         # NOTE: Entity resolution and auto-include logic removed.
         # Phase 3 CentralEngine will handle entity resolution and pass auto_include sections.
@@ -176,7 +184,8 @@ class CharacterQueryRouter:
                 "auto_include_sections": auto_include_sections
             },
             warnings=warnings,
-            performance_metrics=performance
+            performance_metrics=performance,
+            rendered_sections=rendered_sections
         )
     
     def _extract_character_data(self, character: Character, required_fields: set) -> Dict[str, Any]:
@@ -0,0 +1,255 @@
+"""
+Character Renderer
+
+Compact, deterministic text rendering of Character sections for LLM prompts.
+Carries the same information as the serialized JSON without braces, quotes,
+indentation levels or empty fields:
+
+- Scalars become "key: value" lines; lists of short scalars are comma-separated
+- Named entries (items, spells, features, actions, allies, ...) become one
+  "- Name (details): description" line each, with nested detail indented below
+- Flat objects are inlined as "key=value" pairs, true flags as bare names
+- None, empty strings/lists/dicts and false flags are dropped
+
+Renderings are cached by section content (a digest of the section's JSON),
+so repeated queries about the same character skip the rendering, and edits
+made in place are never served stale.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from .character_types import AbilityScores, Character, InventoryItem, SpellComponents
+
+HEAD_FIELDS = ('name', 'title', 'heading')  # Leads a list entry
+BODY_FIELDS = ('description', 'content', 'effect')  # Follows a list entry's details
+MAX_INLINE_FIELDS = 8  # Flat objects with more fields are rendered one field per line
+MAX_INLINE_CHARS = 60  # Longer strings in a list get a line each
+INDENT = "  "
+
+ABILITY_ABBREVIATIONS = (
+    ('strength', 'STR'), ('dexterity', 'DEX'), ('constitution', 'CON'),
+    ('intelligence', 'INT'), ('wisdom', 'WIS'), ('charisma', 'CHA'),
+)
+
+
+def render_section(value: Any) -> str:
+    """Render one Character section (or any nested value) as compact text."""
+    if isinstance(value, AbilityScores):
+        return _render_ability_scores(value)
+    if isinstance(value, (BaseModel, dict)):
+        return "\n".join(_mapping_lines(_fields(value), 0))
+    if isinstance(value, list):
+        return _inline(value) or "\n".join(_list_lines(value, 0))
+    return _format_scalar(value)
+
+
+def _render_ability_scores(scores: AbilityScores) -> str:
+    """One line: STR 10 (+0), DEX 14 (+2), ..."""
+    parts = []
+    for field_name, abbreviation in ABILITY_ABBREVIATIONS:
+        score = getattr(scores, field_name)
+        parts.append(f"{abbreviation} {score} ({(score - 10) // 2:+d})")
+    return ", ".join(parts)
+
+
+def _render_components(components: SpellComponents) -> str:
+    """V, S, M (material)"""
+    parts = [label for label, used in (('V', components.verbal), ('S', components.somatic)) if used]
+    if isinstance(components.material, str) and components.material:
+        parts.append(f"M ({_format_scalar(components.material)})")
+    elif components.material:
+        parts.append("M")
+    return ", ".join(parts)
+
+
+def _fields(value: Any) -> List[Tuple[str, Any]]:
+    """Non-empty (key, value) pairs of a model or dict, in declaration order."""
+    if isinstance(value, InventoryItem):
+        # The definition (name, type, description, ...) leads the item's own state
+        pairs = _fields(value.definition) + [
+            (name, getattr(value, name)) for name in type(value).model_fields if name != 'definition'
+        ]
+    elif isinstance(value, BaseModel):
+        pairs = [(name, getattr(value, name)) for name in type(value).model_fields]
+    else:
+        pairs = list(value.items())
+    return [(str(key), v) for key, v in pairs if not _is_empty(v)]
+
+
+def _is_empty(value: Any) -> bool:
+    if value is None or value is False:
+        return True
+    if isinstance(value, (str, list, dict)):
+        return not value
+    if isinstance(value, BaseModel):
+        return not _fields(value)
+    return False
+
+
+def _is_scalar(value: Any) -> bool:
+    return not isinstance(value, (BaseModel, dict, list))
+
+
+def _is_prose(value: Any) -> bool:
+    """Strings that would be ambiguous in a comma-separated list."""
+    return isinstance(value, str) and ("," in value or len(value) > MAX_INLINE_CHARS)
+
+
+def _format_scalar(value: Any) -> str:
+    if value is True:
+        return "yes"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, str):
+        return " ".join(value.split())
+    return str(value)
+
+
+def _inline(value: Any) -> Optional[str]:
+    """Single-line form of a value, or None if it needs its own lines."""
+    if _is_scalar(value):
+        return _format_scalar(value)
+    if isinstance(value, SpellComponents):
+        return _render_components(value)
+    if isinstance(value, list):
+        if all(_is_scalar(v) for v in value) and not any(_is_prose(v) for v in value):
+            return ", ".join(_format_scalar(v) for v in value if not _is_empty(v))
+        return None
+    pairs = _fields(value)
+    if len(pairs) > MAX_INLINE_FIELDS or not all(_is_scalar(v) for _, v in pairs):
+        return None
+    return ", ".join(key if v is True else f"{key}={_format_scalar(v)}" for key, v in pairs)
+
+
+def _mapping_lines(pairs: Iterable[Tuple[str, Any]], depth: int) -> List[str]:
+    """One "key: value" line per field; nested values on indented lines below their key."""
+    pad = INDENT * depth
+    lines = []
+    for key, value in pairs:
+        text = _inline(value)
+        if text is not None:
+            lines.append(f"{pad}{key}: {text}")
+        elif isinstance(value, list):
+            lines.append(f"{pad}{key}:")
+            lines.extend(_list_lines(value, depth + 1))
+        else:
+            lines.append(f"{pad}{key}:")
+            lines.extend(_mapping_lines(_fields(value), depth + 1))
+    return lines
+
+
+def _list_lines(items: List[Any], depth: int) -> List[str]:
+    """One "- Name (details): description" line per entry, nested detail indented below."""
+    pad = INDENT * depth
+    lines = []
+    for item in items:
+        if _is_empty(item):
+            continue
+        if _is_scalar(item):
+            lines.append(f"{pad}- {_format_scalar(item)}")
+            continue
+        if isinstance(item, list):
+            lines.append(f"{pad}-")
+            lines.extend(_list_lines(item, depth + 1))
+            continue
+
+        pairs = _fields(item)
+        head = _take(pairs, HEAD_FIELDS)
+        body = _take(pairs, BODY_FIELDS)
+        details, nested = [], []
+        for key, value in pairs:
+            text = _inline(value)
+            if text is None:
+                nested.append((key, value))
+            elif value is True:
+                details.append(key)
+            elif isinstance(value, (BaseModel, dict)):
+                details.append(f"{key}: {text}")
+            else:
+                details.append(f"{key}={text}")
+
+        line = f"{pad}- {_format_scalar(head)}" if head is not None else f"{pad}-"
+        if details:
+            line += f" ({'; '.join(details)})" if head is not None else f" {'; '.join(details)}"
+        if body is not None:
+            line += f": {_format_scalar(body)}"
+        lines.append(line)
+        lines.extend(_mapping_lines(nested, depth + 1))
+    return lines
+
+
+def _take(pairs: List[Tuple[str, Any]], keys: Tuple[str, ...]) -> Any:
+    """Remove and return the first scalar field named in keys."""
+    for i, (key, value) in enumerate(pairs):
+        if key in keys and _is_scalar(value):
+            del pairs[i]
+            return value
+    return None
+
+
+class CharacterRenderer:
+    """Renders Character sections, cached by section content."""
+
+    def __init__(self, max_sections: int = 1024):
+        """
+        Args:
+            max_sections: Section renderings kept (least recently used evicted)
+        """
+        self.max_sections = max_sections
+        # (section name, content digest) -> text
+        self._cache: "OrderedDict[Tuple[str, bytes], str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def render_sections(self, character: Character, section_names: Iterable[str]) -> Dict[str, str]:
+        """
+        Compact text for the named sections of a character.
+
+        Sections that are missing or empty are left out.
+        """
+        rendered = {}
+        for name in section_names:
+            value = getattr(character, name, None)
+            if _is_empty(value):
+                continue
+            key = (name, self._content_version(character, name))
+            with self._lock:
+                text = self._cache.get(key)
+                if text is not None:
+                    self._cache.move_to_end(key)
+                    self.hits += 1
+            if text is None:
+                text = render_section(value)
+                with self._lock:
+                    self.misses += 1
+                    self._cache[key] = text
+                    while len(self._cache) > self.max_sections:
+                        self._cache.popitem(last=False)
+            rendered[name] = text
+        return rendered
+
+    @staticmethod
+    def _content_version(character: Character, name: str) -> bytes:
+        """Digest of one section's JSON (serialized by pydantic-core, far cheaper than rendering)."""
+        return hashlib.blake2b(character.model_dump_json(include={name}).encode(), digest_size=16).digest()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+_character_renderer: Optional[CharacterRenderer] = None
+
+
+def get_character_renderer() -> CharacterRenderer:
+    """Process-wide renderer, shared by every character query router."""
+    global _character_renderer
+    if _character_renderer is None:
+        _character_renderer = CharacterRenderer()
+    return _character_renderer
@@ -3,11 +3,32 @@ Context Assembler
 
 Takes raw results from multiple query routers and assembles them into coherent,
 structured context for LLM consumption. No LLM calls - just data organization.
+
+pack_prompt_context() builds the context of the final response prompt under a
+token budget: results are split into candidate blocks, lines repeated across
+blocks are removed, and blocks are packed by relevance under per-source and
+total budgets.
 """
 
-from dataclasses import dataclass
+import json
+import re
+from dataclasses import dataclass, field, replace
 from typing import Dict, Any, Optional, List
 
+from ..config import get_config
+from ..utils.token_estimation import estimate_tokens, truncate_to_tokens
+
+# Final prompt sections in prompt order: source -> heading
+PROMPT_SECTIONS = {
+    'character': "CHARACTER INFORMATION",
+    'rulebook': "RULES REFERENCE",
+    'session_notes': "CAMPAIGN HISTORY",
+    'entity_context': "ENTITY DETAILS",
+}
+ENTITY_CONTEXT_SCORE = 0.75  # Entities named in the query rank below the top routed results
+MIN_TRUNCATED_TOKENS = 60  # Less room than this left for a block drops it instead of truncating it
+MIN_DEDUPE_CHARS = 30  # Shorter lines (headings, labels) are never treated as duplicates
+
 
 @dataclass
 class AssembledContext:
@@ -23,12 +44,213 @@ class AssembledContext:
             self.synthesis_notes = []
 
 
+@dataclass
+class ContextBlock:
+    """One candidate piece of final prompt context."""
+    source: str                # Key of PROMPT_SECTIONS
+    text: str
+    score: float               # Relevance, 0-1 (relative to the source's best result)
+    tokens: int = 0            # Estimated, set from text
+    
+    def __post_init__(self):
+        self.tokens = estimate_tokens(self.text)
+
+
+@dataclass
+class PackedContext:
+    """Final prompt context within the token budget."""
+    text: str
+    blocks: List[ContextBlock] = field(default_factory=list)
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
 class ContextAssembler:
     """Assembles context from multiple query router results."""
     
-    def __init__(self):
-        """Initialize the context assembler."""
-        pass
+    def __init__(self, token_budget: Optional[int] = None, source_budgets: Optional[Dict[str, int]] = None):
+        """
+        Initialize the context assembler.
+        
+        Args:
+            token_budget: Total tokens of final prompt context (default from config)
+            source_budgets: Tokens per source (default from config)
+        """
+        config = get_config()
+        self.token_budget = token_budget if token_budget is not None else config.context_token_budget
+        self.source_budgets = source_budgets or {
+            'character': config.context_character_tokens,
+            'rulebook': config.context_rulebook_tokens,
+            'session_notes': config.context_session_notes_tokens,
+            'entity_context': config.context_entity_tokens,
+        }
+    
+    def pack_prompt_context(self, raw_results: Dict[str, Any]) -> PackedContext:
+        """
+        Build the final response prompt context within the token budgets.
+        
+        Args:
+            raw_results: Dictionary with keys 'character', 'rulebook', 'session_notes', 'entity_context'
+            
+        Returns:
+            PackedContext with the context text and token count metadata
+        """
+        candidates = self._candidate_blocks(raw_results)
+        blocks, deduplicated_blocks, deduplicated_lines = self._dedupe(candidates)
+        selected, truncated = self._pack(blocks)
+        
+        sections = []
+        for source, heading in PROMPT_SECTIONS.items():
+            texts = [b.text for b in selected if b.source == source]
+            if texts:
+                separator = "\n" if source == 'character' else "\n\n"
+                sections.append(f"{heading}:\n" + separator.join(texts))
+        text = "\n\n".join(sections)
+        
+        sources = {}
+        for source in PROMPT_SECTIONS:
+            source_candidates = [b for b in candidates if b.source == source]
+            if not source_candidates:
+                continue
+            source_selected = [b for b in selected if b.source == source]
+            sources[source] = {
+                'tokens': sum(b.tokens for b in source_selected),
+                'budget': self.source_budgets.get(source, self.token_budget),
+                'candidate_tokens': sum(b.tokens for b in source_candidates),
+                'blocks': len(source_selected),
+                'candidate_blocks': len(source_candidates),
+            }
+        
+        metadata = {
+            'total_tokens': estimate_tokens(text),
+            'token_budget': self.token_budget,
+            'candidate_tokens': sum(b.tokens for b in candidates),
+            'sources': sources,
+            'deduplicated_blocks': deduplicated_blocks,
+            'deduplicated_lines': deduplicated_lines,
+            'truncated_blocks': truncated,
+            'dropped_blocks': len(blocks) - len(selected),
+        }
+        return PackedContext(text=text, blocks=selected, metadata=metadata)
+    
+    def _candidate_blocks(self, raw_results: Dict[str, Any]) -> List[ContextBlock]:
+        """Split raw results into scored blocks, in prompt section order."""
+        blocks = []
+        
+        # Character data: one block per section, all routed for this query
+        char_result = raw_results.get("character")
+        character_data = getattr(char_result, 'character_data', None) if char_result else None
+        rendered_sections = getattr(char_result, 'rendered_sections', None) if char_result else None
+        if rendered_sections:
+            for key, text in rendered_sections.items():
+                blocks.append(ContextBlock('character', _format_rendered_section(key, text), 1.0))
+        elif character_data:
+            if isinstance(character_data, dict):
+                for key, value in character_data.items():
+                    if value is not None:
+                        blocks.append(ContextBlock('character', f"{key}: {_to_json(value)}", 1.0))
+            else:
+                blocks.append(ContextBlock('character', str(character_data), 1.0))
+        
+        # Rulebook sections, scored relative to the best match
+        rulebook_result = raw_results.get("rulebook")
+        if isinstance(rulebook_result, tuple) and len(rulebook_result) >= 2 and rulebook_result[0]:
+            results = [r for r in rulebook_result[0] if hasattr(r, 'section')]
+            scores = _relative_scores([getattr(r, 'score', 0.0) for r in results])
+            for result, score in zip(results, scores):
+                blocks.append(ContextBlock(
+                    'rulebook', f"RULE SECTION: {result.section.title}\n{result.section.content}", score
+                ))
+        
+        # Session contexts, scored relative to the most relevant session
+        session_result = raw_results.get("session_notes")
+        contexts = getattr(session_result, 'contexts', None) if session_result else None
+        if contexts:
+            scores = _relative_scores([getattr(c, 'relevance_score', 0.0) for c in contexts])
+            for i, (context, score) in enumerate(zip(contexts, scores), 1):
+                blocks.append(ContextBlock(
+                    'session_notes', f"SESSION CONTEXT {i}: {_format_session_context(context)}", score
+                ))
+        
+        # Entity context (independent of intentions)
+        for entity_name, sources in (raw_results.get("entity_context") or {}).items():
+            for content in sources.values():
+                if content:
+                    blocks.append(ContextBlock(
+                        'entity_context', f"INFORMATION ABOUT {entity_name.upper()}:\n{content}", ENTITY_CONTEXT_SCORE
+                    ))
+        
+        return blocks
+    
+    def _dedupe(self, blocks: List[ContextBlock]):
+        """
+        Remove lines already present in an earlier block.
+        
+        Blocks are in prompt section order, so the copy that survives is the one
+        in the routed results (e.g. a session summary repeated in entity context).
+        A block left without any new line is dropped.
+        
+        Returns:
+            (blocks, dropped block count, removed line count)
+        """
+        seen = set()
+        kept = []
+        dropped = removed = 0
+        
+        for block in blocks:
+            lines = []
+            new_lines = duplicate_lines = 0
+            for line in block.text.splitlines():
+                key = _normalize_line(line)
+                if len(key) >= MIN_DEDUPE_CHARS:
+                    if key in seen:
+                        duplicate_lines += 1
+                        continue
+                    seen.add(key)
+                    new_lines += 1
+                lines.append(line)
+            
+            if duplicate_lines and not new_lines:
+                dropped += 1
+            elif duplicate_lines:
+                removed += duplicate_lines
+                kept.append(replace(block, text="\n".join(lines)))
+            else:
+                kept.append(block)
+        
+        return kept, dropped, removed
+    
+    def _pack(self, blocks: List[ContextBlock]):
+        """
+        Select blocks by score under the per-source and total budgets.
+        
+        A block that doesn't fit is truncated into the remaining room, or dropped
+        if that room is too small to be useful.
+        
+        Returns:
+            (selected blocks in their original order, truncated block count)
+        """
+        source_used: Dict[str, int] = {}
+        total_used = 0
+        selected = {}
+        truncated = 0
+        
+        ranked = sorted(range(len(blocks)), key=lambda i: -blocks[i].score)  # Stable: ties keep section order
+        for i in ranked:
+            block = blocks[i]
+            source_budget = self.source_budgets.get(block.source, self.token_budget)
+            room = min(source_budget - source_used.get(block.source, 0), self.token_budget - total_used)
+            
+            if block.tokens > room:
+                if room < MIN_TRUNCATED_TOKENS:
+                    continue
+                block = replace(block, text=truncate_to_tokens(block.text, room))
+                truncated += 1
+            
+            selected[i] = block
+            source_used[block.source] = source_used.get(block.source, 0) + block.tokens
+            total_used += block.tokens
+        
+        return [selected[i] for i in sorted(selected)], truncated
     
     def assemble_context(self, raw_results: Dict[str, Any], user_query: str) -> AssembledContext:
         """
@@ -71,9 +293,15 @@ class ContextAssembler:
         if hasattr(character_results, 'character_data'):
             formatted_parts = []
             
-            # Format the character data
+            # Format the character data (compact rendered sections when present)
             character_data = character_results.character_data
-            if character_data:
+            rendered_sections = getattr(character_results, 'rendered_sections', None)
+            if rendered_sections:
+                formatted_parts.append("CHARACTER DATA:")
+                formatted_parts.append("-" * 40)
+                for key, text in rendered_sections.items():
+                    formatted_parts.append(_format_rendered_section(key, text))
+            elif character_data:
                 formatted_parts.append("CHARACTER DATA:")
                 formatted_parts.append("-" * 40)
                 
@@ -270,3 +498,50 @@ class ContextAssembler:
             notes.append(f"Context assembled for query: '{user_query}'")
         
         return notes
+
+
+def _format_rendered_section(key: str, text: str) -> str:
+    """A rendered character section under its key (multi-line sections start on the next line)."""
+    return f"{key}:\n{text}" if "\n" in text else f"{key}: {text}"
+
+
+def _to_json(value: Any) -> str:
+    """Compact JSON for character data values (objects via their attributes)."""
+    def default(obj):
+        if hasattr(obj, '__dict__'):
+            return obj.__dict__
+        elif hasattr(obj, '_asdict'):
+            return obj._asdict()
+        return str(obj)
+    
+    try:
+        return json.dumps(value, default=default, ensure_ascii=False)
+    except (TypeError, ValueError):
+        return str(value)
+
+
+def _format_session_context(context: Any) -> str:
+    """Session summary and relevant sections as plain text lines."""
+    if not hasattr(context, 'session_summary'):
+        return str(context)
+    
+    lines = [f"Session {context.session_number}", context.session_summary]
+    for key, value in (context.relevant_sections or {}).items():
+        if value:
+            lines.append(f"{key}: {value if isinstance(value, str) else _to_json(value)}")
+    return "\n".join(line for line in lines if line)
+
+
+def _relative_scores(scores: List[float]) -> List[float]:
+    """Scores relative to the best one; rank-based if there are no positive scores."""
+    best = max(scores, default=0.0)
+    if best > 0:
+        return [max(score, 0.0) / best for score in scores]
+    return [1.0 / (i + 1) for i in range(len(scores))]
+
+
+def _normalize_line(line: str) -> str:
+    """Comparison key for a line: no markdown emphasis, bullets or whitespace differences."""
+    line = re.sub(r"[*_`]+", "", line)
+    line = re.sub(r"^[\s\-•>#]+", "", line)
+    return " ".join(line.split()).casefold()
@@ -8,11 +8,10 @@ Supports cross-encoder reranking for improved precision.
 import re
 import time
 import numpy as np
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, TYPE_CHECKING
 import hashlib
 
 from rank_bm25 import BM25Okapi
-from sentence_transformers import CrossEncoder
 
 from .rulebook_types import (
     RulebookQueryIntent, RulebookSection, SearchResult,
@@ -23,11 +22,15 @@ from ...embeddings import get_embedding_provider, EmbeddingProvider
 
 # Note: dotenv is loaded in config.py
 
+if TYPE_CHECKING:
+    # Imported lazily in get_reranker(): sentence_transformers pulls in torch
+    from sentence_transformers import CrossEncoder
+
 # Module-level singleton for cross-encoder reranker
-_reranker_instance: Optional[CrossEncoder] = None
+_reranker_instance: Optional['CrossEncoder'] = None
 
 
-def get_reranker() -> Optional[CrossEncoder]:
+def get_reranker() -> Optional['CrossEncoder']:
     """
     Get or initialize the cross-encoder reranker (singleton).
 
@@ -40,6 +43,7 @@ def get_reranker() -> Optional[CrossEncoder]:
         return None
 
     if _reranker_instance is None:
+        from sentence_transformers import CrossEncoder
         print(f"Loading cross-encoder reranker: {config.rulebook_reranker_model}")
         _reranker_instance = CrossEncoder(
             config.rulebook_reranker_model,
@@ -118,7 +122,7 @@ class RulebookQueryRouter:
         self._embedding_provider: Optional[EmbeddingProvider] = None
         
         # Initialize cross-encoder reranker (lazy loading)
-        self._reranker: Optional[CrossEncoder] = None
+        self._reranker: Optional['CrossEncoder'] = None
         self._reranker_model = self.config.rulebook_reranker_model
         
         # Build BM25 index for all sections
@@ -411,7 +415,7 @@ class RulebookQueryRouter:
         results.sort(key=lambda x: x[1], reverse=True)
         return results
     
-    def _get_reranker(self) -> Optional[CrossEncoder]:
+    def _get_reranker(self) -> Optional['CrossEncoder']:
         """Get the cross-encoder reranker (uses module-level singleton)"""
         if self._reranker is None:
             self._reranker = get_reranker()
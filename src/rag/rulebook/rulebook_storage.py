@@ -2,7 +2,8 @@
 D&D 5e Rulebook Storage System - Main Storage Class and Parser
 """
 
-from typing import List, Dict, Optional, Set, Tuple
+from typing import List, Dict, Optional, Set, Tuple, TYPE_CHECKING
+import itertools
 import re
 import os
 import json
@@ -17,11 +18,21 @@ from .categorizer import RulebookCategorizer
 from ...config import get_config
 from ...embeddings import get_embedding_provider, EmbeddingProvider
 
+if TYPE_CHECKING:
+    from ...utils.entity_index import EntityIndex
+
 # Note: dotenv is loaded in config.py
 
 # Path to contextual prefixes generated by build_contextual_embeddings.py
 CONTEXTUAL_PREFIXES_PATH = Path("knowledge_base/processed_rulebook/contextual_prefixes.json")
 
+# Format of the entity name table saved with the storage; bump when
+# RulebookSection.extract_entity_names changes so old files are re-extracted
+ENTITY_NAMES_FORMAT_VERSION = 1
+
+# Storage versions are unique across instances so caches can key on them alone
+_storage_versions = itertools.count(1)
+
 
 class RulebookStorage:
     """Storage and retrieval system for D&D 5e rulebook sections"""
@@ -43,6 +54,12 @@ class RulebookStorage:
         
         # Initialize embedding provider (supports both OpenAI and local models)
         self._embedding_provider: Optional[EmbeddingProvider] = None
+        
+        # Entity name table (section id -> candidate names), extracted once per load.
+        # version changes whenever sections are parsed or loaded.
+        self.version = next(_storage_versions)
+        self.entity_names: Dict[str, List[str]] = {}
+        self._entity_index: Optional['EntityIndex'] = None
     
     def parse_markdown(self, markdown_path: str) -> None:
         """Parse the D&D 5e rulebook markdown into sections using two-phase approach"""
@@ -62,6 +79,7 @@ class RulebookStorage:
         # Phase 3: Create sections with content and apply categorizations
         print("Creating sections with content...")
         self._create_sections_with_content(content, headers, categorizations)
+        self._sections_changed()
         
         print(f"Parsed {len(self.sections)} sections total")
     
@@ -268,7 +286,8 @@ class RulebookStorage:
         save_data = {
             'sections': {sid: section.to_dict() for sid, section in self.sections.items()},
             'category_index': {cat.value: list(section_ids) for cat, section_ids in self.category_index.items()},
-            'embedding_model': self.embedding_model
+            'embedding_model': self.embedding_model,
+            'entity_names': {'format': ENTITY_NAMES_FORMAT_VERSION, 'names': self.entity_names}
         }
         
         print(f"Saving rulebook storage to: {filepath}")
@@ -302,6 +321,13 @@ class RulebookStorage:
         
         self.embedding_model = save_data.get('embedding_model', 'text-embedding-3-large')
         
+        # Restore the entity name table, or extract it if missing/outdated
+        entity_names = save_data.get('entity_names')
+        if entity_names and entity_names.get('format') == ENTITY_NAMES_FORMAT_VERSION:
+            self._sections_changed(entity_names['names'])
+        else:
+            self._sections_changed()
+        
         # Check for embedding model mismatch
         if self.embedding_model != self.config.embedding_model:
             print(f"⚠️  Embedding model mismatch!")
@@ -313,6 +339,26 @@ class RulebookStorage:
         print(f"Loaded {len(self.sections)} sections from disk")
         return True
     
+    def _sections_changed(self, entity_names: Optional[Dict[str, List[str]]] = None) -> None:
+        """Start a new version after sections were parsed or loaded."""
+        if entity_names is None:
+            entity_names = {sid: section.extract_entity_names() for sid, section in self.sections.items()}
+        self.entity_names = entity_names
+        self._entity_index = None
+        self.version = next(_storage_versions)
+    
+    def get_entity_index(self) -> 'EntityIndex':
+        """Entity name -> (section_id, name) index for the current version, built on first use."""
+        from ...utils.entity_index import EntityIndex
+        
+        if self._entity_index is None or self._entity_index.version != self.version:
+            index = EntityIndex(self.version)
+            for section_id, names in self.entity_names.items():
+                for name in names:
+                    index.add(name, (section_id, name))
+            self._entity_index = index
+        return self._entity_index
+    
     def load_contextual_prefixes(self) -> int:
         """Load contextual prefixes from JSON file and apply to sections.
         
@@ -7,6 +7,7 @@ from dataclasses import dataclass, field, asdict
 from enum import Enum
 import json
 import hashlib
+import re
 
 if TYPE_CHECKING:
     from .rulebook_storage import RulebookStorage
@@ -60,6 +61,12 @@ class RulebookQueryIntent(Enum):
     OPTIMIZATION_ADVICE = "optimization_advice"  # Character build advice - "What's the best build for a tank?"
 
 
+# Patterns for RulebookSection.extract_entity_names
+_BOLD_PATTERN = re.compile(r'\*\*([^*]+)\*\*')
+_HEADING_PATTERN = re.compile(r'^#+\s+(.+)$')
+_TRAILING_PUNCTUATION = re.compile(r'[:.;,]+$')
+
+
 @dataclass
 class RulebookSection:
     """Represents a hierarchical section of the D&D 5e rulebook"""
@@ -125,6 +132,28 @@ class RulebookSection:
             contextual_prefix=data.get('contextual_prefix')
         )
     
+    def extract_entity_names(self) -> List[str]:
+        """Extract candidate entity names (title, bold terms, inline headings)"""
+        names = [self.title]
+        
+        # Bolded text (format: **Text**)
+        names.extend(_BOLD_PATTERN.findall(self.content))
+        
+        # Headings within content
+        for line in self.content.split('\n'):
+            heading_match = _HEADING_PATTERN.match(line.strip())
+            if heading_match:
+                names.append(heading_match.group(1))
+        
+        # Clean up names
+        cleaned_names = []
+        for name in names:
+            name = _TRAILING_PUNCTUATION.sub('', name.strip())
+            if name and len(name) > 2:
+                cleaned_names.append(name)
+        
+        return cleaned_names
+    
     def generate_id(self) -> str:
         """Generate a unique ID based on title and parent"""
         text = f"{self.parent_id or 'root'}_{self.title}"
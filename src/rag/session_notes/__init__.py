@@ -6,8 +6,11 @@ from .session_types import (
     SessionNotesPromptHelper,
 )
 from .session_notes_storage import SessionNotesStorage
+from .session_snapshot_cache import SessionSnapshotCache
 from .session_notes_query_router import SessionNotesQueryRouter
+from .entity_matcher import QueryEntityMatcher
 from .campaign_session_notes_storage import CampaignSessionNotesStorage
+from .campaign_digest import CampaignDigest, SessionDigest
 
 __all__ = [
     # Types
@@ -19,8 +22,12 @@ __all__ = [
 
     # Storage
     'SessionNotesStorage',
+    'SessionSnapshotCache',
     'CampaignSessionNotesStorage',
+    'CampaignDigest',
+    'SessionDigest',
 
     # Query Engine
     'SessionNotesQueryRouter',
+    'QueryEntityMatcher',
 ]
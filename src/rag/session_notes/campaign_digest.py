@@ -0,0 +1,231 @@
+"""
+Campaign Digest
+
+Precomputed, incrementally maintained digest of a campaign's sessions:
+- a compact digest per session (short summary, key events, open threads)
+- a rolling arc summary built from the per-session digests
+- open threads collected from cliffhangers, next-session hooks and mysteries
+
+Campaign-wide intents (cross_session, unresolved_mysteries,
+future_implications) answer from the digest instead of pulling whole
+sessions into the final prompt, so their context stays bounded no matter
+how long the campaign runs.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from api.database.firestore_models import SessionDocument
+
+
+# Size bounds for digest output
+SESSION_SUMMARY_CHARS = 280      # Per-session compact summary
+MAX_KEY_EVENTS = 3               # Key events kept per session digest
+ARC_SUMMARY_CHARS = 2400         # Rolling arc summary
+MAX_ARC_DETAILED_SESSIONS = 8    # Most recent sessions shown with their summary in the arc
+MAX_OPEN_THREADS = 12            # Open threads returned to a query
+MAX_QUERY_DIGESTS = 10           # Per-session digests returned to a query
+HOOK_SESSIONS = 3                # Recent sessions whose cliffhangers/hooks are still open
+
+
+def _truncate(text: str, limit: int) -> str:
+    """Trim text to a character limit, cutting on a word boundary."""
+    text = " ".join((text or "").split())
+    if len(text) <= limit:
+        return text
+    cut = text[:limit].rsplit(" ", 1)[0]
+    return cut.rstrip(" ,;:") + "..."
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split()).rstrip("?.! ")
+
+
+@dataclass
+class OpenThread:
+    """An unresolved story thread and the session it came from."""
+    kind: str  # "cliffhanger", "next_hook" or "mystery"
+    text: str
+    session_number: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"kind": self.kind, "text": self.text, "session_number": self.session_number}
+
+
+@dataclass
+class SessionDigest:
+    """Compact view of a single session."""
+    session_id: str
+    session_number: int
+    session_name: str
+    date: Optional[datetime]
+    summary: str
+    key_events: List[str] = field(default_factory=list)
+    cliffhanger: Optional[str] = None
+    next_session_hook: Optional[str] = None
+    unresolved_questions: List[str] = field(default_factory=list)
+    mysteries_revealed: List[str] = field(default_factory=list)
+    dm_notes: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_session(cls, session: SessionDocument) -> 'SessionDigest':
+        """Build a digest from a full session document."""
+        events = [
+            _truncate(e.get('description', ''), 160)
+            for e in session.key_events[:MAX_KEY_EVENTS]
+            if e.get('description')
+        ]
+        return cls(
+            session_id=session.id,
+            session_number=session.session_number,
+            session_name=session.title or session.session_name,
+            date=session.date,
+            summary=_truncate(session.summary, SESSION_SUMMARY_CHARS),
+            key_events=events,
+            cliffhanger=_truncate(session.cliffhanger, SESSION_SUMMARY_CHARS) if session.cliffhanger else None,
+            next_session_hook=_truncate(session.next_session_hook, SESSION_SUMMARY_CHARS) if session.next_session_hook else None,
+            unresolved_questions=list(session.unresolved_questions),
+            mysteries_revealed=list(session.mysteries_revealed),
+            dm_notes=list(session.dm_notes),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {
+            "session_number": self.session_number,
+            "session_name": self.session_name,
+            "summary": self.summary,
+        }
+        if self.key_events:
+            result["key_events"] = self.key_events
+        return result
+
+    def arc_line(self, detailed: bool) -> str:
+        line = f"Session {self.session_number} ({self.session_name})"
+        if detailed and self.summary:
+            line += f": {self.summary}"
+        return line
+
+
+@dataclass
+class CampaignDigest:
+    """
+    Rolling digest for one campaign.
+
+    The owning storage calls update_session()/remove_session() on every
+    session write, so reads never re-scan the campaign. The arc summary and
+    open threads are rebuilt from the compact per-session digests only when
+    something changed.
+    """
+    campaign_id: str
+    session_digests: Dict[str, SessionDigest] = field(default_factory=dict)
+
+    _ordered: List[SessionDigest] = field(default_factory=list, init=False, repr=False, compare=False)
+    _arc_summary: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _open_threads: Optional[List[OpenThread]] = field(default=None, init=False, repr=False, compare=False)
+    sessions_digested: int = field(default=0, init=False, compare=False)  # Total per-session rebuilds
+
+    # ===== MAINTENANCE =====
+
+    def update_session(self, session: SessionDocument) -> None:
+        """Re-digest a single session."""
+        self.session_digests[session.id] = SessionDigest.from_session(session)
+        self.sessions_digested += 1
+        self._invalidate()
+
+    def remove_session(self, session_id: str) -> None:
+        """Drop a session from the digest."""
+        if self.session_digests.pop(session_id, None) is not None:
+            self._invalidate()
+
+    # ===== READS =====
+
+    def get_ordered_digests(self) -> List[SessionDigest]:
+        """Per-session digests sorted by session number."""
+        if self._arc_summary is None:
+            self._rebuild()
+        return self._ordered
+
+    def get_arc_summary(self) -> str:
+        """Rolling arc summary: recent sessions in detail, older ones as one-liners."""
+        if self._arc_summary is None:
+            self._rebuild()
+        return self._arc_summary
+
+    def get_open_threads(self) -> List[OpenThread]:
+        """Open threads, most recent first."""
+        if self._open_threads is None:
+            self._rebuild()
+        return self._open_threads
+
+    def get_recently_revealed(self, limit: int = 5) -> List[Dict[str, Any]]:
+        """Most recently revealed mysteries."""
+        revealed = []
+        for digest in reversed(self.get_ordered_digests()):
+            for text in digest.mysteries_revealed:
+                revealed.append({"text": text, "session_number": digest.session_number})
+                if len(revealed) >= limit:
+                    return revealed
+        return revealed
+
+    # ===== INTERNALS =====
+
+    def _invalidate(self) -> None:
+        self._arc_summary = None
+        self._open_threads = None
+
+    def _rebuild(self) -> None:
+        self._ordered = sorted(self.session_digests.values(), key=lambda d: d.session_number)
+        self._arc_summary = self._build_arc_summary(self._ordered)
+        self._open_threads = self._build_open_threads(self._ordered)
+
+    @staticmethod
+    def _build_arc_summary(ordered: List[SessionDigest]) -> str:
+        if not ordered:
+            return ""
+
+        detailed_start = max(0, len(ordered) - MAX_ARC_DETAILED_SESSIONS)
+        recent = [d.arc_line(detailed=True) for d in ordered[detailed_start:]]
+        earlier = [d.arc_line(detailed=False) for d in ordered[:detailed_start]]
+
+        # Recent sessions always fit first; earlier one-liners fill what is left
+        recent_text = "\n".join(recent)
+        budget = ARC_SUMMARY_CHARS - len(recent_text)
+        if budget <= 0:
+            return _truncate(recent_text, ARC_SUMMARY_CHARS)
+
+        kept_earlier = []
+        for line in reversed(earlier):
+            if len(line) + 1 > budget:
+                kept_earlier.append(f"... {detailed_start - len(kept_earlier)} earlier sessions")
+                break
+            kept_earlier.append(line)
+            budget -= len(line) + 1
+        kept_earlier.reverse()
+
+        return "\n".join(kept_earlier + [recent_text]) if kept_earlier else recent_text
+
+    @staticmethod
+    def _build_open_threads(ordered: List[SessionDigest]) -> List[OpenThread]:
+        threads: List[OpenThread] = []
+
+        # Hooks and cliffhangers from the most recent sessions are still live
+        for digest in reversed(ordered[-HOOK_SESSIONS:]):
+            if digest.cliffhanger:
+                threads.append(OpenThread("cliffhanger", digest.cliffhanger, digest.session_number))
+            if digest.next_session_hook:
+                threads.append(OpenThread("next_hook", digest.next_session_hook, digest.session_number))
+
+        # Questions stay open until a later session reveals them
+        revealed_after: set = set()
+        seen_questions: set = set()
+        for digest in reversed(ordered):
+            for question in digest.unresolved_questions:
+                key = _normalize(question)
+                if key in seen_questions or any(key in revealed for revealed in revealed_after):
+                    continue
+                seen_questions.add(key)
+                threads.append(OpenThread("mystery", question, digest.session_number))
+            revealed_after.update(_normalize(text) for text in digest.mysteries_revealed)
+
+        return threads
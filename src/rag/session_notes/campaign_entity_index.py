@@ -0,0 +1,225 @@
+"""
+Campaign Entity Index
+
+Per-campaign lookup tables for entity context retrieval, maintained
+incrementally alongside the campaign's sessions (like CampaignDigest):
+- entity name/alias -> sessions whose entity lists mention it
+- raw section text per section name, searched for a mention in one pass
+- party member and NPC names/aliases for classifier name normalization
+
+A session is re-read when the storage writes it. The campaign-wide tables and
+memoized context snippets are rebuilt lazily, and only after a change, so
+retrieving entity context costs a few lookups instead of a scan of every
+session per entity.
+"""
+
+import bisect
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from api.database.firestore_models import SessionDocument
+
+
+MAX_MEMOIZED_CONTEXTS = 1024     # Context snippets kept per campaign version
+
+# Separator for joined section text; never part of an entity name
+_SEPARATOR = "\x00"
+
+
+@dataclass
+class SessionEntities:
+    """Entity names and searchable text of a single session."""
+    session_id: str
+    session_number: int
+    names: List[str] = field(default_factory=list)            # Lowercase names and aliases from entity lists
+    party_members: List[str] = field(default_factory=list)    # Player character names and aliases
+    npcs: List[str] = field(default_factory=list)             # NPC names and aliases
+    summary: str = ''
+    raw_sections: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_session(cls, session: SessionDocument) -> 'SessionEntities':
+        """Collect names and text from a full session document."""
+        names: List[str] = []
+        for entity_list in (session.player_characters, session.npcs, session.locations, session.items):
+            for entity in entity_list or []:
+                if not isinstance(entity, dict):
+                    continue
+                names.append((entity.get('name') or '').lower())
+                names.extend(
+                    alias.lower() if isinstance(alias, str) else ''
+                    for alias in entity.get('aliases', [])
+                )
+
+        return cls(
+            session_id=session.id,
+            session_number=session.session_number,
+            names=names,
+            party_members=cls._names_and_aliases(session.player_characters),
+            npcs=cls._names_and_aliases(session.npcs),
+            summary=session.summary or '',
+            raw_sections={
+                key: content for key, content in (session.raw_sections or {}).items()
+                if content and isinstance(content, str)
+            },
+        )
+
+    @staticmethod
+    def _names_and_aliases(entities: List[dict]) -> List[str]:
+        names = []
+        for entity in entities or []:
+            if not isinstance(entity, dict):
+                continue
+            if entity.get('name'):
+                names.append(entity['name'])
+            names.extend(alias for alias in entity.get('aliases', []) if alias)
+        return names
+
+
+class _SectionText:
+    """Lowercased text of one raw section across sessions, searched with one find pass."""
+
+    def __init__(self, texts: List[Tuple[int, str]]):
+        self.positions = [pos for pos, _ in texts]
+        self.starts: List[int] = []
+        offset = 0
+        for _, text in texts:
+            self.starts.append(offset)
+            offset += len(text) + 1
+        self.joined = _SEPARATOR.join(text for _, text in texts)
+
+    def mentioning(self, needle: str) -> Set[int]:
+        """Session positions whose text contains needle."""
+        if not needle:
+            return set(self.positions)
+        found: Set[int] = set()
+        starts = self.starts
+        pos = self.joined.find(needle)
+        while pos != -1:
+            i = bisect.bisect_right(starts, pos) - 1
+            found.add(self.positions[i])
+            if i + 1 >= len(starts):
+                break
+            pos = self.joined.find(needle, starts[i + 1])
+        return found
+
+
+@dataclass
+class CampaignEntityIndex:
+    """
+    Entity lookups for one campaign.
+
+    The owning storage calls update_session()/remove_session() on every
+    session write, so reads never re-scan the campaign. Session positions
+    below refer to sessions sorted by (session_number, session_id), the order
+    of get_sessions_sorted().
+    """
+    campaign_id: str
+    session_entities: Dict[str, SessionEntities] = field(default_factory=dict)
+
+    _ordered: Optional[List[SessionEntities]] = field(default=None, init=False, repr=False, compare=False)
+    _name_positions: Dict[str, List[int]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _section_texts: Dict[str, _SectionText] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _contexts: Dict[Tuple[str, str], Optional[str]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    sessions_indexed: int = field(default=0, init=False, compare=False)  # Total per-session rebuilds
+
+    # ===== MAINTENANCE =====
+
+    def update_session(self, session: SessionDocument) -> None:
+        """Re-read a single session."""
+        self.session_entities[session.id] = SessionEntities.from_session(session)
+        self.sessions_indexed += 1
+        self._invalidate()
+
+    def remove_session(self, session_id: str) -> None:
+        """Drop a session from the index."""
+        if self.session_entities.pop(session_id, None) is not None:
+            self._invalidate()
+
+    # ===== READS =====
+
+    def sessions_with_entity(self, entity_lower: str) -> List[SessionEntities]:
+        """Sessions whose entity lists have a name/alias containing, or contained in, entity_lower."""
+        ordered = self._get_ordered()
+        return [ordered[pos] for pos in sorted(self._entity_positions(entity_lower))]
+
+    def entity_context(self, entity_lower: str, raw_section_key: str) -> Optional[str]:
+        """
+        Context snippets for an entity from one raw section of every session.
+
+        A session contributes its raw section when the section mentions the
+        entity, or else its summary when the entity is in the session's entity
+        lists and the summary mentions it. Snippets are in session order.
+        """
+        key = (entity_lower, raw_section_key)
+        if key in self._contexts:
+            return self._contexts[key]
+
+        ordered = self._get_ordered()
+        in_section = self._section_text(raw_section_key).mentioning(entity_lower)
+        context_parts = []
+        for pos in sorted(in_section | self._entity_positions(entity_lower)):
+            session = ordered[pos]
+            if pos in in_section:
+                context_parts.append(
+                    f"Session {session.session_number} - {raw_section_key}:\n{session.raw_sections[raw_section_key]}"
+                )
+            elif session.summary and entity_lower in session.summary.lower():
+                # Fallback to summary if entity found but not in specific section
+                context_parts.append(f"Session {session.session_number} - Summary:\n{session.summary}")
+
+        context = "\n\n".join(context_parts) if context_parts else None
+        if len(self._contexts) >= MAX_MEMOIZED_CONTEXTS:
+            self._contexts.clear()
+        self._contexts[key] = context
+        return context
+
+    def party_members(self) -> List[str]:
+        """Player character names and aliases across the campaign (deduplicated)."""
+        return list(dict.fromkeys(n for s in self._get_ordered() for n in s.party_members))
+
+    def known_npcs(self) -> List[str]:
+        """NPC names and aliases across the campaign (deduplicated)."""
+        return list(dict.fromkeys(n for s in self._get_ordered() for n in s.npcs))
+
+    # ===== INTERNALS =====
+
+    def _get_ordered(self) -> List[SessionEntities]:
+        if self._ordered is None:
+            self._ordered = sorted(
+                self.session_entities.values(),
+                key=lambda s: (s.session_number, s.session_id)
+            )
+            self._name_positions = {}
+            for pos, session in enumerate(self._ordered):
+                for name in session.names:
+                    positions = self._name_positions.setdefault(name, [])
+                    if not positions or positions[-1] != pos:
+                        positions.append(pos)
+        return self._ordered
+
+    def _entity_positions(self, entity_lower: str) -> Set[int]:
+        """Positions of sessions whose entity lists match entity_lower (scans distinct names once)."""
+        self._get_ordered()
+        positions: Set[int] = set()
+        for name, name_positions in self._name_positions.items():
+            if entity_lower in name or name in entity_lower:
+                positions.update(name_positions)
+        return positions
+
+    def _section_text(self, raw_section_key: str) -> _SectionText:
+        section_text = self._section_texts.get(raw_section_key)
+        if section_text is None:
+            section_text = _SectionText([
+                (pos, session.raw_sections[raw_section_key].lower())
+                for pos, session in enumerate(self._get_ordered())
+                if raw_section_key in session.raw_sections
+            ])
+            self._section_texts[raw_section_key] = section_text
+        return section_text
+
+    def _invalidate(self) -> None:
+        self._ordered = None
+        self._name_positions = {}
+        self._section_texts = {}
+        self._contexts = {}
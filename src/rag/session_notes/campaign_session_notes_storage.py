@@ -3,13 +3,31 @@ Campaign Session Notes Storage
 
 In-memory cache for a specific campaign's session documents.
 Loaded from Firestore, used directly for RAG queries.
+
+Sessions are kept in two sorted indexes (by session number and by date) that
+are maintained on every write, so temporal lookups ("recent", "first",
+"between N and M") are served with a binary search instead of a full sort per
+query. Every write also bumps the storage's `revision`, which caches built on
+the sessions use as their version key.
+
+A rolling CampaignDigest is stored alongside the sessions and re-digests a
+session when it is written. A CampaignEntityIndex (entity -> sessions and
+context snippets) is maintained the same way.
 """
 
-from typing import Dict, List, Optional
+import bisect
+import itertools
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 
 from api.database.firestore_models import SessionDocument
+from .campaign_digest import CampaignDigest
+from .campaign_entity_index import CampaignEntityIndex
+
+# Process-wide, so a revision never repeats across storages (unlike id(), which
+# can be reused once a storage is garbage collected)
+_revisions = itertools.count(1)
 
 
 @dataclass
@@ -17,10 +35,58 @@ class CampaignSessionNotesStorage:
     """
     In-memory cache of session documents for a single campaign.
     Sessions are loaded from Firestore and used directly for RAG queries.
+
+    Write sessions through add_session()/remove_session(), which keep the
+    sorted indexes current and bump `revision`. Editing a session in place is
+    not a write, so re-add a session after changing it.
     """
     campaign_id: str
     sessions: Dict[str, SessionDocument] = field(default_factory=dict)
 
+    # Changes on every session write; unique across storages in this process
+    revision: int = field(default=0, init=False, compare=False)
+
+    # Sorted indexes: (session_number, session_id) and (date, session_id)
+    _number_index: List[Tuple[int, str]] = field(default_factory=list, init=False, repr=False, compare=False)
+    _date_index: List[Tuple[datetime, str]] = field(default_factory=list, init=False, repr=False, compare=False)
+
+    # Rolling campaign digest for campaign-wide intents
+    _digest: Optional[CampaignDigest] = field(default=None, init=False, repr=False, compare=False)
+
+    # Entity -> sessions/context index for entity context retrieval
+    _entity_index: Optional[CampaignEntityIndex] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._rebuild_indexes()
+
+    # ===== MUTATION =====
+
+    def add_session(self, session: SessionDocument) -> None:
+        """Add or replace a session."""
+        old = self.sessions.get(session.id)
+        if old is not None:
+            self._unindex(session.id, old)
+        self.sessions[session.id] = session
+        self._index(session.id, session)
+        for derived in (self._digest, self._entity_index):
+            if derived is not None:
+                derived.update_session(session)
+        self.revision = next(_revisions)
+
+    def remove_session(self, session_id: str) -> Optional[SessionDocument]:
+        """Remove a session by ID. Returns the removed session, if any."""
+        old = self.sessions.pop(session_id, None)
+        if old is None:
+            return None
+        self._unindex(session_id, old)
+        for derived in (self._digest, self._entity_index):
+            if derived is not None:
+                derived.remove_session(old.id)
+        self.revision = next(_revisions)
+        return old
+
+    # ===== LOOKUPS =====
+
     def get_all_sessions(self) -> List[SessionDocument]:
         """Get all sessions for this campaign."""
         return list(self.sessions.values())
@@ -35,20 +101,86 @@ class CampaignSessionNotesStorage:
 
     def get_latest_session(self) -> Optional[SessionDocument]:
         """Get the most recent session by session number."""
-        if not self.sessions:
+        if not self._number_index:
             return None
-        return max(self.sessions.values(), key=lambda s: s.session_number)
+        return self.sessions[self._number_index[-1][1]]
 
     def get_sessions_sorted(self) -> List[SessionDocument]:
         """Get all sessions sorted by session number."""
-        return sorted(self.sessions.values(), key=lambda s: s.session_number)
+        return [self.sessions[sid] for _, sid in self._number_index]
+
+    def get_recent_sessions(self, count: int) -> List[SessionDocument]:
+        """Get the last `count` sessions by session number (oldest first)."""
+        if count <= 0:
+            return []
+        return [self.sessions[sid] for _, sid in self._number_index[-count:]]
+
+    def get_first_sessions(self, count: int) -> List[SessionDocument]:
+        """Get the first `count` sessions by session number."""
+        if count <= 0:
+            return []
+        return [self.sessions[sid] for _, sid in self._number_index[:count]]
+
+    def get_sessions_in_range(self, start: int, end: int) -> List[SessionDocument]:
+        """Get sessions with start <= session_number <= end, sorted by number."""
+        if start > end:
+            start, end = end, start
+        lo = bisect.bisect_left(self._number_index, (start, ''))
+        hi = bisect.bisect_left(self._number_index, (end + 1, ''))
+        return [self.sessions[sid] for _, sid in self._number_index[lo:hi]]
+
+    def get_latest_session_date(self) -> Optional[datetime]:
+        """Get the most recent session date, or None if no session has a date."""
+        if not self._date_index:
+            return None
+        return self._date_index[-1][0]
 
     def get_session_date_range(self) -> tuple[Optional[datetime], Optional[datetime]]:
         """Get the date range of all sessions."""
-        if not self.sessions:
+        if not self._date_index:
             return None, None
+        return self._date_index[0][0], self._date_index[-1][0]
 
-        dates = [s.date for s in self.sessions.values() if s.date]
-        if not dates:
-            return None, None
-        return min(dates), max(dates)
+    def get_digest(self) -> CampaignDigest:
+        """Get the campaign digest, built on first use and kept current by session writes."""
+        if self._digest is None:
+            digest = CampaignDigest(campaign_id=self.campaign_id)
+            for session in self.sessions.values():
+                digest.update_session(session)
+            self._digest = digest
+        return self._digest
+
+    def get_entity_index(self) -> CampaignEntityIndex:
+        """Get the entity index, built on first use and kept current by session writes."""
+        if self._entity_index is None:
+            index = CampaignEntityIndex(campaign_id=self.campaign_id)
+            for session in self.sessions.values():
+                index.update_session(session)
+            self._entity_index = index
+        return self._entity_index
+
+    # ===== INDEX MAINTENANCE =====
+
+    # Entries are keyed by the `sessions` dict key, so every entry resolves
+    def _index(self, session_id: str, session: SessionDocument) -> None:
+        bisect.insort(self._number_index, (session.session_number, session_id))
+        if session.date:
+            bisect.insort(self._date_index, (session.date, session_id))
+
+    def _unindex(self, session_id: str, session: SessionDocument) -> None:
+        self._remove_entry(self._number_index, (session.session_number, session_id))
+        if session.date:
+            self._remove_entry(self._date_index, (session.date, session_id))
+
+    @staticmethod
+    def _remove_entry(index: list, entry: tuple) -> None:
+        i = bisect.bisect_left(index, entry)
+        if i < len(index) and index[i] == entry:
+            del index[i]
+
+    def _rebuild_indexes(self) -> None:
+        self._number_index = sorted((s.session_number, sid) for sid, s in self.sessions.items())
+        self._date_index = sorted((s.date, sid) for sid, s in self.sessions.items() if s.date)
+        self._digest = None
+        self._entity_index = None
+        self.revision = next(_revisions)
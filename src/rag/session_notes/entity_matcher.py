@@ -0,0 +1,195 @@
+"""
+Query Entity Matcher
+
+Compiles the entities of a single session notes query into reusable lookup
+structures so that handlers can test names and free text against every query
+entity in one pass instead of re-normalizing each entity name per comparison.
+
+Matching semantics are identical to the router's original helpers:
+- exact name: case-insensitive equality
+- name match: case-insensitive equality or substring in either direction
+- text mention: full name appears in the text, or (for multi-word names) any
+  name part longer than two characters appears in the text
+- full-name mention: only the full name appears in the text
+"""
+
+import bisect
+import re
+from typing import Dict, FrozenSet, Iterable, List, Optional, Pattern, Set
+
+
+_EMPTY: FrozenSet[str] = frozenset()
+
+
+def _build_trie_pattern(terms: Iterable[str]) -> Optional[Pattern]:
+    """Build a regex whose alternation is laid out as a trie of the terms.
+
+    The pattern is wrapped in a lookahead capture so that every start position
+    in the text is tried, and greedy optional branches make the capture the
+    longest term that starts at that position.
+    """
+    trie: Dict = {}
+    for term in terms:
+        if not term:
+            continue
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    if not trie:
+        return None
+
+    def to_regex(node: Dict) -> str:
+        is_terminal = '' in node
+        branches = [re.escape(char) + to_regex(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if is_terminal:
+            # Longer continuation first (greedy), then allow stopping here
+            return '(?:' + body + ')?'
+        return body
+
+    return re.compile('(?=(' + to_regex(trie) + '))')
+
+
+class _TermIndex:
+    """Maps compiled terms back to the entity names they belong to."""
+
+    def __init__(self, term_owners: Dict[str, Set[str]]):
+        # A term that occurs in the text implies every shorter term contained in
+        # it also occurs, so fold those owners in up front. The regex then only
+        # needs to report the longest term at each position.
+        self.owners: Dict[str, FrozenSet[str]] = {}
+        for term in term_owners:
+            names: Set[str] = set()
+            for other, other_names in term_owners.items():
+                if other in term:
+                    names |= other_names
+            self.owners[term] = frozenset(names)
+        self.pattern = _build_trie_pattern(term_owners)
+
+    def search(self, text_lower: str) -> FrozenSet[str]:
+        if self.pattern is None or not text_lower:
+            return _EMPTY
+        found: Set[str] = set()
+        for match in self.pattern.finditer(text_lower):
+            term = match.group(1)
+            if term:
+                found |= self.owners[term]
+        return frozenset(found)
+
+
+class QueryEntityMatcher:
+    """
+    Per-query compiled matcher for session notes entity names.
+
+    Build once per query from the entity dicts and share it across all
+    handlers and sessions. Lookups are memoized per target string, so repeated
+    participant/speaker names across sessions are only resolved once.
+    """
+
+    def __init__(self, entities: List[Dict[str, str]]):
+        self.entity_names: List[str] = [e.get("name", "") for e in entities]
+        self.lowered: Dict[str, str] = {name: name.lower() for name in self.entity_names}
+        self.named_entities: FrozenSet[str] = frozenset(n for n in self.entity_names if n)
+
+        by_lower: Dict[str, Set[str]] = {}
+        for name, lower in self.lowered.items():
+            by_lower.setdefault(lower, set()).add(name)
+        self._by_lower: Dict[str, FrozenSet[str]] = {lower: frozenset(names) for lower, names in by_lower.items()}
+
+        full_terms: Dict[str, Set[str]] = {}
+        mention_terms: Dict[str, Set[str]] = {}
+        for name, lower in self.lowered.items():
+            if not lower:
+                continue
+            full_terms.setdefault(lower, set()).add(name)
+            mention_terms.setdefault(lower, set()).add(name)
+            parts = lower.split()
+            if len(parts) > 1:
+                for part in parts:
+                    if len(part) > 2:  # Avoid matching very short parts
+                        mention_terms.setdefault(part, set()).add(name)
+
+        self._full_index = _TermIndex(full_terms)
+        self._mention_index = _TermIndex(mention_terms)
+
+        # Empty entity names are substrings of every target
+        self._always_matching: FrozenSet[str] = frozenset(n for n in self.entity_names if not n)
+
+        # Entity names joined for "target inside entity name" lookups
+        self._joined_names = "\x00".join(self.lowered[n] for n in self.entity_names)
+        self._name_offsets: List[int] = []
+        offset = 0
+        for name in self.entity_names:
+            self._name_offsets.append(offset)
+            offset += len(self.lowered[name]) + 1
+
+        self._name_cache: Dict[str, FrozenSet[str]] = {}
+        self._mention_cache: Dict[str, FrozenSet[str]] = {}
+        self._full_cache: Dict[str, FrozenSet[str]] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self.entity_names)
+
+    def names_equal(self, target_name: str) -> FrozenSet[str]:
+        """Entity names equal to a target name (case-insensitive)."""
+        return self._by_lower.get(target_name.lower(), _EMPTY)
+
+    def names_matching(self, target_name: str) -> FrozenSet[str]:
+        """Entity names that match a target name (equality or substring either way)."""
+        cached = self._name_cache.get(target_name)
+        if cached is not None:
+            return cached
+
+        target_lower = target_name.lower()
+        if not target_lower:
+            # Empty string is a substring of every entity name
+            result = frozenset(self.entity_names)
+        else:
+            found = set(self._full_index.search(target_lower))
+            found |= self._always_matching
+            found |= self._names_containing(target_lower)
+            result = frozenset(found)
+
+        self._name_cache[target_name] = result
+        return result
+
+    def name_matches(self, entity_name: str, target_name: str) -> bool:
+        """Check if a query entity matches a target name."""
+        return entity_name in self.names_matching(target_name)
+
+    def mentioned_in(self, text: str) -> FrozenSet[str]:
+        """Entity names mentioned in text (full name or significant name part)."""
+        if not text:
+            return _EMPTY
+        cached = self._mention_cache.get(text)
+        if cached is None:
+            cached = self._mention_index.search(text.lower())
+            self._mention_cache[text] = cached
+        return cached
+
+    def full_names_in(self, text: str) -> FrozenSet[str]:
+        """Entity names whose full name appears in text."""
+        if not text:
+            return _EMPTY
+        cached = self._full_cache.get(text)
+        if cached is None:
+            cached = self._full_index.search(text.lower()) | self._always_matching
+            self._full_cache[text] = cached
+        return cached
+
+    def _names_containing(self, target_lower: str) -> Set[str]:
+        """Entity names whose lowercase form contains target_lower."""
+        found: Set[str] = set()
+        start = self._joined_names.find(target_lower)
+        while start != -1:
+            # Locate the entity whose slot contains this offset
+            idx = bisect.bisect_right(self._name_offsets, start) - 1
+            name = self.entity_names[idx]
+            if start + len(target_lower) <= self._name_offsets[idx] + len(self.lowered[name]):
+                found.add(name)
+            start = self._joined_names.find(target_lower, start + 1)
+        return found
@@ -16,6 +16,14 @@ from .session_types import (
     SessionNotesQueryPerformanceMetrics
 )
 from .campaign_session_notes_storage import CampaignSessionNotesStorage
+from .entity_matcher import QueryEntityMatcher
+from .campaign_digest import MAX_OPEN_THREADS, MAX_QUERY_DIGESTS, SessionDigest
+
+# Context hints that request the most recent sessions
+RECENCY_HINTS = ("recent", "recently", "latest", "last")
+
+# Campaign-wide intentions answered from the rolling campaign digest
+DIGEST_INTENTIONS = ("cross_session", "unresolved_mysteries", "future_implications")
 
 
 class SessionNotesQueryRouter:
@@ -33,11 +41,14 @@ class SessionNotesQueryRouter:
         # Initialize performance tracking
         performance = SessionNotesQueryPerformanceMetrics()
         performance.entities_input = len(entities)
-        performance.total_sessions_available = len(self.campaign_storage.get_all_sessions())
+        performance.total_sessions_available = self.campaign_storage.get_session_count()
+
+        # Compile query entities once; shared by session filtering and all handlers
+        matcher = QueryEntityMatcher(entities)
 
         # Step 1: Get relevant sessions based on intention and entities
         filter_start = time.perf_counter()
-        relevant_sessions = self._get_relevant_sessions(intention, entities, context_hints)
+        relevant_sessions = self._get_relevant_sessions(intention, entities, context_hints, matcher)
         filter_end = time.perf_counter()
         performance.session_filtering_ms = (filter_end - filter_start) * 1000
         performance.sessions_searched = len(relevant_sessions)
@@ -45,12 +56,18 @@ class SessionNotesQueryRouter:
         # Step 2: Build contexts for each relevant session
         context_start = time.perf_counter()
         contexts = []
-        for session in relevant_sessions:
-            context = self._build_session_context(
-                session, intention, entities, context_hints
-            )
-            if context.relevance_score > 0:
+        if intention in DIGEST_INTENTIONS:
+            # One bounded context from the campaign digest instead of whole sessions
+            context = self._build_digest_context(relevant_sessions, intention, entities, context_hints, matcher)
+            if context and context.relevance_score > 0:
                 contexts.append(context)
+        else:
+            for session in relevant_sessions:
+                context = self._build_session_context(
+                    session, intention, entities, context_hints, matcher
+                )
+                if context.relevance_score > 0:
+                    contexts.append(context)
         context_end = time.perf_counter()
         performance.context_building_ms = (context_end - context_start) * 1000
         performance.contexts_built = len(contexts)
@@ -79,63 +96,59 @@ class SessionNotesQueryRouter:
             performance_metrics=performance
         )
 
-    def _get_relevant_sessions(self, intention: str, entities: List[Dict[str, str]], context_hints: List[str]) -> List[SessionDocument]:
+    def _get_relevant_sessions(self, intention: str, entities: List[Dict[str, str]], context_hints: List[str],
+                               matcher: QueryEntityMatcher) -> List[SessionDocument]:
         """Get sessions relevant to the query based on intention and entities"""
-        all_sessions = self.campaign_storage.get_all_sessions()
-
         # Handle temporal filters
-        sessions = self._apply_temporal_filters(all_sessions, context_hints)
+        sessions = self._apply_temporal_filters(context_hints)
 
         # Filter by entity presence if entities specified
         if entities:
             relevant_sessions = []
             for session in sessions:
-                if any(self._session_contains_entity(session, entity) for entity in entities):
+                if self._session_contains_entity(session, matcher):
                     relevant_sessions.append(session)
             sessions = relevant_sessions
 
         # If no entities or temporal filters, return all sessions
         if not sessions:
-            sessions = all_sessions
+            sessions = self.campaign_storage.get_all_sessions()
 
         return sessions
 
-    def _apply_temporal_filters(self, sessions: List[SessionDocument], context_hints: List[str]) -> List[SessionDocument]:
-        """Apply temporal filters based on context hints"""
-        sessions_sorted = sorted(sessions, key=lambda s: s.session_number)
-
+    def _apply_temporal_filters(self, context_hints: List[str]) -> List[SessionDocument]:
+        """Apply temporal filters based on context hints (served from the storage's sorted index)"""
         for hint in context_hints:
             hint_lower = hint.lower()
 
-            if hint_lower in ["recent", "recently", "latest", "last"]:
-                return sessions_sorted[-5:]  # Last 5 sessions
+            if hint_lower in RECENCY_HINTS:
+                return self.campaign_storage.get_recent_sessions(5)  # Last 5 sessions
             elif hint_lower in ["early", "beginning", "first"]:
-                return sessions_sorted[:5]   # First 5 sessions
+                return self.campaign_storage.get_first_sessions(5)   # First 5 sessions
             elif "between" in hint_lower:
                 # Extract session range
                 match = re.search(r'(\d+).*?(\d+)', hint)
                 if match:
                     start, end = int(match.group(1)), int(match.group(2))
-                    return [s for s in sessions if start <= s.session_number <= end]
+                    return self.campaign_storage.get_sessions_in_range(start, end)
 
-        return sessions
+        return self.campaign_storage.get_all_sessions()
 
-    def _session_contains_entity(self, session: SessionDocument, entity: Dict[str, str]) -> bool:
-        """Check if a session contains references to an entity"""
-        entity_name = entity.get("name", "").lower()
-        if not entity_name:
+    def _session_contains_entity(self, session: SessionDocument, matcher: QueryEntityMatcher) -> bool:
+        """Check if a session contains references to any of the query entities"""
+        named = matcher.named_entities
+        if not named:
             return False
 
         # Check in entity lists (now List[dict])
         all_entities = session.player_characters + session.npcs + session.locations + session.items
 
         for session_entity in all_entities:
-            session_entity_name = session_entity.get('name', '').lower()
-            if entity_name in session_entity_name or session_entity_name in entity_name:
+            if matcher.names_matching(session_entity.get('name', '')) & named:
                 return True
             # Check aliases
             aliases = session_entity.get('aliases', [])
-            if any(entity_name in alias.lower() or alias.lower() in entity_name for alias in aliases):
+            if any(matcher.names_matching(alias) & named for alias in aliases):
                 return True
 
         # Check in text content
@@ -145,17 +158,18 @@ class SessionNotesQueryRouter:
         ]
 
         for field in text_fields:
-            if entity_name in field.lower():
+            if matcher.full_names_in(field) & named:
                 return True
 
         # Check in raw sections
         for section_text in session.raw_sections.values():
-            if entity_name in section_text.lower():
+            if matcher.full_names_in(section_text) & named:
                 return True
 
         return False
 
-    def _build_session_context(self, session: SessionDocument, intention: str, entities: List[Dict[str, str]], context_hints: List[str]) -> SessionNotesContext:
+    def _build_session_context(self, session: SessionDocument, intention: str, entities: List[Dict[str, str]],
+                               context_hints: List[str], matcher: QueryEntityMatcher) -> SessionNotesContext:
         """Build a SessionNotesContext for a specific session based on the query intention"""
         context = SessionNotesContext(
             session_number=session.session_number,
@@ -180,14 +194,11 @@ class SessionNotesQueryRouter:
             "divine_religious": self._handle_divine_religious,
             "memory_vision": self._handle_memory_vision,
             "rules_mechanics": self._handle_rules_mechanics,
-            "humor_moments": self._handle_humor_moments,
-            "unresolved_mysteries": self._handle_unresolved_mysteries,
-            "future_implications": self._handle_future_implications,
-            "cross_session": self._handle_cross_session
+            "humor_moments": self._handle_humor_moments
         }
 
         handler = intention_handlers.get(intention, self._handle_generic)
-        handler(session, context, entities, context_hints)
+        handler(session, context, entities, context_hints, matcher)
 
         # Calculate relevance score
         context.relevance_score = self._calculate_relevance_score(
@@ -196,7 +207,63 @@ class SessionNotesQueryRouter:
 
         return context
 
-    def _handle_character_status(self, session: SessionDocument, context: SessionNotesContext, entities: List[Dict[str, str]], context_hints: List[str]) -> None:
+    def _build_digest_context(self, sessions: List[SessionDocument], intention: str,
+                              entities: List[Dict[str, str]], context_hints: List[str],
+                              matcher: QueryEntityMatcher) -> Optional[SessionNotesContext]:
+        """Build a single bounded context for campaign-wide intentions from the campaign digest"""
+        digest = self.campaign_storage.get_digest()
+        selected_ids = {session.id for session in sessions}
+        digests = [d for d in digest.get_ordered_digests() if d.session_id in selected_ids]
+        if not digests:
+            return None
+
+        selected_numbers = {d.session_number for d in digests}
+        threads = [t for t in digest.get_open_threads() if t.session_number in selected_numbers]
+
+        context = SessionNotesContext(
+            session_number=digests[-1].session_number,
+            session_summary=digest.get_arc_summary()
+        )
+
+        if intention == "unresolved_mysteries":
+            mysteries = [t.to_dict() for t in threads if t.kind == "mystery"][:MAX_OPEN_THREADS]
+            if mysteries:
+                context.relevant_sections["open_mysteries"] = mysteries
+            revealed = digest.get_recently_revealed()
+            if revealed:
+                context.relevant_sections["recently_revealed"] = revealed
+
+        elif intention == "future_implications":
+            hooks = [t.to_dict() for t in threads if t.kind != "mystery"][:MAX_OPEN_THREADS]
+            if hooks:
+                context.relevant_sections["open_threads"] = hooks
+            if digests[-1].dm_notes:
+                context.relevant_sections["dm_notes"] = digests[-1].dm_notes
+
+        else:
+            # Prefer sessions whose digest mentions a query entity or context hint, most recent last
+            hints = [hint.lower() for hint in context_hints]
+            matching = [d for d in digests if self._digest_mentions(d, matcher, hints)]
+            chosen = (matching or digests)[-MAX_QUERY_DIGESTS:]
+            context.relevant_sections["session_digests"] = [d.to_dict() for d in chosen]
+            if threads:
+                context.relevant_sections["open_threads"] = [t.to_dict() for t in threads[:MAX_OPEN_THREADS]]
+
+        latest_session = self.campaign_storage.get_session(digests[-1].session_id)
+        context.relevance_score = self._calculate_relevance_score(
+            latest_session, context, entities, context_hints, intention
+        )
+        return context
+
+    @staticmethod
+    def _digest_mentions(digest: SessionDigest, matcher: QueryEntityMatcher, hints: List[str]) -> bool:
+        """Whether a session digest's summary or key events mention a query entity or hint"""
+        texts = [digest.summary, *digest.key_events]
+        if matcher and any(matcher.mentioned_in(text) for text in texts):
+            return True
+        return any(hint in text.lower() for text in texts for hint in hints)
+
+    def _handle_character_status(self, session: SessionDocument, context: SessionNotesContext, entities: List[Dict[str, str]], context_hints: List[str], matcher: QueryEntityMatcher) -> None:
         """Handle character status queries"""
         for entity in entities:
             entity_name = entity.get("name", "")
@@ -210,22 +277,21 @@ class SessionNotesQueryRouter:
 
                 # Get recent decisions
                 decisions = [d for d in session.character_decisions
-                            if d.get('character', '').lower() == entity_name.lower()]
+                            if entity_name in matcher.names_equal(d.get('character', ''))]
                 if decisions:
                     context.relevant_sections["decisions"] = decisions
 
-                # Get combat participation
+                # Get combat participation (damage tables are keyed by lowercase name)
+                name_lower = matcher.lowered[entity_name]
                 for encounter in session.combat_encounters:
                     enemies = encounter.get('enemies', [])
-                    damage_dealt = encounter.get('damage_dealt', {})
-                    damage_taken = encounter.get('damage_taken', {})
-                    if (entity_name.lower() in [e.get('name', '').lower() for e in enemies] or
-                        entity_name.lower() in damage_dealt or
-                        entity_name.lower() in damage_taken):
+                    if (any(entity_name in matcher.names_equal(e.get('name', '')) for e in enemies) or
+                        name_lower in encounter.get('damage_dealt', {}) or
+                        name_lower in encounter.get('damage_taken', {})):
                         context.relevant_sections["recent_combat"] = encounter
                         break
 
-    def _handle_event_sequence(self, session: SessionDocument, context: SessionNotesContext, entities: List[Dict[str, str]], context_hints: List[str]) -> None:
+    def _handle_event_sequence(self, session: SessionDocument, context: SessionNotesContext, entities: List[Dict[str, str]], context_hints: List[str], matcher: QueryEntityMatcher) -> None:
         """Handle event sequence queries"""
         relevant_events = []
 
@@ -235,7 +301,7 @@ class SessionNotesQueryRouter:
                     entity_name = entity.get("name", "")
                     # Check participants list
                     participants = event.get('participants', [])
-                    if any(self._name_matches(entity_name, p.get('name', '')) for p in participants):
+                    if any(matcher.name_matches(entity_name, p.get('name', '')) for p in participants):
                         relevant_events.append(event)
                         if entity_name not in context.entities_found:
                             context.entities_found.append(entity_name)
@@ -244,7 +310,7 @@ class SessionNotesQueryRouter:
                     # Also check if entity is mentioned in event description or location
                     description = event.get('description', '')
                     location = event.get('location', '')
-                    if self._entity_mentioned_in_text(entity_name, description) or self._entity_mentioned_in_text(entity_name, location):
+                    if entity_name in matcher.mentioned_in(description) or entity_name in matcher.mentioned_in(location):
                         relevant_events.append(event)
                         if entity_name not in context.entities_found:
                             context.entities_found.append(entity_name)
@@ -255,7 +321,7 @@ class SessionNotesQueryRouter:
         if relevant_events:
             context.relevant_sections["events"] = sorted(relevant_events, key=lambda e: e.get('session_number', 0))
 
-    def _handle_npc_info(self, session: SessionDocument, context: SessionNotesContext, entities: List[Dict[str, str]], context_hints: List[str]) -> None:
+    def _handle_npc_info(self, session: SessionDocument, context: SessionNotesContext, entities: List[Dict[str, str]], context_hints: List[str], matcher: QueryEntityMatcher) -> None:
         """Handle character information queries (NPCs and PCs)"""
         entities_found_count = 0
 
@@ -265,7 +331,7 @@ class SessionNotesQueryRouter:
 
             # Search in NPCs
             for npc in session.npcs:
-                if self._name_matches(entity_name, npc.get('name', '')):
+                if matcher.name_matches(entity_name, npc.get('name', '')):
                     character_entity = npc
                     context.entities_found.append(entity_name)
                     entities_found_count += 1
@@ -274,7 +340,7 @@ class SessionNotesQueryRouter:
             # If not found in NPCs, try player characters
             if not character_entity:
                 for pc in session.player_characters:
-                    if self._name_matches(entity_name, pc.get('name', '')):
+                    if matcher.name_matches(entity_name, pc.get('name', '')):
                         character_entity = pc
                         context.entities_found.append(entity_name)
                         entities_found_count += 1
@@ -285,26 +351,26 @@ class SessionNotesQueryRouter:
 
                 # Find quotes from this character
                 character_quotes = [q for q in session.quotes
-                                  if self._name_matches(entity_name, q.get("speaker", ""))]
+                                  if matcher.name_matches(entity_name, q.get("speaker", ""))]
                 if character_quotes:
                     context.relevant_sections["quotes"] = character_quotes
 
                 # Find events involving this character
                 character_events = [e for e in session.key_events
-                                  if any(self._name_matches(entity_name, p.get('name', '')) for p in e.get('participants', []))]
+                                  if any(matcher.name_matches(entity_name, p.get('name', '')) for p in e.get('participants', []))]
                 if character_events:
                     context.relevant_sections["events"] = character_events
 
                 # Find character status
                 for status_name, status in session.character_statuses.items():
-                    if self._name_matches(entity_name, status_name):
+                    if matcher.name_matches(entity_name, status_name):
                         context.relevant_sections["status"] = status
                         break
 
             # Fallback: search in raw text content
             elif len(entities) <= 2:
                 for section_name, section_text in session.raw_sections.items():
-                    if self._entity_mentioned_in_text(entity_name, section_text):
+                    if entity_name in matcher.mentioned_in(section_text):
                         if "text_mentions" not in context.relevant_sections:
                             context.relevant_sections["text_mentions"] = {}
                         context.relevant_sections["text_mentions"][section_name] = section_text
@@ -314,9 +380,9 @@ class SessionNotesQueryRouter:
 
         # Fallback to party dynamics if multiple characters involved
         if len(entities) >= 2 and entities_found_count >= 1:
-            self._add_party_dynamics_fallback(session, context, entities)
+            self._add_party_dynamics_fallback(session, context, matcher)
 
-    def _handle_location_details(self, session: SessionDocument, context: SessionNotesContext, entities: List[Dict[str, str]], context_hints: List[str]) -> None:
+    def _handle_location_details(self, session: SessionDocument, context: SessionNotesContext, entities: List[Dict[str, str]], context_hints: List[str], matcher: QueryEntityMatcher) -> None:
         """Handle location detail queries"""
         for entity in entities:
             entity_name = entity.get("name", "")
@@ -326,7 +392,7 @@ class SessionNotesQueryRouter:
                 # Find location in session
                 location_entity = None
                 for location in session.locations:
-                    if location.get('name', '').lower() == entity_name.lower():
+                    if entity_name in matcher.names_equal(location.get('name', '')):
                         location_entity = location
                         context.entities_found.append(entity_name)
                         break
@@ -336,17 +402,17 @@ class SessionNotesQueryRouter:
 
                     # Find events at this location
                     location_events = [e for e in session.key_events
-                                     if e.get('location', '').lower() == entity_name.lower()]
+                                     if entity_name in matcher.names_equal(e.get('location', ''))]
                     if location_events:
                         context.relevant_sections["events"] = location_events
 
                     # Check raw sections for description
                     for section_name, section_text in session.raw_sections.items():
-                        if entity_name.lower() in section_text.lower():
+                        if entity_name in matcher.full_names_in(section_text):
                             context.relevant_sections["description"] = section_text
                             break
 
-    def _handle_item_tracking(self, session: SessionDocument, context: SessionNotesContext, entities: List[Dict[str, str]], context_hints: List[str]) -> None:
+    def _handle_item_tracking(self, session: SessionDocument, context: SessionNotesContext, entities: List[Dict[str, str]], context_hints: List[str], matcher: QueryEntityMatcher) -> None:
         """Handle item tracking queries"""
         for entity in entities:
             entity_name = entity.get("name", "")
@@ -368,7 +434,7 @@ class SessionNotesQueryRouter:
                         context.relevant_sections["equipment_changes"] = {char_name: equipment_changes}
                         context.entities_found.append(entity_name)
 
-    def _handle_combat_recap(self, session: SessionDocument, context: SessionNotesContext, entities: List[Dict[str, str]], context_hints: List[str]) -> None:
+    def _handle_combat_recap(self, session: SessionDocument, context: SessionNotesContext, entities: List[Dict[str, str]], context_hints: List[str], matcher: QueryEntityMatcher) -> None:
         """Handle combat recap queries"""
         relevant_encounters = []
 
@@ -404,7 +470,7 @@ class SessionNotesQueryRouter:
             if related_spells:
                 context.relevant_sections["spells_used"] = related_spells
 
-    def _handle_spell_ability_usage(self, session: SessionDocument, context: SessionNotesContext, entities: List[Dict[str, str]], context_hints: List[str]) -> None:
+    def _handle_spell_ability_usage(self, session: SessionDocument, context: SessionNotesContext, entities: List[Dict[str, str]], context_hints: List[str], matcher: QueryEntityMatcher) -> None:
         """Handle spell and ability usage queries"""
         relevant_spells = []
 
@@ -415,8 +481,8 @@ class SessionNotesQueryRouter:
                     caster = spell_use.get('caster', '')
                     targets = spell_use.get('targets', [])
 
-                    if (self._name_matches(entity_name, caster) or
-                        any(self._name_matches(entity_name, target) for target in targets)):
+                    if (matcher.name_matches(entity_name, caster) or
+                        any(matcher.name_matches(entity_name, target) for target in targets)):
                         relevant_spells.append(spell_use)
                         if entity_name not in context.entities_found:
                             context.entities_found.append(entity_name)
@@ -437,7 +503,7 @@ class SessionNotesQueryRouter:
         if relevant_spells:
             context.relevant_sections["spells"] = relevant_spells
 
-    def _handle_character_decisions(self, session: SessionDocument, context: SessionNotesContext, entities: List[Dict[str, str]], context_hints: List[str]) -> None:
+    def _handle_character_decisions(self, session: SessionDocument, context: SessionNotesContext, entities: List[Dict[str, str]], context_hints: List[str], matcher: QueryEntityMatcher) -> None:
         """Handle character decision queries"""
         relevant_decisions = []
 
@@ -445,7 +511,7 @@ class SessionNotesQueryRouter:
             if entities:
                 for entity in entities:
                     entity_name = entity.get("name", "")
-                    if self._name_matches(entity_name, decision.get('character', '')):
+                    if matcher.name_matches(entity_name, decision.get('character', '')):
                         relevant_decisions.append(decision)
                         if entity_name not in context.entities_found:
                             context.entities_found.append(entity_name)
@@ -456,7 +522,7 @@ class SessionNotesQueryRouter:
         if relevant_decisions:
             context.relevant_sections["decisions"] = relevant_decisions
 
-    def _handle_party_dynamics(self, session: SessionDocument, context: SessionNotesContext, entities: List[Dict[str, str]], context_hints: List[str]) -> None:
+    def _handle_party_dynamics(self, session: SessionDocument, context: SessionNotesContext, entities: List[Dict[str, str]], context_hints: List[str], matcher: QueryEntityMatcher) -> None:
         """Handle party dynamics queries"""
         dynamics = {}
 
@@ -489,7 +555,7 @@ class SessionNotesQueryRouter:
         if dynamics:
             context.relevant_sections["dynamics"] = dynamics
 
-    def _handle_quest_tracking(self, session: SessionDocument, context: SessionNotesContext, entities: List[Dict[str, str]], context_hints: List[str]) -> None:
+    def _handle_quest_tracking(self, session: SessionDocument, context: SessionNotesContext, entities: List[Dict[str, str]], context_hints: List[str], matcher: QueryEntityMatcher) -> None:
         """Handle quest tracking queries"""
         quest_info = {}
 
@@ -505,7 +571,7 @@ class SessionNotesQueryRouter:
         if quest_info:
             context.relevant_sections["quest_info"] = quest_info
 
-    def _handle_puzzle_solutions(self, session: SessionDocument, context: SessionNotesContext, entities: List[Dict[str, str]], context_hints: List[str]) -> None:
+    def _handle_puzzle_solutions(self, session: SessionDocument, context: SessionNotesContext, entities: List[Dict[str, str]], context_hints: List[str], matcher: QueryEntityMatcher) -> None:
         """Handle puzzle solution queries"""
         puzzle_info = {}
 
@@ -518,7 +584,7 @@ class SessionNotesQueryRouter:
         if puzzle_info:
             context.relevant_sections["puzzles"] = puzzle_info
 
-    def _handle_loot_rewards(self, session: SessionDocument, context: SessionNotesContext, entities: List[Dict[str, str]], context_hints: List[str]) -> None:
+    def _handle_loot_rewards(self, session: SessionDocument, context: SessionNotesContext, entities: List[Dict[str, str]], context_hints: List[str], matcher: QueryEntityMatcher) -> None:
         """Handle loot and rewards queries"""
         if entities:
             relevant_loot = {}
@@ -533,7 +599,7 @@ class SessionNotesQueryRouter:
             if session.loot_obtained:
                 context.relevant_sections["loot"] = session.loot_obtained
 
-    def _handle_death_revival(self, session: SessionDocument, context: SessionNotesContext, entities: List[Dict[str, str]], context_hints: List[str]) -> None:
+    def _handle_death_revival(self, session: SessionDocument, context: SessionNotesContext, entities: List[Dict[str, str]], context_hints: List[str], matcher: QueryEntityMatcher) -> None:
         """Handle death and revival queries"""
         death_revival_info = {}
 
@@ -552,7 +618,7 @@ class SessionNotesQueryRouter:
         if death_revival_info:
             context.relevant_sections["death_revival"] = death_revival_info
 
-    def _handle_divine_religious(self, session: SessionDocument, context: SessionNotesContext, entities: List[Dict[str, str]], context_hints: List[str]) -> None:
+    def _handle_divine_religious(self, session: SessionDocument, context: SessionNotesContext, entities: List[Dict[str, str]], context_hints: List[str], matcher: QueryEntityMatcher) -> None:
         """Handle divine and religious element queries"""
         divine_info = {}
 
@@ -565,7 +631,7 @@ class SessionNotesQueryRouter:
         if divine_info:
             context.relevant_sections["divine"] = divine_info
 
-    def _handle_memory_vision(self, session: SessionDocument, context: SessionNotesContext, entities: List[Dict[str, str]], context_hints: List[str]) -> None:
+    def _handle_memory_vision(self, session: SessionDocument, context: SessionNotesContext, entities: List[Dict[str, str]], context_hints: List[str], matcher: QueryEntityMatcher) -> None:
         """Handle memory and vision queries"""
         relevant_memories = []
 
@@ -573,7 +639,7 @@ class SessionNotesQueryRouter:
             if entities:
                 for entity in entities:
                     entity_name = entity.get("name", "")
-                    if self._name_matches(entity_name, memory.get('character', '')):
+                    if matcher.name_matches(entity_name, memory.get('character', '')):
                         relevant_memories.append(memory)
                         if entity_name not in context.entities_found:
                             context.entities_found.append(entity_name)
@@ -584,7 +650,7 @@ class SessionNotesQueryRouter:
         if relevant_memories:
             context.relevant_sections["memories"] = relevant_memories
 
-    def _handle_rules_mechanics(self, session: SessionDocument, context: SessionNotesContext, entities: List[Dict[str, str]], context_hints: List[str]) -> None:
+    def _handle_rules_mechanics(self, session: SessionDocument, context: SessionNotesContext, entities: List[Dict[str, str]], context_hints: List[str], matcher: QueryEntityMatcher) -> None:
         """Handle rules and mechanics queries"""
         rules_info = {}
 
@@ -597,7 +663,7 @@ class SessionNotesQueryRouter:
         if rules_info:
             context.relevant_sections["rules"] = rules_info
 
-    def _handle_humor_moments(self, session: SessionDocument, context: SessionNotesContext, entities: List[Dict[str, str]], context_hints: List[str]) -> None:
+    def _handle_humor_moments(self, session: SessionDocument, context: SessionNotesContext, entities: List[Dict[str, str]], context_hints: List[str], matcher: QueryEntityMatcher) -> None:
         """Handle humor and fun moments queries"""
         humor_info = {}
 
@@ -613,40 +679,7 @@ class SessionNotesQueryRouter:
         if humor_info:
             context.relevant_sections["humor"] = humor_info
 
-    def _handle_unresolved_mysteries(self, session: SessionDocument, context: SessionNotesContext, entities: List[Dict[str, str]], context_hints: List[str]) -> None:
-        """Handle unresolved mysteries queries"""
-        mystery_info = {}
-
-        if session.unresolved_questions:
-            mystery_info["unresolved"] = session.unresolved_questions
-
-        if session.mysteries_revealed:
-            mystery_info["revealed"] = session.mysteries_revealed
-
-        if mystery_info:
-            context.relevant_sections["mysteries"] = mystery_info
-
-    def _handle_future_implications(self, session: SessionDocument, context: SessionNotesContext, entities: List[Dict[str, str]], context_hints: List[str]) -> None:
-        """Handle future implications queries"""
-        future_info = {}
-
-        if session.cliffhanger:
-            future_info["cliffhanger"] = session.cliffhanger
-
-        if session.next_session_hook:
-            future_info["next_hook"] = session.next_session_hook
-
-        if session.dm_notes:
-            future_info["dm_notes"] = session.dm_notes
-
-        if future_info:
-            context.relevant_sections["future"] = future_info
-
-    def _handle_cross_session(self, session: SessionDocument, context: SessionNotesContext, entities: List[Dict[str, str]], context_hints: List[str]) -> None:
-        """Handle cross-session queries (aggregated data)"""
-        self._handle_generic(session, context, entities, context_hints)
-
-    def _handle_generic(self, session: SessionDocument, context: SessionNotesContext, entities: List[Dict[str, str]], context_hints: List[str]) -> None:
+    def _handle_generic(self, session: SessionDocument, context: SessionNotesContext, entities: List[Dict[str, str]], context_hints: List[str], matcher: QueryEntityMatcher) -> None:
         """Generic handler for unknown intentions - uses keyword search"""
         relevant_sections = {}
 
@@ -687,10 +720,9 @@ class SessionNotesQueryRouter:
                 score += 0.3
 
         # Recency bonus if requested
-        if any(hint in ["recent", "recently", "latest", "last"] for hint in context_hints):
-            all_sessions = self.campaign_storage.get_all_sessions()
-            if all_sessions and session.date:
-                max_session_date = max((s.date for s in all_sessions if s.date), default=None)
+        if any(hint in RECENCY_HINTS for hint in context_hints):
+            if session.date:
+                max_session_date = self.campaign_storage.get_latest_session_date()
                 if max_session_date:
                     days_diff = (max_session_date - session.date).days
                     score -= 0.1 * (days_diff / 30)  # Penalty based on months old
@@ -709,43 +741,7 @@ class SessionNotesQueryRouter:
 
         return f"Searched for {intention} related to {entity_str} with context: {', '.join(context_hints)} for character: {character_name}"
 
-    def _name_matches(self, search_name: str, target_name: str) -> bool:
-        """Check if two names match using flexible matching"""
-        search_lower = search_name.lower()
-        target_lower = target_name.lower()
-
-        # Exact match
-        if search_lower == target_lower:
-            return True
-
-        # Substring matches (both directions)
-        if search_lower in target_lower or target_lower in search_lower:
-            return True
-
-        return False
-
-    def _entity_mentioned_in_text(self, entity_name: str, text: str) -> bool:
-        """Check if an entity is mentioned in a text string"""
-        if not text or not entity_name:
-            return False
-
-        text_lower = text.lower()
-        entity_name_lower = entity_name.lower()
-
-        # Check main name
-        if entity_name_lower in text_lower:
-            return True
-
-        # For compound names like "Duskryn Nightwarden", also check first name
-        name_parts = entity_name_lower.split()
-        if len(name_parts) > 1:
-            for part in name_parts:
-                if len(part) > 2 and part in text_lower:  # Avoid matching very short parts
-                    return True
-
-        return False
-
-    def _add_party_dynamics_fallback(self, session: SessionDocument, context: SessionNotesContext, entities: List[Dict[str, str]]) -> None:
+    def _add_party_dynamics_fallback(self, session: SessionDocument, context: SessionNotesContext, matcher: QueryEntityMatcher) -> None:
         """Add party dynamics information as fallback when multiple characters are involved"""
         dynamics = {}
 
@@ -753,7 +749,7 @@ class SessionNotesQueryRouter:
         if session.party_conflicts:
             relevant_conflicts = []
             for conflict in session.party_conflicts:
-                if any(self._entity_mentioned_in_text(e.get("name", ""), conflict) for e in entities):
+                if matcher.mentioned_in(conflict):
                     relevant_conflicts.append(conflict)
             if relevant_conflicts:
                 dynamics["conflicts"] = relevant_conflicts
@@ -762,7 +758,7 @@ class SessionNotesQueryRouter:
         if session.party_bonds:
             relevant_bonds = []
             for bond in session.party_bonds:
-                if any(self._entity_mentioned_in_text(e.get("name", ""), bond) for e in entities):
+                if matcher.mentioned_in(bond):
                     relevant_bonds.append(bond)
             if relevant_bonds:
                 dynamics["bonds"] = relevant_bonds
@@ -774,11 +770,7 @@ class SessionNotesQueryRouter:
             quote_text = quote.get("quote", "") + " " + quote.get("context", "")
 
             # Check if quote involves any of our entities
-            entity_mentioned = any(
-                self._name_matches(e.get("name", ""), speaker) or
-                self._entity_mentioned_in_text(e.get("name", ""), quote_text)
-                for e in entities
-            )
+            entity_mentioned = bool(matcher.names_matching(speaker) or matcher.mentioned_in(quote_text))
             if entity_mentioned:
                 relevant_quotes.append(quote)
 
@@ -788,7 +780,7 @@ class SessionNotesQueryRouter:
         # Get group decisions involving these entities
         relevant_decisions = []
         for decision in session.character_decisions:
-            if any(self._name_matches(e.get("name", ""), decision.get('character', '')) for e in entities):
+            if matcher.names_matching(decision.get('character', '')):
                 relevant_decisions.append(decision)
 
         if relevant_decisions:
@@ -4,21 +4,26 @@ Session Notes Storage System
 Loads session documents from Firestore and provides access to campaign-specific storage.
 """
 
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from google.cloud.firestore import AsyncClient
 
-from api.database.firestore_models import SessionDocument
+from api.database.firestore_models import SessionDocument, _parse_datetime
 from .campaign_session_notes_storage import CampaignSessionNotesStorage
+from .session_snapshot_cache import SessionSnapshotCache
 
 
 class SessionNotesStorage:
     """
     Manager for campaign session notes storage.
     Loads session documents from Firestore and caches them in memory.
+
+    With a snapshot cache, cold loads start from the on-disk snapshot and only
+    fetch sessions whose `updated_at` differs from the snapshot.
     """
 
-    def __init__(self, db: AsyncClient):
+    def __init__(self, db: AsyncClient, snapshot_cache: Optional[SessionSnapshotCache] = None):
         self.db = db
+        self.snapshot_cache = snapshot_cache
         self._cache: Dict[str, CampaignSessionNotesStorage] = {}
 
     async def get_campaign(self, campaign_id: str) -> Optional[CampaignSessionNotesStorage]:
@@ -42,13 +47,22 @@ class SessionNotesStorage:
         return storage
 
     async def _load_from_firestore(self, campaign_id: str) -> Optional[CampaignSessionNotesStorage]:
-        """Load all sessions for a campaign from Firestore."""
+        """Load all sessions for a campaign from Firestore (or the local snapshot plus changes)."""
         storage = CampaignSessionNotesStorage(campaign_id=campaign_id)
-
         sessions_ref = self.db.collection('campaigns').document(campaign_id).collection('sessions')
-        async for doc in sessions_ref.stream():
-            session = SessionDocument.from_firestore(doc.id, campaign_id, doc.to_dict())
-            storage.sessions[doc.id] = session
+
+        snapshot = self.snapshot_cache.load(campaign_id) if self.snapshot_cache else {}
+
+        if snapshot:
+            changed = await self._load_changed_sessions(campaign_id, sessions_ref, snapshot, storage)
+        else:
+            async for doc in sessions_ref.stream():
+                session = SessionDocument.from_firestore(doc.id, campaign_id, doc.to_dict())
+                storage.add_session(session)
+            changed = True
+
+        if self.snapshot_cache and changed:
+            self.snapshot_cache.save(campaign_id, storage.get_all_sessions())
 
         # Return None if no sessions found
         if not storage.sessions:
@@ -56,6 +70,40 @@ class SessionNotesStorage:
 
         return storage
 
+    async def _load_changed_sessions(self, campaign_id: str, sessions_ref, snapshot: Dict[str, SessionDocument],
+                                     storage: CampaignSessionNotesStorage) -> bool:
+        """
+        Fill storage from a snapshot, fetching only new or changed sessions.
+
+        Validates the snapshot with a projection query that returns just
+        `updated_at` per session, then fetches full documents for sessions
+        that are missing from the snapshot or have a different `updated_at`.
+
+        Returns:
+            True if the snapshot was out of date
+        """
+        stale_ids: List[str] = []
+        live_ids = set()
+        async for doc in sessions_ref.select(['updated_at']).stream():
+            live_ids.add(doc.id)
+            cached = snapshot.get(doc.id)
+            updated_at = _parse_datetime((doc.to_dict() or {}).get('updated_at'))
+            if cached is None or updated_at is None or cached.updated_at != updated_at:
+                stale_ids.append(doc.id)
+            else:
+                storage.add_session(cached)
+
+        if stale_ids:
+            refs = [sessions_ref.document(session_id) for session_id in stale_ids]
+            async for doc in self.db.get_all(refs):
+                if doc.exists:
+                    storage.add_session(SessionDocument.from_firestore(doc.id, campaign_id, doc.to_dict()))
+
+        removed = len(set(snapshot) - live_ids)
+        print(f"[SessionNotesStorage] Snapshot for {campaign_id}: "
+              f"{len(live_ids) - len(stale_ids)} reused, {len(stale_ids)} fetched, {removed} removed")
+        return bool(stale_ids or removed)
+
     def invalidate(self, campaign_id: str) -> None:
         """
         Invalidate cached data for a campaign.
@@ -0,0 +1,102 @@
+"""
+Session Snapshot Cache
+
+Optional on-disk snapshot of a campaign's session documents, used to speed up
+cold starts. SessionNotesStorage loads the snapshot first, validates it against
+a projection query on `updated_at`, and only fetches sessions that are new or
+changed since the snapshot was written.
+
+Snapshots are zlib-compressed pickles of SessionDocument field dicts, one file
+per campaign. A snapshot is ignored if its format version or the
+SessionDocument schema no longer matches.
+"""
+
+import hashlib
+import os
+import pickle
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable
+
+from api.database.firestore_models import SessionDocument
+
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+def _schema_fingerprint() -> str:
+    """Hash of SessionDocument's field names, so schema changes invalidate snapshots."""
+    fields = ",".join(sorted(SessionDocument.model_fields))
+    return hashlib.sha1(fields.encode("utf-8")).hexdigest()[:12]
+
+
+class SessionSnapshotCache:
+    """Reads and writes per-campaign session snapshots in a local directory."""
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = Path(cache_dir)
+        self.schema = _schema_fingerprint()
+
+    def _path(self, campaign_id: str) -> Path:
+        safe_id = "".join(c if c.isalnum() or c in "-_" else "_" for c in campaign_id)
+        return self.cache_dir / f"{safe_id}.sessions.pkl.z"
+
+    def load(self, campaign_id: str) -> Dict[str, SessionDocument]:
+        """
+        Load a campaign snapshot.
+
+        Returns:
+            Dict of session_id -> SessionDocument, empty if there is no usable snapshot
+        """
+        path = self._path(campaign_id)
+        if not path.exists():
+            return {}
+
+        try:
+            with open(path, "rb") as f:
+                data = pickle.loads(zlib.decompress(f.read()))
+        except Exception as e:
+            print(f"[SessionSnapshotCache] Ignoring unreadable snapshot {path}: {e}")
+            return {}
+
+        if (data.get("format_version") != SNAPSHOT_FORMAT_VERSION
+                or data.get("schema") != self.schema
+                or data.get("campaign_id") != campaign_id):
+            print(f"[SessionSnapshotCache] Ignoring outdated snapshot for campaign {campaign_id}")
+            return {}
+
+        try:
+            return {
+                sid: SessionDocument.model_validate(fields)
+                for sid, fields in data.get("sessions", {}).items()
+            }
+        except Exception as e:
+            print(f"[SessionSnapshotCache] Ignoring invalid snapshot for campaign {campaign_id}: {e}")
+            return {}
+
+    def save(self, campaign_id: str, sessions: Iterable[SessionDocument]) -> None:
+        """Write a campaign snapshot atomically."""
+        data = {
+            "format_version": SNAPSHOT_FORMAT_VERSION,
+            "schema": self.schema,
+            "campaign_id": campaign_id,
+            "sessions": {s.id: s.model_dump() for s in sessions},
+        }
+        payload = zlib.compress(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+
+        path = self._path(campaign_id)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(path.suffix + ".tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[SessionSnapshotCache] Could not write snapshot {path}: {e}")
+
+    def delete(self, campaign_id: str) -> None:
+        """Remove a campaign snapshot if present."""
+        try:
+            self._path(campaign_id).unlink()
+        except FileNotFoundError:
+            pass
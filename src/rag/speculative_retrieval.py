@@ -0,0 +1,236 @@
+"""
+Speculative Retrieval
+
+Starts the retrievals a query will probably need while the LLM tool selector
+is still in flight, instead of leaving the CPU idle for the router's latency.
+
+Entity resolution searches every tool regardless of routing, so it always
+runs during the router call. Tool queries are predicted, at most one per tool:
+- the local classifier's decision, when it runs alongside the router
+  (comparison mode)
+- otherwise keyword rules on the normalized query, and the intention the
+  SRD entity types suggest for rulebook-looking queries
+- every tool an entity resolved to, with the fallback intention the pipeline
+  adds it with when the router doesn't select it
+
+A speculative query is kept only if the routed query has the same signature
+(tool, intention, entities, auto-include sections), so a kept result is
+exactly what a fresh query would return. The rest are discarded: not-yet
+started ones are cancelled, running ones finish in the background and count
+as wasted work. Speculative queries run on their own executor, so wasted work
+never holds up the routed queries.
+"""
+
+import asyncio
+import re
+import threading
+import time
+from concurrent.futures import Executor, Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .tool_intentions import get_fallback_intention
+
+# Rulebook intention suggested by the SRD entity types in a query
+RULEBOOK_ENTITY_INTENTIONS: Dict[str, str] = {
+    'SPELL': 'spell_details',
+    'CONDITION': 'condition_effects',
+    'CREATURE': 'monster_stats',
+    'ITEM': 'equipment_properties',
+    'DAMAGE_TYPE': 'damage_types',
+    'SKILL': 'skill_usage',
+}
+
+# (tool, intention, pattern) tried in order on the lowercased normalized query
+_SELF = r"(\b(?:my|i|me)\b|\{character\})"
+KEYWORD_RULES: List[Tuple[str, str, re.Pattern]] = [
+    ('character_data', 'combat_info', re.compile(
+        _SELF + r".*\b(ac|armor class|hp|hit points|initiative|attack bonus|saving throws?)\b")),
+    ('character_data', 'magic_info', re.compile(_SELF + r".*\b(spells?|cantrips?|spell slots?|spell save)\b")),
+    ('character_data', 'inventory_info', re.compile(_SELF + r".*\b(inventory|items?|gold|carrying|equipment)\b")),
+    ('character_data', 'character_basics', re.compile(_SELF + r".*\b(level|class|race|background)\b")),
+    ('session_notes', 'npc_info', re.compile(r"\b(who is|who was|what do we know about)\b.*\{npc\}")),
+    ('rulebook', 'rule_mechanics', re.compile(r"\b(how does|how do|rules? for|what happens when)\b")),
+]
+
+
+def submit_tracked(executor: Executor, call: Callable[[], Any]) -> Tuple[Future, Future]:
+    """
+    Submit a call to an executor, tracking when a worker picks it up.
+
+    Returns:
+        (future of the call's result, future of the time a worker started it).
+        The second never resolves if the call is cancelled while queued.
+    """
+    started: Future = Future()
+
+    def run():
+        started.set_result(time.time())
+        return call()
+
+    return executor.submit(run), started
+
+
+def predict_tools(
+    normalized_query: str,
+    entities: List[Dict[str, Any]],
+    entity_distribution: Dict[str, List[str]],
+    classifier_tools: Optional[List[Dict[str, Any]]] = None,
+    max_queries: int = 2
+) -> List[Dict[str, Any]]:
+    """
+    Predict the (tool, intention) pairs the router will likely choose.
+
+    Args:
+        normalized_query: The placeholder-normalized query
+        entities: Gazetteer entities ({'name', 'type', ...})
+        entity_distribution: Tool -> entity names, from entity resolution
+        classifier_tools: The local classifier's tools_needed, if it ran
+        max_queries: Maximum predicted tools
+
+    Returns:
+        tools_needed-style dicts, most likely first
+    """
+    predicted: Dict[str, str] = {}
+
+    if classifier_tools:
+        for tool in classifier_tools:
+            predicted.setdefault(tool['tool'], tool['intention'])
+    else:
+        query = normalized_query.lower()
+        for tool, intention, pattern in KEYWORD_RULES:
+            if tool not in predicted and pattern.search(query):
+                predicted[tool] = intention
+        if 'rulebook' not in predicted and 'character_data' not in predicted:
+            for entity in entities:
+                intention = RULEBOOK_ENTITY_INTENTIONS.get(entity.get('type', ''))
+                if intention and not entity.get('is_dynamic', False):
+                    predicted['rulebook'] = intention
+                    break
+
+    for tool in entity_distribution:
+        predicted.setdefault(tool, get_fallback_intention(tool))
+
+    return [{'tool': tool, 'intention': intention} for tool, intention in list(predicted.items())[:max_queries]]
+
+
+@dataclass
+class SpeculationStats:
+    """Process-wide speculation counters."""
+    pipelines: int = 0
+    launched: int = 0
+    kept: int = 0
+    wasted: int = 0
+    cancelled: int = 0
+    saved_ms: float = 0.0
+    wasted_ms: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, **deltas: float) -> None:
+        with self._lock:
+            for name, delta in deltas.items():
+                setattr(self, name, getattr(self, name) + delta)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'pipelines': self.pipelines,
+                'launched': self.launched,
+                'kept': self.kept,
+                'wasted': self.wasted,
+                'cancelled': self.cancelled,
+                'hit_rate': self.kept / self.launched if self.launched else 0.0,
+                'saved_ms': round(self.saved_ms, 1),
+                'wasted_ms': round(self.wasted_ms, 1),
+            }
+
+
+_speculation_stats = SpeculationStats()
+
+
+def get_speculation_stats() -> SpeculationStats:
+    """Process-wide speculation stats (served by /metrics/speculation)."""
+    return _speculation_stats
+
+
+@dataclass
+class _Speculated:
+    signature: tuple
+    future: Future
+    started: Future
+    launched_at: float
+    finished_at: Optional[float] = None
+
+
+class SpeculativeRetrieval:
+    """One pipeline run's speculative work: resolved entities and in-flight tool queries."""
+
+    def __init__(self, stats: Optional[SpeculationStats] = None):
+        self.stats = stats or get_speculation_stats()
+        self.entity_results: Optional[Dict[str, List[Any]]] = None
+        self.entity_resolution_ms = 0.0
+        self.routed_at: Optional[float] = None  # Set once the router answers; nothing is launched after that
+        self.task: Optional[asyncio.Task] = None
+        self.queries: Dict[str, _Speculated] = {}
+        self.kept: List[str] = []
+        self.discarded: List[str] = []
+        self.saved_ms = 0.0
+        self.stats.record(pipelines=1)
+
+    @property
+    def routed(self) -> bool:
+        return self.routed_at is not None
+
+    def mark_routed(self) -> None:
+        """Record that the router answered; speculation stops launching queries."""
+        self.routed_at = time.time()
+
+    def launch(self, key: str, signature: tuple, call: Callable[[], Any], executor: Executor) -> None:
+        """Submit a predicted tool query."""
+        speculated = _Speculated(signature, *submit_tracked(executor, call), time.time())
+        speculated.future.add_done_callback(lambda _: setattr(speculated, 'finished_at', time.time()))
+        self.queries[key] = speculated
+        self.stats.record(launched=1)
+        print(f"🔮 Speculating {key} {signature[1]!r}")
+
+    def take(self, key: str, signature: tuple) -> Optional[Tuple[Future, Future]]:
+        """
+        The speculative query for this result key if it matches the routed query, else None.
+
+        Returned as submit_tracked() returns it.
+        """
+        speculated = self.queries.get(key)
+        if speculated is None or speculated.signature != signature:
+            return None
+        del self.queries[key]
+
+        # Only the work done before routing finished would otherwise have been waited for
+        now = time.time()
+        saved_until = min(speculated.finished_at or now, self.routed_at or now)
+        saved_ms = max(saved_until - speculated.launched_at, 0.0) * 1000
+        self.kept.append(key)
+        self.saved_ms += saved_ms
+        self.stats.record(kept=1, saved_ms=saved_ms)
+        return speculated.future, speculated.started
+
+    def discard(self) -> None:
+        """Drop the speculative queries the router didn't confirm."""
+        for key, speculated in self.queries.items():
+            self.discarded.append(key)
+            if speculated.future.cancel():
+                self.stats.record(cancelled=1)
+                continue
+            self.stats.record(wasted=1)
+            speculated.future.add_done_callback(
+                lambda _, s=speculated: self.stats.record(wasted_ms=((s.finished_at or time.time()) - s.launched_at) * 1000)
+            )
+        self.queries.clear()
+
+    def summary(self) -> Dict[str, Any]:
+        """Per-query speculation outcome for the performance metrics event."""
+        return {
+            'entity_resolution_ms': self.entity_resolution_ms,
+            'kept': self.kept,
+            'discarded': self.discarded,
+            'saved_ms': self.saved_ms,
+        }
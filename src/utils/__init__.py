@@ -1,11 +1,14 @@
 """
 Utility Module
 
-Character inspection, entity search, and query normalization utilities.
+Character inspection, entity search, query normalization, and token estimation utilities.
 """
 
 from .character_inspector import CharacterInspector
+from .entity_index import EntityIndex
 from .entity_search_engine import EntitySearchEngine
 from .query_normalization import apply_entity_placeholders
+from .token_estimation import estimate_tokens, truncate_to_tokens
 
-__all__ = ['CharacterInspector', 'EntitySearchEngine', 'apply_entity_placeholders']
+__all__ = ['CharacterInspector', 'EntityIndex', 'EntitySearchEngine', 'apply_entity_placeholders',
+           'estimate_tokens', 'truncate_to_tokens']
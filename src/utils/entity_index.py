@@ -0,0 +1,235 @@
+"""
+Entity Index
+
+Precomputed lookup structure for EntitySearchEngine. An EntityIndex is built
+once per data source version (a character, a campaign's session notes, a
+rulebook) and maps names to the records they came from.
+
+lookup() does not score anything itself: it returns, in insertion order,
+every record whose name could pass one of EntitySearchEngine.match_entity_name's
+strategies, using
+- normalized names (exact match, and names contained in the search text)
+- a joined-name scan (search text contained in a name)
+- word and hyphen/apostrophe component postings, with sorted tables for
+  prefix matches
+- character-count candidate indexes (first-word and full-name similarity)
+
+The engine then runs match_entity_name on just those records, so results are
+identical to a full scan while the cost depends on the number of plausible
+matches instead of the size of the source.
+
+Long text passages (session summaries, raw sections) can be added with
+add_text() and searched for normalized mentions with records_mentioning().
+"""
+
+import bisect
+import re
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Set
+
+from src.classifiers.aho_corasick import AhoCorasick
+from src.classifiers.fuzzy_index import FuzzyCandidateIndex
+
+
+# Kept in sync with EntitySearchEngine.match_entity_name
+_NON_WORD = re.compile(r'[^\w\s]')
+_COMPONENT_SPLIT = re.compile(r"['\"'\s-]+")
+MIN_WORD_LENGTH = 3          # Words/components shorter than this never match
+MIN_PREFIX_LENGTH = 4        # Prefix matches need at least this many characters
+FIRST_WORD_MIN_SIMILARITY = 0.75
+
+# Separator for joined scans; normalization strips it from any search text
+_SEPARATOR = "\x00"
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text for comparison (lowercase, remove special chars)."""
+    return _NON_WORD.sub('', text.lower().strip())
+
+
+class _TokenTable:
+    """Token -> name ids, with a sorted token list for prefix lookups."""
+
+    def __init__(self):
+        self.postings: Dict[str, List[int]] = {}
+        self.sorted_tokens: List[str] = []
+
+    def add(self, token: str, name_id: int) -> None:
+        ids = self.postings.setdefault(token, [])
+        if not ids or ids[-1] != name_id:
+            ids.append(name_id)
+
+    def finish(self) -> None:
+        self.sorted_tokens = sorted(self.postings)
+
+    def matching(self, token: str) -> Iterator[int]:
+        """Ids of names with a token equal to, extending, or prefixing this token."""
+        postings = self.postings
+        yield from postings.get(token, ())
+
+        if len(token) >= MIN_PREFIX_LENGTH:
+            # Name tokens that start with the search token
+            tokens = self.sorted_tokens
+            i = bisect.bisect_left(tokens, token)
+            while i < len(tokens) and tokens[i].startswith(token):
+                yield from postings[tokens[i]]
+                i += 1
+            # Name tokens (of 4+ characters) that the search token starts with
+            for length in range(MIN_PREFIX_LENGTH, len(token)):
+                yield from postings.get(token[:length], ())
+
+
+class _JoinedText:
+    """Substring search over many strings with one str.find pass."""
+
+    def __init__(self, texts: List[str]):
+        self.joined = _SEPARATOR.join(texts)
+        self.starts: List[int] = []
+        offset = 0
+        for text in texts:
+            self.starts.append(offset)
+            offset += len(text) + 1
+
+    def containing(self, needle: str) -> Iterator[int]:
+        """Indexes of texts that contain needle (which must not contain the separator)."""
+        joined = self.joined
+        starts = self.starts
+        pos = joined.find(needle)
+        while pos != -1:
+            i = bisect.bisect_right(starts, pos) - 1
+            yield i
+            if i + 1 >= len(starts):
+                break
+            pos = joined.find(needle, starts[i + 1])
+
+
+class EntityIndex:
+    """
+    Name -> record postings for one data source.
+
+    Records are opaque to the index; lookup() returns them in the order they
+    were added so callers can reproduce a sequential scan exactly.
+    """
+
+    def __init__(self, version: Optional[Hashable] = None):
+        self.version = version
+        self.records: List[Any] = []
+        self._names: List[str] = []
+        self._name_ids: Dict[str, int] = {}
+        self._postings: List[List[int]] = []      # name id -> record ids
+        self._text_records: List[Any] = []
+        self._texts: List[str] = []
+        self._built = False
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def add(self, name: str, record: Any) -> None:
+        """Add a record under a candidate name (empty names are ignored)."""
+        if not name:
+            return
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            name_id = len(self._names)
+            self._name_ids[name] = name_id
+            self._names.append(name)
+            self._postings.append([])
+        self._postings[name_id].append(len(self.records))
+        self.records.append(record)
+        self._built = False
+
+    def add_text(self, text: str, record: Any) -> None:
+        """Add a text passage for records_mentioning()."""
+        self._texts.append(normalize_text(text))
+        self._text_records.append(record)
+        self._built = False
+
+    def _build(self) -> None:
+        normalized = [normalize_text(name) for name in self._names]
+        self._normalized_ids: Dict[str, List[int]] = {}
+        for name_id, norm in enumerate(normalized):
+            self._normalized_ids.setdefault(norm, []).append(name_id)
+
+        # Names that normalize to nothing are substrings of every search text
+        self._empty_ids = self._normalized_ids.get('', [])
+        self._contained = AhoCorasick(normalized)
+        self._joined_names = _JoinedText(normalized)
+
+        self._words = _TokenTable()
+        self._components = _TokenTable()
+        first_word_ids: Dict[str, List[int]] = {}
+        for name_id, (name, norm) in enumerate(zip(self._names, normalized)):
+            words = norm.split()
+            for word in words:
+                if len(word) >= MIN_WORD_LENGTH:
+                    self._words.add(word, name_id)
+            for component in _COMPONENT_SPLIT.split(name.lower()):
+                if len(component) >= MIN_WORD_LENGTH:
+                    self._components.add(component, name_id)
+            if words and len(words[0]) >= MIN_PREFIX_LENGTH:
+                first_word_ids.setdefault(words[0], []).append(name_id)
+        self._words.finish()
+        self._components.finish()
+
+        self._first_words = list(first_word_ids)
+        self._first_word_ids = [first_word_ids[w] for w in self._first_words]
+        self._first_word_index = FuzzyCandidateIndex(self._first_words)
+        self._fuzzy_index = FuzzyCandidateIndex(normalized)
+
+        self._joined_texts = _JoinedText(self._texts)
+        self._built = True
+
+    def _candidate_names(self, entity_name: str, threshold: float) -> Iterable[int]:
+        """Ids of names that may match entity_name under any match strategy."""
+        search = normalize_text(entity_name)
+        if not search:
+            # An empty search is a substring of every name
+            return range(len(self._names))
+
+        ids: Set[int] = set(self._empty_ids)
+
+        # Exact match, and names contained in the search text
+        for _, _, pattern in self._contained.iter_matches(search):
+            ids.update(self._normalized_ids[pattern])
+        # Search text contained in a name
+        ids.update(self._joined_names.containing(search))
+
+        # Word-level exact/prefix matches
+        search_words = search.split()
+        for word in search_words:
+            if len(word) >= MIN_WORD_LENGTH:
+                ids.update(self._words.matching(word))
+
+        # Hyphen/apostrophe component exact/prefix matches
+        for component in _COMPONENT_SPLIT.split(entity_name.lower()):
+            if len(component) >= MIN_WORD_LENGTH:
+                ids.update(self._components.matching(component))
+
+        # Fuzzy first word
+        if search_words and len(search_words[0]) >= MIN_PREFIX_LENGTH:
+            for word_id in self._first_word_index.candidates(search_words[0], FIRST_WORD_MIN_SIMILARITY):
+                ids.update(self._first_word_ids[word_id])
+
+        # Fuzzy full name
+        ids.update(self._fuzzy_index.candidates(search, threshold).tolist())
+        return ids
+
+    def lookup(self, entity_name: str, threshold: float) -> List[Any]:
+        """Records whose names may match entity_name, in insertion order."""
+        if not self._built:
+            self._build()
+        postings = self._postings
+        record_ids = sorted(
+            record_id
+            for name_id in self._candidate_names(entity_name, threshold)
+            for record_id in postings[name_id]
+        )
+        return [self.records[record_id] for record_id in record_ids]
+
+    def records_mentioning(self, entity_name: str) -> List[Any]:
+        """Text records whose normalized text contains the normalized entity name, in insertion order."""
+        if not self._built:
+            self._build()
+        search = normalize_text(entity_name)
+        if not search:
+            return list(self._text_records)
+        return [self._text_records[i] for i in self._joined_texts.containing(search)]
@@ -7,18 +7,61 @@ Unified search system for finding entities across all data sources:
 - Rulebook (spells, items, creatures, conditions, rules)
 
 Provides consistent fuzzy matching and result formatting across all sources.
+
+Each source is searched through an EntityIndex built once per character
+section content, campaign and rulebook version, so only names that can actually match are
+scored with match_entity_name. Rulebook candidate names are extracted once
+per RulebookStorage load and indexed by the storage itself.
+
+Candidates are scored in batches with match_entity_names (see fuzzy_scoring),
+which returns the same results as calling match_entity_name on each name.
 """
 
+import hashlib
 import re
-from typing import List, Optional, Dict, TYPE_CHECKING
+from collections import OrderedDict
+from typing import Hashable, List, Optional, Dict, TYPE_CHECKING
 from difflib import SequenceMatcher
 
+from .entity_index import EntityIndex, normalize_text
+from .fuzzy_scoring import match_names
+
 if TYPE_CHECKING:
     from src.rag.character.character_types import Character
     from src.rag.character.character_query_types import EntitySearchResult, SearchContext
     from src.rag.session_notes.campaign_session_notes_storage import CampaignSessionNotesStorage
     from src.rag.rulebook.rulebook_storage import RulebookStorage
-    from src.rag.rulebook.rulebook_types import RulebookSection
+
+
+class RulebookResultCache:
+    """LRU cache of rulebook search results keyed by (storage version, entity name)"""
+    
+    def __init__(self, max_size: int = 512):
+        self.cache: 'OrderedDict[tuple, List[EntitySearchResult]]' = OrderedDict()
+        self.max_size = max_size
+    
+    def __len__(self) -> int:
+        return len(self.cache)
+    
+    def get(self, version: Hashable, entity_name: str) -> Optional[List['EntitySearchResult']]:
+        """Get cached results (None on a miss)"""
+        key = (version, entity_name)
+        if key in self.cache:
+            # Move to end (most recently used)
+            self.cache.move_to_end(key)
+            return self.cache[key]
+        return None
+    
+    def put(self, version: Hashable, entity_name: str, results: List['EntitySearchResult']) -> None:
+        """Store results, evicting the least recently used entries"""
+        key = (version, entity_name)
+        self.cache[key] = results
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.max_size:
+            self.cache.popitem(last=False)
+    
+    def clear(self) -> None:
+        self.cache.clear()
 
 
 class EntitySearchEngine:
@@ -31,14 +74,16 @@ class EntitySearchEngine:
     3. Fuzzy similarity match - confidence based on similarity score
     """
     
-    def __init__(self, threshold: float = 0.60):
+    def __init__(self, threshold: float = 0.60, rulebook_cache_size: int = 512):
         """Initialize the entity search engine.
         
         Args:
             threshold: Minimum similarity score for fuzzy matching (default 0.60 - permissive to avoid missing content)
+            rulebook_cache_size: Maximum cached rulebook lookups (entries are per rulebook version)
         """
         self.threshold = threshold
-        self._rulebook_cache: Dict[str, List['EntitySearchResult']] = {}  # Cache for rulebook lookups
+        self._rulebook_cache = RulebookResultCache(rulebook_cache_size)  # Cache for rulebook lookups
+        self._indexes: Dict[str, EntityIndex] = {}  # Source name -> index for its current version
     
     # ===== HIGH-LEVEL ENTITY RESOLUTION =====
     
@@ -92,17 +137,16 @@ class EntitySearchEngine:
             
             # 3. Search rulebook if selected (with caching)
             if 'rulebook' in selected_tools and rulebook_storage:
-                # Check cache first
-                if entity_name in self._rulebook_cache:
-                    rulebook_results = self._rulebook_cache[entity_name]
-                else:
+                # Check cache first (reloading the rulebook changes its version)
+                rulebook_results = self._rulebook_cache.get(rulebook_storage.version, entity_name)
+                if rulebook_results is None:
                     # Search and cache
                     rulebook_results = self.search_rulebook(
                         rulebook_storage,
                         entity_name,
                         max_results=5
                     )
-                    self._rulebook_cache[entity_name] = rulebook_results
+                    self._rulebook_cache.put(rulebook_storage.version, entity_name, rulebook_results)
                 
                 all_results.extend(rulebook_results)
             
@@ -114,7 +158,7 @@ class EntitySearchEngine:
     @staticmethod
     def normalize_text(text: str) -> str:
         """Normalize text for comparison (lowercase, remove special chars)."""
-        return re.sub(r'[^\w\s]', '', text.lower().strip())
+        return normalize_text(text)
     
     @staticmethod
     def calculate_similarity(text1: str, text2: str) -> float:
@@ -209,6 +253,18 @@ class EntitySearchEngine:
         
         return None
     
+    def match_entity_names(
+        self,
+        entity_name: str,
+        candidate_names: List[str],
+        threshold: Optional[float] = None
+    ) -> List[Optional[tuple]]:
+        """Match an entity name against many candidates in one call.
+        
+        Returns match_entity_name's result for each candidate, in order.
+        """
+        return match_names(entity_name, candidate_names, threshold or self.threshold)
+    
     # ===== CHARACTER DATA SEARCH =====
     
     def search_character_inventory(
@@ -222,11 +278,7 @@ class EntitySearchEngine:
         if not character.inventory:
             return None
         
-        items = self._get_all_inventory_items(character)
-        best_match = self._find_best_match_in_items(
-            entity_name,
-            items
-        )
+        best_match = self._find_best_indexed_match(character, 'inventory', entity_name)
         
         if best_match:
             confidence, strategy, matched_text = best_match
@@ -251,8 +303,7 @@ class EntitySearchEngine:
         if not character.spell_list or not character.spell_list.spells:
             return None
         
-        spells = self._get_all_spells(character)
-        best_match = self._find_best_match_in_items(entity_name, spells)
+        best_match = self._find_best_indexed_match(character, 'spell_list', entity_name)
         
         if best_match:
             confidence, strategy, matched_text = best_match
@@ -277,8 +328,7 @@ class EntitySearchEngine:
         if not character.features_and_traits:
             return None
         
-        features = self._get_all_features_traits(character)
-        best_match = self._find_best_match_in_items(entity_name, features)
+        best_match = self._find_best_indexed_match(character, 'features_and_traits', entity_name)
         
         if best_match:
             confidence, strategy, matched_text = best_match
@@ -303,8 +353,7 @@ class EntitySearchEngine:
         if not hasattr(character, 'proficiencies') or not character.proficiencies:
             return None
         
-        proficiencies = character.proficiencies if isinstance(character.proficiencies, list) else []
-        best_match = self._find_best_match_in_items(entity_name, proficiencies)
+        best_match = self._find_best_indexed_match(character, 'proficiencies', entity_name)
         
         if best_match:
             confidence, strategy, matched_text = best_match
@@ -441,82 +490,58 @@ class EntitySearchEngine:
         if not campaign_storage:
             return []
 
+        index = self._get_session_notes_index(campaign_storage)
+        records = index.lookup(entity_name, self.threshold)
+        name_matches = self._match_distinct_names(entity_name, [alias or name for name, alias, _, _ in records])
         all_matches = []
 
-        # Strategy 1 & 2: Search per-session entity lists
-        for session in campaign_storage.get_all_sessions():
-            session_num = session.session_number
-
-            # Define entity lists with their types
-            entity_lists = [
-                (session.player_characters, 'player_character'),
-                (session.npcs, 'npc'),
-                (session.locations, 'location'),
-                (session.items, 'item'),
-            ]
-
-            for entity_list, entity_type in entity_lists:
-                for entity in entity_list:
-                    if not isinstance(entity, dict):
-                        continue
-
-                    name = entity.get('name', '')
-                    if not name:
-                        continue
-
-                    section = f'session_notes.{entity_type}'
-
-                    # Check main name
-                    match_result = self.match_entity_name(entity_name, name)
-                    if match_result:
-                        confidence, strategy, matched_text = match_result
-                        all_matches.append((confidence, strategy, f"{matched_text} (session {session_num})", section))
-
-                    # Check aliases
-                    aliases = entity.get('aliases', [])
-                    for alias in aliases:
-                        if not alias:
-                            continue
-
-                        match_result = self.match_entity_name(entity_name, alias)
-                        if match_result:
-                            confidence, strategy, _ = match_result
-                            # Slightly lower confidence for alias matches
-                            confidence = min(confidence, 0.95)
-                            all_matches.append((confidence, f"{strategy}_alias", f"{name} (alias: {alias}, session {session_num})", section))
+        # Strategy 1 & 2: Search per-session entity names and aliases
+        for name, alias, session_num, section in records:
+            if alias is None:
+                # Check main name
+                match_result = name_matches[name]
+                if match_result:
+                    confidence, strategy, matched_text = match_result
+                    all_matches.append((confidence, strategy, f"{matched_text} (session {session_num})", section))
+            else:
+                match_result = name_matches[alias]
+                if match_result:
+                    confidence, strategy, _ = match_result
+                    # Slightly lower confidence for alias matches
+                    confidence = min(confidence, 0.95)
+                    all_matches.append((confidence, f"{strategy}_alias", f"{name} (alias: {alias}, session {session_num})", section))
 
         # Strategy 3: Search raw session content for text mentions (if no high-confidence match found)
         high_confidence_found = any(m[0] >= 0.8 for m in all_matches)
 
         if not high_confidence_found:
-            normalized_entity = self.normalize_text(entity_name)
-
-            for session in campaign_storage.get_all_sessions():
-                session_num = session.session_number
+            sessions_with_raw_match = set()
 
-                # Check session summary
-                if session.summary and normalized_entity in self.normalize_text(session.summary):
+            for session_pos, session_num, section_name in index.records_mentioning(entity_name):
+                # Session summary
+                if section_name is None:
                     all_matches.append((0.75, "content_search", f"Found in session {session_num} summary", 'session_notes.content'))
+                    continue
 
-                # Check raw_sections
-                if session.raw_sections:
-                    for section_name, section_content in session.raw_sections.items():
-                        if normalized_entity in self.normalize_text(section_content):
-                            # Determine section type from section name
-                            section_type = 'content'
-                            if 'npc' in section_name.lower():
-                                section_type = 'npc'
-                            elif 'player' in section_name.lower() or 'character' in section_name.lower():
-                                section_type = 'player_character'
-                            elif 'location' in section_name.lower():
-                                section_type = 'location'
-                            elif 'combat' in section_name.lower():
-                                section_type = 'combat'
-                            elif 'event' in section_name.lower():
-                                section_type = 'event'
+                # raw_sections: one match per session is enough
+                if session_pos in sessions_with_raw_match:
+                    continue
+                sessions_with_raw_match.add(session_pos)
+
+                # Determine section type from section name
+                section_type = 'content'
+                if 'npc' in section_name.lower():
+                    section_type = 'npc'
+                elif 'player' in section_name.lower() or 'character' in section_name.lower():
+                    section_type = 'player_character'
+                elif 'location' in section_name.lower():
+                    section_type = 'location'
+                elif 'combat' in section_name.lower():
+                    section_type = 'combat'
+                elif 'event' in section_name.lower():
+                    section_type = 'event'
 
-                            all_matches.append((0.75, "raw_section_search", f"Found in {section_name} (session {session_num})", f'session_notes.{section_type}'))
-                            break  # One match per session is enough
+                all_matches.append((0.75, "raw_section_search", f"Found in {section_name} (session {session_num})", f'session_notes.{section_type}'))
 
         # Return ALL matches above threshold, sorted by confidence
         if all_matches:
@@ -560,20 +585,15 @@ class EntitySearchEngine:
         
         matches: Dict[str, tuple] = {}  # section_id -> (confidence, strategy, matched_text, section)
         
-        for section_id, section in rulebook_storage.sections.items():
-            # Extract entity names from section
-            entity_names = self._extract_rulebook_entity_names(section)
-            
-            for candidate_name in entity_names:
-                if not candidate_name:
-                    continue
-                
-                match_result = self.match_entity_name(entity_name, candidate_name)
-                if match_result:
-                    confidence, strategy, matched_text = match_result
-                    # Only keep if better than existing match for this section
-                    if section_id not in matches or matches[section_id][0] < confidence:
-                        matches[section_id] = (confidence, strategy, matched_text, section)
+        records = rulebook_storage.get_entity_index().lookup(entity_name, self.threshold)
+        name_matches = self._match_distinct_names(entity_name, [candidate_name for _, candidate_name in records])
+        for section_id, candidate_name in records:
+            match_result = name_matches[candidate_name]
+            if match_result:
+                confidence, strategy, matched_text = match_result
+                # Only keep if better than existing match for this section
+                if section_id not in matches or matches[section_id][0] < confidence:
+                    matches[section_id] = (confidence, strategy, matched_text, rulebook_storage.sections[section_id])
         
         # Convert to EntitySearchResult objects
         results = []
@@ -598,6 +618,116 @@ class EntitySearchEngine:
         results.sort(key=lambda r: r.match_confidence, reverse=True)
         return results[:max_results]
     
+    # ===== ENTITY INDEXES =====
+    
+    def _get_index(self, source: str, version: Hashable, build) -> EntityIndex:
+        """Return the index for a source, rebuilding it if the source version changed."""
+        index = self._indexes.get(source)
+        if index is None or index.version != version:
+            index = build(version)
+            self._indexes[source] = index
+        return index
+    
+    def _character_section_items(self, character: 'Character', section: str) -> List[any]:
+        """Items of one character section searched by name."""
+        if section == 'inventory':
+            return self._get_all_inventory_items(character) if character.inventory else []
+        if section == 'spell_list':
+            return self._get_all_spells(character) if character.spell_list and character.spell_list.spells else []
+        if section == 'features_and_traits':
+            return self._get_all_features_traits(character) if character.features_and_traits else []
+        proficiencies = getattr(character, 'proficiencies', None)
+        return proficiencies if isinstance(proficiencies, list) else []
+    
+    def _get_character_index(self, character: 'Character', section: str) -> EntityIndex:
+        """Index of one character section's item/spell/feature/proficiency names."""
+        def build(version: Hashable) -> EntityIndex:
+            index = EntityIndex(version)
+            for item in self._character_section_items(character, section):
+                name = self._get_item_name(item)
+                index.add(name, name)
+            return index
+        
+        # Keyed on the section's content, so in-place edits are picked up too
+        version = hashlib.blake2b(character.model_dump_json(include={section}).encode(), digest_size=16).digest()
+        return self._get_index(f'character_data.{section}', version, build)
+    
+    def _get_session_notes_index(self, campaign_storage: 'CampaignSessionNotesStorage') -> EntityIndex:
+        """Index of session entity names/aliases and session text for a campaign."""
+        def build(version: Hashable) -> EntityIndex:
+            sessions = campaign_storage.get_all_sessions()
+            index = EntityIndex(version)
+            for session_pos, session in enumerate(sessions):
+                session_num = session.session_number
+                
+                # Define entity lists with their types
+                entity_lists = [
+                    (session.player_characters, 'player_character'),
+                    (session.npcs, 'npc'),
+                    (session.locations, 'location'),
+                    (session.items, 'item'),
+                ]
+                
+                for entity_list, entity_type in entity_lists:
+                    for entity in entity_list:
+                        if not isinstance(entity, dict):
+                            continue
+                        name = entity.get('name', '')
+                        if not name:
+                            continue
+                        section = f'session_notes.{entity_type}'
+                        # Records: (name, alias or None, session number, section)
+                        index.add(name, (name, None, session_num, section))
+                        for alias in entity.get('aliases', []):
+                            if alias:
+                                index.add(alias, (name, alias, session_num, section))
+                
+                # Text records: (session position, session number, raw section name or None for summary)
+                if session.summary:
+                    index.add_text(session.summary, (session_pos, session_num, None))
+                if session.raw_sections:
+                    for section_name, section_content in session.raw_sections.items():
+                        index.add_text(section_content, (session_pos, session_num, section_name))
+            return index
+        
+        # Bumped on every session write; unique across storages
+        return self._get_index('session_notes', campaign_storage.revision, build)
+    
+    def _match_distinct_names(self, entity_name: str, candidate_names: List[str]) -> Dict[str, Optional[tuple]]:
+        """match_entity_name results for each distinct candidate name, scored in one batch."""
+        distinct = list(dict.fromkeys(candidate_names))
+        return dict(zip(distinct, self.match_entity_names(entity_name, distinct)))
+    
+    def _find_best_indexed_match(
+        self,
+        character: 'Character',
+        section: str,
+        entity_name: str
+    ) -> Optional[tuple]:
+        """Find the best match among one character section's names.
+        
+        Same result as _find_best_match_in_items over that section's items.
+        Returns tuple of (confidence, strategy, matched_text) or None.
+        """
+        return self._best_match(entity_name, self._get_character_index(character, section).lookup(entity_name, self.threshold))
+    
+    def _best_match(self, entity_name: str, names: List[str]) -> Optional[tuple]:
+        """Highest-confidence match among names (the first one on ties)."""
+        best_match = None
+        best_confidence = 0.0
+        
+        for match_result in self.match_entity_names(entity_name, names):
+            if match_result:
+                confidence, strategy, matched_text = match_result
+                if confidence > best_confidence:
+                    best_match = (confidence, strategy, matched_text)
+                    best_confidence = confidence
+                    # Perfect match, stop searching
+                    if confidence == 1.0:
+                        break
+        
+        return best_match
+    
     # ===== HELPER METHODS =====
     
     def _get_item_name(self, item: any) -> Optional[str]:
@@ -629,25 +759,7 @@ class EntitySearchEngine:
         
         Returns tuple of (confidence, strategy, matched_text) or None.
         """
-        best_match = None
-        best_confidence = 0.0
-        
-        for item in items:
-            name = self._get_item_name(item)
-            if not name:
-                continue
-            
-            match_result = self.match_entity_name(entity_name, name)
-            if match_result:
-                confidence, strategy, matched_text = match_result
-                if confidence > best_confidence:
-                    best_match = (confidence, strategy, matched_text)
-                    best_confidence = confidence
-                    # Perfect match, stop searching
-                    if confidence == 1.0:
-                        break
-        
-        return best_match
+        return self._best_match(entity_name, [name for name in map(self._get_item_name, items) if name])
     
     def _get_all_inventory_items(self, character: 'Character') -> List[any]:
         """Get all inventory items (equipped and backpack)."""
@@ -691,31 +803,3 @@ class EntitySearchEngine:
             features.extend(character.features_and_traits.feats)
         
         return features
-    
-    def _extract_rulebook_entity_names(self, section: 'RulebookSection') -> List[str]:
-        """Extract potential entity names from a rulebook section."""
-        names = []
-        
-        # Add section title
-        names.append(section.title)
-        
-        # Extract bolded text (format: **Text**)
-        bold_pattern = r'\*\*([^*]+)\*\*'
-        bold_matches = re.findall(bold_pattern, section.content)
-        names.extend(bold_matches)
-        
-        # Extract headings within content
-        heading_pattern = r'^#+\s+(.+)$'
-        for line in section.content.split('\n'):
-            heading_match = re.match(heading_pattern, line.strip())
-            if heading_match:
-                names.append(heading_match.group(1))
-        
-        # Clean up names
-        cleaned_names = []
-        for name in names:
-            name = re.sub(r'[:.;,]+$', '', name.strip())
-            if name and len(name) > 2:
-                cleaned_names.append(name)
-        
-        return cleaned_names
@@ -0,0 +1,164 @@
+"""
+Batch Fuzzy Scoring
+
+Scores one search name against many candidate names in a single call, with
+exactly the (confidence, strategy, matched_text) results
+EntitySearchEngine.match_entity_name returns for each candidate.
+
+The cheap strategies (exact, substring, word and component matches) are plain
+string comparisons on pre-split candidates. The two SequenceMatcher strategies
+(first-word fuzzy, full-name fuzzy) dominate the cost, so they only run for
+candidates whose similarity upper bound clears the strategy's threshold.
+Bounds are computed for all remaining candidates at once:
+- a length bound, 2 * min(len) / (len + len), for every candidate
+- rapidfuzz's Indel similarity (a C-accelerated LCS ratio) for candidates
+  that pass it, when rapidfuzz is installed; otherwise a character-count
+  bound with numpy
+
+None of these is ever below SequenceMatcher.ratio(): the blocks SequenceMatcher
+matches form a common subsequence, and share characters. Filtering on them
+therefore never changes a result.
+"""
+
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.classifiers.fuzzy_index import ratio_upper_bounds
+from .entity_index import (
+    _COMPONENT_SPLIT,
+    FIRST_WORD_MIN_SIMILARITY,
+    MIN_PREFIX_LENGTH,
+    MIN_WORD_LENGTH,
+    normalize_text,
+)
+
+# Use try/except for rapidfuzz as it may not be installed
+try:
+    from rapidfuzz import process as rapidfuzz_process
+    from rapidfuzz.distance import Indel
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
+# Slack for float rounding when comparing bounds with thresholds
+_EPSILON = 1e-9
+
+MatchResult = Tuple[float, str, str]
+
+
+@lru_cache(maxsize=65536)
+def _prepare(name: str) -> Tuple[str, Tuple[str, ...], Tuple[str, ...]]:
+    """(normalized name, words, components) for a search or candidate name."""
+    normalized = normalize_text(name)
+    return normalized, tuple(normalized.split()), tuple(_COMPONENT_SPLIT.split(name.lower()))
+
+
+def _word_match(search_words: Sequence[str], candidate_words: Sequence[str]) -> Optional[Tuple[float, str]]:
+    """Strategy 3: first word-level exact/prefix match, in match_entity_name's loop order."""
+    for search_word in search_words:
+        if len(search_word) >= MIN_WORD_LENGTH:
+            for candidate_word in candidate_words:
+                if search_word == candidate_word:
+                    return (0.85, "word_match")
+                if len(search_word) >= MIN_PREFIX_LENGTH and candidate_word.startswith(search_word):
+                    return (0.80, "word_prefix")
+                if len(candidate_word) >= MIN_PREFIX_LENGTH and search_word.startswith(candidate_word):
+                    return (0.80, "word_prefix")
+    return None
+
+
+def _component_match(search_components: Sequence[str], candidate_components: Sequence[str]) -> Optional[Tuple[float, str]]:
+    """Strategy 4: first apostrophe/hyphen component exact/prefix match."""
+    for search_comp in search_components:
+        if len(search_comp) >= MIN_WORD_LENGTH:
+            for cand_comp in candidate_components:
+                if len(cand_comp) >= MIN_WORD_LENGTH:
+                    if search_comp == cand_comp:
+                        return (0.85, "component_match")
+                    if len(search_comp) >= MIN_PREFIX_LENGTH and cand_comp.startswith(search_comp):
+                        return (0.75, "component_prefix")
+                    if len(cand_comp) >= MIN_PREFIX_LENGTH and search_comp.startswith(cand_comp):
+                        return (0.75, "component_prefix")
+    return None
+
+
+def similarity_bounds(text: str, candidates: Sequence[str], min_similarity: float) -> np.ndarray:
+    """Upper bounds of SequenceMatcher(None, text, c).ratio() for every candidate.
+
+    Bounds below min_similarity may be reported as 0.
+    """
+    lengths = np.fromiter((len(c) for c in candidates), dtype=np.int64, count=len(candidates))
+    bounds = 2.0 * np.minimum(lengths, len(text)) / np.maximum(lengths + len(text), 1)
+    keep = np.flatnonzero(bounds >= min_similarity - _EPSILON)
+    bounds[:] = 0.0
+    if not len(keep):
+        return bounds
+
+    kept = [candidates[i] for i in keep]
+    if RAPIDFUZZ_AVAILABLE:
+        bounds[keep] = rapidfuzz_process.cdist(
+            [text], kept, scorer=Indel.normalized_similarity, dtype=np.float64
+        )[0]
+    else:
+        bounds[keep] = ratio_upper_bounds(kept, text)
+    return bounds
+
+
+def match_names(entity_name: str, candidate_names: Sequence[str], threshold: float) -> List[Optional[MatchResult]]:
+    """match_entity_name(entity_name, name, threshold) for every candidate name, in order."""
+    results: List[Optional[MatchResult]] = [None] * len(candidate_names)
+    search, search_words, search_components = _prepare(entity_name)
+
+    # Strategies 1-4, collecting candidates that fall through to the fuzzy strategies
+    pending: List[int] = []
+    pending_prepared = []
+    for i, candidate_name in enumerate(candidate_names):
+        if not candidate_name:
+            continue
+        prepared = _prepare(candidate_name)
+        normalized, candidate_words, candidate_components = prepared
+
+        if search == normalized:
+            results[i] = (1.0, "exact", candidate_name)
+        elif search in normalized or normalized in search:
+            results[i] = (0.9, "substring", candidate_name)
+        else:
+            match = (_word_match(search_words, candidate_words)
+                     or _component_match(search_components, candidate_components))
+            if match:
+                results[i] = (match[0], match[1], candidate_name)
+            else:
+                pending.append(i)
+                pending_prepared.append(prepared)
+
+    if not pending:
+        return results
+
+    # Strategy 5: first word fuzzy
+    first_search = search_words[0] if search_words else ''
+    first_bounds = None
+    if len(first_search) >= MIN_PREFIX_LENGTH:
+        first_words = [words[0] if words else '' for _, words, _ in pending_prepared]
+        first_bounds = similarity_bounds(first_search, first_words, FIRST_WORD_MIN_SIMILARITY)
+
+    # Strategy 6: full name fuzzy
+    full_bounds = similarity_bounds(search, [normalized for normalized, _, _ in pending_prepared], threshold)
+
+    for j, i in enumerate(pending):
+        normalized, candidate_words, _ = pending_prepared[j]
+        if first_bounds is not None and first_bounds[j] >= FIRST_WORD_MIN_SIMILARITY - _EPSILON \
+                and len(candidate_words[0]) >= MIN_PREFIX_LENGTH:
+            first_similarity = SequenceMatcher(None, first_search, candidate_words[0]).ratio()
+            if first_similarity >= FIRST_WORD_MIN_SIMILARITY:
+                results[i] = (first_similarity * 0.9, "first_word_fuzzy", candidate_names[i])
+                continue
+
+        if full_bounds[j] >= threshold - _EPSILON:
+            similarity = SequenceMatcher(None, search, normalized).ratio()
+            if similarity >= threshold:
+                results[i] = (similarity, "fuzzy", candidate_names[i])
+
+    return results
@@ -0,0 +1,30 @@
+"""
+Token Estimation Utilities
+
+Cheap token counts for prompt budgeting. No provider tokenizer is bundled, so
+counts use the ~4 characters per token rule of thumb for English text, which
+is close enough to keep prompts inside a budget.
+"""
+
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of a text."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def truncate_to_tokens(text: str, max_tokens: int, marker: str = " …[truncated]") -> str:
+    """
+    Clip text to about max_tokens, cutting at a word boundary.
+
+    Returns the text unchanged if it already fits; otherwise the clipped text
+    ends with the marker (which counts toward the budget).
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    max_chars = max(0, max_tokens * CHARS_PER_TOKEN - len(marker))
+    clipped = text[:max_chars]
+    if ' ' in clipped[max_chars // 2:]:
+        clipped = clipped[:clipped.rindex(' ')]
+    return clipped.rstrip() + marker
@@ -0,0 +1,32 @@
+"""
+Shared builders for the classifier tests.
+"""
+
+import json
+from typing import Dict, List, Sequence
+
+import pytest
+
+from src.classifiers.gazetteer_ner import GazetteerEntityExtractor
+
+
+@pytest.fixture
+def make_extractor(tmp_path):
+    """
+    Build a GazetteerEntityExtractor over an SRD cache in tmp_path.
+
+    spells are written to the cache before the extractor loads it, and
+    entities maps an entity type to the names added to the extractor.
+    """
+    def make(
+        spells: Sequence[str] = (),
+        entities: Dict[str, List[str]] = None,
+        min_similarity: float = 0.85
+    ) -> GazetteerEntityExtractor:
+        if spells:
+            (tmp_path / "spells.json").write_text(json.dumps({"results": [{"name": name} for name in spells]}))
+        extractor = GazetteerEntityExtractor(tmp_path, min_similarity=min_similarity)
+        for entity_type, names in (entities or {}).items():
+            extractor.add_entities(names, entity_type)
+        return extractor
+    return make
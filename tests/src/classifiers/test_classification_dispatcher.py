@@ -0,0 +1,118 @@
+"""
+Test request batching in ClassificationDispatcher.
+
+A recording classifier stands in for the model so batches are deterministic
+and fast. Concurrent requests should share one batch while each caller gets
+its own result, normalized with its own names; the batch size cap, metrics
+and error propagation to every caller in a batch are checked as well.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.classifiers.base import ClassificationResult
+from src.classifiers.classification_dispatcher import ClassificationDispatcher
+
+
+class RecordingClassifier:
+    """Classifier that records each batch and echoes the normalized query."""
+
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.batches = []
+        self.delay = delay
+        self.fail = fail
+        self.threads = set()
+
+    def normalize_query(self, query, character_name=None, character_aliases=None,
+                        party_members=None, known_npcs=None):
+        return query.replace(character_name, "{CHARACTER}") if character_name else query
+
+    def predict_normalized(self, queries, normalized_queries, tool_threshold=None,
+                           entities=None, batch_size=32, start_time=None):
+        self.threads.add(threading.get_ident())
+        self.batches.append(list(normalized_queries))
+        time.sleep(self.delay)
+        if self.fail:
+            raise ValueError("model exploded")
+        return [
+            ClassificationResult(
+                tools_needed=[{'tool': 'rulebook', 'intention': normalized, 'confidence': 1.0}],
+                entities=query_entities or [],
+                backend='local'
+            )
+            for normalized, query_entities in zip(normalized_queries, entities)
+        ]
+
+
+async def classify_all(dispatcher, queries, **kwargs):
+    return await asyncio.gather(*(dispatcher.classify(q, **kwargs) for q in queries))
+
+
+class TestClassificationDispatcher:
+    """Test micro-batching of concurrent requests."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_a_batch(self):
+        classifier = RecordingClassifier()
+        dispatcher = ClassificationDispatcher(classifier, max_wait_ms=50)
+        queries = [f"query {i}" for i in range(5)]
+
+        results = await classify_all(dispatcher, queries)
+
+        assert [r.tools_needed[0]['intention'] for r in results] == queries
+        assert classifier.batches == [queries]
+        assert threading.get_ident() not in classifier.threads
+        stats = dispatcher.get_stats()
+        assert stats['requests'] == 5 and stats['batches'] == 1
+        assert stats['batch_sizes'] == {5: 1}
+        assert stats['queue_depth'] == 0
+        dispatcher.close()
+
+    @pytest.mark.asyncio
+    async def test_per_request_normalization_and_entities(self):
+        classifier = RecordingClassifier()
+        dispatcher = ClassificationDispatcher(classifier, max_wait_ms=50)
+        entities = [{'name': 'Fireball', 'type': 'SPELL'}]
+
+        first, second = await asyncio.gather(
+            dispatcher.classify("Does Duskryn know Fireball?", character_name="Duskryn", entities=entities),
+            dispatcher.classify("Is Brenna hurt?", character_name="Brenna"),
+        )
+
+        assert classifier.batches == [["Does {CHARACTER} know Fireball?", "Is {CHARACTER} hurt?"]]
+        assert first.entities == entities
+        assert second.entities == []
+        dispatcher.close()
+
+    @pytest.mark.asyncio
+    async def test_batch_size_cap(self):
+        classifier = RecordingClassifier(delay=0.01)
+        dispatcher = ClassificationDispatcher(classifier, max_wait_ms=20, max_batch_size=2)
+
+        results = await classify_all(dispatcher, [f"q{i}" for i in range(5)])
+
+        assert len(results) == 5
+        assert max(len(b) for b in classifier.batches) == 2
+        assert sum(len(b) for b in classifier.batches) == 5
+        stats = dispatcher.get_stats()
+        assert stats['max_batch_size'] == 2
+        assert stats['max_queue_depth'] == 5
+        dispatcher.close()
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_caller(self):
+        dispatcher = ClassificationDispatcher(RecordingClassifier(fail=True), max_wait_ms=50)
+
+        results = await asyncio.gather(
+            dispatcher.classify("a"), dispatcher.classify("b"), return_exceptions=True
+        )
+
+        assert all(isinstance(r, ValueError) for r in results)
+        assert dispatcher.get_stats()['errors'] == 1
+
+        dispatcher.close()
+        with pytest.raises(RuntimeError):
+            await dispatcher.classify("c")
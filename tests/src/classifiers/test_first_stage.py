@@ -0,0 +1,152 @@
+"""
+Test the first-stage classifier cascade.
+
+Tests the hashed n-gram model, trained on synthetic query-log examples over
+the real label mappings, for:
+- Training, calibration and the save/load round trip
+- Answering confident in-vocabulary queries and deferring the rest
+- Per-stage hit rates and sampled agreement
+- Recording which stage answered in LocalClassifier results
+"""
+
+import random
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from scripts.train_first_stage_classifier import evaluate, load_label_mappings, train_first_stage
+from src.classifiers.first_stage import FIRST_STAGE_FILENAME, ClassifierCascade, HashedNgramClassifier
+
+
+MODEL_DIR = Path(__file__).parents[3] / "models" / "routing_classifier"
+
+TEMPLATES = {
+    ('character_data', 'combat_info'): [
+        "what is my ac", "what's {CHARACTER}'s armor class", "how much hp do i have", "what is my initiative bonus",
+    ],
+    ('character_data', 'magic_info'): [
+        "how many spell slots do i have", "what spells does {CHARACTER} know", "what cantrips do i have",
+        "what is my spell save dc",
+    ],
+    ('session_notes', 'npc_info'): [
+        "who is {NPC}", "what do we know about {NPC}", "when did we meet {NPC}", "what did {NPC} tell us",
+    ],
+    ('rulebook', 'rule_mechanics'): [
+        "how does grappling work", "how does advantage work", "what are the rules for flanking",
+        "how does concentration work",
+    ],
+}
+
+ROUTINE = ["what is my ac?", "How many spell slots do I have", "who is {NPC}", "how does grappling work"]
+
+
+def make_examples(seed: int = 0):
+    rng = random.Random(seed)
+    examples = []
+    for (tool, intent), templates in TEMPLATES.items():
+        for template in templates:
+            for _ in range(10):
+                query = rng.choice([template, template + "?", "hey " + template, template.capitalize()])
+                examples.append((query, tool, intent))
+    return examples
+
+
+@pytest.fixture(scope="module")
+def first_stage():
+    tools, intents_per_tool = load_label_mappings(MODEL_DIR)
+    model, val = train_first_stage(make_examples(), tools, intents_per_tool, epochs=100)
+    return model, val
+
+
+def fake_transformer(calls, rulebook_intent=0):
+    """Transformer stand-in that always answers rulebook (one fixed intent) with confidence 0.8."""
+    def forward(queries):
+        calls.append(list(queries))
+        return [
+            (np.array([0.1, 0.1, 0.8]), {
+                'character_data': np.eye(10)[0], 'session_notes': np.eye(20)[0],
+                'rulebook': np.eye(30)[rulebook_intent],
+            })
+            for _ in queries
+        ]
+    return forward
+
+
+class TestHashedNgramClassifier:
+    """Test training, calibration and persistence."""
+
+    def test_learns_routine_queries(self, first_stage):
+        model, val = first_stage
+        metrics = evaluate(model, val, threshold=0.9)
+
+        assert metrics['accuracy'] == 1.0
+        assert metrics['coverage'] > 0.5
+        assert metrics['answered_accuracy'] == 1.0
+        assert all(0.5 <= t <= 10.0 for t in model.temperatures.values())
+
+    def test_save_load_round_trip(self, first_stage, tmp_path):
+        model, _ = first_stage
+        model.save(tmp_path / FIRST_STAGE_FILENAME)
+        loaded = HashedNgramClassifier.load(tmp_path / FIRST_STAGE_FILENAME)
+
+        assert loaded.tools == model.tools
+        assert loaded.intents_per_tool == model.intents_per_tool
+        assert loaded.temperatures == pytest.approx(model.temperatures)
+        assert (loaded.known_words == model.known_words).all()
+        for (tools, intents), (want_tools, want_intents) in zip(loaded.predict(ROUTINE), model.predict(ROUTINE)):
+            assert tools == pytest.approx(want_tools, abs=1e-3)  # float16 weights
+
+
+class TestClassifierCascade:
+    """Test gating, stage routing and stats."""
+
+    def test_routes_by_confidence(self, first_stage):
+        model, _ = first_stage
+        cascade = ClassifierCascade(model, threshold=0.9, sample_every=0)
+        calls = []
+        queries = ROUTINE + ["did we ever pay the smuggler back after the heist"]
+
+        outputs, stages = cascade.run(queries, fake_transformer(calls))
+
+        assert stages == ['first_stage'] * 4 + ['transformer']
+        assert calls == [[queries[-1]]]
+        assert model.tools[int(np.argmax(outputs[0][0]))] == 'character_data'
+        assert float(outputs[-1][0][2]) == pytest.approx(0.8)
+
+        stats = cascade.get_stats()
+        assert stats['first_stage_hits'] == 4 and stats['transformer_hits'] == 1
+        assert stats['first_stage_hit_rate'] == pytest.approx(0.8)
+
+    def test_sampled_agreement(self, first_stage):
+        model, _ = first_stage
+        cascade = ClassifierCascade(model, threshold=0.9, sample_every=1)
+        calls = []
+        rule_mechanics = model.intents_per_tool['rulebook'].index('rule_mechanics')
+
+        _, stages = cascade.run(ROUTINE, fake_transformer(calls, rule_mechanics))
+
+        assert stages == ['first_stage'] * 4
+        assert calls == [ROUTINE]
+        # The fake transformer only agrees on the rulebook query
+        assert cascade.get_stats()['sampled_agreement'] == pytest.approx(0.25)
+
+    def test_local_classifier_records_stage(self, first_stage, tmp_path):
+        pytest.importorskip("torch")
+        pytest.importorskip("transformers")
+        pytest.importorskip("sentencepiece")
+        from src.classifiers.local_classifier import LocalClassifier
+        from tests.src.classifiers.test_local_classifier_batch import build_tiny_checkpoint
+
+        model_dir = build_tiny_checkpoint(tmp_path)
+        first_stage[0].save(model_dir / FIRST_STAGE_FILENAME)
+        classifier = LocalClassifier(model_path=str(model_dir), device="cpu", use_gazetteer=False)
+        assert classifier.cascade is not None
+
+        routine, other = classifier.predict_batch(["What is my AC?", "Summarize the heist at the docks"])
+
+        assert routine.cascade_stage == 'first_stage'
+        assert routine.tools_needed[0]['tool'] == 'character_data'
+        assert routine.tools_needed[0]['intention'] == 'combat_info'
+        assert other.cascade_stage == 'transformer'
+        assert routine.cascade_stats['queries'] == 2
@@ -0,0 +1,38 @@
+"""
+Test batch extraction in GazetteerEntityExtractor.
+
+extract_batch must return the same entities as calling extract() per text,
+in input order, whether it runs in-process or with worker processes and
+whether the texts arrive as a list or a generator. extract_simple_batch is
+checked against extract_simple() the same way.
+"""
+
+TEXTS = [
+    "Does Duskryn have advantage on Strength checks?",
+    "",
+    "Ghul'Vor cast a spell at the Greywater Docks",
+    "What is my spell save dc",
+    "Duskryn Nightwardn and the Greywatr Docks",
+] * 7
+
+
+ENTITIES = {"CHARACTER": ["Duskryn Nightwarden"], "NPC": ["Ghul'Vor"], "LOCATION": ["Greywater Docks"]}
+
+
+class TestExtractBatch:
+    """Test batch extraction against single-text extraction."""
+
+    def test_matches_extract_in_order(self, make_extractor):
+        extractor = make_extractor(entities=ENTITIES, min_similarity=0.7)
+        expected = [extractor.extract(text) for text in TEXTS]
+
+        assert list(extractor.extract_batch(TEXTS)) == expected
+        assert list(extractor.extract_batch(iter(TEXTS), workers=2, chunksize=3)) == expected
+
+    def test_simple_batch(self, make_extractor):
+        extractor = make_extractor(entities=ENTITIES, min_similarity=0.7)
+        results = list(extractor.extract_simple_batch(TEXTS[:3], workers=2, chunksize=1))
+
+        assert results == [extractor.extract_simple(text) for text in TEXTS[:3]]
+        assert results[1] == []
+        assert {"canonical": "Ghul'Vor", "is_dynamic": True}.items() <= results[2][0].items()
@@ -0,0 +1,95 @@
+"""
+Test Aho-Corasick exact matching in GazetteerEntityExtractor.
+
+Tests the automaton and the extractor for:
+- Finding every occurrence, overlapping ones included
+- Word-bounded, longest-match-first exact extraction
+- Rebuilding the index after add_entities / clear_dynamic_entities
+- Agreeing with a per-name find() scan on randomized inputs
+"""
+
+import random
+from typing import List, Tuple
+
+from src.classifiers.aho_corasick import AhoCorasick
+
+
+def reference_exact_matches(gazetteers, text: str) -> List[Tuple[str, str, int, int]]:
+    """The original scan: every name, longest first, via str.find."""
+    results = []
+    text_lower = text.lower()
+    matched_spans = []
+    for name_lower in sorted(gazetteers.keys(), key=len, reverse=True):
+        canonical, _ = gazetteers[name_lower]
+        start = 0
+        while True:
+            idx = text_lower.find(name_lower, start)
+            if idx == -1:
+                break
+            end = idx + len(name_lower)
+            before_ok = idx == 0 or not text[idx-1].isalnum()
+            after_ok = end == len(text) or not text[end].isalnum()
+            overlaps = any(not (end <= s or idx >= e) for s, e in matched_spans)
+            if before_ok and after_ok and not overlaps:
+                results.append((text[idx:end], canonical, idx, end))
+                matched_spans.append((idx, end))
+            start = end
+    return results
+
+
+class TestAhoCorasick:
+    """Test the automaton directly."""
+
+    def test_finds_overlapping_occurrences(self):
+        automaton = AhoCorasick(["he", "she", "hers", "his"])
+        matches = sorted(automaton.iter_matches("ushers"))
+        assert matches == [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")]
+
+    def test_empty_and_duplicate_patterns_ignored(self):
+        automaton = AhoCorasick(["", "ab", "ab"])
+        assert len(automaton) == 1
+        assert list(automaton.iter_matches("abab")) == [(0, 2, "ab"), (2, 4, "ab")]
+
+
+class TestExactExtraction:
+    """Test exact extraction through the extractor."""
+
+    def test_longest_match_wins(self, make_extractor):
+        extractor = make_extractor()
+        extractor.add_entities(["Staff", "Staff of Frost"], "SESSION_ITEM")
+        entities = extractor._find_exact_matches("I raise my staff of frost")
+        assert [(e.text, e.canonical) for e in entities] == [("staff of frost", "Staff of Frost")]
+
+    def test_word_boundaries(self, make_extractor):
+        extractor = make_extractor()
+        extractor.add_entities(["Vor"], "NPC")
+        assert extractor._find_exact_matches("the vortex") == []
+        assert [e.canonical for e in extractor._find_exact_matches("ask Vor.")] == ["Vor"]
+
+    def test_index_follows_entity_changes(self, make_extractor):
+        extractor = make_extractor()
+        assert extractor._find_exact_matches("Greywater Docks") == []
+        extractor.add_entities(["Greywater Docks"], "LOCATION")
+        assert [e.canonical for e in extractor._find_exact_matches("Greywater Docks")] == ["Greywater Docks"]
+        extractor.clear_dynamic_entities()
+        assert extractor._find_exact_matches("Greywater Docks") == []
+
+
+class TestReferenceEquivalence:
+    """Compare automaton-based matching with the original scan."""
+
+    def test_randomized_equivalence(self, make_extractor):
+        rng = random.Random(7)
+        alphabet = "ab -'"
+
+        def word(lo=1, hi=5):
+            return "".join(rng.choice(alphabet) for _ in range(rng.randint(lo, hi))).strip() or "a"
+
+        for _ in range(200):
+            extractor = make_extractor()
+            extractor.add_entities([word() for _ in range(rng.randint(1, 8))], "NPC")
+            for _ in range(5):
+                text = word(0, 25)
+                expected = reference_exact_matches(extractor.gazetteers, text)
+                actual = [(e.text, e.canonical, e.start, e.end) for e in extractor._find_exact_matches(text)]
+                assert actual == expected, (list(extractor.gazetteers), text)
@@ -0,0 +1,81 @@
+"""
+Test the shared gazetteer extraction cache.
+
+Repeated extractions should be served from the cache as independent copies,
+any overlay change (add, overwrite, clear, reload) should move the overlay
+version, and extractors over the same base and overlay should share results.
+"""
+
+import pytest
+
+from src.classifiers.gazetteer_ner import ExtractionCache, GazetteerEntityExtractor, get_extraction_cache
+
+
+QUERY = "Does Duskryn know Fireball?"
+
+
+def canonicals(entities):
+    return [e.canonical for e in entities]
+
+
+class TestExtractionCache:
+    """Test cached extraction results."""
+
+    def test_repeated_extraction_hits_cache(self, make_extractor):
+        extractor = make_extractor(spells=["Fireball"])
+        cache = get_extraction_cache()
+        first = extractor.extract(QUERY)
+        hits = cache.hits
+
+        first[0].confidence = 0.0
+        second = extractor.extract(QUERY)
+        assert cache.hits == hits + 1
+        assert second[0].confidence == 1.0
+        assert second == extractor._extract_uncached(QUERY, True)
+
+    def test_overlay_changes_invalidate(self, make_extractor):
+        extractor = make_extractor(spells=["Fireball"])
+        empty_version = extractor.overlay_version
+        assert canonicals(extractor.extract(QUERY)) == ["Fireball"]
+
+        extractor.add_entities(["Duskryn Nightwarden"], "CHARACTER")
+        assert extractor.overlay_version != empty_version
+        assert canonicals(extractor.extract(QUERY)) == ["Duskryn Nightwarden", "Fireball"]
+
+        extractor.clear_dynamic_entities()
+        assert extractor.overlay_version == empty_version
+        assert canonicals(extractor.extract(QUERY)) == ["Fireball"]
+
+    def test_overwriting_an_entity_invalidates(self, make_extractor):
+        extractor = make_extractor(spells=["Fireball"])
+        extractor.add_entities(["Duskryn"], "CHARACTER")
+        assert extractor.extract_simple("Duskryn")[0]["type"] == "CHARACTER"
+
+        # Same overlay size, different entry
+        extractor.add_entities(["Duskryn"], "NPC")
+        assert extractor.extract_simple("Duskryn")[0]["type"] == "NPC"
+
+        with pytest.raises(TypeError):
+            extractor.gazetteers["duskryn"] = ("Duskryn", "CHARACTER")
+
+    def test_same_overlay_shares_results(self, tmp_path, make_extractor):
+        first = make_extractor(spells=["Fireball"])
+        second = GazetteerEntityExtractor(tmp_path)
+        for extractor in (first, second):
+            extractor.add_entities(["Duskryn Nightwarden"], "CHARACTER")
+
+        cache = get_extraction_cache()
+        first.extract(QUERY)
+        hits = cache.hits
+        assert second.extract(QUERY) == first.extract(QUERY)
+        assert cache.hits == hits + 2
+
+    def test_lru_bound(self):
+        cache = ExtractionCache(max_size=2)
+        cache.put(("a",), [])
+        cache.put(("b",), [])
+        assert cache.get(("a",)) == []
+        cache.put(("c",), [])
+
+        assert len(cache) == 2
+        assert cache.get(("b",)) is None
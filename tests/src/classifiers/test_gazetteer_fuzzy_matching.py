@@ -0,0 +1,88 @@
+"""
+Test indexed fuzzy matching in GazetteerEntityExtractor.
+
+The candidate index may only prune names that cannot reach the similarity
+threshold, so _find_fuzzy_matches is compared against the full
+SequenceMatcher scan, including first-word bonus matches such as
+"Duskryn" -> "Duskryn Nightwarden".
+"""
+
+import random
+from difflib import SequenceMatcher
+
+from src.classifiers.fuzzy_index import FuzzyCandidateIndex
+
+
+def reference_score(phrase: str, name_lower: str) -> float:
+    """Original per-name fuzzy score."""
+    score = SequenceMatcher(None, phrase.lower(), name_lower).ratio()
+    phrase_words = phrase.lower().split()
+    name_words = name_lower.split()
+    if phrase_words and name_words:
+        first_word_sim = SequenceMatcher(None, phrase_words[0], name_words[0]).ratio()
+        if first_word_sim >= 0.85:
+            score = max(score, first_word_sim * 0.9)
+    return score
+
+
+def random_name(rng: random.Random) -> str:
+    words = ["".join(rng.choice("aeiourstlnkd") for _ in range(rng.randint(2, 8))) for _ in range(rng.randint(1, 3))]
+    return " ".join(words)
+
+
+def typo(rng: random.Random, text: str) -> str:
+    if len(text) < 3:
+        return text
+    i = rng.randrange(len(text) - 1)
+    return rng.choice([text[:i] + text[i + 1:], text[:i] + rng.choice("aeiou") + text[i:],
+                       text[:i] + text[i + 1] + text[i] + text[i + 2:]])
+
+
+class TestFuzzyCandidateIndex:
+    """Test candidate shortlisting."""
+
+    def test_candidates_are_superset_of_matches(self):
+        rng = random.Random(3)
+        names = [random_name(rng) for _ in range(200)]
+        index = FuzzyCandidateIndex(names)
+
+        for _ in range(60):
+            phrase = typo(rng, rng.choice(names)) if rng.random() < 0.7 else random_name(rng)
+            scores = [reference_score(phrase, name) for name in names]
+            for threshold in (0.6, 0.7, 0.85):
+                candidates = set(index.candidates(phrase, threshold).tolist())
+                for i, score in enumerate(scores):
+                    if score >= threshold:
+                        assert i in candidates, (phrase, names[i], threshold)
+
+    def test_first_word_bonus_candidate(self):
+        index = FuzzyCandidateIndex(["duskryn nightwarden", "fireball"])
+        assert 0 in index.candidates("Duskryn", 0.7).tolist()
+
+    def test_empty_index(self):
+        assert len(FuzzyCandidateIndex([]).candidates("anything", 0.7)) == 0
+
+
+class TestIndexedFuzzyMatching:
+    """Compare indexed fuzzy matching with the full scan."""
+
+    def test_matches_full_scan(self, make_extractor):
+        rng = random.Random(11)
+        extractor = make_extractor(min_similarity=0.7)
+        names = [random_name(rng).title() for _ in range(150)]
+        extractor.add_entities(names, "NPC")
+
+        def as_tuples(entities):
+            return [(e.text, e.canonical, e.confidence, e.start, e.end) for e in entities]
+
+        for _ in range(40):
+            text = " and ".join(typo(rng, rng.choice(names)) for _ in range(rng.randint(1, 3)))
+            indexed = as_tuples(extractor._find_fuzzy_matches(text, []))
+
+            # Full scan: every gazetteer entry (SRD and overlay) is a candidate
+            extractor._fuzzy_candidates = lambda phrase: iter(extractor.gazetteers.items())
+            full_scan = as_tuples(extractor._find_fuzzy_matches(text, []))
+            del extractor._fuzzy_candidates
+
+            assert indexed == full_scan, text
+
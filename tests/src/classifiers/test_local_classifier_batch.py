@@ -0,0 +1,116 @@
+"""
+Test batched inference in LocalClassifier.
+
+Tests a tiny randomly initialized JointClassifier checkpoint, built with the
+real label mappings and tokenizer, for:
+- predict_batch parity with per-query max_length-padded inference
+- predict_sync / classify_single sharing the dynamic-padding path
+- Passing precomputed entities through
+"""
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("transformers")
+pytest.importorskip("sentencepiece")
+
+import torch.nn.functional as F
+from transformers import DebertaV2Config
+
+from src.classifiers.local_classifier import JointClassifier, LocalClassifier
+
+
+MODEL_DIR = Path(__file__).parents[3] / "models" / "routing_classifier"
+
+QUERIES = [
+    "What is my AC?",
+    "How does {CHARACTER} use sneak attack when flanking an enemy that is already prone?",
+    "fireball",
+    "What happened with the smuggler we met at the docks two sessions ago, and did we ever pay her back?",
+    "Can I cast shield as a reaction?",
+]
+
+
+def build_tiny_checkpoint(tmp_path: Path) -> Path:
+    """Write a tiny random JointClassifier checkpoint with the real mappings and tokenizer."""
+    shutil.copy(MODEL_DIR / "label_mappings.json", tmp_path / "label_mappings.json")
+    shutil.copytree(MODEL_DIR / "tokenizer", tmp_path / "tokenizer")
+    mappings = json.loads((tmp_path / "label_mappings.json").read_text())
+
+    config = DebertaV2Config(
+        vocab_size=128100, hidden_size=32, num_hidden_layers=2, num_attention_heads=2,
+        intermediate_size=64, relative_attention=True, position_buckets=256,
+        pos_att_type=["p2c", "c2p"], max_relative_positions=-1, position_biased_input=False,
+        norm_rel_ebd="layer_norm", share_att_key=True,
+    )
+    config.save_pretrained(tmp_path / "config")
+
+    torch.manual_seed(0)
+    model = JointClassifier(
+        config,
+        num_tools=len(mappings["tool_to_idx"]),
+        num_character_intents=mappings["num_intents_per_tool"]["character_data"],
+        num_session_intents=mappings["num_intents_per_tool"]["session_notes"],
+        num_rulebook_intents=mappings["num_intents_per_tool"]["rulebook"],
+    )
+    torch.save({
+        "model_state_dict": model.state_dict(),
+        "config": {"model_name": str(tmp_path / "config"), "max_length": 64},
+    }, tmp_path / "joint_classifier.pt")
+    return tmp_path
+
+
+@pytest.fixture(scope="module")
+def classifier(tmp_path_factory):
+    model_dir = build_tiny_checkpoint(tmp_path_factory.mktemp("routing_classifier"))
+    return LocalClassifier(model_path=str(model_dir), device="cpu", use_gazetteer=False)
+
+
+def padded_probs(classifier, query):
+    """Reference: one query padded to max_length."""
+    encoding = classifier.tokenizer(query, max_length=classifier.max_length, padding="max_length",
+                                    truncation=True, return_tensors="pt")
+    with torch.no_grad():
+        tool_logits, intent_logits = classifier.model(encoding["input_ids"], encoding["attention_mask"])
+    temp = classifier.model.temperature.item()
+    intent_logits["character_data"] = intent_logits["character"]
+    return (F.softmax(tool_logits / temp, dim=-1)[0],
+            {tool: F.softmax(intent_logits[tool] / temp, dim=-1)[0] for tool in classifier.tools})
+
+
+class TestPredictBatch:
+    """Test batched inference against single-query inference."""
+
+    def test_matches_padded_single_queries(self, classifier):
+        results = classifier.predict_batch(QUERIES, tool_threshold=0.0, batch_size=2)
+        assert len(results) == len(QUERIES)
+
+        for query, result in zip(QUERIES, results):
+            tool_probs, intent_probs = padded_probs(classifier, query)
+            for i, tool in classifier.idx_to_tool.items():
+                assert result.tool_confidences[tool] == pytest.approx(tool_probs[i].item(), abs=1e-5)
+            for tool_entry in result.tools_needed:
+                expected = classifier.idx_to_intent_per_tool[tool_entry["tool"]][
+                    torch.argmax(intent_probs[tool_entry["tool"]]).item()]
+                assert tool_entry["intention"] == expected
+
+    def test_single_paths_agree(self, classifier):
+        batch = classifier.predict_batch(QUERIES)
+        for query, result in zip(QUERIES, batch):
+            single = classifier.predict_sync(query)
+            assert [(t["tool"], t["intention"]) for t in single.tools_needed] == \
+                [(t["tool"], t["intention"]) for t in result.tools_needed]
+            assert single.tool_confidences == pytest.approx(result.tool_confidences, abs=1e-5)
+            best = classifier.classify_single(query)
+            assert best.tool_confidence == pytest.approx(max(single.tool_confidences.values()), abs=1e-5)
+
+    def test_entities_pass_through(self, classifier):
+        entities = [{"name": "Fireball", "type": "SPELL"}]
+        results = classifier.predict_batch(["fireball", "hello"], entities=[entities, None])
+        assert results[0].entities == entities
+        assert results[1].entities == []
+        assert classifier.predict_batch([]) == []
@@ -0,0 +1,75 @@
+"""
+Test the int8 ONNX export and OnnxLocalClassifier.
+
+The tiny checkpoint from test_local_classifier_batch is exported with
+scripts/export_onnx_classifier.py. The quantized model must keep parity with
+the torch model on held-out queries, route the same way as LocalClassifier,
+and classify without importing torch.
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+pytest.importorskip("sentencepiece")
+pytest.importorskip("onnx")
+pytest.importorskip("onnxruntime")
+
+from scripts.export_onnx_classifier import check_parity, export_onnx, load_heldout_queries
+from src.classifiers.local_classifier import LocalClassifier
+from src.classifiers.onnx_classifier import OnnxLocalClassifier
+from tests.src.classifiers.test_local_classifier_batch import QUERIES, build_tiny_checkpoint
+
+
+PROJECT_ROOT = Path(__file__).parents[3]
+
+
+@pytest.fixture(scope="module")
+def exported(tmp_path_factory):
+    model_dir = build_tiny_checkpoint(tmp_path_factory.mktemp("routing_classifier"))
+    classifier = LocalClassifier(model_path=str(model_dir), device="cpu", use_gazetteer=False)
+    export_onnx(classifier, model_dir / "onnx")
+    return classifier, OnnxLocalClassifier(model_path=str(model_dir), use_gazetteer=False)
+
+
+class TestOnnxClassifier:
+    """Test the ONNX backend against the torch backend."""
+
+    def test_heldout_parity(self, exported):
+        classifier, onnx_classifier = exported
+        parity = check_parity(classifier, onnx_classifier, load_heldout_queries())
+
+        assert parity['queries'] > 50
+        assert parity['tool_agreement'] >= 0.95
+        assert parity['intent_agreement'] >= 0.95
+        assert parity['max_tool_prob_diff'] < 0.01
+
+    def test_same_routing_results(self, exported):
+        classifier, onnx_classifier = exported
+        expected = classifier.predict_batch(QUERIES, character_name="Duskryn", tool_threshold=0.0)
+        actual = onnx_classifier.predict_batch(QUERIES, character_name="Duskryn", tool_threshold=0.0)
+
+        for want, got in zip(expected, actual):
+            assert got.tool_confidences == pytest.approx(want.tool_confidences, abs=0.01)
+            assert got.backend == 'local'
+        assert onnx_classifier.max_length == classifier.max_length
+
+    def test_serves_without_torch(self, exported):
+        _, onnx_classifier = exported
+        script = (
+            "import json, sys\n"
+            "from src.classifiers.onnx_classifier import OnnxLocalClassifier\n"
+            f"c = OnnxLocalClassifier(model_path={str(onnx_classifier.model_path)!r}, use_gazetteer=False)\n"
+            "r = c.predict_sync('What is my AC?')\n"
+            "print(json.dumps({'torch': 'torch' in sys.modules, 'tools': len(r.tool_confidences)}))\n"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", script], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip().splitlines()[-1]
+
+        assert json.loads(output) == {'torch': False, 'tools': 3}
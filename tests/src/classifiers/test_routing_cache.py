@@ -0,0 +1,133 @@
+"""
+Test the routing decision cache.
+
+Tests RoutingDecisionCache and the engine's LLM tool selector for:
+- Normalized-query keys shared by case/spacing variants but not across
+  modes or model versions
+- TTL expiry and the LRU bound
+- The write-behind persistent tier, its size bound and reloads
+- Hit-rate and savings stats
+- Keying the tool selector on the whole prompt, first turns only
+"""
+
+import sqlite3
+
+import pytest
+
+from src.classifiers.routing_cache import RoutingCache
+from src.llm.central_prompt_manager import CentralPromptManager
+from src.llm.conversation_memory import ConversationMemory
+from src.rag.context_assembler import ContextAssembler
+from tests.src.test_central_engine_rag_queries import make_engine
+
+
+QUERY = "What level is {CHARACTER}?"
+DECISION = {'tools_needed': [{'tool': 'character_data', 'intention': 'character_basics', 'confidence': 0.97}]}
+
+
+class TestRoutingCache:
+    """Test cached routing decisions."""
+
+    def test_keys_on_normalized_query_mode_and_version(self):
+        cache = RoutingCache()
+        cache.put('llm', QUERY, 'anthropic:haiku', DECISION, cost_ms=800.0)
+
+        hit = cache.get('llm', "  what level is   {character}? ", 'anthropic:haiku')
+        assert hit == DECISION
+        assert cache.get('local', QUERY, 'anthropic:haiku') is None
+        assert cache.get('llm', QUERY, 'openai:gpt-4o-mini') is None
+
+        hit['tools_needed'].append({'tool': 'rulebook'})
+        assert cache.get('llm', QUERY, 'anthropic:haiku') == DECISION
+
+    def test_ttl_and_size_bound(self):
+        cache = RoutingCache(max_size=2, ttl_seconds=60.0)
+        cache.put('llm', QUERY, 'v1', DECISION)
+        cache.entries[('llm', QUERY.casefold(), 'v1')].created_at -= 61.0
+        assert cache.get('llm', QUERY, 'v1') is None
+        assert cache.get_stats()['expired'] == 1
+
+        for query in ("a", "b", "c"):
+            cache.put('local', query, 'v1', DECISION)
+        assert len(cache) == 2
+        assert cache.get('local', "a", 'v1') is None
+        assert cache.get('local', "c", 'v1') == DECISION
+
+    def test_persistent_tier_survives_restart(self, tmp_path):
+        path = tmp_path / "routing_cache.sqlite"
+        cache = RoutingCache(persist_path=str(path))
+        cache.put('llm', QUERY, 'v1', DECISION, cost_ms=650.0)
+        cache.flush()
+
+        restarted = RoutingCache(persist_path=str(path))
+        assert len(restarted) == 0
+        assert restarted.get('llm', QUERY, 'v1') == DECISION
+        assert len(restarted) == 1
+        assert restarted.get_stats()['persistent_hits'] == 1
+
+        expired = RoutingCache(ttl_seconds=0.0, persist_path=str(path))
+        assert expired.get('llm', QUERY, 'v1') is None
+
+    def test_persistent_tier_is_written_behind_and_trimmed(self, tmp_path):
+        path = tmp_path / "routing_cache.sqlite"
+        cache = RoutingCache(max_size=2, persist_path=str(path))
+        for query in ("a", "b", "c"):
+            cache.put('local', query, 'v1', DECISION)
+        cache.flush()
+
+        rows = sqlite3.connect(str(path)).execute("SELECT query FROM routing_cache ORDER BY query").fetchall()
+        assert rows == [("b",), ("c",)]
+
+    def test_stats(self):
+        cache = RoutingCache()
+        cache.put('llm', QUERY, 'v1', DECISION, cost_ms=800.0)
+        cache.put('local', QUERY, 'v1', DECISION, cost_ms=12.0)
+        for _ in range(3):
+            cache.get('llm', QUERY, 'v1')
+        cache.get('llm', "How does grappling work?", 'v1')
+        cache.get('local', QUERY, 'v1')
+
+        stats = cache.get_stats()
+        assert stats['lookups'] == 5 and stats['hits'] == 4
+        assert stats['hit_rate_by_mode'] == {'llm': 0.75, 'local': 1.0}
+        assert stats['llm_calls_saved'] == 3
+        assert stats['saved_ms'] == 2412.0
+
+
+class CountingRouterClient:
+    """LLM client stand-in that counts tool selector calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def generate_json_response(self, prompt, **kwargs):
+        self.calls += 1
+        return DECISION
+
+
+class TestToolSelectorCache:
+    """Test when the engine reuses LLM routing decisions."""
+
+    def make_selector_engine(self):
+        engine = make_engine(router_llm_provider="anthropic")
+        engine.llm_clients = {"anthropic": CountingRouterClient()}
+        engine.prompt_manager = CentralPromptManager(ContextAssembler())
+        engine.conversation_memory = ConversationMemory()
+        engine.routing_cache = RoutingCache()
+        return engine
+
+    @pytest.mark.asyncio
+    async def test_keyed_on_character_and_first_turns_only(self):
+        engine = self.make_selector_engine()
+        client = engine.llm_clients["anthropic"]
+
+        engine.add_conversation_turn("user", QUERY)
+        await engine._call_tool_selector(QUERY, "Duskryn")
+        assert (await engine._call_tool_selector(QUERY, "Duskryn")).cached
+        assert not (await engine._call_tool_selector(QUERY, "Another Character")).cached
+        assert client.calls == 2
+
+        engine.add_conversation_turn("assistant", "Level 13.")
+        engine.add_conversation_turn("user", QUERY)
+        assert not (await engine._call_tool_selector(QUERY, "Duskryn")).cached
+        assert client.calls == 3
@@ -0,0 +1,121 @@
+"""
+Test the shared SRD gazetteer and per-extractor overlays.
+
+Every extractor over a cache directory shares one SRD gazetteer; dynamic
+entities, context clears and reloads only touch the extractor's own overlay,
+which shadows SRD names without changing the shared base. The compiled
+artifact's round trip and rebuilds are covered too.
+"""
+
+import json
+
+from src.classifiers.gazetteer_ner import GazetteerEntityExtractor
+from src.classifiers.srd_gazetteer import (
+    build_srd_gazetteer,
+    clear_srd_gazetteers,
+    get_srd_gazetteer,
+    load_artifact,
+    source_fingerprint,
+)
+
+
+def write_srd_cache(path):
+    path.mkdir(exist_ok=True)
+    (path / "spells.json").write_text(json.dumps({"results": [{"name": "Fireball"}, {"name": "Shield"}]}))
+    (path / "monsters.json").write_text(json.dumps([{"name": "Goblin"}]))
+    return path
+
+
+def canonicals(extractor, text):
+    return [(e.canonical, e.type) for e in extractor.extract(text)]
+
+
+class TestSharedBase:
+    """Test process-wide sharing of the SRD gazetteer."""
+
+    def test_extractors_share_base(self, tmp_path):
+        write_srd_cache(tmp_path)
+        first = GazetteerEntityExtractor(tmp_path)
+        second = GazetteerEntityExtractor(tmp_path / ".." / tmp_path.name)
+        assert first.base is second.base is get_srd_gazetteer(tmp_path)
+        assert first.gazetteers["fireball"] == ("Fireball", "SPELL")
+        assert first.gazetteers["strength"] == ("Strength", "ABILITY")
+
+    def test_clear_reloads_from_disk(self, tmp_path):
+        write_srd_cache(tmp_path)
+        base = get_srd_gazetteer(tmp_path)
+        clear_srd_gazetteers(tmp_path)
+        assert get_srd_gazetteer(tmp_path) is not base
+
+
+class TestOverlay:
+    """Test per-extractor dynamic entities."""
+
+    def test_dynamic_entities_are_isolated(self, tmp_path):
+        write_srd_cache(tmp_path)
+        first = GazetteerEntityExtractor(tmp_path)
+        second = GazetteerEntityExtractor(tmp_path)
+        first.add_entities(["Duskryn Nightwarden"], "CHARACTER")
+
+        assert ("Duskryn Nightwarden", "CHARACTER") in canonicals(first, "Duskryn casts Fireball")
+        assert canonicals(second, "Duskryn casts Fireball") == [("Fireball", "SPELL")]
+        assert "duskryn" not in first.base.entries
+
+    def test_reload_context_keeps_base(self, tmp_path):
+        write_srd_cache(tmp_path)
+        extractor = GazetteerEntityExtractor(tmp_path)
+        base = extractor.base
+        extractor.add_entities(["Greywater Docks"], "LOCATION")
+
+        extractor.reload_context()
+        assert extractor.base is base
+        assert extractor.overlay == {}
+        assert canonicals(extractor, "Goblins at Greywater Docks") == [("Goblin", "CREATURE")]
+
+    def test_overlay_shadows_srd_name(self, tmp_path):
+        write_srd_cache(tmp_path)
+        extractor = GazetteerEntityExtractor(tmp_path)
+        extractor.add_entities(["Shield"], "NPC")
+        assert canonicals(extractor, "ask Shield") == [("Shield", "NPC")]
+
+        # Clearing the overlay brings the SRD entry back
+        extractor.clear_dynamic_entities()
+        assert canonicals(extractor, "ask Shield") == [("Shield", "SPELL")]
+        assert extractor.base.entries["shield"] == ("Shield", "SPELL")
+
+
+class TestArtifact:
+    """Test the compiled gazetteer artifact."""
+
+    def test_round_trip(self, tmp_path):
+        cache = write_srd_cache(tmp_path / "srd")
+        artifact = tmp_path / "srd.gazetteer.pkl"
+        built = build_srd_gazetteer(cache, artifact)
+
+        loaded = load_artifact(artifact, source_fingerprint(cache))
+        assert loaded is not None and loaded is not built
+        assert dict(loaded.entries) == dict(built.entries)
+        assert list(loaded.automaton.iter_matches("goblin fireball")) == \
+            list(built.automaton.iter_matches("goblin fireball"))
+        assert loaded.fuzzy_index.candidates("Firebal", 0.8).tolist() == \
+            built.fuzzy_index.candidates("Firebal", 0.8).tolist()
+
+    def test_rebuilt_when_source_changes(self, tmp_path):
+        cache = write_srd_cache(tmp_path / "srd")
+        artifact = tmp_path / "srd.gazetteer.pkl"
+        build_srd_gazetteer(cache, artifact)
+
+        (cache / "monsters.json").write_text(json.dumps([{"name": "Owlbear"}]))
+        assert load_artifact(artifact, source_fingerprint(cache)) is None
+        rebuilt = build_srd_gazetteer(cache, artifact)
+        assert "owlbear" in rebuilt.entries and "goblin" not in rebuilt.entries
+        assert load_artifact(artifact, source_fingerprint(cache)) is not None
+
+    def test_corrupt_artifact_is_rebuilt(self, tmp_path):
+        cache = write_srd_cache(tmp_path / "srd")
+        artifact = tmp_path / "srd.gazetteer.pkl"
+        artifact.write_bytes(b"not a pickle")
+
+        gazetteer = build_srd_gazetteer(cache, artifact)
+        assert gazetteer.entries["fireball"] == ("Fireball", "SPELL")
+        assert load_artifact(artifact, source_fingerprint(cache)) is not None
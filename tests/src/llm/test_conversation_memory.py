@@ -0,0 +1,83 @@
+"""
+Test token-budgeted conversation memory.
+
+History must stay within the token budget however long a chat runs, keeping
+recent turns verbatim with alternating roles. Long turns are clipped when
+stored, and folded turns are summarized in the background, falling back to
+notes when summarization fails.
+"""
+
+import asyncio
+
+import pytest
+
+from src.llm.conversation_memory import SUMMARY_PREFIX, ConversationMemory
+from src.utils.token_estimation import estimate_tokens
+
+
+def chat(memory: ConversationMemory, exchanges: int, start: int = 0, words: int = 60):
+    for i in range(start, start + exchanges):
+        memory.add_turn("user", f"Question {i}: " + "what about the dragon " * (words // 4))
+        memory.add_turn("assistant", f"Answer {i}: " + "the dragon sleeps " * (words // 3))
+
+
+def history_tokens(memory: ConversationMemory) -> int:
+    return sum(estimate_tokens(t["content"]) for t in memory.get_history())
+
+
+class TestConversationMemory:
+    """Test budgeting, clipping and summarization."""
+
+    def test_history_is_bounded(self):
+        memory = ConversationMemory(token_budget=1000, summary_tokens=200)
+        chat(memory, 10)
+        short_chat_tokens = history_tokens(memory)
+        chat(memory, 190, start=10)
+
+        history = memory.get_history()
+        assert history_tokens(memory) <= 1000 + 20  # Summary exchange framing
+        assert history_tokens(memory) < short_chat_tokens * 1.5
+        assert history[0]["content"].startswith(SUMMARY_PREFIX)
+        assert history[-1]["content"].startswith("Answer 199:")
+        assert [t["role"] for t in history] == ["user", "assistant"] * (len(history) // 2)
+        assert memory.folded_turns > 350
+
+    def test_long_turns_are_clipped(self):
+        memory = ConversationMemory(max_turn_tokens=100)
+        memory.add_turn("assistant", "Fireball deals 8d6 fire damage. " * 200)
+
+        stored = memory.get_history()[0]["content"]
+        assert estimate_tokens(stored) <= 100
+        assert stored.endswith("[truncated]")
+
+    @pytest.mark.asyncio
+    async def test_background_summary(self):
+        calls = []
+
+        async def summarizer(previous, turns):
+            calls.append(len(turns))
+            await asyncio.sleep(0.01)
+            return previous + f"\n- Talked about the dragon ({len(turns)} turns)"
+
+        memory = ConversationMemory(token_budget=600, summary_tokens=150, summarizer=summarizer)
+        chat(memory, 6)
+        assert calls == []  # Not awaited by add_turn
+        assert "User asked: Question" in memory.get_summary()
+
+        await memory.wait_for_summary()
+        assert calls and sum(calls) == memory.folded_turns
+        assert memory.unsummarized == []
+        assert "Talked about the dragon" in memory.get_summary()
+
+    @pytest.mark.asyncio
+    async def test_failed_summary_keeps_notes(self):
+        async def summarizer(previous, turns):
+            raise RuntimeError("rate limited")
+
+        memory = ConversationMemory(token_budget=600, summary_tokens=150, summarizer=summarizer)
+        chat(memory, 6)
+        await memory.wait_for_summary()
+
+        assert memory.unsummarized == []
+        assert "User asked: Question" in memory.summary
+        assert estimate_tokens(memory.get_summary()) <= 150
@@ -0,0 +1,103 @@
+"""
+Test compact rendering of character sections.
+
+Tests the renderer for:
+- Terse per-section lines with empty fields and false flags dropped
+- Deterministic output cached by section content, in-place edits included
+- Carrying rendered sections, not the serialized dict, into the final prompt
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+
+from src.rag.character.character_query_router import CharacterQueryRouter
+from src.rag.character.character_renderer import CharacterRenderer, render_section
+from src.rag.character.character_types import (
+    InventoryItem, InventoryItemDefinition, Spell, SpellComponents, create_empty_character
+)
+from src.rag.context_assembler import ContextAssembler
+
+
+def make_character():
+    character = create_empty_character("Duskryn", "Hill Dwarf", "Warlock")
+    character.ability_scores.charisma = 24
+    character.inventory.equipped_items.append(InventoryItem(
+        definition=InventoryItemDefinition(
+            name="Warhammer", type="Weapon", description="A heavy war hammer.",
+            magic=False, weight=2.0, tags=["Damage"], damage={"diceString": "1d8"}, range=None
+        ),
+        quantity=1, isAttuned=False, equipped=True
+    ))
+    character.spell_list.spells = {"Warlock": {"1st_level": [Spell(
+        name="Hex", level=1, school="Enchantment", casting_time="1 bonus action", range="90 feet",
+        components=SpellComponents(verbal=True, somatic=True, material="the petrified eye of a newt"),
+        duration="Concentration, up to 1 hour", description="You place a curse on a creature.",
+        concentration=True
+    )]}}
+    return character
+
+
+class TestRenderSection:
+    """Test section text."""
+
+    def test_sections_are_terse(self):
+        character = make_character()
+
+        assert render_section(character.ability_scores) == (
+            "STR 10 (+0), DEX 10 (+0), CON 10 (+0), INT 10 (+0), WIS 10 (+0), CHA 24 (+7)"
+        )
+        inventory = render_section(character.inventory)
+        assert "  - Warhammer (type=Weapon; weight=2; tags=Damage; damage: diceString=1d8; quantity=1; equipped)" \
+               ": A heavy war hammer." in inventory
+        assert "magic" not in inventory and "isAttuned" not in inventory and "None" not in inventory
+        assert "- Hex (level=1; school=Enchantment; casting_time=1 bonus action; range=90 feet; " \
+               "components: V, S, M (the petrified eye of a newt); duration=Concentration, up to 1 hour; " \
+               "concentration): You place a curse on a creature." in render_section(character.spell_list)
+
+    def test_deterministic(self):
+        character = make_character()
+        copy = character.model_copy(deep=True)
+
+        for section in ("inventory", "spell_list", "features_and_traits", "combat_stats"):
+            assert render_section(getattr(character, section)) == render_section(getattr(copy, section))
+
+
+class TestCharacterRenderer:
+    """Test caching by section content."""
+
+    def test_cached_until_section_changes(self):
+        renderer = CharacterRenderer()
+        character = make_character()
+
+        first = renderer.render_sections(character, ["combat_stats", "inventory", "notes"])
+        assert set(first) == {"combat_stats", "inventory"}  # Empty sections left out
+        assert renderer.render_sections(character, ["combat_stats", "inventory"]) == first
+        assert (renderer.hits, renderer.misses) == (2, 2)
+
+        # In-place edits are picked up without a new object or timestamp
+        character.combat_stats.armor_class = 20
+        assert "armor_class: 20" in renderer.render_sections(character, ["combat_stats"])["combat_stats"]
+
+        # Other sections, and equal content on another object, stay cached
+        character.last_updated = datetime.now()
+        renderer.render_sections(character, ["inventory"])
+        renderer.render_sections(character.model_copy(deep=True), ["inventory"])
+        assert (renderer.hits, renderer.misses) == (4, 3)
+
+
+class TestCharacterQueryResult:
+    """Test rendered sections reaching the final prompt context."""
+
+    def test_prompt_uses_rendered_sections(self):
+        router = CharacterQueryRouter(make_character())
+        result = router.query_character(["combat_info"])
+        assert result.rendered_sections and result.character_data == {}
+
+        assembler = ContextAssembler()
+        rendered = assembler.pack_prompt_context({"character": result})
+        serialized = router._extract_character_data(router.character, set(result.rendered_sections))
+        as_json = assembler.pack_prompt_context(
+            {"character": SimpleNamespace(character_data=serialized)}
+        )
+        assert "ability_scores: STR 10 (+0)" in rendered.text
+        assert rendered.metadata["total_tokens"] < as_json.metadata["total_tokens"] * 0.8
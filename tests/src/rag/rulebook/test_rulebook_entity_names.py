@@ -0,0 +1,100 @@
+"""
+Test rulebook entity names extracted at load time.
+
+Names are extracted when the rulebook is parsed and persisted with the
+storage; outdated name tables are re-extracted on load. EntitySearchEngine
+caches rulebook lookups per storage version behind an LRU bound.
+"""
+
+import pickle
+
+from src.rag.rulebook.rulebook_storage import RulebookStorage
+from src.utils.entity_search_engine import EntitySearchEngine, RulebookResultCache
+
+
+RULEBOOK_MD = """# Spells
+
+## Fireball
+
+A bright streak flashes to a point you choose. **Spell Save:** Dexterity.
+
+### At Higher Levels
+
+## Shield
+
+An invisible barrier of magical force appears.
+"""
+
+
+def make_storage(tmp_path) -> RulebookStorage:
+    source = tmp_path / "rulebook.md"
+    source.write_text(RULEBOOK_MD)
+    storage = RulebookStorage(storage_path=str(tmp_path / "store"))
+    storage.parse_markdown(str(source))
+    return storage
+
+
+def section_id(storage, title):
+    return next(sid for sid, section in storage.sections.items() if section.title == title)
+
+
+class TestEntityNameTable:
+    """Test the per-load entity name table."""
+
+    def test_extracted_at_parse_time(self, tmp_path):
+        storage = make_storage(tmp_path)
+        fireball = section_id(storage, "Fireball")
+
+        assert storage.entity_names[fireball] == ["Fireball", "Spell Save"]
+        assert storage.get_entity_index() is storage.get_entity_index()
+        assert (fireball, "Fireball") in storage.get_entity_index().lookup("fireball", 0.6)
+
+    def test_persisted_and_reloaded(self, tmp_path):
+        storage = make_storage(tmp_path)
+        storage.save_to_disk()
+
+        loaded = RulebookStorage(storage_path=str(tmp_path / "store"))
+        assert loaded.load_from_disk()
+        assert loaded.entity_names == storage.entity_names
+        assert loaded.version != storage.version
+
+    def test_outdated_table_is_reextracted(self, tmp_path):
+        storage = make_storage(tmp_path)
+        storage.save_to_disk()
+        path = tmp_path / "store" / "rulebook_storage.pkl"
+        data = pickle.loads(path.read_bytes())
+        data['entity_names'] = {'format': 0, 'names': {}}
+        path.write_bytes(pickle.dumps(data))
+
+        loaded = RulebookStorage(storage_path=str(tmp_path / "store"))
+        loaded.load_from_disk()
+        assert loaded.entity_names == storage.entity_names
+
+
+class TestRulebookResultCache:
+    """Test versioned, bounded caching of rulebook lookups."""
+
+    def test_lru_bound(self):
+        cache = RulebookResultCache(max_size=2)
+        cache.put(1, "a", ["a"])
+        cache.put(1, "b", ["b"])
+        assert cache.get(1, "a") == ["a"]
+        cache.put(1, "c", ["c"])
+
+        assert len(cache) == 2
+        assert cache.get(1, "b") is None
+        assert cache.get(2, "a") is None
+
+    def test_reload_invalidates_cached_lookups(self, tmp_path):
+        storage = make_storage(tmp_path)
+        engine = EntitySearchEngine(rulebook_cache_size=8)
+        engine.resolve_entities([{"name": "Shield"}], ["rulebook"], None, rulebook_storage=storage)
+        first_version = storage.version
+        assert engine._rulebook_cache.get(first_version, "Shield")[0].match_strategy == "exact"
+
+        storage.save_to_disk()
+        storage.load_from_disk()
+        assert engine._rulebook_cache.get(storage.version, "Shield") is None
+        resolved = engine.resolve_entities([{"name": "Shield"}], ["rulebook"], None, rulebook_storage=storage)
+        assert resolved["Shield"] == engine._rulebook_cache.get(storage.version, "Shield")
+        assert storage.version != first_version
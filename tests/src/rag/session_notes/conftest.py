@@ -0,0 +1,38 @@
+"""
+Shared builders for the session notes tests.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from api.database.firestore_models import SessionDocument
+from src.rag.session_notes.campaign_session_notes_storage import CampaignSessionNotesStorage
+
+
+@pytest.fixture
+def make_session():
+    """Build a minimal SessionDocument; extra keyword arguments become session fields."""
+    def make(number: int, date: datetime = None, session_id: str = None, **fields) -> SessionDocument:
+        return SessionDocument(
+            id=session_id or f"session-{number}",
+            campaign_id="test-campaign",
+            user_id="user",
+            session_number=number,
+            session_name=f"Session {number}",
+            summary=fields.pop("summary", f"The party travelled onward in session {number}. " * 5),
+            date=date,
+            **fields,
+        )
+    return make
+
+
+@pytest.fixture
+def make_storage(make_session):
+    """Build a storage with one session per number, session N dated 2025-01-01 + (N - 1) days."""
+    def make(numbers, **fields) -> CampaignSessionNotesStorage:
+        storage = CampaignSessionNotesStorage(campaign_id="test-campaign")
+        for number in numbers:
+            storage.add_session(make_session(number, datetime(2025, 1, 1) + timedelta(days=number - 1), **fields))
+        return storage
+    return make
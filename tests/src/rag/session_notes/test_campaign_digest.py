@@ -0,0 +1,89 @@
+"""
+Test the rolling CampaignDigest.
+
+Tests the digest and the session notes router for:
+- Re-digesting only the sessions a write changed
+- Open threads from cliffhangers, hooks and unresolved questions
+- A bounded arc summary for long campaigns
+- Answering campaign-wide intents from the digest
+"""
+
+from datetime import datetime
+
+from src.rag.session_notes.campaign_digest import ARC_SUMMARY_CHARS, MAX_QUERY_DIGESTS
+from src.rag.session_notes.campaign_session_notes_storage import CampaignSessionNotesStorage
+from src.rag.session_notes.session_notes_query_router import SessionNotesQueryRouter
+
+
+class TestIncrementalDigest:
+    """Test that only changed sessions are re-digested."""
+
+    def test_unchanged_sessions_are_not_redigested(self, make_session, make_storage):
+        storage = make_storage(range(1, 6))
+        digest = storage.get_digest()
+        assert digest.sessions_digested == 5
+
+        storage.get_digest()
+        assert digest.sessions_digested == 5
+
+        storage.add_session(make_session(3, summary="Rewritten", updated_at=datetime(2025, 2, 1)))
+        storage.get_digest()
+        assert digest.sessions_digested == 6
+        assert digest.session_digests["session-3"].summary == "Rewritten"
+
+    def test_removed_sessions_leave_digest(self, make_storage):
+        storage = make_storage(range(1, 4))
+        storage.get_digest()
+        storage.remove_session("session-2")
+        digest = storage.get_digest()
+        assert [d.session_number for d in digest.get_ordered_digests()] == [1, 3]
+
+
+class TestOpenThreads:
+    """Test open thread extraction."""
+
+    def test_hooks_and_unresolved_questions(self, make_session):
+        storage = CampaignSessionNotesStorage(campaign_id="c")
+        storage.add_session(make_session(1, unresolved_questions=["Who sent the letter?", "Where is the key?"]))
+        storage.add_session(make_session(2, mysteries_revealed=["Where is the key? In the crypt"],
+                                         cliffhanger="The door slams shut", next_session_hook="Escape the crypt"))
+        storage.add_session(make_session(3, unresolved_questions=["Who sent the letter?"]))
+        threads = storage.get_digest().get_open_threads()
+
+        kinds = [(t.kind, t.session_number) for t in threads]
+        assert ("cliffhanger", 2) in kinds and ("next_hook", 2) in kinds
+        mysteries = [t.text for t in threads if t.kind == "mystery"]
+        # Duplicate question kept once (most recent), revealed question dropped
+        assert mysteries == ["Who sent the letter?"]
+
+
+class TestBoundedArc:
+    """Test that digest output stays bounded for long campaigns."""
+
+    def test_arc_summary_bounded(self, make_storage):
+        storage = make_storage(range(1, 501))
+        arc = storage.get_digest().get_arc_summary()
+        assert len(arc) <= ARC_SUMMARY_CHARS + 40
+        assert "Session 500" in arc
+
+    def test_router_returns_single_bounded_context(self, make_storage):
+        storage = make_storage(range(1, 201), unresolved_questions=["What lies below?"])
+        router = SessionNotesQueryRouter(storage)
+
+        result = router.query("Hero", "what has happened so far", "cross_session", [], [])
+        assert len(result.contexts) == 1
+        assert len(result.contexts[0].relevant_sections["session_digests"]) == MAX_QUERY_DIGESTS
+
+        result = router.query("Hero", "what mysteries remain", "unresolved_mysteries", [], [])
+        assert result.contexts[0].relevant_sections["open_mysteries"][0]["session_number"] == 200
+
+    def test_cross_session_prefers_sessions_mentioning_entities(self, make_session, make_storage):
+        storage = make_storage(range(1, 21))
+        for number in (4, 11):
+            storage.add_session(make_session(number, summary=f"Vexa bargained with the party in session {number}."))
+        router = SessionNotesQueryRouter(storage)
+
+        result = router.query("Hero", "what do we know about Vexa", "cross_session",
+                              [{"name": "Vexa Thorn", "type": "npc"}], [])
+        digests = result.contexts[0].relevant_sections["session_digests"]
+        assert [d["session_number"] for d in digests] == [4, 11]
@@ -0,0 +1,68 @@
+"""
+Test CampaignEntityIndex.
+
+entity_context() must equal a scan over every session, per entity and per
+section. Party members and NPCs come from the sessions' entity lists, and a
+session change re-reads only that session.
+"""
+
+from scripts.synthetic_campaign import generate_campaign
+
+
+def scan_context(storage, entity_lower, raw_section_key):
+    """Reference: CentralEngine's per-session scan before the index existed."""
+    context_parts = []
+    for session in storage.get_sessions_sorted():
+        entity_found = False
+        for entity in session.player_characters + session.npcs + session.locations + session.items:
+            names = [entity.get('name', '').lower()] + [a.lower() for a in entity.get('aliases', [])]
+            if any(entity_lower in name or name in entity_lower for name in names):
+                entity_found = True
+        section_content = (session.raw_sections or {}).get(raw_section_key, '')
+        if section_content and entity_lower in section_content.lower():
+            context_parts.append(f"Session {session.session_number} - {raw_section_key}:\n{section_content}")
+        elif entity_found and session.summary and entity_lower in session.summary.lower():
+            context_parts.append(f"Session {session.session_number} - Summary:\n{session.summary}")
+    return "\n\n".join(context_parts) if context_parts else None
+
+
+class TestCampaignEntityIndex:
+    """Test indexed entity context against the full scan."""
+
+    def test_context_matches_scan(self):
+        storage = generate_campaign(40, seed=7)
+        index = storage.get_entity_index()
+        entities = ["duskryn", "brenna vale", "the smuggler", "emberfall keep", "cult", "ghul'vor", "", "zzz"]
+
+        for entity_lower in entities:
+            for key in ["Summary", "NPCs", "Combat", "Missing"]:
+                assert index.entity_context(entity_lower, key) == scan_context(storage, entity_lower, key), \
+                    (entity_lower, key)
+        assert any(index.entity_context(e, "NPCs") for e in entities)
+
+    def test_party_members_and_npcs(self):
+        storage = generate_campaign(5, seed=1)
+        index = storage.get_entity_index()
+
+        assert "Duskryn Nightwarden" in index.party_members()
+        assert "Duskryn" in index.party_members()
+        assert "Brenna Vale" in index.known_npcs()
+        assert len(index.known_npcs()) == len(set(index.known_npcs()))
+
+    def test_incremental_sync(self):
+        storage = generate_campaign(10, seed=2)
+        index = storage.get_entity_index()
+        assert index.sessions_indexed == 10
+        assert index.entity_context("zyxthar", "NPCs") is None
+
+        session = storage.get_sessions_sorted()[3]
+        storage.add_session(session.model_copy(update={
+            "npcs": [{"name": "Zyxthar"}],
+            "raw_sections": {"NPCs": "Zyxthar the lich appeared."},
+        }))
+
+        assert storage.get_entity_index() is index
+        assert index.sessions_indexed == 11
+        assert index.entity_context("zyxthar", "NPCs") == \
+            f"Session {session.session_number} - NPCs:\nZyxthar the lich appeared."
+        assert [s.session_number for s in index.sessions_with_entity("zyxthar")] == [session.session_number]
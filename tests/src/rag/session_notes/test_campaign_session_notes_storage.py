@@ -0,0 +1,121 @@
+"""
+Test the sorted session indexes in CampaignSessionNotesStorage.
+
+Tests the storage and the router's temporal filters for:
+- Session-number ordering of recent, first and range lookups
+- Index upkeep and revision bumps on add, replace and remove
+- The cached latest date used by recency scoring
+"""
+
+from datetime import datetime
+
+from src.rag.session_notes.campaign_session_notes_storage import CampaignSessionNotesStorage
+from src.rag.session_notes.session_notes_query_router import SessionNotesQueryRouter
+from src.rag.session_notes.session_types import SessionNotesContext
+
+
+class TestSessionNumberIndex:
+    """Test ordered lookups by session number."""
+
+    def test_sessions_sorted_regardless_of_insert_order(self, make_storage):
+        storage = make_storage([3, 1, 5, 2, 4])
+        assert [s.session_number for s in storage.get_sessions_sorted()] == [1, 2, 3, 4, 5]
+
+    def test_latest_session(self, make_storage):
+        storage = make_storage([3, 7, 2])
+        assert storage.get_latest_session().session_number == 7
+
+    def test_latest_session_empty(self):
+        storage = CampaignSessionNotesStorage(campaign_id="empty")
+        assert storage.get_latest_session() is None
+        assert storage.get_recent_sessions(5) == []
+        assert storage.get_latest_session_date() is None
+
+    def test_recent_and_first_sessions(self, make_storage):
+        storage = make_storage(range(1, 11))
+        assert [s.session_number for s in storage.get_recent_sessions(3)] == [8, 9, 10]
+        assert [s.session_number for s in storage.get_first_sessions(3)] == [1, 2, 3]
+
+    def test_sessions_in_range_is_inclusive(self, make_storage):
+        storage = make_storage(range(1, 11))
+        assert [s.session_number for s in storage.get_sessions_in_range(4, 6)] == [4, 5, 6]
+        assert [s.session_number for s in storage.get_sessions_in_range(6, 4)] == [4, 5, 6]
+        assert storage.get_sessions_in_range(20, 30) == []
+
+    def test_replace_session_updates_index(self, make_session, make_storage):
+        storage = make_storage([1, 2, 3])
+        storage.add_session(make_session(9, session_id="session-1"))
+        assert storage.get_session_count() == 3
+        assert [s.session_number for s in storage.get_sessions_sorted()] == [2, 3, 9]
+
+    def test_remove_session_updates_index(self, make_storage):
+        storage = make_storage([1, 2, 3])
+        removed = storage.remove_session("session-3")
+        assert removed.session_number == 3
+        assert storage.get_latest_session().session_number == 2
+        assert storage.remove_session("missing") is None
+
+    def test_same_key_replace_bumps_revision(self, make_session, make_storage):
+        storage = make_storage([1, 2, 3])
+        revision = storage.revision
+        storage.add_session(make_session(0, session_id="session-3"))
+        assert storage.revision != revision
+        assert [s.session_number for s in storage.get_sessions_sorted()] == [0, 1, 2]
+
+    def test_constructor_sessions_are_indexed(self, make_session):
+        sessions = {"other-key": make_session(2), "session-1": make_session(1)}
+        storage = CampaignSessionNotesStorage(campaign_id="c", sessions=sessions)
+        assert storage.sessions is sessions
+        assert [s.session_number for s in storage.get_sessions_sorted()] == [1, 2]
+        storage.remove_session("other-key")
+        assert [s.session_number for s in storage.get_sessions_sorted()] == [1]
+
+
+class TestDateIndex:
+    """Test the cached date index."""
+
+    def test_latest_date_and_range(self, make_storage):
+        storage = make_storage([2, 5, 3])
+        assert storage.get_latest_session_date() == datetime(2025, 1, 5)
+        assert storage.get_session_date_range() == (datetime(2025, 1, 2), datetime(2025, 1, 5))
+
+    def test_sessions_without_dates_are_skipped(self, make_session):
+        storage = CampaignSessionNotesStorage(campaign_id="c")
+        storage.add_session(make_session(1))
+        assert storage.get_session_date_range() == (None, None)
+        storage.add_session(make_session(2, datetime(2025, 3, 1)))
+        assert storage.get_latest_session_date() == datetime(2025, 3, 1)
+
+
+class TestRouterTemporalFilters:
+    """Test that the router's temporal filters use the storage index."""
+
+    def test_recent_hint(self, make_storage):
+        router = SessionNotesQueryRouter(make_storage(range(1, 9)))
+        sessions = router._apply_temporal_filters(["recent"])
+        assert [s.session_number for s in sessions] == [4, 5, 6, 7, 8]
+
+    def test_first_hint(self, make_storage):
+        router = SessionNotesQueryRouter(make_storage(range(1, 9)))
+        sessions = router._apply_temporal_filters(["first"])
+        assert [s.session_number for s in sessions] == [1, 2, 3, 4, 5]
+
+    def test_between_hint(self, make_storage):
+        router = SessionNotesQueryRouter(make_storage(range(1, 9)))
+        sessions = router._apply_temporal_filters(["between 2 and 4"])
+        assert [s.session_number for s in sessions] == [2, 3, 4]
+
+    def test_recency_scoring_penalizes_older_sessions(self, make_session):
+        storage = CampaignSessionNotesStorage(campaign_id="c")
+        old = make_session(1, datetime(2025, 1, 1))
+        new = make_session(2, datetime(2025, 4, 1))
+        storage.add_session(old)
+        storage.add_session(new)
+        router = SessionNotesQueryRouter(storage)
+
+        def score(session):
+            context = SessionNotesContext(session_number=session.session_number, session_summary="")
+            context.relevant_sections["quest_info"] = {"next_hook": "x"}
+            return router._calculate_relevance_score(session, context, [], ["recent"], "quest_tracking")
+
+        assert score(new) > score(old)
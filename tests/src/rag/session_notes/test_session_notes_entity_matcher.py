@@ -0,0 +1,111 @@
+"""
+Test the per-query QueryEntityMatcher used by SessionNotesQueryRouter.
+
+The matcher must give the same answers as comparing every entity name
+directly: case-insensitive lookups, equality and substring name matches,
+and text mentions by full name or significant name parts, with overlapping
+names checked on randomized inputs.
+"""
+
+import random
+
+from src.rag.session_notes.entity_matcher import QueryEntityMatcher
+
+
+def naive_name_matches(search_name: str, target_name: str) -> bool:
+    search_lower = search_name.lower()
+    target_lower = target_name.lower()
+    return search_lower == target_lower or search_lower in target_lower or target_lower in search_lower
+
+
+def naive_mentioned(entity_name: str, text: str) -> bool:
+    if not text or not entity_name:
+        return False
+    text_lower = text.lower()
+    name_lower = entity_name.lower()
+    if name_lower in text_lower:
+        return True
+    parts = name_lower.split()
+    if len(parts) > 1:
+        return any(len(part) > 2 and part in text_lower for part in parts)
+    return False
+
+
+def make_matcher(*names):
+    return QueryEntityMatcher([{"name": n, "type": ""} for n in names])
+
+
+class TestNameMatching:
+    """Test flexible name matching against a target."""
+
+    def test_exact_and_case_insensitive(self):
+        matcher = make_matcher("Duskryn Nightwarden")
+        assert matcher.name_matches("Duskryn Nightwarden", "duskryn nightwarden")
+
+    def test_names_equal_is_exact(self):
+        matcher = make_matcher("Duskryn", "duskryn", "Greywater Docks")
+        assert matcher.names_equal("DUSKRYN") == {"Duskryn", "duskryn"}
+        assert matcher.names_equal("Greywater") == set()
+
+    def test_substring_both_directions(self):
+        matcher = make_matcher("Duskryn", "Eldaryth of Regret")
+        assert matcher.names_matching("Duskryn Nightwarden") == {"Duskryn"}
+        assert matcher.names_matching("Eldaryth") == {"Eldaryth of Regret"}
+        assert matcher.names_matching("Ghul") == set()
+
+    def test_empty_target_matches_every_entity(self):
+        matcher = make_matcher("Duskryn", "Ghul'Vor")
+        assert matcher.names_matching("") == {"Duskryn", "Ghul'Vor"}
+
+    def test_no_entities(self):
+        matcher = make_matcher()
+        assert not matcher
+        assert matcher.names_matching("") == set()
+        assert matcher.mentioned_in("anything") == set()
+
+
+class TestTextMentions:
+    """Test mention detection in free text."""
+
+    def test_name_part_mention(self):
+        matcher = make_matcher("Duskryn Nightwarden", "Al Bo")
+        assert matcher.mentioned_in("Nightwarden drew his blade") == {"Duskryn Nightwarden"}
+        # Parts of two characters or fewer are ignored
+        assert matcher.mentioned_in("Al went home") == set()
+
+    def test_nested_names_are_all_reported(self):
+        matcher = make_matcher("Ann", "Anna", "Joanna Bell")
+        assert matcher.mentioned_in("Joanna waved") == {"Ann", "Anna", "Joanna Bell"}
+        assert matcher.full_names_in("Joanna waved") == {"Ann", "Anna"}
+
+    def test_empty_text(self):
+        matcher = make_matcher("Duskryn")
+        assert matcher.mentioned_in("") == set()
+        assert matcher.full_names_in("") == set()
+
+
+class TestNaiveEquivalence:
+    """Compare the compiled matcher against per-entity comparisons."""
+
+    def test_randomized_equivalence(self):
+        rng = random.Random(1234)
+        alphabet = "abn '-"
+
+        def word():
+            return "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 6)))
+
+        for _ in range(300):
+            names = [word() for _ in range(rng.randint(1, 5))]
+            matcher = make_matcher(*names)
+            for _ in range(5):
+                target = word()
+                expected = {n for n in names if naive_name_matches(n, target)}
+                assert matcher.names_matching(target) == expected, (names, target)
+                assert matcher.names_equal(target) == {n for n in names if n.lower() == target.lower()}
+
+                text = " ".join(word() for _ in range(rng.randint(0, 4)))
+                expected_mentions = {n for n in names if naive_mentioned(n, text)}
+                assert matcher.mentioned_in(text) == expected_mentions, (names, text)
+
+                expected_full = {n for n in names if n.lower() in text.lower()} if text else set()
+                assert matcher.full_names_in(text) == expected_full, (names, text)
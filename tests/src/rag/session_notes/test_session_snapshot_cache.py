@@ -0,0 +1,143 @@
+"""
+Test the on-disk session snapshot cache.
+
+Snapshots must round-trip and mismatched ones must be rejected. A cold
+SessionNotesStorage load reuses unchanged sessions from the snapshot, fetches
+only new or changed ones and drops deleted ones.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from api.database.firestore_models import SessionDocument
+from src.rag.session_notes.session_notes_storage import SessionNotesStorage
+from src.rag.session_notes.session_snapshot_cache import SessionSnapshotCache
+
+
+def session_data(number: int, updated_at: datetime) -> dict:
+    return {
+        'user_id': 'user',
+        'session_number': number,
+        'session_name': f'Session {number}',
+        'summary': f'Summary {number}',
+        'updated_at': updated_at,
+    }
+
+
+class FakeDoc:
+    def __init__(self, doc_id, data, fields=None):
+        self.id = doc_id
+        self._data = data
+        self._fields = fields
+        self.exists = data is not None
+
+    def to_dict(self):
+        if self._fields is None:
+            return dict(self._data)
+        return {k: v for k, v in self._data.items() if k in self._fields}
+
+
+class FakeQuery:
+    def __init__(self, collection, fields=None):
+        self.collection = collection
+        self.fields = fields
+
+    async def stream(self):
+        for doc_id, data in self.collection.docs.items():
+            self.collection.db.reads.append((doc_id, tuple(self.fields) if self.fields else None))
+            yield FakeDoc(doc_id, data, self.fields)
+
+
+class FakeCollection:
+    def __init__(self, db, docs):
+        self.db = db
+        self.docs = docs
+
+    def document(self, doc_id):
+        return doc_id  # Document references are just IDs here
+
+    def collection(self, name):
+        return self
+
+    def select(self, fields):
+        return FakeQuery(self, fields)
+
+    def stream(self):
+        return FakeQuery(self).stream()
+
+
+class FakeDB:
+    """Minimal async Firestore stand-in for a single campaign."""
+
+    def __init__(self, docs):
+        self.sessions = FakeCollection(self, docs)
+        self.reads = []
+
+    def collection(self, name):
+        return self
+
+    def document(self, campaign_id):
+        return self.sessions
+
+    async def get_all(self, refs):
+        for doc_id in refs:
+            self.reads.append((doc_id, None))
+            yield FakeDoc(doc_id, self.sessions.docs.get(doc_id))
+
+
+T1 = datetime(2025, 1, 1)
+T2 = datetime(2025, 2, 1)
+
+
+class TestSnapshotFile:
+    """Test snapshot serialization."""
+
+    def test_round_trip(self, tmp_path):
+        cache = SessionSnapshotCache(str(tmp_path))
+        session = SessionDocument.from_firestore('s1', 'camp', session_data(1, T1))
+        cache.save('camp', [session])
+        loaded = cache.load('camp')
+        assert loaded['s1'] == session
+
+    def test_schema_mismatch_is_ignored(self, tmp_path):
+        cache = SessionSnapshotCache(str(tmp_path))
+        cache.save('camp', [SessionDocument.from_firestore('s1', 'camp', session_data(1, T1))])
+        other = SessionSnapshotCache(str(tmp_path))
+        other.schema = 'different'
+        assert other.load('camp') == {}
+
+    def test_missing_snapshot(self, tmp_path):
+        assert SessionSnapshotCache(str(tmp_path)).load('nope') == {}
+
+
+class TestIncrementalLoad:
+    """Test SessionNotesStorage loading through the snapshot cache."""
+
+    @pytest.mark.asyncio
+    async def test_only_changed_sessions_are_fetched(self, tmp_path):
+        docs = {f's{n}': session_data(n, T1) for n in range(1, 6)}
+        cache = SessionSnapshotCache(str(tmp_path))
+
+        # First cold start: full load, snapshot written
+        db = FakeDB(docs)
+        storage = await SessionNotesStorage(db, snapshot_cache=cache).get_campaign('camp')
+        assert storage.get_session_count() == 5
+        assert all(fields is None for _, fields in db.reads)
+
+        # Session 3 changes, session 5 is deleted, session 6 is added
+        docs['s3'] = dict(session_data(3, T2), summary='Rewritten')
+        del docs['s5']
+        docs['s6'] = session_data(6, T2)
+
+        db = FakeDB(docs)
+        storage = await SessionNotesStorage(db, snapshot_cache=cache).get_campaign('camp')
+        full_reads = sorted(doc_id for doc_id, fields in db.reads if fields is None)
+        assert full_reads == ['s3', 's6']
+        assert sorted(storage.sessions) == ['s1', 's2', 's3', 's4', 's6']
+        assert storage.get_session('s3').summary == 'Rewritten'
+
+        # Snapshot was refreshed: nothing to fetch on the next cold start
+        db = FakeDB(docs)
+        await SessionNotesStorage(db, snapshot_cache=cache).get_campaign('camp')
+        assert [doc_id for doc_id, fields in db.reads if fields is None] == []
@@ -0,0 +1,98 @@
+"""
+Test token-budgeted assembly of the final prompt context.
+
+Tests the assembler for:
+- Dropping entity context that repeats session context, line by line
+- Packing blocks by relevance under per-source and total budgets
+- Reporting token counts and the final prompt's context size
+"""
+
+from types import SimpleNamespace
+
+from src.llm.central_prompt_manager import CentralPromptManager
+from src.rag.context_assembler import ContextAssembler
+from src.rag.session_notes.session_types import QueryEngineResult, SessionNotesContext
+from src.utils.token_estimation import estimate_tokens
+
+
+SUMMARY = "The party confronted Ghul'Vor in the sunken temple and sealed the rift."
+
+
+def rulebook(*sections):
+    """Rulebook router result: (search results, performance)."""
+    results = [
+        SimpleNamespace(section=SimpleNamespace(title=title, content=content), score=score)
+        for title, content, score in sections
+    ]
+    return results, None
+
+
+def session_notes():
+    return QueryEngineResult(contexts=[
+        SessionNotesContext(session_number=3, session_summary=SUMMARY, relevance_score=2.0),
+    ])
+
+
+class TestDedupe:
+    """Test removing content repeated across sources."""
+
+    def test_entity_context_repeating_session_context_is_dropped(self):
+        raw_results = {
+            "session_notes": session_notes(),
+            "entity_context": {
+                "Ghul'Vor": {"session_notes": f"Session 3 - Summary:\n- {SUMMARY}"},
+                "Rift": {"session_notes": f"Session 3 - Summary:\n{SUMMARY}\nThe rift hums when touched by moonlight."},
+            },
+        }
+        packed = ContextAssembler(token_budget=5000).pack_prompt_context(raw_results)
+
+        assert packed.text.count("sunken temple") == 1
+        assert "INFORMATION ABOUT GHUL'VOR" not in packed.text
+        assert "The rift hums" in packed.text
+        assert packed.metadata["deduplicated_blocks"] == 1
+        assert packed.metadata["deduplicated_lines"] == 1
+
+
+class TestPacking:
+    """Test relevance-ordered packing under budgets."""
+
+    def test_source_budget_keeps_best_sections(self):
+        sections = [(f"Rule {i}", f"Rule text number {i}. " * 40, score) for i, score in enumerate([1, 9, 5, 3])]
+        assembler = ContextAssembler(token_budget=5000, source_budgets={"rulebook": 520})
+        packed = assembler.pack_prompt_context({"rulebook": rulebook(*sections)})
+
+        rulebook_stats = packed.metadata["sources"]["rulebook"]
+        assert "RULE SECTION: Rule 1" in packed.text and "RULE SECTION: Rule 2" in packed.text
+        assert "RULE SECTION: Rule 0" not in packed.text
+        assert packed.text.index("Rule 1") < packed.text.index("Rule 2")  # Original order kept
+        assert rulebook_stats["tokens"] <= 520
+        assert rulebook_stats["candidate_blocks"] == 4
+        assert packed.metadata["truncated_blocks"] == 1  # Rule 3, into the remaining ~110 tokens
+        assert "RULE SECTION: Rule 3" in packed.text and packed.text.endswith("[truncated]")
+        assert packed.metadata["dropped_blocks"] == 1
+
+    def test_total_budget_prefers_relevance_across_sources(self):
+        raw_results = {
+            "character": SimpleNamespace(character_data={"combat_stats": {"armor_class": 17, "max_hp": 45}}),
+            "rulebook": rulebook(("Grappling", "Grapple rules. " * 60, 4.0), ("Shoving", "Shove rules. " * 60, 1.0)),
+            "session_notes": session_notes(),
+        }
+        packed = ContextAssembler(token_budget=300).pack_prompt_context(raw_results)
+
+        assert 'combat_stats: {"armor_class": 17, "max_hp": 45}' in packed.text
+        assert "Grappling" in packed.text and "Shoving" not in packed.text
+        assert packed.metadata["total_tokens"] <= 300 + 20  # Section headings
+        assert packed.metadata["candidate_tokens"] > 400
+
+
+class TestFinalResponsePrompt:
+    """Test the prompt manager's use of the packed context."""
+
+    def test_prompt_reports_context_tokens(self):
+        manager = CentralPromptManager(ContextAssembler())
+        prompt, metadata = manager.build_final_response_prompt({"session_notes": session_notes()}, "Who is Ghul'Vor?")
+
+        assert "CAMPAIGN HISTORY:\nSESSION CONTEXT 1: Session 3\n" + SUMMARY in prompt
+        assert metadata["prompt_tokens"] == estimate_tokens(prompt)
+        assert metadata["sources"]["session_notes"]["blocks"] == 1
+        assert manager.get_final_response_prompt({}, "hi").count("No relevant data found.") == 1
@@ -0,0 +1,90 @@
+"""
+Test speculative retrieval while the LLM router runs.
+
+Predictions come from the local classifier first and keyword/entity-type
+rules otherwise. Speculation the router agrees with is reused, cutting the
+post-routing wait by the router latency; the rest is discarded and counted
+as wasted work. The sleeping routers come from the RAG query tests.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from src.rag.speculative_retrieval import SpeculationStats, SpeculativeRetrieval, predict_tools
+from tests.src.test_central_engine_rag_queries import make_engine
+
+
+RULEBOOK = [{"tool": "rulebook", "intention": "rule_mechanics"}]
+
+
+class TestPredictTools:
+    """Test tool/intention predictions."""
+
+    def test_classifier_decision_first(self):
+        classifier_tools = [{"tool": "session_notes", "intention": "npc_info", "confidence": 0.9}]
+        predicted = predict_tools("how does grappling work", [], {"rulebook": ["Grappled"]}, classifier_tools)
+
+        assert predicted == [
+            {"tool": "session_notes", "intention": "npc_info"},
+            {"tool": "rulebook", "intention": "general_info"},
+        ]
+
+    def test_rules_and_entity_types(self):
+        assert predict_tools("What is {CHARACTER}'s AC?", [], {}) == [
+            {"tool": "character_data", "intention": "combat_info"}
+        ]
+        assert predict_tools("How does grappling work?", [], {}) == RULEBOOK
+        assert predict_tools("What does Fireball do?", [{"name": "Fireball", "type": "SPELL"}], {}) == [
+            {"tool": "rulebook", "intention": "spell_details"}
+        ]
+        assert len(predict_tools("how do my spell slots work", [], {"session_notes": ["Ghul'Vor"]},
+                                 max_queries=2)) == 2
+
+
+class TestSpeculativeRetrieval:
+    """Test keeping and discarding speculative queries."""
+
+    async def route_and_execute(self, routed_tools):
+        engine = make_engine(rulebook=0.3, speculative_retrieval_enabled=True)
+        speculation = engine._start_speculation("How does grappling work?", "How does grappling work?", [])
+        speculation.stats = SpeculationStats()
+
+        await asyncio.sleep(0.3)  # Router latency
+        speculation.mark_routed()
+        await speculation.task
+
+        timings = {}
+        start = time.perf_counter()
+        results = await engine._execute_rag_queries(
+            routed_tools, {}, speculation.entity_results, "How does grappling work?",
+            tool_timings=timings, speculation=speculation
+        )
+        return results, timings, time.perf_counter() - start, speculation
+
+    @pytest.mark.asyncio
+    async def test_agreeing_router_reuses_speculation(self):
+        results, timings, elapsed, speculation = await self.route_and_execute(RULEBOOK)
+
+        assert results == {"rulebook": "rulebook"}
+        assert timings["rulebook"]["speculative"] is True
+        assert elapsed < 0.15  # Started 0.3s earlier
+        assert speculation.kept == ["rulebook"]
+        assert speculation.stats.to_dict()["hit_rate"] == 1.0
+
+    @pytest.mark.asyncio
+    async def test_disagreeing_router_discards_speculation(self):
+        routed = [{"tool": "rulebook", "intention": "spell_details"}]
+        results, timings, elapsed, speculation = await self.route_and_execute(routed)
+
+        assert results == {"rulebook": "rulebook"}
+        assert timings["rulebook"]["speculative"] is False
+        assert speculation.discarded == ["rulebook"]
+        stats = speculation.stats.to_dict()
+        assert stats["kept"] == 0 and stats["wasted"] == 1 and stats["wasted_ms"] >= 290
+
+    def test_nothing_launched_after_routing(self):
+        speculation = SpeculativeRetrieval(SpeculationStats())
+        speculation.discard()
+        assert speculation.summary()["kept"] == [] and speculation.stats.launched == 0
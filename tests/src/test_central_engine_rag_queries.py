@@ -0,0 +1,124 @@
+"""
+Test concurrent RAG tool queries in CentralEngine.
+
+The engine is built without its data sources, and stand-in routers that
+sleep simulate retrieval latency. Multi-tool latency should track the slowest
+tool rather than the sum, and a tool that times out or raises is dropped
+while the others are still returned with their timings.
+"""
+
+import dataclasses
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.central_engine import CentralEngine, await_tracked
+from src.config import get_config
+from src.rag.speculative_retrieval import SpeculationStats, SpeculativeRetrieval, submit_tracked
+
+
+TOOLS = [
+    {"tool": "character_data", "intention": "combat_info"},
+    {"tool": "session_notes", "intention": "npc_info"},
+    {"tool": "rulebook", "intention": "rule_mechanics"},
+]
+
+
+class SlowRouter:
+    """Router stand-in: sleeps, then returns its name (or raises)."""
+
+    def __init__(self, name: str, delay: float, error: bool = False):
+        self.name = name
+        self.delay = delay
+        self.error = error
+
+    def _run(self, **kwargs):
+        time.sleep(self.delay)
+        if self.error:
+            raise RuntimeError(f"{self.name} unavailable")
+        return self.name
+
+    query_character = query = _run
+
+
+def make_engine(character=0.3, session_notes=0.3, rulebook=0.3, **config_overrides) -> CentralEngine:
+    engine = CentralEngine.__new__(CentralEngine)
+    engine.config = dataclasses.replace(get_config(), **config_overrides)
+    engine.character = None
+    engine.campaign_session_notes = None
+    engine.rulebook_storage = None
+    engine.character_router = SlowRouter("character", character)
+    engine.session_notes_router = SlowRouter("session_notes", session_notes)
+    engine.rulebook_router = SlowRouter("rulebook", rulebook)
+    return engine
+
+
+class TestExecuteRagQueries:
+    """Test concurrent dispatch, timeouts and partial failures."""
+
+    @pytest.mark.asyncio
+    async def test_tools_run_concurrently(self):
+        engine = make_engine()
+        timings = {}
+
+        start = time.perf_counter()
+        results = await engine._execute_rag_queries(TOOLS, {}, {}, "query", tool_timings=timings)
+        elapsed = time.perf_counter() - start
+
+        assert results == {"character": "character", "session_notes": "session_notes", "rulebook": "rulebook"}
+        assert elapsed < 0.6  # Sequential would be 0.9s
+        assert set(timings) == {"character", "session_notes", "rulebook"}
+        assert all(t["status"] == "ok" and t["time_ms"] >= 290 for t in timings.values())
+
+    @pytest.mark.asyncio
+    async def test_timeout_and_error_are_partial_failures(self):
+        engine = make_engine(character=0.05, rulebook=0.5, rag_rulebook_timeout_seconds=0.1)
+        engine.session_notes_router.error = True
+        timings = {}
+
+        results = await engine._execute_rag_queries(TOOLS, {}, {}, "query", tool_timings=timings)
+
+        assert results == {"character": "character"}
+        assert timings["rulebook"]["status"] == "timeout"
+        assert timings["rulebook"]["time_ms"] < 400
+        assert timings["session_notes"]["status"] == "error"
+
+    @pytest.mark.asyncio
+    async def test_timeout_starts_when_query_runs(self):
+        executor = ThreadPoolExecutor(max_workers=1)
+        busy = submit_tracked(executor, lambda: time.sleep(0.2))
+        queued = submit_tracked(executor, lambda: time.sleep(0.05) or "done")
+
+        # Queued for 0.2s, then runs well within its 0.15s timeout
+        assert await await_tracked(queued, 0.15) == "done"
+        await await_tracked(busy, 1.0)
+        executor.shutdown()
+
+
+class TestSpeculativeQueries:
+    """Test claiming and dropping speculative queries in _execute_rag_queries."""
+
+    @pytest.mark.asyncio
+    async def test_matching_query_taken_others_discarded(self):
+        engine = make_engine(session_notes=0.3, rulebook=0.3)
+        executor = ThreadPoolExecutor(max_workers=2)
+        speculation = SpeculativeRetrieval(SpeculationStats())
+        predicted = [TOOLS[1], {"tool": "rulebook", "intention": "spell_details"}]
+        for key, (signature, call, _) in engine._build_rag_queries(predicted, {}, {}, "query").items():
+            speculation.launch(key, signature, call, executor)
+
+        time.sleep(0.1)  # Router latency
+        speculation.mark_routed()
+        timings = {}
+        results = await engine._execute_rag_queries(
+            TOOLS[1:], {}, {}, "query", tool_timings=timings, speculation=speculation
+        )
+
+        assert results == {"session_notes": "session_notes", "rulebook": "rulebook"}
+        assert speculation.kept == ["session_notes"] and speculation.discarded == ["rulebook"]
+        assert timings["session_notes"]["speculative"] and not timings["rulebook"]["speculative"]
+        # Credited only up to routing, though the query ran on for another 0.2s
+        assert 90 <= speculation.saved_ms < 200
+        assert speculation.stats.wasted == 1
+        executor.shutdown()
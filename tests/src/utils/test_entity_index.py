@@ -0,0 +1,122 @@
+"""
+Test EntityIndex and the indexed EntitySearchEngine lookups.
+
+Tests the index for:
+- Returning every record match_entity_name accepts, on randomized names
+- Insertion-ordered records and text mentions via records_mentioning()
+- Session notes search equal to the full scan
+- Rebuilds when the source revision or content changes
+"""
+
+import random
+
+from src.rag.character.character_types import (
+    InventoryItem, InventoryItemDefinition, create_empty_character
+)
+from src.utils.entity_index import EntityIndex, normalize_text
+from src.utils.entity_search_engine import EntitySearchEngine
+from scripts.synthetic_campaign import generate_campaign
+
+
+def random_name(rng: random.Random) -> str:
+    def word():
+        return "".join(rng.choice("aeilnorst") for _ in range(rng.randint(1, 7)))
+    separators = [" ", " ", "-", "'", " the "]
+    name = word()
+    for _ in range(rng.randint(0, 2)):
+        name += rng.choice(separators) + word()
+    return name.title() if rng.random() < 0.5 else name
+
+
+def mutate(rng: random.Random, text: str) -> str:
+    if len(text) < 3:
+        return text
+    i = rng.randrange(len(text) - 1)
+    return rng.choice([text[:i] + text[i + 1:], text[:i] + rng.choice("aeio") + text[i:], text[:i + 2],
+                       text.split()[0], text + "'s", "!!"])
+
+
+class TestEntityIndex:
+    """Test candidate lookup against match_entity_name."""
+
+    def test_lookup_finds_every_match(self):
+        rng = random.Random(4)
+        engine = EntitySearchEngine()
+        names = [random_name(rng) for _ in range(300)]
+        index = EntityIndex()
+        for i, name in enumerate(names):
+            index.add(name, i)
+
+        for _ in range(150):
+            query = mutate(rng, rng.choice(names)) if rng.random() < 0.8 else random_name(rng)
+            found = index.lookup(query, engine.threshold)
+            expected = [i for i, name in enumerate(names) if engine.match_entity_name(query, name)]
+            assert found == sorted(found)
+            assert set(expected) <= set(found), query
+
+    def test_records_in_insertion_order(self):
+        index = EntityIndex()
+        index.add("Ghul'Vor", "b")
+        index.add("Fireball", "x")
+        index.add("Ghul'Vor", "a")
+        index.add("", "ignored")
+        assert index.lookup("Ghul", 0.6) == ["b", "a"]
+        assert len(index) == 3
+
+    def test_records_mentioning(self):
+        index = EntityIndex()
+        index.add_text("They met Ghul'Vor at the docks.", 1)
+        index.add_text("Nothing happened.", 2)
+        index.add_text("ghulvor returned", 3)
+        assert index.records_mentioning("Ghul'Vor") == [1, 3]
+        assert normalize_text(" Ghul'Vor! ") == "ghulvor"
+
+
+class TestIndexedSearch:
+    """Compare indexed engine searches with a full scan."""
+
+    def test_session_notes_match_full_scan(self, monkeypatch):
+        storage = generate_campaign(30, seed=9)
+        engine = EntitySearchEngine()
+        queries = ["Duskryn", "Aldric Blackthorn", "Greywatr Docks", "Staff of Frost", "Ghul'Vor", "the",
+                   "Lathander", "Eldaryth", "Kael Moro", "!!"]
+
+        def as_tuples(results):
+            return [(r.found_in_sections, r.match_confidence, r.matched_text, r.match_strategy) for r in results]
+
+        indexed = [as_tuples(engine.search_session_notes(storage, q)) for q in queries]
+
+        # Full scan: every record is a candidate and every text is checked
+        monkeypatch.setattr(EntityIndex, "lookup", lambda self, name, threshold: list(self.records))
+        monkeypatch.setattr(EntityIndex, "records_mentioning", lambda self, name: [
+            record for text, record in zip(self._texts, self._text_records) if normalize_text(name) in text
+        ])
+        full_scan = [as_tuples(engine.search_session_notes(storage, q)) for q in queries]
+
+        assert indexed == full_scan
+        assert any(indexed)
+
+    def test_index_follows_source_version(self):
+        storage = generate_campaign(3, seed=1)
+        engine = EntitySearchEngine()
+        first = engine._get_session_notes_index(storage)
+        assert engine._get_session_notes_index(storage) is first
+
+        session = storage.get_all_sessions()[0]
+        storage.add_session(session.model_copy(update={"npcs": [{"name": "Zyxthar"}]}))
+        assert engine._get_session_notes_index(storage) is not first
+        assert engine.search_session_notes(storage, "Zyxthar")[0].match_strategy == "exact"
+
+    def test_character_index_follows_content(self):
+        character = create_empty_character("Duskryn", "Hill Dwarf", "Warlock")
+        engine = EntitySearchEngine()
+        first = engine._get_character_index(character, 'inventory')
+        assert engine._get_character_index(character, 'inventory') is first
+
+        # In-place edits change the section digest
+        character.inventory.backpack.append(InventoryItem(
+            definition=InventoryItemDefinition(name="Staff of Frost", type="Staff"),
+            quantity=1, isAttuned=False, equipped=False
+        ))
+        assert engine._get_character_index(character, 'inventory') is not first
+        assert engine._find_best_indexed_match(character, 'inventory', "Staff of Frost")[1] == "exact"
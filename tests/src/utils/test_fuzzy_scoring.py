@@ -0,0 +1,60 @@
+"""
+Test batch fuzzy scoring.
+
+match_entity_names must agree with match_entity_name for every candidate,
+with and without rapidfuzz, and the similarity bounds must never fall below
+SequenceMatcher.ratio().
+"""
+
+import random
+from difflib import SequenceMatcher
+
+import pytest
+
+from src.utils import fuzzy_scoring
+from src.utils.entity_search_engine import EntitySearchEngine
+
+
+def random_name(rng: random.Random) -> str:
+    def word():
+        return "".join(rng.choice("aeilnorst") for _ in range(rng.randint(1, 8)))
+    name = word()
+    for _ in range(rng.randint(0, 3)):
+        name += rng.choice([" ", " ", "-", "'", " of "]) + word()
+    return name.title() if rng.random() < 0.5 else name
+
+
+def mutate(rng: random.Random, text: str) -> str:
+    i = rng.randrange(len(text))
+    return rng.choice([text[:i] + text[i + 1:], text[:i] + rng.choice("aeio") + text[i:], text[:i + 3],
+                       text.split()[-1], text + "'s servants", ""])
+
+
+@pytest.fixture(params=[True, False], ids=["rapidfuzz", "numpy"])
+def backend(request, monkeypatch):
+    if request.param and not fuzzy_scoring.RAPIDFUZZ_AVAILABLE:
+        pytest.skip("rapidfuzz not installed")
+    monkeypatch.setattr(fuzzy_scoring, "RAPIDFUZZ_AVAILABLE", request.param)
+
+
+class TestMatchEntityNames:
+    """Test batch scoring against match_entity_name."""
+
+    def test_same_results_as_match_entity_name(self, backend):
+        rng = random.Random(11)
+        engine = EntitySearchEngine()
+        names = [random_name(rng) for _ in range(200)] + ["", "!!", "Ghul'Vor", "Ghul-kin"]
+
+        for _ in range(200):
+            query = mutate(rng, rng.choice(names[:200])) if rng.random() < 0.8 else random_name(rng)
+            threshold = rng.choice([None, 0.5, 0.8])
+            expected = [engine.match_entity_name(query, name, threshold) for name in names]
+            assert engine.match_entity_names(query, names, threshold) == expected, query
+
+    def test_bounds_are_upper_bounds(self, backend):
+        rng = random.Random(5)
+        names = [random_name(rng).lower() for _ in range(300)]
+        for text in names[:30]:
+            bounds = fuzzy_scoring.similarity_bounds(text, names, 0.0)
+            ratios = [SequenceMatcher(None, text, name).ratio() for name in names]
+            assert all(bound >= ratio - 1e-9 for bound, ratio in zip(bounds, ratios))